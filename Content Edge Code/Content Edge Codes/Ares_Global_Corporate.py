@@ -1,11 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
 import re
 from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "Ares Management"
@@ -36,41 +37,7 @@ class AresScraperGlobal:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                "--disable-gpu",
-                "--no-sandbox",
-                "--single-process",
-                "--disable-dev-shm-usage",
-                "--no-zygote",
-                "--disable-setuid-sandbox",
-                "--disable-accelerated-2d-canvas",
-                "--disable-dev-shm-usage",
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-background-networking",
-                "--disable-background-timer-throttling",
-                "--disable-client-side-phishing-detection",
-                "--disable-component-update",
-                "--disable-default-apps",
-                "--disable-domain-reliability",
-                "--disable-features=AudioServiceOutOfProcess",
-                "--disable-hang-monitor",
-                "--disable-ipc-flooding-protection",
-                "--disable-popup-blocking",
-                "--disable-prompt-on-repost",
-                "--disable-renderer-backgrounding",
-                "--disable-sync",
-                "--force-color-profile=srgb",
-                "--metrics-recording-only",
-                "--mute-audio",
-                "--no-pings",
-                "--use-gl=swiftshader",
-                "--window-size=1280,1696"
-            ]
-        )
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
@@ -100,14 +67,14 @@ class AresScraperGlobal:
                 logger.info(f"Scraping listing page: {paged_url}")
 
                 await page.goto(paged_url, timeout=120000)
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
 
                 # Step 2: Disclaimer (kept for template)
                 try:
                     await page.locator("#selector-form-confirm").click(timeout=3000)
                     await page.locator("#im-jurisdiction").click(timeout=3000)
                     await page.get_by_role("button", name="Proceed").click()
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(page, self.sleep_time)
                 except:
                     pass
 
@@ -193,7 +160,7 @@ class AresScraperGlobal:
             # Step 6: Scrape article pages for content
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             self.items = [item for item in self.items if item["article_content"]]
             return self.items
 
@@ -215,7 +182,7 @@ class AresScraperGlobal:
 
             try:
                 await page.goto(url, timeout=120000)
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
 
                 content_el = await page.locator("div.rich-text-inner-content").all_text_contents()
                 full_text = " ".join(map(str.strip, content_el)).strip()
@@ -261,12 +228,10 @@ async def ARESGCO(target_date):
         scraper = AresScraperGlobal(target_date)
         results = await scraper.scrape(url)
 
-        output_path=f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} Global articles after {target_date}")
-        return 200
+        return results
 
     except Exception as error:
         logger.error(f"Error: {error}")
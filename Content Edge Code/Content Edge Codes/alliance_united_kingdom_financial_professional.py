@@ -1,11 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
 from dateutil import parser
 import re 
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 site = "Alliance Bernstein"
 section = "Insights"
@@ -36,39 +38,7 @@ class AllianceScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                        ])
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                     )
@@ -87,14 +57,15 @@ class AllianceScraper:
                 })
             await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
-            try:
-                logger.info("Selecting UK + Financial Advisor")
-                await page.get_by_role("link", name="UK", exact=True).click()
-                await page.get_by_role("link", name="Financial Adviser").click()
-                await page.get_by_role("button", name="Yes Continue").click()
-            except Exception as e:
-                logger.debug(f"Error Occured while selecting: {e}")
+            await wait_until_ready(page, self.sleep_time)
+            with run_report.span("consent"):
+                try:
+                    logger.info("Selecting UK + Financial Advisor")
+                    await page.get_by_role("link", name="UK", exact=True).click()
+                    await page.get_by_role("link", name="Financial Adviser").click()
+                    await page.get_by_role("button", name="Yes Continue").click()
+                except Exception as e:
+                    logger.debug(f"Error Occured while selecting: {e}")
 
             while True:
                 await page.wait_for_selector(".ab-card", timeout=15000)
@@ -116,7 +87,7 @@ class AllianceScraper:
                         if await load_more.count() > 0:
                             logger.info("Clicking 'Load More' directly")
                             await load_more.first.click()
-                            await asyncio.sleep(self.sleep_time)
+                            await wait_until_ready(page, self.sleep_time, count_selector=".ab-card", previous_count=len(cards))
                         else:
                             logger.info("Button not found — scrolling to bottom to render it...")
                             await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
@@ -124,7 +95,7 @@ class AllianceScraper:
                             if await load_more.count() > 0:
                                 logger.info("Button appeared after scroll")
                                 await load_more.first.click()
-                                await asyncio.sleep(self.sleep_time)
+                                await wait_until_ready(page, self.sleep_time, count_selector=".ab-card", previous_count=len(cards))
                             else:
                                 logger.info("Still no 'Load More' button — stopping.")
                                 break
@@ -171,42 +142,39 @@ class AllianceScraper:
 
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             return [i for i in self.items if i["article_date"] and parser.parse(i["article_date"]).date() >= self.target_date]
     async def scrape_article_pages(self, context):
         logger.debug("DEBUG: Starting to scrape individual articles")
-        for item in self.items:
-            url = item["article_url"]
-            if not url:
-                continue
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-                paragraphs = await page.locator("p").all_text_contents()
-                full_text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = full_text
-                logger.debug(f"Succesfully scraped url:{url}")
+        await fetch_articles(context, self.items, self.scrape_article)
+
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
+            paragraphs = await page.locator("p").all_text_contents()
+            full_text = " ".join(p.strip() for p in paragraphs if p.strip())
+            item["article_content"] = full_text
+            logger.debug(f"Succesfully scraped url:{url}")
 
-            except Exception as e:
-                logger.error(f"ERROR: Failed to scrape {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+        except Exception as e:
+            logger.error(f"ERROR: Failed to scrape {url}: {e}")
+            item["article_content"] = None
 
 async def ABUKFP(target_date):
     url = "https://www.alliancebernstein.com/gb/en-gb/adviser/insights.html"
     scraper = AllianceScraper(target_date)
     results = await scraper.scrape(url)
-    output_path=f"/tmp/{company_site_id}.json"
     print(results)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
     logger.info(f" Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 if __name__ == "__main__":
     target_date = sys.argv[1] if len(sys.argv) > 1 else "2025-12-01"
@@ -1,11 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
-import re
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from http_articles import HttpArticleReader
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "Allspring Global Investments"
@@ -36,41 +38,7 @@ class AllSpringScraperGlobal:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--disable-dev-shm-usage",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                 user_agent=(
                     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -102,41 +70,42 @@ class AllSpringScraperGlobal:
                 if page_index == 1:
                     logger.info(f"Scraping listing page {page_index}: {url}")
                     await page.goto(url, timeout=120000)
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(page, self.sleep_time)
                 else:
                     logger.info(f"Clicking pagination button for page {page_index}")
                     try:
                         await page.locator(
                             f"nav.allspring-pagination button.score-button.text-secondary[data-page='{page_index}']"
                         ).click()
-                        await asyncio.sleep(self.sleep_time)
+                        await wait_until_ready(page, self.sleep_time)
                     except Exception as e:
                         logger.info(f"No pagination button for page {page_index} → stopping. Error: {e}")
                         break
 
-                try:
-                    await page.locator("#dropdown-location-button").click(timeout=3000)
-                    await asyncio.sleep(1)
+                with run_report.span("consent"):
+                    try:
+                        await page.locator("#dropdown-location-button").click(timeout=3000)
+                        await asyncio.sleep(1)
 
-                    await page.locator("#dropdown-location-option-gb").click(timeout=3000)
-                    await asyncio.sleep(1)
+                        await page.locator("#dropdown-location-option-gb").click(timeout=3000)
+                        await asyncio.sleep(1)
 
-                    await page.locator(
-                        "button.self-id__role:has(div.self-id__role-title:has-text('Financial Intermediary'))"
-                    ).click(timeout=3000)
-                    await asyncio.sleep(1)
+                        await page.locator(
+                            "button.self-id__role:has(div.self-id__role-title:has-text('Financial Intermediary'))"
+                        ).click(timeout=3000)
+                        await asyncio.sleep(1)
 
-                    await page.locator("button.self-id__footer-terms-actions--submit").click(timeout=3000)
-                    await asyncio.sleep(self.sleep_time)
+                        await page.locator("button.self-id__footer-terms-actions--submit").click(timeout=3000)
+                        await wait_until_ready(page, self.sleep_time)
 
-                except Exception as e:
-                    logger.debug(f"Self-ID popup not shown or already accepted: {e}")
+                    except Exception as e:
+                        logger.debug(f"Self-ID popup not shown or already accepted: {e}")
 
-                try:
-                    await page.locator("#onetrust-close-btn-container").click(timeout=2000)
-                    await asyncio.sleep(1)
-                except:
-                    pass
+                    try:
+                        await page.locator("#onetrust-close-btn-container").click(timeout=2000)
+                        await asyncio.sleep(1)
+                    except:
+                        pass
 
                 try:
                     await page.wait_for_selector("a.card.insight-card", state="attached", timeout=15000)
@@ -224,40 +193,40 @@ class AllSpringScraperGlobal:
 
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
 
             self.items = [item for item in self.items if item["article_content"]]
             return self.items
 
     async def scrape_article_pages(self, context):
-        page = await context.new_page()
+        # Article bodies are server-rendered; the browser is only a fallback.
+        reader = HttpArticleReader(context, "div.richtext__content", self.parse_article)
+        await fetch_articles(context, self.items, self.scrape_article, fast_path=reader)
 
-        for idx, item in enumerate(self.items, start=1):
-            url = item["article_url"]
-            if not url:
-                continue
+    def parse_article(self, doc, item):
+        content_el_list = doc.all_text_contents("div.richtext__content")
+        item["article_content"] = " ".join([c.strip() for c in content_el_list if c.strip()]).strip()
 
-            if url.lower().endswith(".pdf"):
-                item["article_content"] = url
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
 
-            try:
-                logger.info(f"Scraping article #{idx}: {url}")
-                await page.goto(url, timeout=120000)
-                await asyncio.sleep(self.sleep_time)
-
-                try:
-                    content_el_list = await page.locator("div.richtext__content").all_text_contents()
-                    full_text = " ".join([c.strip() for c in content_el_list if c.strip()]).strip()
-                except:
-                    full_text = ""
+        if url.lower().endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-                item["article_content"] = full_text
+        logger.info(f"Scraping article: {url}")
+        await page.goto(url, timeout=120000)
+        await wait_until_ready(page, self.sleep_time)
 
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx}: {e}")
+        try:
+            content_el_list = await page.locator("div.richtext__content").all_text_contents()
+            full_text = " ".join([c.strip() for c in content_el_list if c.strip()]).strip()
+        except:
+            full_text = ""
 
-        await page.close()
+        item["article_content"] = full_text
 
 
 async def ASGIUKFI(target_date):
@@ -267,12 +236,10 @@ async def ASGIUKFI(target_date):
         scraper = AllSpringScraperGlobal(target_date)
         results = await scraper.scrape(url)
 
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} UK Financial Intermediary articles after {target_date}")
-        return 200
+        return results
 
     except Exception as error:
         logger.error(f"Error: {error}")
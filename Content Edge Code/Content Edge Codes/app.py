@@ -1,69 +1,63 @@
-import asyncio
 from datetime import date
 import logging
 import json
 import os
 from dotenv import load_dotenv
 import boto3
+from botocore.config import Config
 
 load_dotenv()
 
-# --- Normaliser ---
-from normalise import clean_data
+# --- Browser runtime (kept warm across invocations) ---
+from browser_runtime import runtime
+from scraper_registry import ScraperRegistry
+import crawl_state
+from pipeline import SitePipeline
+from output_writer import get_s3_client, upload_items
+from orchestrator import INVOKE_TIMEOUT, FanOutOrchestrator, LambdaInvoker, worker_functions_from_env
+
+# --- Scraper registry (modules are imported on first use) ---
+registry = ScraperRegistry({
+    "am-213": ("kkr_global", "KKRGLOBALCO", "KKR Global Corporate"),
+    "am-201": ("nuveen_united_states_financial_professional", "NuveenUSFA", "Nuveen US Financial Professional"),
+    "am-212": ("pimco_singapore_financial_intermediary", "PIMCOSGFI", "PIMCO SG Financial Intermediary"),
+    "am-211": ("pimco_united_kingdom_financial_professional", "PIMCOUKFP", "PIMCO UK Financial Professional"),
+    "am-210": ("pimco_united_states_financial_advisors", "PIMCOUSFA", "PIMCO US Financial Advisors"),
+    "am-231": ("schroders_singapore_wealth_management", "SIMSGWM", "Schroders SG Wealth Management"),
+    "am-230": ("schroders_united_kingdom_intermediary", "SIMUKI", "Schroders UK Intermediary"),
+    "am-229": ("schroders_united_states_intermediary", "SIMUSI", "Schroders US Intermediary"),
+    "am-291": ("alliance_united_kingdom_financial_intermediary", "ABUKFI", "AB UK Financial Intermediary"),
+    "am-290": ("alliance_united_kingdom_financial_professional", "ABUKFP", "AB UK Financial Professional"),
+    "am-289": ("alliance_united_states_financial_professional", "ABUSFP", "AB US Financial Professional"),
+    "am-233": ("robeco_united_kingdom_corporate", "RobecoUKC", "Robeco UK Corporate"),
+    "am-232": ("robeco_united_states_corporate", "RobecoUSC", "Robeco US Corporate"),
+    "am-234": ("robeco_singapore_corporate", "RobecoSGC", "Robeco SG Corporate"),
+    "am-239": ("bnp_singapore_financial_intermediary", "BNPSGFI", "BNP SG Financial Intermediary"),
+    "am-238": ("bnp_united_kingdom_financial_intermediary", "BNPUKFI", "BNP UK Financial Intermediary"),
+    "am-265": ("ssga_united_kingdom_financial_professional", "SSGAUKFP", "SSGA UK Financial Professional"),
+    "am-264": ("sssga_united_states_financial_professional", "SSGAUSFP", "SSGA US Financial Professional"),
+    "am-280": ("franklin_singapore_financial_professional", "FTSGFP", "Franklin SG Financial Professional"),
+    "am-279": ("franklin_united_kingdom_financial_professional", "FTUKFP", "Franklin UK Financial Professional"),
+    "am-278": ("franklin_united_states_financial_professional", "FTUSFP", "Franklin US Financial Professional"),
+    "am-272": ("blackstone_united_states_corporate", "BSUSCO", "Blackstone US Corporate"),
+    "am-353": ("Ares_Global_Corporate", "ARESGCO", "Ares Global Corporate"),
+    "am-340": ("allspring_Singapore_financial_Intermediary", "ASGISGFI", "Allspring Singapore Financial Intermediary"),
+    "am-339": ("allspring_united_Kingdom_financial_Intermediary", "ASGIUKFI", "Allspring United Kingdom Financial Intermediary"),
+    "am-338": ("allspring_united_states_financial_advisor", "ASGIUSFA", "Allspring United States Financial Advisor"),
+    "am-297": ("wellington_singapore_financial_intermediary", "WMGSGFP", "Wellington Singapore Financial Intermediary"),
+    "am-296": ("wellington_united_kingdom_financial_professional", "WMGUKFP", "Wellington United Kingdom Financial Professional"),
+    "am-295": ("wellington_united_state_financial_intermediary", "WMGUSFP", "Wellington United States Financial Intermediary"),
+    "am-218": ("federated_united_states_financial_advisor", "FHUSFA", "Federated Hermes United States Financial Advisor"),
+    "am-247": ("jp_morgan_united_states_financial_professional", "JPMUSFP", "J.P. Morgan Asset Management United States Financial Professional"),
+    "am-248": ("jp_morgan_united_Kingdom_financial_advisor", "JPMUKFA", "J.P. Morgan Asset Management United Kingdom Financial Advisor"),
+    "am-271": ("gsami_singapore_financial_intermediary", "GSAMSGFI", "Goldman Sachs AM International Singapore Financial Intermediary"),
+    "am-270": ("gsami_united_states_financial_intermediary", "GSAMUSFI", "Goldman Sachs AM International United States Financial Intermediary"),
+    "am-273": ("gsami_united_kingdom_financial_intermediary", "GSAMUKFI", "Goldman Sachs AM International United Kingdom Financial Intermediary"),
+})
 
-# --- Scraper Imports ---
-from KKR_Global_Corporate import KKRGLOBALCO
-from Nuveen_Investments_United_States_Financial_Professional import NuveenUSFA as Nuveen_amg
-
-from pimco_singapore_financial_intermediary import PIMCOSGFI
-from pimco_united_kingdom_financial_professional import PIMCOUKFP
-from pimco_united_states_financial_advisors import PIMCOUSFA
-
-from schroders_singapore_wealth_management import SIMSGWM
-from schroders_united_kingdom_intermediary import SIMUKI
-from schroders_united_states_intermediary import SIMUSI
-
-from alliance_united_kingdom_financial_intermediary import ABUKFI
-from alliance_united_kingdom_financial_professional import ABUKFP
-from alliance_united_states_financial_professional import ABUSFP
-
-from robeco_united_kingdom_corporate import RobecoUKC
-from robeco_united_states_corporate import RobecoUSC
-from robeco_singapore_corporate import RobecoSGC
-
-from bnp_singapore_financial_intermediary import BNPSGFI
-from bnp_united_kingdom_financial_intermediary import BNPUKFI
-
-from ssga_united_kingdom_financial_professional import SSGAUKFP
-from sssga_united_states_financial_professional import SSGAUSFP
-
-from franklin_singapore_financial_professional import FTScraperSG as FranklinSGFP
-from franklin_united_kingdom_financial_professional import FTScraperUK as FranklinUKFP
-from franklin_united_states_financial_professional import FTScraperUS as FranklinUSFP
-
-from blackstone_united_states_corporate import BSUSCO
-
-from Ares_Global_Corporate import ARESGCO
-
-from allspring_Singapore_financial_Intermediary import ASGISGFI
-from allspring_united_Kingdom_financial_Intermediary import ASGIUKFI
-from allspring_united_states_financial_advisor import ASGIUSFA
-
-from wellington_united_kingdom_financial_professional import WMGUKFP
-from wellington_singapore_financial_intermediary import WMGSGFP
-from wellington_united_state_financial_intermediary import WMGUSFI
-
-from federated_united_states_financial_advisor import FederatedHermesScraper as ASGIUSFA
-
-from jp_morgan_united_states_financial_professional import JPMScraperGlobal as JPMSGFP
-from jp_morgan_united_Kingdom_financial_advisor import JPMScraperGlobal as JPMSGUKFA
-
-from gsami_singapore_financial_intermediary import GSAMSGFI
-from gsami_united_states_financial_intermediary import GSAMUSFI
-from gsami_united_kingdom_financial_intermediary import GSAMUKFI
 # --- AWS Setup ---
-s3 = boto3.resource("s3")
-lambda_client = boto3.client("lambda")
+# Synchronous worker invokes are given up after INVOKE_TIMEOUT seconds
+lambda_client = boto3.client("lambda", config=Config(read_timeout=INVOKE_TIMEOUT, retries={"max_attempts": 0}))
 
 logging.basicConfig(
     level=logging.INFO,
@@ -73,181 +67,79 @@ logging.basicConfig(
 logger = logging.getLogger("LAMBDA_HANDLER")
 bucket_name = os.getenv("BUCKET_NAME")
 
+# --- Crawl state (what earlier runs already captured) ---
+crawl_store = crawl_state.get_state_store(bucket_name)
+
 
 def save_json_to_s3(data, bucket_name, file_key):
     try:
-        client = boto3.client("s3")
-        json_data = json.dumps(data, indent=2, default=str)
+        upload_items(get_s3_client(), data, bucket_name, file_key)
+        return True
 
-        client.put_object(
+    except Exception as e:
+        logger.error(f"Error uploading to S3: {e}")
+        return False
+
+
+def save_report_to_s3(report, bucket_name, file_key):
+    try:
+        get_s3_client().put_object(
             Bucket=bucket_name,
             Key=file_key,
-            Body=json_data,
+            Body=json.dumps(report, indent=2).encode("utf-8"),
             ContentType="application/json",
         )
         return True
 
     except Exception as e:
-        logger.error(f"Error uploading to S3: {e}")
+        logger.error(f"Error uploading run report to S3: {e}")
         return False
 
 
+# --- Pipeline: scrape, clean, dedupe against crawl state, upload ---
+pipeline = SitePipeline(registry, bucket_name, save_json_to_s3, crawl_store, group="content-edge-codes", upload_report=save_report_to_s3)
+
+
 def lambda_handler(event, context):
+    """
+    Single site: {"company_site_id": "am-xxx", "target_date": "YYYY-MM-DD"}
+    Batch: {"company_site_ids": [...]} or {"site_group": "content-edge-codes"}, optionally
+    with "sites_in_flight"; returns per-site status codes and timings.
+    Sibling groups: {"sibling_groups": ["pimco", ...]} or "all" runs each
+    group's regional sites together, fetching shared articles once.
+    List sites: {"action": "list_sites"} (used by the orchestrator)
+    Each site result carries a run report (phase timings, article latency
+    p50/p95, pages, retries, bytes), also uploaded next to its output; a
+    single-site event with "report": true returns the whole result.
+    """
+    target_date = event.get("target_date", str(date.today()))
+
+    if event.get("action") == "list_sites":
+        return {"statusCode": 200, "site_group": pipeline.group, "company_site_ids": list(registry)}
+
+    if pipeline.is_batch(event):
+        return runtime.run(pipeline.run_batch(event, target_date))
+
     company_site_id = event.get("company_site_id")
+    if company_site_id not in registry:
+        logger.error(f"Unknown company_site_id: {company_site_id}")
+        return {"statusCode": 400, "body": "Unknown company_site_id"}
+
+    result = runtime.run(pipeline.run_site(company_site_id, target_date, event.get("full_crawl", False)))
+    if event.get("report"):
+        return result
+    return result["statusCode"]
+
+
+def orchestrator_handler(event, context):
+    """
+    Fan the daily crawl out to the worker Lambdas of several site groups.
+    Event: {"target_date": "YYYY-MM-DD", "site_groups": ["amg-1", "amg-2"],
+    "max_concurrency": 10}. Worker function names come from WORKER_FUNCTIONS.
+    """
+    function_names = worker_functions_from_env()
     target_date = event.get("target_date", str(date.today()))
+    groups = event.get("site_groups") or list(function_names)
 
-    match company_site_id:
-
-        case "am-213":
-            logger.info("am-213 | KKR Global Corporate")
-            scraper_func = KKRGLOBALCO
-
-        case "am-201":
-            logger.info("am-201 | Nuveen US Financial Professional")
-            scraper_func = Nuveen_amg
-
-        case "am-212":
-            logger.info("am-212 | PIMCO SG Financial Intermediary")
-            scraper_func = PIMCOSGFI
-
-        case "am-211":
-            logger.info("am-211 | PIMCO UK Financial Professional")
-            scraper_func = PIMCOUKFP
-
-        case "am-210":
-            logger.info("am-210 | PIMCO US Financial Advisors")
-            scraper_func = PIMCOUSFA
-
-        case "am-231":
-            logger.info("am-231 | Schroders SG Wealth Management")
-            scraper_func = SIMSGWM
-
-        case "am-230":
-            logger.info("am-230 | Schroders UK Intermediary")
-            scraper_func = SIMUKI
-
-        case "am-229":
-            logger.info("am-229 | Schroders US Intermediary")
-            scraper_func = SIMUSI
-
-        case "am-291":
-            logger.info("am-291 | AB UK Financial Intermediary")
-            scraper_func = ABUKFI
-
-        case "am-290":
-            logger.info("am-290 | AB UK Financial Professional")
-            scraper_func = ABUKFP
-
-        case "am-289":
-            logger.info("am-289 | AB US Financial Professional")
-            scraper_func = ABUSFP
-
-        case "am-233":
-            logger.info("am-233 | Robeco UK Corporate")
-            scraper_func = RobecoUKC
-
-        case "am-232":
-            logger.info("am-232 | Robeco US Corporate")
-            scraper_func = RobecoUSC
-
-        case "am-234":
-            logger.info("am-234 | Robeco SG Corporate")
-            scraper_func = RobecoSGC
-
-        case "am-239":
-            logger.info("am-239 | BNP SG Financial Intermediary")
-            scraper_func = BNPSGFI
-
-        case "am-238":
-            logger.info("am-238 | BNP UK Financial Intermediary")
-            scraper_func = BNPUKFI
-
-        case "am-265":
-            logger.info("am-265 | SSGA UK Financial Professional")
-            scraper_func = SSGAUKFP
-
-        case "am-264":
-            logger.info("am-264 | SSGA US Financial Professional")
-            scraper_func = SSGAUSFP
-
-        case "am-280":
-            logger.info("am-280 | Franklin SG Financial Professional")  
-            scraper_func = FranklinSGFP
-        case "am-279":
-            logger.info("am-279 | Franklin UK Financial Professional")  
-            scraper_func = FranklinUKFP
-        case "am-278":
-            logger.info("am-278 | Franklin US Financial Professional")  
-            scraper_func = FranklinUSFP
-        
-        case "am-272":
-            logger.info("am-272 | Blackstone US Corporate") 
-            scraper_func = BSUSCO
-        
-        case "am-353":
-            logger.info("am-353 | Ares Global Corporate")
-            scraper_func = ARESGCO
-        
-        case "am-340":
-            logger.info("am-340 | Allspring Singapore Financial Intermediary")
-            scraper_func = ASGISGFI
-
-        case "am-339":
-            logger.info("am-339 | Allspring United Kingdom Financial Intermediary")
-            scraper_func = ASGIUKFI
-        
-        case "am-338":
-            logger.info("am-338 | Allspring United States Financial Advisor")
-            scraper_func = ASGIUSFA
-
-        case "am-297":
-            logger.info("am-297 | Wellington Singapore Financial Intermediary")
-            scraper_func = WMGSGFP
-        case "am-296":
-            logger.info("am-296 | Wellington United Kingdom Financial Professional")
-            scraper_func = WMGUKFP
-        case "am-295":
-            logger.info("am-295 | Wellington United States Financial Intermediary")
-            scraper_func = WMGUSFI
-        
-        case "am-218":
-            logger.info("am-218 | Federated Hermes United States Financial Advisor")
-            scraper_func = ASGIUSFA
-
-        case "am-247":
-            logger.info("am-247 | J.P. Morgan Asset Management United States Financial Professional")
-            scraper_func = JPMSGFP
-        case "am-248":
-            logger.info("am-248 | J.P. Morgan Asset Management United Kingdom Financial Advisor")
-            scraper_func = JPMSGUKFA
-        
-        case "am-271":
-            logger.info("am-271 | Goldman Sachs AM International Singapore Financial Intermediary")
-            scraper_func = GSAMSGFI
-        case "am-270":  
-            logger.info("am-270 | Goldman Sachs AM International United States Financial Intermediary")
-            scraper_func = GSAMUSFI
-        case "am-273":
-            logger.info("am-273 | Goldman Sachs AM International United Kingdom Financial Intermediary")
-            scraper_func = GSAMUKFI
-            
-        case _:
-            logger.error(f"Unknown company_site_id: {company_site_id}")
-            return {"statusCode": 400, "body": "Unknown company_site_id"}
-
-    response = asyncio.run(scraper_func(target_date))
-
-    if response == 200:
-        output_path = f"/tmp/{company_site_id}.json"
-
-        with open(output_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
-
-        data = clean_data(data)
-
-        target_date_str = "/".join(target_date.split("-"))
-        file_key = f"output/website/{target_date_str}/{company_site_id}.json"
-
-        save_json_to_s3(data, bucket_name, file_key)
-
-    return response
+    orchestrator = FanOutOrchestrator(LambdaInvoker(lambda_client, function_names), event.get("max_concurrency"))
+    return orchestrator.run(target_date, groups, full_crawl=event.get("full_crawl", False))
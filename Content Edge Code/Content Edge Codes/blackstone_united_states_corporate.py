@@ -1,11 +1,11 @@
 import asyncio
-import json
 import logging
 import sys
-import re
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 
 site = "Blackstone Group LP"
@@ -37,40 +37,7 @@ class BlackstoneScraperUS:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -92,7 +59,7 @@ class BlackstoneScraperUS:
             })
             await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             while True:
                 await page.wait_for_selector("article.bx-article-column", timeout=20000)
@@ -115,7 +82,7 @@ class BlackstoneScraperUS:
                 load_more = page.locator("button.js-load-more-insight")
                 if await load_more.count() > 0:
                     await load_more.click()
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(page, self.sleep_time, count_selector="article.bx-article-column", previous_count=len(cards))
                 else:
                     break
 
@@ -160,51 +127,47 @@ class BlackstoneScraperUS:
 
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
 
             return self.items
 
     async def scrape_article_pages(self, context):
         logger.debug("DEBUG: Starting to scrape individual Blackstone articles")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-        for item in self.items:
-            url = item["article_url"]
-            if not url:
-                continue
-
-            page = await context.new_page()
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
 
-            try:
-                resp = await page.goto(url, timeout=60000)
+        try:
+            resp = await page.goto(url, timeout=60000)
 
-                # PDF detection
-                ct = resp.headers.get("content-type", "").lower()
-                if "pdf" in ct:
-                    item["article_content"] = url
-                    await page.close()
-                    continue
-
-                await asyncio.sleep(self.sleep_time)
-
-                # Extract content
-                paragraphs = await page.locator("div.bx-article-content__content p").all_text_contents()
-                if paragraphs:
-                    item["article_description"] = paragraphs[0].strip()
-                    item["article_content"] = " ".join(
-                        p.strip() for p in paragraphs if p.strip()
-                    )
-                else:
-                    item["article_description"] = await page.locator("meta[name='description']").get_attribute("content")
-                    item["article_content"] = None
-
-                logger.debug(f"Succesfully scraped url:{url}")
-
-            except Exception as e:
-                logger.error(f"ERROR: Failed to scrape {url}: {e}")
+            # PDF detection
+            ct = resp.headers.get("content-type", "").lower()
+            if "pdf" in ct:
+                item["article_content"] = url
+                await page.close()
+                return
+
+            await wait_until_ready(page, self.sleep_time)
+
+            # Extract content
+            paragraphs = await page.locator("div.bx-article-content__content p").all_text_contents()
+            if paragraphs:
+                item["article_description"] = paragraphs[0].strip()
+                item["article_content"] = " ".join(
+                    p.strip() for p in paragraphs if p.strip()
+                )
+            else:
+                item["article_description"] = await page.locator("meta[name='description']").get_attribute("content")
                 item["article_content"] = None
 
-            finally:
-                await page.close()
+            logger.debug(f"Succesfully scraped url:{url}")
+
+        except Exception as e:
+            logger.error(f"ERROR: Failed to scrape {url}: {e}")
+            item["article_content"] = None
 
 
 async def BSUSCO(target_date):
@@ -212,13 +175,10 @@ async def BSUSCO(target_date):
     scraper = BlackstoneScraperUS(target_date)
     results = await scraper.scrape(url)
 
-    output_path = f"/tmp/{company_site_id}.json"
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} Blackstone articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
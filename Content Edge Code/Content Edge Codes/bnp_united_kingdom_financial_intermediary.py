@@ -1,10 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from article_fetch import fetch_articles
+import run_report
+from section_crawl import discover_sections
 
 # --- Site metadata ---
 site = "BNP Paribas Asset Management"
@@ -32,62 +35,55 @@ class BNPUKScraper:
     async def scrape(self):
         logger.info("Starting BNP UK FI scraper")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--disable-dev-shm-usage",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(
+            company_site_id,
+            args=[
+                "--disable-gpu",
+                "--no-sandbox",
+                "--single-process",
+                "--disable-dev-shm-usage",
+                "--no-zygote",
+                "--disable-setuid-sandbox",
+                "--disable-accelerated-2d-canvas",
+                "--disable-dev-shm-usage",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "--disable-background-networking",
+                "--disable-background-timer-throttling",
+                "--disable-client-side-phishing-detection",
+                "--disable-component-update",
+                "--disable-default-apps",
+                "--disable-domain-reliability",
+                "--disable-hang-monitor",
+                "--disable-ipc-flooding-protection",
+                "--disable-popup-blocking",
+                "--disable-prompt-on-repost",
+                "--disable-renderer-backgrounding",
+                "--disable-sync",
+                "--force-color-profile=srgb",
+                "--metrics-recording-only",
+                "--mute-audio",
+                "--no-pings",
+                "--use-gl=swiftshader",
+                "--window-size=1280,1696",
+            ],
+        ) as browser:
 
             context = await browser.new_context(
                 user_agent=(
                     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) ""AppleWebKit/537.36 (KHTML, like Gecko) ""Chrome/91.0.4472.124 Safari/537.36"
                 )
             )
-            page = await context.new_page()
-
             url_list = [
                 "https://www.bnpparibas-am.com/en-gb/intermediaries/insights/category/front-of-mind/",
                 "https://www.bnpparibas-am.com/en-gb/intermediaries/insights/category/portfolio-perspectives/",
                 "https://www.bnpparibas-am.com/en-gb/intermediaries/insights/category/forward-thinking/",
             ]
 
-            all_cards = []
-            for url in url_list:
-                logger.info(f"Processing category URL: {url}")
-                cards = await self._scrape_listing_page(page, url)
-                all_cards.extend(cards)
+            all_cards = await discover_sections(context, url_list, self._scrape_listing_page)
 
             await self.scrape_article_pages(context, all_cards)
-            await browser.close()
+            await context.close()
             logger.info(f"BNP scraper finished with {len(self.items)} articles having content")
             return self.items
 
@@ -96,28 +92,29 @@ class BNPUKScraper:
         cards_data = []
 
         await page.goto(url, timeout=120000)
-        await asyncio.sleep(self.sleep_time)
+        await wait_until_ready(page, self.sleep_time)
 
-        try:
-            await page.locator("#onetrust-accept-btn-handler").click(timeout=5000)
-            logger.debug("Accepted cookies")
-            await asyncio.sleep(1)
-        except Exception:
-            logger.debug("Cookie banner not found")
+        with run_report.span("consent"):
+            try:
+                await page.locator("#onetrust-accept-btn-handler").click(timeout=5000)
+                logger.debug("Accepted cookies")
+                await asyncio.sleep(1)
+            except Exception:
+                logger.debug("Cookie banner not found")
 
-        try:
-            await page.locator('xpath=//*[@id="investor_types"]/button[2]').click(timeout=5000)
-            logger.debug("Selected investor type: Intermediary")
-            await asyncio.sleep(1)
-        except Exception:
-            logger.debug("Investor type selection not present")
+            try:
+                await page.locator('xpath=//*[@id="investor_types"]/button[2]').click(timeout=5000)
+                logger.debug("Selected investor type: Intermediary")
+                await asyncio.sleep(1)
+            except Exception:
+                logger.debug("Investor type selection not present")
 
-        try:
-            await page.locator(".accept-button").click(timeout=5000)
-            logger.debug("Accepted disclaimer")
-            await asyncio.sleep(1)
-        except Exception:
-            logger.debug("Disclaimer button not found")
+            try:
+                await page.locator(".accept-button").click(timeout=5000)
+                logger.debug("Accepted disclaimer")
+                await asyncio.sleep(1)
+            except Exception:
+                logger.debug("Disclaimer button not found")
 
         while True:
 
@@ -125,8 +122,9 @@ class BNPUKScraper:
                 load_more = page.locator("#load-more-posts")
                 if await load_more.is_visible():
                     logger.info("Clicking 'Load more posts'")
+                    previous_count = await page.locator("a.post").count()
                     await load_more.click()
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(page, self.sleep_time, count_selector="a.post", previous_count=previous_count)
                 else:
                     logger.info("No visible 'Load more posts' button - stopping pagination")
                     break
@@ -214,69 +212,56 @@ class BNPUKScraper:
         return cards_data
 
     async def scrape_article_pages(self, context, cards_data):
-        """Deep scrape individual article pages (same logic as your Selenium version)."""
+        """Deep scrape individual article pages, keeping those with content."""
         logger.debug("Starting deep article scraping")
-        page = await context.new_page()
+        await fetch_articles(context, cards_data, self.scrape_article)
+        self.items = [item for item in cards_data if item["article_content"]]
 
-        for idx, item in enumerate(cards_data, start=1):
-            url = item.get("article_url")
-            if not url:
-                continue
-
-            try:
-                await page.goto(url, timeout=120000)
-                await asyncio.sleep(self.sleep_time)
-
-                try:
-                    tag_elements = page.locator(".tag-item")
-                    tag_count = await tag_elements.count()
-                    tags = []
-                    for i in range(tag_count):
-                        txt = await tag_elements.nth(i).text_content()
-                        if txt:
-                            tags.append(txt.strip())
-                except Exception:
-                    tags = []
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        await page.goto(url, timeout=120000)
+        await wait_until_ready(page, self.sleep_time)
 
-                try:
-                    content = await page.locator(".content-wrapper").text_content()
-                    content = content.strip() if content else None
-                except Exception:
-                    content = None
-                try:
-                    meta_desc = await page.locator('meta[name="description"]').get_attribute("content")
-                    description = meta_desc.strip() if meta_desc else None
-                except Exception:
-                    description = item.get("article_description")
-                try:
-                    title = await page.locator("h1").text_content()
-                    title = title.strip() if title else None
-                except Exception:
-                    title = item.get("article_title")
-                item["article_title"] = title
-                item["article_content"] = content
-                item["article_description"] = description
-                item["article_tags"] = tags
+        try:
+            tag_elements = page.locator(".tag-item")
+            tag_count = await tag_elements.count()
+            tags = []
+            for i in range(tag_count):
+                txt = await tag_elements.nth(i).text_content()
+                if txt:
+                    tags.append(txt.strip())
+        except Exception:
+            tags = []
 
-                if content:
-                    self.items.append(item)
-                logger.debug(f"Deep scraped article #{idx}: {title}")
-            except Exception as e:
-                logger.error(f"[Error:] Failed to scrape article page {url}: {e}")
-                continue
-        await page.close()
+        try:
+            content = await page.locator(".content-wrapper").text_content()
+            content = content.strip() if content else None
+        except Exception:
+            content = None
+        try:
+            meta_desc = await page.locator('meta[name="description"]').get_attribute("content")
+            description = meta_desc.strip() if meta_desc else None
+        except Exception:
+            description = item.get("article_description")
+        try:
+            title = await page.locator("h1").text_content()
+            title = title.strip() if title else None
+        except Exception:
+            title = item.get("article_title")
+        item["article_title"] = title
+        item["article_content"] = content
+        item["article_description"] = description
+        item["article_tags"] = tags
+        logger.debug(f"Deep scraped article: {title}")
 
 async def BNPUKFI(target_date):
     results = []
     try:
         scraper = BNPUKScraper(target_date)
         results = await scraper.scrape()
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
         logger.info(f"Scraped {len(results)} BNP UK FI articles after {target_date}")
-        print(f"\nJSON saved at: {output_path}\n")
-        return 200
+        return results
     except Exception as error:
         logger.error(f"Error in BNPUKFI: {error}")
         return 500
@@ -0,0 +1,114 @@
+import logging
+import re
+from collections import Counter
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from dateutil import parser
+
+logger = logging.getLogger("DATE_PARSING")
+
+# Unambiguous formats tried before dateutil; sites add their own (for
+# instance "%d-%m-%Y", which dateutil would read month first).
+COMMON_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%d %B %Y",
+    "%d %b %Y",
+    "%b. %d, %Y",
+)
+
+_RELATIVE_RE = re.compile(
+    r"\b(\d+|an?|one)\s+(second|minute|min|hour|hr|day|week|month|year)s?\s+ago\b", re.I
+)
+_RELATIVE_DAYS = {
+    "second": 0, "minute": 0, "min": 0, "hour": 0, "hr": 0,
+    "day": 1, "week": 7, "month": 30, "year": 365,
+}
+
+# Strings that only dateutil's fuzzy mode could read, counted per site.
+fuzzy_fallbacks = Counter()
+# Per site, the format that matched last goes first next time.
+_site_formats = {}
+
+
+def parse_relative_date(text, today=None):
+    """Date for "today", "yesterday" or "<n> <unit>s ago"; None for anything else."""
+    if not text:
+        return None
+    today = today or date.today()
+    lowered = text.strip().lower()
+    if lowered in ("today", "just now"):
+        return today
+    if lowered == "yesterday":
+        return today - timedelta(days=1)
+    match = _RELATIVE_RE.search(lowered)
+    if not match:
+        return None
+    amount = match.group(1)
+    amount = int(amount) if amount.isdigit() else 1
+    return today - timedelta(days=amount * _RELATIVE_DAYS[match.group(2).lower()])
+
+
+def _formats_for(site, formats):
+    ordered = _site_formats.get(site, [])
+    return ordered + [f for f in (*formats, *COMMON_FORMATS) if f not in ordered]
+
+
+def _remember_format(site, fmt):
+    ordered = _site_formats.setdefault(site, [])
+    if ordered[:1] != [fmt]:
+        if fmt in ordered:
+            ordered.remove(fmt)
+        ordered.insert(0, fmt)
+
+
+@lru_cache(maxsize=8192)
+def _parse(text, site, formats, dayfirst, fuzzy):
+    """(date, how) for a stripped string; how is "format", "dateutil", "fuzzy" or None."""
+    for fmt in _formats_for(site, formats):
+        try:
+            parsed = datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+        _remember_format(site, fmt)
+        return parsed, "format"
+    try:
+        return parser.parse(text, dayfirst=dayfirst).date(), "dateutil"
+    except (ValueError, OverflowError):
+        pass
+    if fuzzy:
+        try:
+            parsed = parser.parse(text, dayfirst=dayfirst, fuzzy=True).date()
+        except (ValueError, OverflowError):
+            return None, None
+        logger.info(f"{site or '-'}: fuzzy date parse {text!r} -> {parsed}")
+        return parsed, "fuzzy"
+    return None, None
+
+
+def parse_date(text, site=None, formats=(), dayfirst=False, fuzzy=True, relative=True):
+    """
+    Parse a date string from a listing or article page.
+
+    Tries relative dates ("3 days ago"), then the site's format strings and
+    the common ones, then dateutil, and last dateutil's fuzzy mode, which is
+    logged and counted in ``fuzzy_fallbacks``. Results for the same string
+    are memoised, since listings repeat the same few dates many times.
+
+    Returns:
+        datetime.date, or None if the string holds no date
+    """
+    if not text:
+        return None
+    text = str(text).strip()
+    if relative:
+        parsed = parse_relative_date(text)
+        if parsed:
+            return parsed
+    parsed, how = _parse(text, site, tuple(formats), dayfirst, fuzzy)
+    if how == "fuzzy":
+        fuzzy_fallbacks[site] += 1
+    return parsed
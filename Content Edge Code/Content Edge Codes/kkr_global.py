@@ -1,12 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
-import re
-import os
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "KKR"
@@ -34,44 +34,10 @@ class KKR_Global_co:
         self.items = []
         self.seen_urls = set()
 
-    async def scrape(self, url):
-        logger.info(f"Starting scraper for URL: {url}")
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                        ])
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                     )
@@ -95,15 +61,16 @@ class KKR_Global_co:
 
             # Step 1: Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            # Accept cookies if present
-            try:
-                await page.locator("#onetrust-accept-btn-handler").click(timeout=5000)
-                logger.debug("Cookie accept clicked")
-                await asyncio.sleep(1)
-            except Exception as e:
-                logger.warning(f"Cookie accept not present or failed: {e}")
+            with run_report.span("consent"):
+                # Accept cookies if present
+                try:
+                    await page.locator("#onetrust-accept-btn-handler").click(timeout=5000)
+                    logger.debug("Cookie accept clicked")
+                    await asyncio.sleep(1)
+                except Exception as e:
+                    logger.warning(f"Cookie accept not present or failed: {e}")
 
             # Determine total pages
             total_pages = 1
@@ -129,7 +96,7 @@ class KKR_Global_co:
                 if p_no > 1:
                     try:
                         await page.locator(f'span.cmp-insights-filter__page[data-page="{p_no}"]').click(timeout=10000)
-                        await asyncio.sleep(self.sleep_time)
+                        await wait_until_ready(page, self.sleep_time)
                         await page.wait_for_selector(".teaser", timeout=15000)
                         await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                         await asyncio.sleep(2)
@@ -197,74 +164,69 @@ class KKR_Global_co:
             # --- Scrape article pages for full content ---
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             logger.info(f"Finished scraping {len(self.items)} total articles")
             return self.items
 
     async def scrape_article_pages(self, context):
         logger.debug("Scraping individual article pages...")
-        page = await context.new_page()
-        for idx, item in enumerate(self.items, start=1):
-            url = item.get("article_url")
-            if not url:
-                continue
-            if url.lower().endswith(".pdf"):
-                item["article_content"] = url
-                item["article_date"] = item.get("article_date") or str(self.target_date)
-                continue
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-
-                # Extract description
-                try:
-                    desc = await page.locator('meta[name="description"]').get_attribute("content")
-                    item["article_description"] = desc
-                except:
-                    item["article_description"] = None
-
-                # Extract tags
-                try:
-                    tags = await page.locator(".cmp-category-navigation__list-item").all_text_contents()
-                    item["article_tags"] = [t.strip() for t in tags if t.strip()]
-                except:
-                    item["article_tags"] = []
-
-                # Extract main content
-                content_text = None
-                try:
-                    sel_candidates = [
-                        "div.aem-Grid.aem-Grid--12.aem-Grid--default--12",
-                        "div.article-content",
-                        "div.cmp-text.wysiwyg",
-                        "div.cmp-content",
-                        "article",
-                        "main"
-                    ]
-                    texts = []
-                    for sel in sel_candidates:
-                        parts = await page.locator(sel).all_text_contents()
-                        texts.extend([p.strip() for p in parts if p.strip()])
-                    content_text = " ".join(texts).strip()
-                except:
-                    content_text = None
-
-                # Attempt to extract date from article
-                parsed_date = None
-                try:
-                    time_el = page.locator("time").first
-                    time_attr = await time_el.get_attribute("datetime")
-                    if time_attr:
-                        parsed_date = parser.parse(time_attr, fuzzy=True).date()
-                except:
-                    parsed_date = None
-                item["article_date"] = item.get("article_date") or str(parsed_date)
-                item["article_content"] = content_text
-
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx} ({url}): {e}")
-
-        await page.close()
+        await fetch_articles(context, self.items, self.scrape_article)
+
+    async def scrape_article(self, page, item):
+        url = item.get("article_url")
+        if not url:
+            return
+        if url.lower().endswith(".pdf"):
+            item["article_content"] = url
+            item["article_date"] = item.get("article_date") or str(self.target_date)
+            return
+        await page.goto(url, timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
+
+        # Extract description
+        try:
+            desc = await page.locator('meta[name="description"]').get_attribute("content")
+            item["article_description"] = desc
+        except:
+            item["article_description"] = None
+
+        # Extract tags
+        try:
+            tags = await page.locator(".cmp-category-navigation__list-item").all_text_contents()
+            item["article_tags"] = [t.strip() for t in tags if t.strip()]
+        except:
+            item["article_tags"] = []
+
+        # Extract main content
+        content_text = None
+        try:
+            sel_candidates = [
+                "div.aem-Grid.aem-Grid--12.aem-Grid--default--12",
+                "div.article-content",
+                "div.cmp-text.wysiwyg",
+                "div.cmp-content",
+                "article",
+                "main"
+            ]
+            texts = []
+            for sel in sel_candidates:
+                parts = await page.locator(sel).all_text_contents()
+                texts.extend([p.strip() for p in parts if p.strip()])
+            content_text = " ".join(texts).strip()
+        except:
+            content_text = None
+
+        # Attempt to extract date from article
+        parsed_date = None
+        try:
+            time_el = page.locator("time").first
+            time_attr = await time_el.get_attribute("datetime")
+            if time_attr:
+                parsed_date = parser.parse(time_attr, fuzzy=True).date()
+        except:
+            parsed_date = None
+        item["article_date"] = item.get("article_date") or str(parsed_date)
+        item["article_content"] = content_text
 
 
 async def KKRGLOBALCO(target_date):
@@ -276,13 +238,10 @@ async def KKRGLOBALCO(target_date):
         results = await scraper.scrape(url)
 
   
-        output_path=f"/tmp/{company_site_id}.json"
-
-        with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} articles after {target_date}")
-        return 200
+        return results
     except Exception as error:
         logger.error(f"Error: {error}")
         return 500
@@ -0,0 +1,200 @@
+import json
+import logging
+from collections import Counter
+from urllib.parse import urlparse
+
+from date_parsing import parse_date
+from http_articles import HTTP_ARTICLE_TIMEOUT, HTTP_ARTICLES_ENABLED, HtmlDocument
+from readiness import wait_until_ready
+
+logger = logging.getLogger("LISTING_BOUNDARY")
+
+# Date markup tried on a listing card when the scraper names none.
+LISTING_DATE_SELECTORS = (("time[datetime]", "datetime"), ("time", None))
+# Publication-date metadata in an article's static HTML, most specific first.
+META_DATE_SELECTORS = (
+    ("meta[property=article:published_time]", "content"),
+    ("meta[itemprop=datePublished]", "content"),
+    ("meta[name=publish_date]", "content"),
+    ("meta[name=publishdate]", "content"),
+    ("meta[name=date]", "content"),
+    ("meta[name=dcterms.date]", "content"),
+    ("time[datetime]", "datetime"),
+)
+EMBEDDED_JSON_SELECTOR = "script[type='application/ld+json'], script#__NEXT_DATA__"
+JSON_URL_KEYS = ("url", "href", "link", "uri", "clickUri", "path", "@id")
+JSON_DATE_KEYS = (
+    "datePublished", "publishDate", "publishedDate", "publicationDate",
+    "published_at", "publishedAt", "displayDate", "date",
+)
+
+
+def _url_key(url):
+    """URLs compared by path, so absolute, relative and trailing-slash forms match."""
+    return urlparse(url or "").path.rstrip("/").lower()
+
+
+def _walk_json(value):
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from _walk_json(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _walk_json(child)
+
+
+def embedded_dates(scripts):
+    """
+    Dates by URL path from JSON blobs (JSON-LD, __NEXT_DATA__): any object
+    holding both a URL-like and a date-like field.
+    """
+    dates = {}
+    for text in scripts:
+        try:
+            data = json.loads(text or "")
+        except ValueError:
+            continue
+        for node in _walk_json(data):
+            url = next((node[k] for k in JSON_URL_KEYS if isinstance(node.get(k), str)), None)
+            raw = next((node[k] for k in JSON_DATE_KEYS if isinstance(node.get(k), (str, int))), None)
+            if url and raw:
+                parsed = parse_date(str(raw), relative=False)
+                if parsed:
+                    dates.setdefault(_url_key(url), parsed)
+    return dates
+
+
+def metadata_date(doc, selectors=META_DATE_SELECTORS):
+    """Publication date from an article's meta tags, JSON-LD or <time> element."""
+    for selector, attr in selectors:
+        for node in doc.query_all(selector):
+            parsed = parse_date(node.attrs.get(attr), relative=False)
+            if parsed:
+                return parsed
+    for text in doc.all_text_contents("script[type=application/ld+json]"):
+        try:
+            data = json.loads(text or "")
+        except ValueError:
+            continue
+        for node in _walk_json(data):
+            raw = node.get("datePublished")
+            parsed = parse_date(raw, relative=False) if isinstance(raw, str) else None
+            if parsed:
+                return parsed
+    return None
+
+
+class ListingBoundary:
+    """
+    Decides whether a "Load More" listing has reached ``target_date``
+    without opening an article per click.
+
+    The date of the boundary card (the oldest one loaded) is looked up
+    cheapest first: the card's own markup, JSON embedded in the listing
+    page, the article's static HTML metadata fetched without rendering,
+    and only then the rendered article page. Dates are cached by URL and
+    ``sources`` counts which step answered.
+
+    Args:
+        context: Playwright BrowserContext, for HTTP fetches and rendering
+        target_date: oldest date wanted
+        site: company_site_id, for date-parsing stats
+        article_date_selector: date element on the article page
+        listing_date_selectors: ``(selector, attr)`` pairs tried on the card;
+            attr None reads the element's text
+        clean: optional callable applied to date text before parsing
+    """
+
+    def __init__(self, context, target_date, site=None, article_date_selector=None,
+                 listing_date_selectors=LISTING_DATE_SELECTORS, clean=None):
+        self.context = context
+        self.target_date = target_date
+        self.site = site
+        self.article_date_selector = article_date_selector
+        self.listing_date_selectors = listing_date_selectors
+        self.clean = clean
+        self.sources = Counter()
+        self._dates = {}
+
+    def _parse(self, text):
+        if not text:
+            return None
+        if self.clean:
+            text = self.clean(text)
+        return parse_date(text, site=self.site)
+
+    async def _from_card(self, card):
+        for selector, attr in self.listing_date_selectors:
+            located = card.locator(selector)
+            if await located.count():
+                first = located.first
+                parsed = self._parse(await (first.get_attribute(attr) if attr else first.text_content()))
+                if parsed:
+                    return parsed
+        return None
+
+    async def _from_listing_json(self, page, url):
+        scripts = await page.eval_on_selector_all(EMBEDDED_JSON_SELECTOR, "els => els.map(e => e.textContent)")
+        return embedded_dates(scripts).get(_url_key(url))
+
+    async def _from_static_html(self, url):
+        response = await self.context.request.get(url, timeout=HTTP_ARTICLE_TIMEOUT * 1000, fail_on_status_code=False)
+        if not response.ok or "html" not in response.headers.get("content-type", "html"):
+            return None
+        doc = HtmlDocument(await response.text())
+        if self.article_date_selector:
+            for text in doc.all_text_contents(self.article_date_selector):
+                parsed = self._parse(text)
+                if parsed:
+                    return parsed
+        return metadata_date(doc)
+
+    async def _from_rendered_page(self, url):
+        article_page = await self.context.new_page()
+        try:
+            await article_page.goto(url, timeout=60000)
+            await wait_until_ready(article_page, 1)
+            if self.article_date_selector:
+                located = article_page.locator(self.article_date_selector)
+                if await located.count():
+                    parsed = self._parse(await located.first.text_content())
+                    if parsed:
+                        return parsed
+            return metadata_date(HtmlDocument(await article_page.content()))
+        finally:
+            await article_page.close()
+
+    async def card_date(self, url, card=None, page=None):
+        """Date of the card linking to ``url``, or None if no step finds one."""
+        if url in self._dates:
+            return self._dates[url]
+
+        steps = []
+        if card is not None:
+            steps.append(("listing markup", lambda: self._from_card(card)))
+        if page is not None:
+            steps.append(("embedded JSON", lambda: self._from_listing_json(page, url)))
+        if url and not url.lower().endswith(".pdf"):
+            if HTTP_ARTICLES_ENABLED:
+                steps.append(("article metadata", lambda: self._from_static_html(url)))
+            steps.append(("rendered article", lambda: self._from_rendered_page(url)))
+
+        found = None
+        for source, step in steps:
+            try:
+                found = await step()
+            except Exception as e:
+                logger.debug(f"{source} gave no date for {url}: {e}")
+                continue
+            if found:
+                self.sources[source] += 1
+                logger.debug(f"Boundary date {found} for {url} from {source}")
+                break
+        self._dates[url] = found
+        return found
+
+    async def reached(self, url, card=None, page=None):
+        """True when the card linking to ``url`` is dated before target_date."""
+        found = await self.card_date(url, card, page)
+        return found is not None and found < self.target_date
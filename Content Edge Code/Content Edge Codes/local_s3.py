@@ -0,0 +1,124 @@
+import hashlib
+import io
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+
+
+class LocalS3Client:
+    """
+    Stand-in for boto3's S3 client that keeps objects under a directory.
+
+    Covers the calls the output writer, the crawl state store and the
+    Parquet export make (put/get/list objects and the multipart upload
+    calls), so uploads can be run and checked without AWS. Objects live at
+    ``<root>/<bucket>/<key>`` with their metadata in a ``.meta.json`` file
+    next to them.
+    """
+
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+        class NoSuchUpload(Exception):
+            pass
+
+    def __init__(self, root):
+        self.root = root
+        self._uploads = {}
+
+    def _path(self, bucket, key):
+        return os.path.join(self.root, bucket, *key.split("/"))
+
+    def _entry(self, bucket, key):
+        stat = os.stat(self._path(bucket, key))
+        return {
+            "Key": key,
+            "Size": stat.st_size,
+            "LastModified": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+        }
+
+    def _store(self, bucket, key, body, **metadata):
+        path = self._path(bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(body)
+        with open(path + ".meta.json", "w", encoding="utf-8") as f:
+            json.dump({k: v for k, v in metadata.items() if v is not None}, f)
+        return {"ETag": f'"{hashlib.md5(body).hexdigest()}"'}
+
+    def put_object(self, Bucket, Key, Body=b"", ContentType=None, ContentEncoding=None, **kwargs):
+        if isinstance(Body, str):
+            Body = Body.encode("utf-8")
+        elif hasattr(Body, "read"):
+            Body = Body.read()
+        return self._store(Bucket, Key, bytes(Body), ContentType=ContentType, ContentEncoding=ContentEncoding)
+
+    def get_object(self, Bucket, Key, **kwargs):
+        path = self._path(Bucket, Key)
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            raise self.exceptions.NoSuchKey(Key)
+        try:
+            with open(path + ".meta.json", "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except FileNotFoundError:
+            metadata = {}
+        return {"Body": io.BytesIO(body), "ContentLength": len(body), **metadata}
+
+    def list_objects_v2(self, Bucket, Prefix="", ContinuationToken=None, MaxKeys=1000, **kwargs):
+        base = os.path.join(self.root, Bucket)
+        keys = []
+        for directory, _, names in os.walk(base):
+            for name in names:
+                if name.endswith(".meta.json"):
+                    continue
+                key = os.path.relpath(os.path.join(directory, name), base).replace(os.sep, "/")
+                if key.startswith(Prefix):
+                    keys.append(key)
+        keys.sort()
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + MaxKeys]
+        response = {
+            "Contents": [self._entry(Bucket, key) for key in page],
+            "KeyCount": len(page),
+            "IsTruncated": start + MaxKeys < len(keys),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + MaxKeys)
+        return response
+
+    def create_multipart_upload(self, Bucket, Key, ContentType=None, ContentEncoding=None, **kwargs):
+        upload_id = uuid.uuid4().hex
+        self._uploads[upload_id] = {
+            "bucket": Bucket,
+            "key": Key,
+            "parts": {},
+            "metadata": {"ContentType": ContentType, "ContentEncoding": ContentEncoding},
+        }
+        return {"Bucket": Bucket, "Key": Key, "UploadId": upload_id}
+
+    def _upload(self, UploadId):
+        try:
+            return self._uploads[UploadId]
+        except KeyError:
+            raise self.exceptions.NoSuchUpload(UploadId)
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, **kwargs):
+        body = bytes(Body)
+        self._upload(UploadId)["parts"][PartNumber] = body
+        return {"ETag": f'"{hashlib.md5(body).hexdigest()}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload, **kwargs):
+        upload = self._upload(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        body = b"".join(upload["parts"][number] for number in numbers)
+        del self._uploads[UploadId]
+        return self._store(Bucket, Key, body, **upload["metadata"])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId, **kwargs):
+        self._uploads.pop(UploadId, None)
+        return {}
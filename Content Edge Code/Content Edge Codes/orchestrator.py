@@ -0,0 +1,155 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger("ORCHESTRATOR")
+
+# Worker invocations in flight at once.
+MAX_CONCURRENCY = int(os.getenv("ORCHESTRATOR_CONCURRENCY", "10"))
+# Seconds one worker invocation may take before it is given up as failed.
+# Well below the orchestrator's own 15 minute limit, so a hung site is
+# reported instead of timing the whole run out.
+INVOKE_TIMEOUT = int(os.getenv("ORCHESTRATOR_INVOKE_TIMEOUT", "600"))
+
+
+def worker_functions_from_env():
+    """Site group -> worker Lambda function name, from WORKER_FUNCTIONS (JSON object)."""
+    return json.loads(os.getenv("WORKER_FUNCTIONS", "{}"))
+
+
+class LambdaInvoker:
+    """
+    Invokes the worker Lambda of each site group through boto3's lambda client.
+    The client's read_timeout should be INVOKE_TIMEOUT, so a call that runs
+    longer raises and the site is reported as failed.
+    """
+
+    def __init__(self, client, function_names):
+        self.client = client
+        self.function_names = function_names
+
+    def invoke(self, group, payload):
+        function_name = self.function_names.get(group)
+        if not function_name:
+            raise ValueError(f"No worker function configured for site group {group}")
+
+        response = self.client.invoke(
+            FunctionName=function_name,
+            InvocationType="RequestResponse",
+            Payload=json.dumps(payload).encode("utf-8"),
+        )
+        body = json.loads(response["Payload"].read() or "null")
+        if response.get("FunctionError"):
+            message = body.get("errorMessage") if isinstance(body, dict) else body
+            raise RuntimeError(f"{function_name} failed: {message}")
+        return body
+
+
+class LocalInvoker:
+    """
+    In-process stand-in for LambdaInvoker, for tests and local runs.
+
+    ``handlers`` maps a site group to a ``handler(event, context)``. Calls are
+    serialised because in-process handlers share one browser runtime and
+    event loop; payloads are JSON round-tripped like a real invoke.
+    """
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self._lock = threading.Lock()
+
+    def invoke(self, group, payload):
+        handler = self.handlers.get(group)
+        if handler is None:
+            raise ValueError(f"No local handler for site group {group}")
+        with self._lock:
+            result = handler(json.loads(json.dumps(payload)), None)
+        return json.loads(json.dumps(result, default=str))
+
+
+class FanOutOrchestrator:
+    """
+    Runs the daily crawl across site groups by invoking the worker handler
+    once per site, keeping up to ``max_concurrency`` calls in flight: each
+    finished call frees its slot for the next site, so one slow site does not
+    hold back the rest.
+    """
+
+    def __init__(self, invoker, max_concurrency=None):
+        self.invoker = invoker
+        self.max_concurrency = max_concurrency or MAX_CONCURRENCY
+
+    def list_sites(self, group):
+        response = self.invoker.invoke(group, {"action": "list_sites"})
+        return response["company_site_ids"]
+
+    def _invoke_site(self, group, company_site_id, target_date, full_crawl):
+        started = time.perf_counter()
+        payload = {
+            "company_site_ids": [company_site_id],
+            "target_date": target_date,
+            "full_crawl": full_crawl,
+        }
+        try:
+            response = self.invoker.invoke(group, payload)
+            result = dict(response["results"][0])
+        except Exception as e:
+            logger.error(f"{group}/{company_site_id} invocation failed: {e}")
+            result = {"company_site_id": company_site_id, "statusCode": 500, "articles": 0, "body": str(e)}
+        result["site_group"] = group
+        result["invoke_seconds"] = round(time.perf_counter() - started, 2)
+        return result
+
+    def run(self, target_date, groups, full_crawl=False):
+        """
+        Crawl every site of ``groups`` for ``target_date``.
+
+        Returns:
+            Run summary with per-site results, failures and timings
+        """
+        started = time.perf_counter()
+        jobs, group_errors = [], {}
+        for group in groups:
+            try:
+                jobs.extend((group, site_id) for site_id in self.list_sites(group))
+            except Exception as e:
+                logger.error(f"Could not list sites of {group}: {e}")
+                group_errors[group] = str(e)
+
+        logger.info(f"Invoking {len(jobs)} sites, {self.max_concurrency} at a time")
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = [
+                executor.submit(self._invoke_site, group, site_id, target_date, full_crawl)
+                for group, site_id in jobs
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                logger.info(
+                    f"{len(results)}/{len(jobs)} {result['site_group']}/{result['company_site_id']}: "
+                    f"{result.get('statusCode')} in {result['invoke_seconds']}s"
+                )
+
+        failed = [r["company_site_id"] for r in results if r.get("statusCode") != 200]
+        summary = {
+            "statusCode": 200 if not failed and not group_errors else 207,
+            "target_date": target_date,
+            "site_groups": list(groups),
+            "sites": len(results),
+            "succeeded": len(results) - len(failed),
+            "failed": failed,
+            "group_errors": group_errors,
+            "articles": sum(r.get("articles", 0) for r in results),
+            "max_concurrency": self.max_concurrency,
+            "seconds": round(time.perf_counter() - started, 2),
+            "results": results,
+        }
+        logger.info(
+            f"Run for {target_date}: {summary['succeeded']}/{summary['sites']} sites ok, "
+            f"{summary['articles']} articles in {summary['seconds']}s"
+        )
+        return summary
@@ -1,12 +1,16 @@
 import asyncio
-import json
 import logging
 import sys
-import re
-import os
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from card_extraction import extract_cards
+from coveo_listing import CoveoListing, CoveoSearchCapture
+from date_parsing import parse_date
+from paged_listing import PagedListing
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "PIMCO"
@@ -16,6 +20,22 @@ country = "United Kingdom"
 role = "Financial Professional"
 BASE_URL = "https://www.pimco.com"
 
+# Coveo search used by the insights listing (newest first).
+SORT_CRITERIA = "@publishz32xdate descending"
+DATE_FIELD = "publishz32xdate"
+PAGE_SIZE = 10
+
+# Coveo result card fields, read in one round trip per page.
+CARD_FIELDS = {
+    "title": "a.CoveoResultLink",
+    "href": [("a.CoveoResultLink", "href"), ("a", "href")],
+    "date": [
+        (".coveo-result-row.result-date span.CoveoFieldValue span", "title"),
+        ".coveo-result-row.result-date .CoveoFieldValue",
+    ],
+    "description": ".coveo-result-row.result-text span.CoveoFieldValue span",
+}
+
 # --- Logging setup ---
 logging.basicConfig(
     level=logging.DEBUG,
@@ -39,47 +59,13 @@ class PIMCOScraperUK:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
-            page = await context.new_page()
-
-            # Set headers
-            await page.set_extra_http_headers({
+            # Set the headers on the context so the results page tabs and
+            # the article tabs send them too
+            await context.set_extra_http_headers({
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
                 "Accept-Language": "en-US,en;q=0.5",
                 "Accept-Encoding": "gzip, deflate, br",
@@ -91,242 +77,212 @@ class PIMCOScraperUK:
                 "Sec-Fetch-User": "?1",
                 "Cache-Control": "max-age=0",
             })
+            page = await context.new_page()
 
             # minimal content guard
             await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
 
+            # Record the search call the results page makes on load
+            search_capture = CoveoSearchCapture(page)
+
             # Load initial page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
-
-            # Accept cookies / overlays if present (best-effort)
-            try:
-                await page.locator("#onetrust-accept-btn-handler, .cc-btn.cc-allow, button[aria-label='accept']").first.click(timeout=5000)
-                logger.debug("Cookie/consent accepted (if present)")
-                await asyncio.sleep(1)
-            except Exception:
-                pass
-            total_pages = 1
-            try:
-                # Wait for pager; Coveo uses .coveo-pager-list-item or similar
-                await page.wait_for_selector(".coveo-pager-list-item span, .coveo-pager-list-item-text", timeout=5000)
-                pager_buttons = await page.locator(".coveo-pager-list-item span, .coveo-pager-list-item-text").all()
-                page_nums = []
-                for btn in pager_buttons:
-                    try:
-                        txt = (await btn.text_content() or "").strip()
-                        if txt.isdigit():
-                            page_nums.append(int(txt))
-                    except Exception:
-                        continue
-                if page_nums:
-                    total_pages = max(page_nums)
-                logger.info(f"Detected {total_pages} pagination pages")
-            except Exception as e:
-                logger.warning(f"Pagination not detected via DOM, defaulting strategy: {e}")
-                total_pages = 100
-
-            stop_scraping = False
-            page_size = 10
-            if total_pages > 50:
-                max_pages = total_pages
-            else:
-                max_pages = total_pages
-
-            for p_no in range(1, max_pages + 1):
-                logger.info(f"Scraping page {p_no}...")
-                first_offset = (p_no - 1) * page_size
-                fragment = f"#first={first_offset}&sort=%40publishz32xdate%20descending"
-                page_url = BASE_URL + "/gb/en/insights" + fragment
+            await wait_until_ready(page, self.sleep_time)
 
+            with run_report.span("consent"):
+                # Accept cookies / overlays if present (best-effort)
                 try:
-                    await page.goto(page_url, timeout=60000)
-                    await asyncio.sleep(self.sleep_time)
-                    await page.wait_for_selector(".coveo-result-cell.coveoforsitecore-information-section, .coveo-result", timeout=15000)
-                    # attempt to dismiss any small consent popups
-                    try:
-                        await page.locator(".cc-btn.cc-allow, #onetrust-accept-btn-handler").first.click(timeout=2000)
-                    except Exception:
-                        pass
-                    # scroll to bottom to ensure lazy load run
-                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    await page.locator("#onetrust-accept-btn-handler, .cc-btn.cc-allow, button[aria-label='accept']").first.click(timeout=5000)
+                    logger.debug("Cookie/consent accepted (if present)")
                     await asyncio.sleep(1)
-                except Exception as e:
-                    logger.warning(f"Failed loading page {p_no} ({page_url}): {e}")
-                    # If navigation fails, try next page (don't crash)
-                    continue
+                except Exception:
+                    pass
+            # Page through the Coveo search API directly; render the results
+            # pages only if the call could not be replayed.
+            if not await self.scrape_search_api(context, search_capture.request):
+                await self.scrape_results_pages(page)
 
-                # Collect article cards
-                try:
-                    cards = await page.locator(".coveo-result-cell.coveoforsitecore-information-section, .coveo-result").all()
-                    logger.info(f"Page {p_no}: Found {len(cards)} article cards")
-                except Exception as e:
-                    logger.warning(f"No article cards found on page {p_no}: {e}")
-                    cards = []
-
-                # Iterate cards and collect listing-level metadata
-                for idx, card in enumerate(cards, start=1):
-                    try:
-                        # Title and relative URL
-                        title_el = card.locator("a.CoveoResultLink").first
-                        title = (await title_el.text_content()) or None
-                        href = (await title_el.get_attribute("href")) or None
-                        if not href:
-                            # fallback: try anchor inside result
-                            href = (await card.locator("a").first.get_attribute("href")) or None
-
-                        url_full = href if (href and href.startswith("http")) else (BASE_URL + href if href else None)
-                        if not url_full:
-                            logger.debug(f"Card {idx} has no URL, skipping")
-                            continue
-
-                        # avoid duplicates
-                        if url_full in self.seen_urls:
-                            logger.debug(f"Duplicate URL skipped: {url_full}")
-                            continue
-                        self.seen_urls.add(url_full)
-
-                        # slug
-                        slug = url_full.rstrip("/").split("/")[-1]
-                        date_text = None
-                        try:
-                            date_el = card.locator(".coveo-result-row.result-date span.CoveoFieldValue span").first
-                            date_text = await date_el.get_attribute("title")
-                        except Exception:
-                            try:
-                                date_text = (await card.locator(".coveo-result-row.result-date .CoveoFieldValue").text_content()) or None
-                            except Exception:
-                                date_text = None
-
-                        parsed_date = None
-                        if date_text:
-                            try:
-                                parsed_date = parser.parse(date_text, fuzzy=True).date()
-                            except Exception:
-                                parsed_date = None
-
-                        # If date parsed and older than target -> set stop flag
-                        if parsed_date and parsed_date < self.target_date:
-                            stop_scraping = True
-                            logger.info(f"STOP: Found older article {parsed_date} < {self.target_date} (page {p_no})")
-                            break
-
-                        # description (short)
-                        try:
-                            description = (await card.locator(".coveo-result-row.result-text span.CoveoFieldValue span").text_content()) or None
-                        except Exception:
-                            description = None
-
-                        self.items.append({
-                            "company_site_id": company_site_id,
-                            "company_site_country": country,
-                            "company_site_role": role,
-                            "article_source": site,
-                            "article_section": section,
-                            "article_date": str(parsed_date) if parsed_date else None,
-                            "article_title": title,
-                            "article_description": description,
-                            "article_content": None,
-                            "article_tags": [],
-                            "article_slug": slug,
-                            "article_url": url_full
-                        })
-                        logger.debug(f"Added listing: {title} -> {url_full}")
-
-                    except Exception as e:
-                        logger.error(f"Error parsing card on page {p_no} #{idx}: {e}")
-                        continue
-
-                if stop_scraping:
-                    break
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             logger.info(f"Finished scraping {len(self.items)} total articles")
             # Keep behaviour similar to template: only keep items that have article_content
             self.items = [item for item in self.items if item.get("article_content")]
             return self.items
 
-    async def scrape_article_pages(self, context):
-        logger.debug("Starting to scrape individual article pages...")
-        page = await context.new_page()
-
-        for idx, item in enumerate(self.items, start=1):
-            url = item.get("article_url")
-            if not url:
+    async def scrape_search_api(self, context, request):
+        """Collect listing items from the Coveo search API. False if it cannot be used."""
+        if request is None:
+            logger.info("No Coveo search request seen, using the results pages")
+            return False
+        try:
+            listing = await CoveoListing.from_request(context, request, SORT_CRITERIA, page_size=PAGE_SIZE)
+            results = await listing.results_since(self.target_date, DATE_FIELD)
+        except Exception as e:
+            logger.warning(f"Coveo search API failed ({e}), using the results pages")
+            return False
+
+        for result, parsed_date in results:
+            url_full = result.get("clickUri") or result.get("uri")
+            if not url_full or url_full in self.seen_urls:
                 continue
+            self.seen_urls.add(url_full)
+            raw = result.get("raw", {})
+
+            self.items.append({
+                "company_site_id": company_site_id,
+                "company_site_country": country,
+                "company_site_role": role,
+                "article_source": site,
+                "article_section": section,
+                "article_date": str(parsed_date) if parsed_date else None,
+                "article_title": result.get("title"),
+                "article_description": raw.get("description") or result.get("excerpt") or None,
+                "article_content": None,
+                "article_tags": [],
+                "article_slug": url_full.rstrip("/").split("/")[-1],
+                "article_url": url_full
+            })
 
-            # Skip PDFs
-            if url.lower().endswith(".pdf"):
-                item["article_content"] = url
-                item["article_date"] = item.get("article_date") or str(self.target_date)
-                logger.debug(f"#{idx}: Skipped PDF -> {url}")
+        logger.info(f"Coveo search API returned {len(self.items)} listings")
+        return True
+
+    async def scrape_results_pages(self, page):
+        """Fallback: render the Coveo results pages back to target_date and read the cards."""
+        listing = PagedListing(lambda p_no: self.scrape_results_page(page.context, p_no), self.target_date)
+        for card, parsed_date in await listing.results_since():
+            href = card["href"]
+            url_full = href if (href and href.startswith("http")) else (BASE_URL + href if href else None)
+            if not url_full or url_full in self.seen_urls:
                 continue
+            self.seen_urls.add(url_full)
+
+            self.items.append({
+                "company_site_id": company_site_id,
+                "company_site_country": country,
+                "company_site_role": role,
+                "article_source": site,
+                "article_section": section,
+                "article_date": str(parsed_date) if parsed_date else None,
+                "article_title": card["title"],
+                "article_description": card["description"],
+                "article_content": None,
+                "article_tags": [],
+                "article_slug": url_full.rstrip("/").split("/")[-1],
+                "article_url": url_full
+            })
+            logger.debug(f"Added listing: {card['title']} -> {url_full}")
 
+    async def scrape_results_page(self, context, p_no):
+        """Cards of results page ``p_no`` as ``(card, date)``, in its own tab so pages can load in parallel."""
+        first_offset = (p_no - 1) * PAGE_SIZE
+        page_url = f"{BASE_URL}/gb/en/insights#first={first_offset}&sort=%40publishz32xdate%20descending"
+        logger.info(f"Scraping page {p_no}...")
+        page = await context.new_page()
+        try:
+            # Navigation errors propagate: PagedListing retries the page
+            # once and then fails the site
+            response = await page.goto(page_url, timeout=60000)
+            if response is not None and not response.ok:
+                raise RuntimeError(f"Listing page {page_url} returned HTTP {response.status}")
+            await wait_until_ready(page, self.sleep_time)
             try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-
-                # Accept small consent on article pages if any
+                await page.wait_for_selector(".coveo-result-cell.coveoforsitecore-information-section, .coveo-result", timeout=15000)
+            except Exception:
+                # An empty result list means past the last page; no result
+                # list at all means the search never rendered
+                if not await page.locator(".CoveoResultList, .coveo-result-list-container").count():
+                    raise RuntimeError(f"Search results did not render on {page_url}")
+                logger.info(f"No results on page {p_no} ({page_url})")
+                return []
+            with run_report.span("consent"):
                 try:
                     await page.locator(".cc-btn.cc-allow, #onetrust-accept-btn-handler").first.click(timeout=2000)
                 except Exception:
                     pass
+            # scroll to bottom to ensure lazy load run
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await asyncio.sleep(1)
+            cards = await extract_cards(page, ".coveo-result-cell.coveoforsitecore-information-section, .coveo-result", CARD_FIELDS)
+        finally:
+            await page.close()
+        logger.info(f"Page {p_no}: Found {len(cards)} article cards")
+        return [(card, parse_date(card["date"], site=company_site_id)) for card in cards]
 
-                # description (meta)
-                try:
-                    desc = await page.locator('meta[name="description"]').get_attribute("content")
-                    item["article_description"] = desc
-                except Exception:
-                    item["article_description"] = item.get("article_description")
+    async def scrape_article_pages(self, context):
+        logger.debug("Starting to scrape individual article pages...")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-                # tags: try hero eyebrow or other possible selectors
-                try:
-                    tags = await page.locator(".hero__eyebrow-subtitle, .article-tags li, .tag, .coveo-field-json .tags").all_text_contents()
-                    tags = [t.strip() for t in tags if t and t.strip()]
-                    item["article_tags"] = tags
-                except Exception:
-                    item["article_tags"] = item.get("article_tags", []) or []
-                try:
-                    sel_candidates = [
-                        ".page-text-area__text",
-                        ".article__content",
-                        "article",
-                        "main",
-                        ".rich-text"
-                    ]
-                    texts = []
-                    for sel in sel_candidates:
-                        try:
-                            parts = await page.locator(sel).all_text_contents()
-                            if parts:
-                                texts.extend([p.strip() for p in parts if p and p.strip()])
-                        except Exception:
-                            continue
-                    content_text = " ".join(texts).strip() if texts else None
-                except Exception:
-                    content_text = None
+    async def scrape_article(self, page, item):
+        url = item.get("article_url")
+        if not url:
+            return
+
+        # Skip PDFs
+        if url.lower().endswith(".pdf"):
+            item["article_content"] = url
+            item["article_date"] = item.get("article_date") or str(self.target_date)
+            logger.debug(f"Skipped PDF -> {url}")
+            return
+
+        await page.goto(url, timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
 
-                item["article_content"] = content_text
+        with run_report.span("consent"):
+            # Accept small consent on article pages if any
+            try:
+                await page.locator(".cc-btn.cc-allow, #onetrust-accept-btn-handler").first.click(timeout=2000)
+            except Exception:
+                pass
 
-                # date extraction from article page if present
+        # description (meta)
+        try:
+            desc = await page.locator('meta[name="description"]').get_attribute("content")
+            item["article_description"] = desc
+        except Exception:
+            item["article_description"] = item.get("article_description")
+
+        # tags: try hero eyebrow or other possible selectors
+        try:
+            tags = await page.locator(".hero__eyebrow-subtitle, .article-tags li, .tag, .coveo-field-json .tags").all_text_contents()
+            tags = [t.strip() for t in tags if t and t.strip()]
+            item["article_tags"] = tags
+        except Exception:
+            item["article_tags"] = item.get("article_tags", []) or []
+        try:
+            sel_candidates = [
+                ".page-text-area__text",
+                ".article__content",
+                "article",
+                "main",
+                ".rich-text"
+            ]
+            texts = []
+            for sel in sel_candidates:
                 try:
-                    time_el = page.locator("time").first
-                    time_attr = await time_el.get_attribute("datetime")
-                    if time_attr:
-                        dt = parser.parse(time_attr, fuzzy=True)
-                        item["article_date"] = str(dt.date())
+                    parts = await page.locator(sel).all_text_contents()
+                    if parts:
+                        texts.extend([p.strip() for p in parts if p and p.strip()])
                 except Exception:
-                    # keep existing article_date if any
-                    pass
+                    continue
+            content_text = " ".join(texts).strip() if texts else None
+        except Exception:
+            content_text = None
 
-                logger.debug(f"Scraped article #{idx}: {item.get('article_title','')[:60]} ({item.get('article_date')})")
+        item["article_content"] = content_text
 
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx} ({url}): {e}")
-                # continue to next article
+        # date extraction from article page if present
+        try:
+            time_el = page.locator("time").first
+            time_attr = await time_el.get_attribute("datetime")
+            if time_attr:
+                dt = parser.parse(time_attr, fuzzy=True)
+                item["article_date"] = str(dt.date())
+        except Exception:
+            # keep existing article_date if any
+            pass
 
-        await page.close()
+        logger.debug(f"Scraped article: {item.get('article_title','')[:60]} ({item.get('article_date')})")
 
 
 async def PIMCOUKFP(target_date):
@@ -335,12 +291,9 @@ async def PIMCOUKFP(target_date):
         url = BASE_URL + "/gb/en/insights#sort=%40publishz32xdate%20descending"
         scraper = PIMCOScraperUK(target_date)
         results = await scraper.scrape(url)
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
         logger.info(f"Scraped {len(results)} articles after {target_date}")
-        logger.info(f"Saved JSON at: {output_path}")
-        return 200
+        return results
     except Exception as error:
         logger.error(f"Error: {error}")
         return 500
@@ -0,0 +1,50 @@
+import importlib
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger("SCRAPER_REGISTRY")
+
+ScraperEntry = namedtuple("ScraperEntry", ["module", "function", "label"])
+
+
+class ScraperRegistry:
+    """
+    Maps company_site_id to the scraper module and entry function that serve it.
+
+    Modules are imported on first lookup only, so a Lambda invocation pays the
+    import cost (Playwright, dateutil, per-module logging setup) of the one
+    scraper it runs instead of every scraper in the image.
+    """
+
+    def __init__(self, entries):
+        self._entries = {
+            site_id: ScraperEntry(*entry) for site_id, entry in entries.items()
+        }
+        self._loaded = {}
+
+    def __contains__(self, company_site_id):
+        return company_site_id in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entry(self, company_site_id):
+        return self._entries.get(company_site_id)
+
+    def get(self, company_site_id):
+        """Return the scraper entry function, importing its module if needed. None if unknown."""
+        entry = self._entries.get(company_site_id)
+        if entry is None:
+            return None
+
+        scraper_func = self._loaded.get(company_site_id)
+        if scraper_func is None:
+            module = importlib.import_module(entry.module)
+            scraper_func = getattr(module, entry.function)
+            self._loaded[company_site_id] = scraper_func
+
+        logger.info(f"{company_site_id} | {entry.label}")
+        return scraper_func
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import re
+from collections import Counter
+from urllib.parse import urlsplit
+
+import crawl_state
+
+logger = logging.getLogger("SIBLING_ARTICLES")
+
+# Regional editions of one asset manager's site, scraped as separate site ids
+# but publishing largely the same articles.
+SIBLING_GROUPS = {
+    "pimco": ("am-210", "am-211", "am-212"),
+    "schroders": ("am-229", "am-230", "am-231"),
+    "robeco": ("am-232", "am-233", "am-234"),
+    "gsam": ("am-270", "am-271", "am-273"),
+    "franklin": ("am-278", "am-279", "am-280"),
+    "wellington": ("am-295", "am-296", "am-297"),
+    "pinebridge": ("am-414", "am-415", "am-416"),
+    "dimensional": ("am-418", "am-419", "am-420"),
+    "pgim": ("am-428", "am-429", "am-430"),
+}
+
+# Path segments that differ between regional editions of the same article:
+# locales (en-us, gb-en), country and language codes (/us/en/) and the
+# audience each region's site is aimed at.
+_LOCALE_SEGMENT_RE = re.compile(r"^[a-z]{2}[-_][a-z]{2}$")
+REGION_SEGMENTS = {"us", "gb", "uk", "sg", "hk", "en", "intl", "global"}
+AUDIENCE_SEGMENTS = {
+    "intermediary", "intermediaries", "professional", "professionals",
+    "advisor", "advisors", "adviser", "advisers", "financial-professional",
+    "financial-professionals", "wealth-management", "intermediary-and-individual",
+}
+# Country domains of one site: franklintempleton.co.uk, .com.sg -> .com
+_COUNTRY_DOMAIN_RE = re.compile(r"\.(?:com?\.)?(?:uk|sg|hk)$")
+
+# Fields a region sets itself; everything else an article fetch fills in is shared.
+REGIONAL_FIELDS = {
+    "company_site_id", "company_site_country", "company_site_role",
+    "article_source", "article_section", "article_date",
+    "article_slug", "article_url",
+}
+
+
+def canonical_article_url(url):
+    """
+    One key for every regional edition of an article: host without "www."
+    or country domain, path without locale, region or audience segments.
+    """
+    parts = urlsplit(url or "")
+    host = _COUNTRY_DOMAIN_RE.sub(".com", parts.netloc.lower().removeprefix("www."))
+    segments = [
+        segment for segment in parts.path.lower().split("/")
+        if segment
+        and not _LOCALE_SEGMENT_RE.match(segment)
+        and segment not in REGION_SEGMENTS
+        and segment not in AUDIENCE_SEGMENTS
+    ]
+    return f"{host}/{'/'.join(segments)}"
+
+
+class SharedArticles:
+    """
+    Article fetches shared by the regional sites of one sibling group while
+    they run together.
+
+    The first site to reach an article fetches it; siblings listing the same
+    article (by ``canonical_article_url``) wait for that fetch and copy what
+    it filled in, keeping their own region fields. If the fetch fails or
+    finds no content, the next sibling fetches the article itself.
+    """
+
+    def __init__(self, group, site_ids):
+        self.group = group
+        self.site_ids = tuple(site_ids)
+        self.stats = Counter()
+        self._fetches = {}
+
+    async def claim(self, item):
+        """
+        Key the caller must fetch ``item`` under and then ``settle``, or None
+        when the item was filled in from a sibling's fetch.
+        """
+        key = canonical_article_url(item["article_url"])
+        while True:
+            future = self._fetches.get(key)
+            if future is None or (future.done() and future.result() is None):
+                self._fetches[key] = asyncio.get_running_loop().create_future()
+                return key
+            fields = await asyncio.shield(future)
+            if fields is not None:
+                item.update(fields)
+                self.stats["shared"] += 1
+                logger.debug(f"{item.get('company_site_id')}: reused sibling fetch of {item['article_url']}")
+                return None
+
+    def settle(self, key, item, before, fetched):
+        """Publish what the fetch of ``item`` filled in (compared with ``before``), or release the claim."""
+        future = self._fetches[key]
+        if future.done():
+            return
+        if fetched and item.get("article_content"):
+            future.set_result({
+                field: value for field, value in item.items()
+                if field not in REGIONAL_FIELDS and before.get(field) != value
+            })
+            self.stats["fetched"] += 1
+        else:
+            future.set_result(None)
+            self.stats["failed"] += 1
+
+
+# Sibling groups currently running, by registry site id, so fetch_articles
+# can share article fetches between them.
+_active = {}
+
+
+def activate(shared):
+    for company_site_id in shared.site_ids:
+        _active[company_site_id] = shared
+
+
+def deactivate(shared):
+    for company_site_id in shared.site_ids:
+        if _active.get(company_site_id) is shared:
+            del _active[company_site_id]
+
+
+def active():
+    """Sibling group of the site the running pipeline task is scraping (see ``crawl_state.running_site``), or None."""
+    return _active.get(crawl_state.running_site())
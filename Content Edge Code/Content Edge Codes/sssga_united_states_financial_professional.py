@@ -1,12 +1,14 @@
 import asyncio
-import json
 import logging
 import sys
 import re
 import os
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 # --- Site metadata ---
 site = "State Street Global Advisors"
@@ -35,52 +37,18 @@ class SSGAScraperUS:
         self.stop_pagination = False   # <-- ADDED
 
     def normalize_date(self, raw):
-        try:
-            if re.match(r"^[A-Za-z]+\s+\d{4}$", raw.strip()):
-                dt = parser.parse(raw, fuzzy=True)
-                return datetime(dt.year, dt.month, 1).date()
-            return parser.parse(raw, fuzzy=True).date()
-        except:
+        parsed = parse_date(raw, site=company_site_id)
+        if not parsed:
             return self.target_date
+        # "March 2025" is dated the first of the month
+        if re.match(r"^[A-Za-z]+\s+\d{4}$", raw.strip()):
+            return parsed.replace(day=1)
+        return parsed
 
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                "--disable-gpu",
-                "--no-sandbox",
-                "--single-process",
-                "--disable-dev-shm-usage",
-                "--no-zygote",
-                "--disable-setuid-sandbox",
-                "--disable-accelerated-2d-canvas",
-                "--disable-dev-shm-usage",
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-background-networking",
-                "--disable-background-timer-throttling",
-                "--disable-client-side-phishing-detection",
-                "--disable-component-update",
-                "--disable-default-apps",
-                "--disable-domain-reliability",
-                "--disable-features=AudioServiceOutOfProcess",
-                "--disable-hang-monitor",
-                "--disable-ipc-flooding-protection",
-                "--disable-popup-blocking",
-                "--disable-prompt-on-repost",
-                "--disable-renderer-backgrounding",
-                "--disable-sync",
-                "--force-color-profile=srgb",
-                "--metrics-recording-only",
-                "--mute-audio",
-                "--no-pings",
-                "--use-gl=swiftshader",
-                "--window-size=1280,1696"
-            ]
-        )
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
             )
@@ -103,7 +71,7 @@ class SSGAScraperUS:
             await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
 
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             try:
                 await page.wait_for_selector(
@@ -156,7 +124,7 @@ class SSGAScraperUS:
                 logger.info(f"Found {len(cards)} article cards on the page")
             except Exception as e:
                 logger.error(f"Could not find article cards: {e}")
-                await browser.close()
+                await context.close()
                 return []
 
             for idx, card in enumerate(cards, start=1):
@@ -213,7 +181,7 @@ class SSGAScraperUS:
 
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             logger.info(f"Finished scraping {len(self.items)} total articles")
             self.items = [item for item in self.items if item["article_content"]]
             return self.items
@@ -221,31 +189,25 @@ class SSGAScraperUS:
 
     async def scrape_article_pages(self, context):
         logger.debug("Starting to scrape individual article pages...")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-        page = await context.new_page()
-        for idx, item in enumerate(self.items, start=1):
-            url = item["article_url"]
-            if not url:
-                continue
-
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                item["article_date"] = str(self.target_date)
-                continue
-
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
 
-                content_el = await page.locator("div.ssmp-richtext").all_text_contents()
-                full_text = " ".join(map(str.strip, content_el)).strip()
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            item["article_date"] = str(self.target_date)
+            return
 
-                item["article_content"] = full_text
+        await page.goto(url, timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
 
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx}: {e}")
+        content_el = await page.locator("div.ssmp-richtext").all_text_contents()
+        full_text = " ".join(map(str.strip, content_el)).strip()
 
-        await page.close()
+        item["article_content"] = full_text
 
 
 async def SSGAUSFP(target_date):
@@ -258,13 +220,10 @@ async def SSGAUSFP(target_date):
         if not os.path.exists("/tmp"):
             os.makedirs("/tmp")
 
-        output_path=f"/tmp/{company_site_id}.json"
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} U.S. articles after {target_date}")
-        return 200
+        return results
     except Exception as error:
         logger.error(f"Error: {error}")
         return 500
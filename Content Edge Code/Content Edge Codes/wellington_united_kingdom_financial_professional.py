@@ -1,11 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
-import re
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from http_articles import HttpArticleReader
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "Wellington Management Company"
@@ -35,41 +37,7 @@ class WellingtonScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--disable-dev-shm-usage",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent=(
@@ -83,17 +51,18 @@ class WellingtonScraper:
             await page.goto(url, timeout=120000)
             await page.wait_for_load_state("networkidle")
 
-            try:
-                checkbox = page.locator("input#attestation-remember")
-                if await checkbox.count():
-                    await checkbox.check(force=True)
+            with run_report.span("consent"):
                 try:
-                    await page.locator("button.cmp-button.accept").click(force=True)
+                    checkbox = page.locator("input#attestation-remember")
+                    if await checkbox.count():
+                        await checkbox.check(force=True)
+                    try:
+                        await page.locator("button.cmp-button.accept").click(force=True)
+                    except:
+                        await page.locator("button.accept").click(force=True)
+                    await page.wait_for_load_state("networkidle")
                 except:
-                    await page.locator("button.accept").click(force=True)
-                await page.wait_for_load_state("networkidle")
-            except:
-                pass
+                    pass
 
             while True:
                 try:
@@ -176,41 +145,41 @@ class WellingtonScraper:
                 })
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
 
             self.items = [i for i in self.items if i["article_content"]]
             return self.items
 
     async def scrape_article_pages(self, context):
-        page = await context.new_page()
+        # Article bodies are server-rendered; the browser is only a fallback.
+        reader = HttpArticleReader(context, "div.text__content", self.parse_article)
+        await fetch_articles(context, self.items, self.scrape_article, fast_path=reader)
 
-        for idx, item in enumerate(self.items, start=1):
-            url = item["article_url"]
-            if not url:
-                continue
+    def parse_article(self, doc, item):
+        contents = doc.all_text_contents("div.text__content")
+        item["article_content"] = " ".join([x.strip() for x in contents if x.strip()])
 
-            if url.lower().endswith(".pdf"):
-                item["article_content"] = url
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
 
-            try:
-                logger.info(f"Scraping article #{idx}: {url}")
-                await page.goto(url, timeout=120000)
-                await page.wait_for_load_state("networkidle")
-                await asyncio.sleep(self.sleep_time)
-
-                try:
-                    contents = await page.locator("div.text__content").all_text_contents()
-                    full_text = " ".join([x.strip() for x in contents if x.strip()])
-                except:
-                    full_text = ""
+        if url.lower().endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-                item["article_content"] = full_text
+        logger.info(f"Scraping article: {url}")
+        await page.goto(url, timeout=120000)
+        await page.wait_for_load_state("networkidle")
+        await wait_until_ready(page, self.sleep_time)
 
-            except Exception as e:
-                logger.error(f"Failed scraping article #{idx}: {e}")
+        try:
+            contents = await page.locator("div.text__content").all_text_contents()
+            full_text = " ".join([x.strip() for x in contents if x.strip()])
+        except:
+            full_text = ""
 
-        await page.close()
+        item["article_content"] = full_text
 
 
 async def WMGUKFP(target_date):
@@ -220,12 +189,10 @@ async def WMGUKFP(target_date):
         scraper = WellingtonScraper(target_date)
         results = await scraper.scrape(url)
 
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} Wellington articles after {target_date}")
-        return 200
+        return results
 
     except Exception as error:
         logger.error(f"Error: {error}")
@@ -0,0 +1,105 @@
+"""
+Normaliser throughput and golden-output check.
+
+Cleans a corpus with the current normalise module and with the reference
+copy in legacy_normalise.py, fails if any item differs, and reports
+throughput in MB/s of article text for both. The corpus is one or more
+output files (a scraper's /tmp/<company_site_id>.json debug output or any
+output object); without them a synthetic corpus with awkward spacing,
+special spaces and punctuation is used.
+
+Usage:
+    python normalise_benchmark.py [output files...] [--runs N]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scraper-amg-1"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import legacy_normalise  # noqa: E402
+import normalise  # noqa: E402
+from output_writer import read_items  # noqa: E402
+
+IMPLEMENTATIONS = {
+    "clean_data": (legacy_normalise.clean_data, normalise.clean_data),
+    "clean_data_advanced": (legacy_normalise.clean_data_advanced, normalise.clean_data_advanced),
+}
+
+
+def synthetic_corpus(count=500):
+    rng = random.Random(0)
+    words = (
+        "the fund returned over quarter yields fell spreads tightened long-term investors "
+        "and short-term traders alike should note that central banks held rates while "
+        "inflation eased across developed markets emerging credit outperformed"
+    ).split()
+    spaces = [" "] * 40 + ["  ", "\xa0", "\u202f", "\u200b", "\t"]
+    endings = [".", ".", ".", ",", ",", ";", ":", "!", "?", " —", " .", " ,"]
+
+    def paragraph():
+        sentences = []
+        for _ in range(rng.randint(2, 6)):
+            sentence = "".join(rng.choice(words) + rng.choice(spaces) for _ in range(rng.randint(6, 25)))
+            sentences.append(sentence.rstrip() + rng.choice(endings))
+        return " ".join(sentences)
+
+    corpus = []
+    for i in range(count):
+        corpus.append({
+            "company_site_country": " United\xa0Kingdom ",
+            "article_title": f"  Outlook\u202f{i} : rates ,  credit ",
+            "article_description": "A look  at the quarter ahead .",
+            "article_tags": [" Fixed income ", "", "Macro\u200b"],
+            "article_date": "2025-12-01",
+            "article_content": "\n\n".join(paragraph() for _ in range(rng.randint(3, 30))),
+        })
+    return corpus
+
+
+def load_corpus(paths):
+    corpus = []
+    for path in paths:
+        with open(path, "rb") as f:
+            corpus.extend(read_items(f.read()))
+    return corpus
+
+
+def text_megabytes(corpus):
+    return sum(len(str(item.get("article_content") or "").encode("utf-8")) for item in corpus) / 1_000_000
+
+
+def benchmark(corpus, runs=5):
+    megabytes = text_megabytes(corpus)
+    report = {"items": len(corpus), "article_text_mb": round(megabytes, 2)}
+    for name, (legacy, current) in IMPLEMENTATIONS.items():
+        if json.dumps(legacy(corpus)) != json.dumps(current(corpus)):
+            raise AssertionError(f"{name}: output differs from legacy_normalise")
+
+        row = {}
+        for label, func in (("legacy", legacy), ("current", current)):
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                func(corpus)
+                timings.append(time.perf_counter() - started)
+            row[f"{label}_mb_per_s"] = round(megabytes / statistics.median(timings), 2)
+        row["speedup"] = round(row["current_mb_per_s"] / row["legacy_mb_per_s"], 2)
+        report[name] = row
+    return report
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Normaliser throughput and golden-output check.")
+    arguments.add_argument("files", nargs="*")
+    arguments.add_argument("--runs", type=int, default=5)
+    args = arguments.parse_args()
+
+    corpus = load_corpus(args.files) if args.files else synthetic_corpus()
+    print(json.dumps(benchmark(corpus, args.runs), indent=2))
@@ -0,0 +1,101 @@
+"""
+Output size and upload-time benchmark.
+
+Uploads the items of a sample run in every format/compression combination
+and reports object size and upload time. The sample is a scraper's debug
+output (/tmp/<company_site_id>.json, or any output object in either format);
+without one, synthetic articles shaped like scraper output are used.
+Uploads go to the local S3 stand-in unless a bucket is given.
+
+Usage:
+    python output_benchmark.py [sample.json[.gz|.zst]] [runs] [--bucket BUCKET]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scraper-amg-1"))
+
+import output_writer  # noqa: E402
+from local_s3 import LocalS3Client  # noqa: E402
+
+COMBINATIONS = [
+    ("json", "none"),
+    ("jsonl", "none"),
+    ("jsonl", "gzip"),
+    ("jsonl", "zstd"),
+]
+
+
+def synthetic_items(count=300):
+    rng = random.Random(0)
+    words = (
+        "markets moved higher over the quarter as inflation eased and central banks signalled "
+        "that policy rates had peaked fixed income returns improved across duration buckets "
+        "while equity leadership broadened beyond large caps emerging credit spreads tightened"
+    ).split()
+    return [
+        {
+            "company_site_id": "am-000",
+            "company_site_country": "United Kingdom",
+            "company_site_role": "Financial Professional",
+            "article_source": "Sample Asset Management",
+            "article_section": "Insights",
+            "article_title": f"Quarterly outlook {i}",
+            "article_url": f"https://www.example.com/insights/quarterly-outlook-{i}",
+            "article_date": "2025-12-01",
+            "article_content": " ".join(rng.choice(words) for _ in range(rng.randint(300, 3000))),
+        }
+        for i in range(count)
+    ]
+
+
+def load_items(path):
+    with open(path, "rb") as f:
+        return output_writer.read_items(f.read())
+
+
+def benchmark(items, runs=3, client=None, bucket="benchmark"):
+    client = client or LocalS3Client(tempfile.mkdtemp(prefix="output-benchmark-"))
+    report = {"items": len(items)}
+    for fmt, compression in COMBINATIONS:
+        if compression == "zstd":
+            if importlib.util.find_spec("zstandard") is None:
+                report[f"{fmt}+{compression}"] = "skipped (zstandard not installed)"
+                continue
+        key = f"output-benchmark/sample{output_writer.output_extension(fmt, compression)}"
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            size = output_writer.upload_items(client, items, bucket, key, fmt=fmt, compression=compression)
+            timings.append(time.perf_counter() - started)
+        report[f"{fmt}+{compression}"] = {"bytes": size, "median_seconds": round(statistics.median(timings), 4)}
+
+    baseline = report["json+none"]["bytes"]
+    for name, row in report.items():
+        if isinstance(row, dict):
+            row["size_vs_json"] = round(row["bytes"] / baseline, 3)
+    return report
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("sample", nargs="?")
+    arguments.add_argument("runs", nargs="?", type=int, default=3)
+    arguments.add_argument("--bucket", help="upload to this S3 bucket instead of the local stand-in")
+    args = arguments.parse_args()
+
+    items = load_items(args.sample) if args.sample else synthetic_items()
+    client = None
+    if args.bucket:
+        import boto3
+
+        client = boto3.client("s3")
+    print(json.dumps(benchmark(items, args.runs, client, args.bucket or "benchmark"), indent=2))
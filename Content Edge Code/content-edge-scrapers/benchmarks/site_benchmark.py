@@ -0,0 +1,324 @@
+"""
+Offline end-to-end scraper benchmark on recorded site fixtures.
+
+record - runs scrapers against the live sites, every browser context
+         recording a HAR file under <fixtures>/<company_site_id>/
+replay - runs them again without touching the live sites: requests are
+         answered from the HAR files, either by Playwright's route_from_har
+         ("har" transport) or by a local HTTP server holding the recorded
+         responses ("server"), with latency added to every response
+
+Replay reports per site the median wall time and the page loads, requests,
+response bytes, requests missing from the fixtures and items of the last
+run, as JSON. Requests not in the fixtures are aborted, so a replay never
+reaches a live site.
+
+Fetches made outside the browser (the HTTP article fast path, the listing
+boundary's metadata fetch and Coveo search paging) bypass Playwright's
+routing, so both modes switch them off (HTTP_ARTICLES=0, COVEO_API=0) and
+the scrapers use their browser paths.
+
+Usage:
+    python site_benchmark.py record am-247 [am-248 ...] [--target-date 2025-12-01]
+    python site_benchmark.py replay am-247 [...] [--latency-ms 150] [--jitter-ms 50]
+        [--transport har|server] [--runs 3] [--output report.json]
+"""
+import argparse
+import asyncio
+import base64
+import glob
+import importlib
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+# Read by the scraper modules at import time.
+os.environ["HTTP_ARTICLES"] = "0"
+os.environ["COVEO_API"] = "0"
+os.environ.setdefault("CRAWL_STATE", "off")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRECTORIES = ["scraper-amg-1", "scraper-amg-2", "scraper-amg-4"]
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Registry lines in app.py: "am-247": ("module", "Function", "label"),
+REGISTRY_RE = re.compile(r'"(am-\d+)":\s*\("([^"]+)",\s*"([^"]+)"')
+# Headers recomputed for a replayed body.
+DROPPED_HEADERS = {"content-length", "content-encoding", "transfer-encoding", "connection"}
+
+
+def find_scraper(company_site_id):
+    """(directory, module, function) registered for a site in one of the dispatchers' app.py."""
+    for directory in DIRECTORIES:
+        with open(os.path.join(ROOT, directory, "app.py"), encoding="utf-8") as f:
+            for site_id, module, function in REGISTRY_RE.findall(f.read()):
+                if site_id == company_site_id:
+                    return directory, module, function
+    raise ValueError(f"No scraper registered for {company_site_id}")
+
+
+def load_scraper(company_site_id):
+    directory, module, function = find_scraper(company_site_id)
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return getattr(importlib.import_module(module), function)
+
+
+def site_fixtures(fixtures, company_site_id):
+    return os.path.join(fixtures, company_site_id)
+
+
+def har_files(fixtures, company_site_id):
+    return sorted(glob.glob(os.path.join(site_fixtures(fixtures, company_site_id), "*.har")))
+
+
+def read_manifest(fixtures, company_site_id):
+    with open(os.path.join(site_fixtures(fixtures, company_site_id), "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class HarRecorder:
+    """Context hook giving every context of a site its own HAR file."""
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.contexts = 0
+
+    def context_options(self, site_id):
+        self.contexts += 1
+        path = os.path.join(site_fixtures(self.fixtures, site_id), f"context-{self.contexts}.har")
+        return {"record_har_path": path, "record_har_content": "embed"}
+
+    async def install(self, context, site_id):
+        pass
+
+
+class RecordedResponses:
+    """Responses of a site's HAR files by (method, URL); the first recording of each wins."""
+
+    def __init__(self, paths):
+        self.responses = {}
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)["log"]["entries"]
+            for entry in entries:
+                request, response = entry["request"], entry["response"]
+                if response.get("status", 0) <= 0:
+                    continue
+                content = response.get("content", {})
+                body = content.get("text") or ""
+                body = base64.b64decode(body) if content.get("encoding") == "base64" else body.encode("utf-8")
+                headers = [
+                    (h["name"], h["value"]) for h in response.get("headers", [])
+                    if h["name"].lower() not in DROPPED_HEADERS
+                ]
+                self.responses.setdefault((request["method"], request["url"]), (response["status"], headers, body))
+
+    def get(self, method, url):
+        return self.responses.get((method, url))
+
+
+class FixtureServer:
+    """
+    Local HTTP server answering ``/replay?method=...&url=...`` from
+    recorded responses, sleeping ``latency`` (+ up to ``jitter``) seconds
+    before each one.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.recorded = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                site = query.get("site", [""])[0]
+                found = server.recorded.get(site) and server.recorded[site].get(
+                    query.get("method", ["GET"])[0], query.get("url", [""])[0]
+                )
+                time.sleep(server.latency + random.uniform(0, server.jitter))
+                if found is None:
+                    self.send_error(404)
+                    return
+                status, headers, body = found
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/replay"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def load(self, company_site_id, paths):
+        self.recorded[company_site_id] = RecordedResponses(paths)
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+class Replay:
+    """
+    Context hook serving a site from its fixtures and counting what the
+    scraper requested. Routes run newest first: the latency (or server)
+    route, then the HAR routes, then a catch-all that aborts anything the
+    fixtures do not hold.
+    """
+
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, server=None):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.server = server
+        self.reset()
+
+    def reset(self):
+        self.stats = {"page_loads": 0, "requests": 0, "missing": 0, "bytes": 0}
+
+    def context_options(self, site_id):
+        return {}
+
+    async def install(self, context, site_id):
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_finished)
+
+        async def missing(route):
+            self.stats["missing"] += 1
+            await route.abort()
+
+        await context.route("**/*", missing)
+        if self.server is not None:
+            async def serve(route):
+                request = route.request
+                query = urlencode({"site": site_id, "method": request.method, "url": request.url})
+                response = await route.fetch(url=f"{self.server.url}?{query}", method="GET")
+                if response.status == 404:
+                    await route.fallback()
+                    return
+                await route.fulfill(response=response)
+
+            await context.route("**/*", serve)
+            return
+
+        for path in har_files(self.fixtures, site_id):
+            await context.route_from_har(path, not_found="fallback")
+
+        async def delay(route):
+            await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+            await route.fallback()
+
+        await context.route("**/*", delay)
+
+    def _on_request(self, request):
+        self.stats["requests"] += 1
+        if request.is_navigation_request():
+            self.stats["page_loads"] += 1
+
+    async def _on_finished(self, request):
+        try:
+            sizes = await request.sizes()
+            self.stats["bytes"] += sizes["responseBodySize"]
+        except Exception:
+            pass
+
+
+def record(site_ids, target_date, fixtures):
+    from browser_runtime import runtime
+
+    recorder = HarRecorder(fixtures)
+    runtime.context_hooks.append(recorder)
+    for company_site_id in site_ids:
+        scraper_func = load_scraper(company_site_id)
+        directory = site_fixtures(fixtures, company_site_id)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+        started = time.perf_counter()
+        response = runtime.run(scraper_func(target_date))
+        items = len(response) if isinstance(response, list) else 0
+        with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "company_site_id": company_site_id,
+                "target_date": target_date,
+                "recorded_on": str(date.today()),
+                "items": items,
+                "seconds": round(time.perf_counter() - started, 2),
+            }, f, indent=2)
+        print(f"{company_site_id}: recorded {len(har_files(fixtures, company_site_id))} HAR files, {items} items")
+    runtime.run(runtime.close())
+
+
+def replay(site_ids, fixtures, runs=3, latency=0.0, jitter=0.0, transport="har"):
+    from browser_runtime import runtime
+
+    server = FixtureServer(latency, jitter) if transport == "server" else None
+    hook = Replay(fixtures, latency, jitter, server)
+    runtime.context_hooks.append(hook)
+
+    report = {"transport": transport, "latency_ms": latency * 1000, "jitter_ms": jitter * 1000, "sites": {}}
+    try:
+        for company_site_id in site_ids:
+            manifest = read_manifest(fixtures, company_site_id)
+            if server is not None:
+                server.load(company_site_id, har_files(fixtures, company_site_id))
+            scraper_func = load_scraper(company_site_id)
+
+            timings = []
+            for _ in range(runs):
+                hook.reset()
+                started = time.perf_counter()
+                response = runtime.run(scraper_func(manifest["target_date"]))
+                timings.append(time.perf_counter() - started)
+
+            report["sites"][company_site_id] = {
+                "target_date": manifest["target_date"],
+                "wall_seconds": round(statistics.median(timings), 2),
+                **hook.stats,
+                "items": len(response) if isinstance(response, list) else 0,
+                "recorded_items": manifest.get("items"),
+            }
+    finally:
+        runtime.run(runtime.close())
+        if server is not None:
+            server.close()
+    return report
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Offline end-to-end scraper benchmark.")
+    arguments.add_argument("mode", choices=["record", "replay"])
+    arguments.add_argument("sites", nargs="+", help="company_site_ids")
+    arguments.add_argument("--fixtures", default=FIXTURES)
+    arguments.add_argument("--target-date", default=str(date.today().replace(day=1)))
+    arguments.add_argument("--runs", type=int, default=3)
+    arguments.add_argument("--latency-ms", type=float, default=100)
+    arguments.add_argument("--jitter-ms", type=float, default=0)
+    arguments.add_argument("--transport", choices=["har", "server"], default="har")
+    arguments.add_argument("--output", help="also write the report to this JSON file")
+    args = arguments.parse_args()
+
+    if args.mode == "record":
+        record(args.sites, args.target_date, args.fixtures)
+    else:
+        result = replay(args.sites, args.fixtures, args.runs, args.latency_ms / 1000, args.jitter_ms / 1000, args.transport)
+        print(json.dumps(result, indent=2))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
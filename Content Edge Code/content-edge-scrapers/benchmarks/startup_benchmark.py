@@ -0,0 +1,64 @@
+"""
+Cold-start benchmark for the Lambda dispatchers.
+
+Each sample runs in a fresh interpreter inside a scraper directory and times:
+  lazy  - import app and resolve one company_site_id (what an invocation does now)
+  eager - import app and resolve every company_site_id (what the old
+          module-level imports in app.py cost)
+
+Usage:
+    python startup_benchmark.py [scraper-amg-1|scraper-amg-2|scraper-amg-4|"../Content Edge Codes"] [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The deploy directories, and the "Content Edge Codes" copy that ships the same registry.
+DIRECTORIES = ["scraper-amg-1", "scraper-amg-2", "scraper-amg-4", os.path.join(os.pardir, "Content Edge Codes")]
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import app
+site_ids = list(app.registry)
+targets = site_ids if sys.argv[1] == "eager" else site_ids[:1]
+for site_id in targets:
+    app.registry.get(site_id)
+print(json.dumps({"seconds": time.perf_counter() - t0, "modules": len(sys.modules)}))
+"""
+
+
+def sample(directory, mode):
+    env = dict(os.environ)
+    env.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, mode],
+        cwd=os.path.join(ROOT, directory),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(directory, runs=5):
+    report = {}
+    for mode in ("lazy", "eager"):
+        samples = [sample(directory, mode) for _ in range(runs)]
+        report[mode] = {
+            "median_seconds": round(statistics.median(s["seconds"] for s in samples), 4),
+            "modules": samples[-1]["modules"],
+        }
+    report["saving_seconds"] = round(report["eager"]["median_seconds"] - report["lazy"]["median_seconds"], 4)
+    return report
+
+
+if __name__ == "__main__":
+    directories = [sys.argv[1]] if len(sys.argv) > 1 else DIRECTORIES
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    for directory in directories:
+        print(directory, json.dumps(benchmark(directory, runs), indent=2))
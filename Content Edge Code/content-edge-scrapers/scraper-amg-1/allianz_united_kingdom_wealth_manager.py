@@ -1,12 +1,13 @@
 import asyncio
-from asyncio.timeouts import timeout
-import json
 import logging
 import sys
-from datetime import date, datetime
 from dateutil import parser
 
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 
 site = "Allianz Global Investors"
@@ -36,39 +37,7 @@ class AllianzScraper:
         self.items=[]
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                        ])
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                     )
@@ -92,14 +61,15 @@ class AllianzScraper:
 
             # Step 1: Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            # Step 2: Handle disclaimer
-            try:
+            with run_report.span("consent"):
+                # Step 2: Handle disclaimer
+                try:
 
-                await page.get_by_role("button", name="Accept").click()
-            except Exception as e:
-                logger.info(f"Error selecting Financial Professional:{e}")
+                    await page.get_by_role("button", name="Accept").click()
+                except Exception as e:
+                    logger.info(f"Error selecting Financial Professional:{e}")
 
             while True:
                 cards= await page.locator(".c-agi-tile").all()
@@ -161,33 +131,32 @@ class AllianzScraper:
 
     async def scrape_article_pages(self,context):
         logger.debug("DEBUG: Starting to scrape individual articles")
-        for item in self.items:
-            url = item["article_url"]
-            #logger.debug(f"url:{url}")
-            if not url:
-                continue
+        await fetch_articles(context, self.items, self.scrape_article)
 
-            # Skip PDFs
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        #logger.debug(f"url:{url}")
+        if not url:
+            return
 
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-
-                # Extract full content text
-                paragraphs = await page.locator("p").all_text_contents()
-                full_text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = full_text
-                logger.debug(f"Succesfully scraped url:{url}")
-
-            except Exception as e:
-                logger.error(f"ERROR: Failed to scrape {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+        # Skip PDFs
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
+
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
+
+            # Extract full content text
+            paragraphs = await page.locator("p").all_text_contents()
+            full_text = " ".join(p.strip() for p in paragraphs if p.strip())
+            item["article_content"] = full_text
+            logger.debug(f"Succesfully scraped url:{url}")
+
+        except Exception as e:
+            logger.error(f"ERROR: Failed to scrape {url}: {e}")
+            item["article_content"] = None
 async def AllianzUKWM(target_date):
     urls = [
         "https://uk.allianzgi.com/en-gb/insights/outlook-and-commentary",
@@ -202,13 +171,10 @@ async def AllianzUKWM(target_date):
         items = await scraper.scrape(url)
         all_items.extend(items)  # merge results
 
-    output_path = f"/tmp/{company_site_id}.json"
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(all_items, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, all_items)
 
     logger.info(f"Scraped total {len(all_items)} articles after {target_date}")
-    return 200
+    return all_items
 
 if __name__=="__main__":
     target_date=sys.argv[1] if len(sys.argv) >1 else "2025-10-01"
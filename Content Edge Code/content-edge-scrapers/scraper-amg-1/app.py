@@ -1,4 +1,3 @@
-import asyncio
 from datetime import date
 import logging
 import json
@@ -8,12 +7,18 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-from normalise import clean_data
-import uuid
+# --- Browser runtime (kept warm across invocations) ---
+from browser_runtime import runtime
+from scraper_registry import ScraperRegistry
+import crawl_state
+from pipeline import SitePipeline
+from output_writer import get_s3_client, upload_items
+from orchestrator import INVOKE_TIMEOUT, FanOutOrchestrator, LambdaInvoker, worker_functions_from_env
 import boto3
+from botocore.config import Config
 
-s3 = boto3.resource('s3')
-lambda_client = boto3.client('lambda')
+# Synchronous worker invokes are given up after INVOKE_TIMEOUT seconds
+lambda_client = boto3.client('lambda', config=Config(read_timeout=INVOKE_TIMEOUT, retries={'max_attempts': 0}))
 
 # --- Logging setup ---
 logging.basicConfig(
@@ -22,226 +27,117 @@ logging.basicConfig(
 )
 logger = logging.getLogger("BNYM_LAMBDA")
 
-
-
-from bnymellon_united_kingdom_financial_advisor import BNYMIMUKFA
-
-from bnymellon_united_states_financial_advisor import BNYMIMUSFA
-
-from vanguard_united_states_financial_advisor import VanguardUSFA
-
-from vanguard_united_kingdom_professional_investor import VanguardUKPI
-
-from capital_united_states_financial_professional import CapitalUSFP
-
-from capital_united_kingdom_financial_professional import CapitalUKFP
-
-from capital_singapore_financial_professional import CapitalSGFP
-
-from apollo_global_wealth_professional import ApolloGlobalWM
-
-from invesco_united_kingdom_financial_professional import InvescoUKFA
-
-from invesco_united_states_financial_professional import InvescoUSFP
-
-from blackrock_united_states_financial_professional import BlackRockUSFP
-
-from ubs_united_states_financial_advisor import UBSUSFA
-
-from ubs_united_kingdom_financial_advisor import UBSUKFA
-
-from axa_united_states_corporate import AxaUSCO
-
-from axa_united_kingdom_corporate import AxaUKCO
-
-from axa_singapore_corporate import AxaSGCO
-
-from msim_united_states_financial_professional import MSIMUSFP
-
-from msim_united_kingdom_financial_professional import MSIMUKFP
-
-from mandg_united_kingdom_financial_professional import MANDGUKFP
-
-from mandg_singapore_financial_professional import MANDGSGFP
-
-from fidelity_global_financial_advisor import FidelityGlobalFA
-
-from landg_united_kingdom_wealth_advisor import LANDGWMUK
-
-from landg_singapore_wealth_advisor import LANDGWMSG
-
-from natixisim_united_states_financial_professional import NatixisUSFP
-
-from natixisim_united_kingdom_financial_professional import NatixisUKFP
-
-from natixisim_singapore_financial_professional import NatixisSGFP
-
-from allianz_united_kingdom_wealth_manager import AllianzUKWM
-
-from allianz_singapore_wealth_manager import AllianzSGWM
-
-from trowe_united_kingdom_financial_professional import TrowepriceUKFP
-
-from trowe_singapore_financial_professional import TrowepriceSGFP
+# --- Scraper registry (modules are imported on first use) ---
+registry = ScraperRegistry({
+    "am-255": ("bnymellon_united_states_financial_advisor", "BNYMIMUSFA", "BNY Mellon Investment Management | US | Financial Advisor"),
+    "am-256": ("bnymellon_united_kingdom_financial_advisor", "BNYMIMUKFA", "BNY Mellon Investment Management | UK | Financial Advisor"),
+    "am-205": ("vanguard_united_states_financial_advisor", "VanguardUSFA", "Vanguard | US | Financial Advisor"),
+    "am-206": ("vanguard_united_kingdom_professional_investor", "VanguardUKPI", "Vanguard | UK | Professional Investor"),
+    "am-223": ("capital_united_states_financial_professional", "CapitalUSFP", "Capital Group | US | Financial Professional"),
+    "am-224": ("capital_united_kingdom_financial_professional", "CapitalUKFP", "Capital Group | UK | Financial Professional"),
+    "am-225": ("capital_singapore_financial_professional", "CapitalSGFP", "Capital Group | SG | Financial Professional"),
+    "am-215": ("apollo_global_wealth_professional", "ApolloGlobalWM", "Apollo Global Management | Global | Wealth Professional"),
+    "am-301": ("invesco_united_states_financial_professional", "InvescoUSFP", "Invesco | US | Financial Professional"),
+    "am-302": ("invesco_united_kingdom_financial_professional", "InvescoUKFA", "Invesco | UK | Financial Professional"),
+    "am-243": ("blackrock_united_states_financial_professional", "BlackRockUSFP", "BlackRock | US | Financial Professional"),
+    "am-259": ("ubs_united_states_financial_advisor", "UBSUSFA", "UBS Asset Management | US | Financial Advisor"),
+    "am-260": ("ubs_united_kingdom_financial_advisor", "UBSUKFA", "UBS Asset Management | UK | Financial Advisor"),
+    "am-249": ("axa_united_states_corporate", "AxaUSCO", "AXA Investment Managers | US | Corporate"),
+    "am-250": ("axa_united_kingdom_corporate", "AxaUKCO", "AXA Investment Managers | UK | Corporate"),
+    "am-251": ("axa_singapore_corporate", "AxaSGCO", "AXA Investment Managers | SG | Corporate"),
+    "am-319": ("msim_united_states_financial_professional", "MSIMUSFP", "Morgan Stanley Investment Management | US | Financial Professional"),
+    "am-320": ("msim_united_kingdom_financial_professional", "MSIMUKFP", "Morgan Stanley Investment Management | UK | Financial Professional"),
+    "am-313": ("mandg_united_kingdom_financial_professional", "MANDGUKFP", "M&G Investments | UK | Financial Professional"),
+    "am-314": ("mandg_singapore_financial_professional", "MANDGSGFP", "M&G Investments | SG | Financial Professional"),
+    "am-274": ("fidelity_global_financial_advisor", "FidelityGlobalFA", "Fidelity International | Global | Financial Advisor"),
+    "am-350": ("landg_united_kingdom_wealth_advisor", "LANDGWMUK", "Legal & General Investment Management | United Kingdom | Wealth Manager"),
+    "am-351": ("landg_singapore_wealth_advisor", "LANDGWMSG", "Legal & General Investment Management | Asia ex-Japan | Wealth Manager"),
+    "am-306": ("natixisim_united_states_financial_professional", "NatixisUSFP", "Natixis Investment Managers | United States | Financial Professional"),
+    "am-307": ("natixisim_united_kingdom_financial_professional", "NatixisUKFP", "Natixis Investment Managers | United Kingdom | Financial Professional"),
+    "am-308": ("natixisim_singapore_financial_professional", "NatixisSGFP", "Natixis Investment Managers | Singapore | Financial Professional"),
+    "am-324": ("allianz_united_kingdom_wealth_manager", "AllianzUKWM", "Allianz Global Investors | United Kingdom | Wealth Manager"),
+    "am-325": ("allianz_singapore_wealth_manager", "AllianzSGWM", "Allianz Global Investors | Singapore | Wealth Manager"),
+    "am-345": ("trowe_united_kingdom_financial_professional", "TrowepriceUKFP", "T. Rowe Price | United Kingdom | Financial Professional"),
+    "am-346": ("trowe_singapore_financial_professional", "TrowepriceSGFP", "T. Rowe Price | Singapore | Financial Professional"),
+})
 
 bucket_name=os.getenv("BUCKET_NAME")
 
+# --- Crawl state (what earlier runs already captured) ---
+crawl_store = crawl_state.get_state_store(bucket_name)
+
 
 def save_json_to_s3(data, bucket_name, file_key):
     try:
-        s3 = boto3.client('s3')
-        json_data = json.dumps(data, indent=2, default=str)
-        s3.put_object(
-            Bucket=bucket_name,
-            Key=file_key,
-            Body=json_data,
-            ContentType='application/json'
-        )
+        upload_items(get_s3_client(), data, bucket_name, file_key)
         
-        return f"Successfully saved JSON to s3://{bucket_name}/{file_key}"
+        logger.info(f"Successfully saved JSON to s3://{bucket_name}/{file_key}")
+        return True
         
     except Exception as e:
-        return f"Error saving JSON to S3: {e}"
-
+        logger.error(f"Error saving JSON to S3: {e}")
+        return False
 
-def lambda_handler(event, context):
-    data=[]
-    company_site_id=event.get("company_site_id")
-    target_date=event.get("target_date",str(date.today()))
 
-    match company_site_id:
+def save_report_to_s3(report, bucket_name, file_key):
+    try:
+        get_s3_client().put_object(
+            Bucket=bucket_name,
+            Key=file_key,
+            Body=json.dumps(report, indent=2).encode("utf-8"),
+            ContentType="application/json",
+        )
+        return True
 
-        case "am-255":
-            logger.info("am-255 | BNY Mellon Investment Management | US | Financial Advisor")
-            scraper_func = BNYMIMUSFA
-        
-        case "am-256":
-            logger.info("am-256 | BNY Mellon Investment Management | UK | Financial Advisor")
-            scraper_func= BNYMIMUKFA
+    except Exception as e:
+        logger.error(f"Error saving run report to S3: {e}")
+        return False
 
-        case "am-205":
-            logger.info("am-205 | Vanguard | US | Financial Advisor")
-            scraper_func= VanguardUSFA
 
-        case "am-206":
-            logger.info("am-206 | Vanguard | UK | Professional Investor")
-            scraper_func= VanguardUKPI
+# --- Pipeline: scrape, clean, dedupe against crawl state, upload ---
+pipeline = SitePipeline(registry, bucket_name, save_json_to_s3, crawl_store, group="amg-1", upload_report=save_report_to_s3)
 
-        case "am-223":
-            logger.info("am-223 | Capital Group | US | Financial Professional")
-            scraper_func=CapitalUSFP
-        
-        case "am-224":
-            logger.info("am-224 | Capital Group | UK | Financial Professional")
-            scraper_func= CapitalUKFP
-
-        case "am-225":
-            logger.info("am-225 | Capital Group | SG | Financial Professional")
-            scraper_func = CapitalSGFP             
-
-        case "am-215":
-            logger.info("am-215 | Apollo Global Management | Global | Wealth Professional")
-            scraper_func = ApolloGlobalWM
-        case "am-301":
-            logger.info("am-301 | Invesco | US | Financial Professional")
-            scraper_func= InvescoUSFP 
-        
-        case "am-302":
-            logger.info("am-302 | Invesco | UK | Financial Professional")
-            scraper_func = InvescoUKFA
 
-        case "am-243":
-            logger.info("am-243 | BlackRock | US | Financial Professional")
-            scraper_func = BlackRockUSFP
+def lambda_handler(event, context):
+    """
+    Single site: {"company_site_id": "am-xxx", "target_date": "YYYY-MM-DD"}
+    Batch: {"company_site_ids": [...]} or {"site_group": "amg-1"}, optionally
+    with "sites_in_flight"; returns per-site status codes and timings.
+    Sibling groups: {"sibling_groups": ["pimco", ...]} or "all" runs each
+    group's regional sites together, fetching shared articles once.
+    List sites: {"action": "list_sites"} (used by the orchestrator)
+    Each site result carries a run report (phase timings, article latency
+    p50/p95, pages, retries, bytes), also uploaded next to its output; a
+    single-site event with "report": true returns the whole result.
+    """
+    target_date=event.get("target_date", str(date.today()))
+
+    if event.get("action") == "list_sites":
+        return {"statusCode": 200, "site_group": pipeline.group, "company_site_ids": list(registry)}
+
+    if pipeline.is_batch(event):
+        return runtime.run(pipeline.run_batch(event, target_date))
 
-        case "am-259":
-            logger.info("am-259 | UBS Asset Management | US | Financial Advisor")
-            scraper_func = UBSUSFA
-        
-        case "am-260":
-            logger.info("am-260 | UBS Asset Management | UK | Financial Advisor")
-            scraper_func =UBSUKFA
-
-        case "am-249":
-            logger.info("am-259 | AXA Investment Managers | US | Corporate")
-            scraper_func= AxaUSCO
-
-        case "am-250":
-            logger.info("am-250 | AXA Investment Managers | UK | Corporate")
-            scraper_func =AxaUKCO
-
-        case "am-251":
-            logger.info("am-251 | AXA Investment Managers | SG | Corporate")
-            scraper_func=AxaSGCO
-
-        case "am-319":
-            logger.info("am-319 | Morgan Stanley Investment Management | US | Financial Professional")
-            scraper_func=MSIMUSFP
-
-        case "am-320":
-            logger.info("am-320 | Morgan Stanley Investment Management | UK | Financial Professional")
-            scraper_func= MSIMUKFP
-
-        case "am-313":
-            logger.info("am-313 | M&G Investments | UK | Financial Professional")
-            scraper_func=MANDGUKFP
-
-        case "am-314":
-            logger.info("am-314 | M&G Investments | SG | Financial Professional")
-            scraper_func=MANDGSGFP
-
-        case "am-274":
-            logger.info("am-274 | Fidelity International | Global | Financial Advisor")
-            scraper_func=FidelityGlobalFA
-
-        case "am-350":
-            logger.info("am-351 | Legal & General Investment Management | United Kingdom | Wealth Manager")
-            scraper_func=LANDGWMUK
-
-        case "am-351":
-            logger.info("am-351 | Legal & General Investment Management | Asia ex-Japan | Wealth Manager")
-            scraper_func=LANDGWMSG
-
-        case "am-306":
-            logger.info("am-306 | Natixis Investment Managers | United States | Financial Professional")
-            scraper_func=NatixisUSFP
-
-        case "am-307":
-            logger.info("am-307 | Natixis Investment Managers | United Kingdom | Financial Professional")
-            scraper_func=NatixisUKFP
-
-        case "am-308":
-            logger.info("am-308 | Natixis Investment Managers | Singapore | Financial Professional")
-            scraper_func=NatixisSGFP
-
-        case "am-324":
-            logger.info("am-324 | Allianz Global Investors | United Kingdom | Wealth Manager")
-            scraper_func= AllianzUKWM
-
-        case "am-325":
-            logger.info("am-325 | Allianz Global Investors | Singapore | Wealth Manager")
-            scraper_func= AllianzSGWM
-
-        case "am-345":
-            logger.info("am-345 | T. Rowe Price | United Kingdom | Financial Professional")
-            scraper_func=TrowepriceUKFP
-
-        case "am-346":
-            logger.info("am-346 | T. Rowe Price | Singapore | Financial Professional")
-            scraper_func= TrowepriceSGFP
-
-        case _:          
-            logger.error(f"Unknown company_site_id: {company_site_id}")
-            return {"statusCode": 400, "body": "Unknown company_site_id"}
-
-    response = asyncio.run(scraper_func(target_date))
-    if response==200:
-        output_path=f"/tmp/{company_site_id}.json"
-        with open(output_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        data=clean_data(data)
-        target_date_str=("/").join(target_date.split("-"))
-        file_key=f"output/website/{target_date_str}/{company_site_id}.json"
-        save_json_to_s3(data, bucket_name, file_key)
-
-    return response
+    company_site_id=event.get("company_site_id")
+    if company_site_id not in registry:
+        logger.error(f"Unknown company_site_id: {company_site_id}")
+        return {"statusCode": 400, "body": "Unknown company_site_id"}
+
+    result=runtime.run(pipeline.run_site(company_site_id, target_date, event.get("full_crawl", False)))
+    if event.get("report"):
+        return result
+    return result["statusCode"]
+
+
+def orchestrator_handler(event, context):
+    """
+    Fan the daily crawl out to the worker Lambdas of several site groups.
+    Event: {"target_date": "YYYY-MM-DD", "site_groups": ["amg-1", "amg-2"],
+    "max_concurrency": 10}. Worker function names come from WORKER_FUNCTIONS.
+    """
+    function_names=worker_functions_from_env()
+    target_date=event.get("target_date", str(date.today()))
+    groups=event.get("site_groups") or list(function_names)
+
+    orchestrator=FanOutOrchestrator(LambdaInvoker(lambda_client, function_names), event.get("max_concurrency"))
+    return orchestrator.run(target_date, groups, full_crawl=event.get("full_crawl", False))
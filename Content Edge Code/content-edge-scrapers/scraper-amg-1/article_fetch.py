@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import crawl_state
+import run_report
+import sibling_articles
+
+logger = logging.getLogger("ARTICLE_FETCH")
+
+# Defaults can be tuned per deployment without touching the scrapers.
+ARTICLE_CONCURRENCY = int(os.getenv("ARTICLE_CONCURRENCY", "4"))
+ARTICLE_DOMAIN_CONCURRENCY = int(os.getenv("ARTICLE_DOMAIN_CONCURRENCY", "3"))
+ARTICLE_TIMEOUT = float(os.getenv("ARTICLE_TIMEOUT", "150"))
+
+
+async def fetch_articles(context, items, handler,
+                         concurrency=None,
+                         per_domain=None,
+                         timeout=None,
+                         fast_path=None):
+    """
+    Run a scraper's per-article handler over ``items`` with bounded concurrency.
+
+    Each worker owns one page in ``context`` and feeds it to
+    ``handler(page, item)``, which navigates and fills the item in place.
+    Pages are throttled per domain, every item gets its own timeout, and a
+    failing item is logged and left as-is without stopping the others.
+    When ``fast_path(item)`` is given and returns True the item is done and
+    no page is opened for it (see ``http_articles.HttpArticleReader``).
+    Articles captured on an earlier run (see ``crawl_state``) are skipped,
+    and while a sibling group runs (see ``sibling_articles``) an article
+    another region already fetched is copied instead of fetched again.
+
+    Args:
+        context: Playwright BrowserContext to open worker pages in
+        items: list of item dicts (each with an "article_url")
+        handler: async callable ``(page, item)``
+        concurrency: number of pages working in parallel
+        per_domain: maximum in-flight pages against one host
+        timeout: seconds allowed per item, fast path and browser together,
+            before it is abandoned
+        fast_path: optional async callable ``(item) -> bool`` tried first
+
+    Returns:
+        Dict with counts of fetched, failed, timed-out and already-known
+        items, and of those fetched without the browser or copied from a
+        sibling region
+    """
+    concurrency = concurrency or ARTICLE_CONCURRENCY
+    per_domain = per_domain or ARTICLE_DOMAIN_CONCURRENCY
+    timeout = timeout or ARTICLE_TIMEOUT
+
+    stats = {"fetched": 0, "failed": 0, "timed_out": 0, "via_http": 0, "known": 0, "shared": 0}
+    run_report.end("listing")
+
+    state = crawl_state.active()
+    shared = sibling_articles.active()
+    queue = asyncio.Queue()
+    for idx, item in enumerate(items, start=1):
+        if not item.get("article_url"):
+            continue
+        if state is not None and state.is_known(item["article_url"]):
+            stats["known"] += 1
+            continue
+        queue.put_nowait((idx, item))
+
+    domain_limits = defaultdict(lambda: asyncio.Semaphore(per_domain))
+
+    async def worker():
+        page = None
+        while True:
+            try:
+                idx, item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
+            url = item["article_url"]
+            if shared is not None:
+                key = await shared.claim(item)
+                if key is None:
+                    stats["fetched"] += 1
+                    stats["shared"] += 1
+                    continue
+                before = dict(item)
+
+            fetched = False
+            try:
+                domain = urlparse(url).netloc
+                async with domain_limits[domain]:
+                    with run_report.span("article"):
+                        # One deadline per item: the browser only gets what
+                        # the fast path left of it.
+                        deadline = asyncio.get_running_loop().time() + timeout
+                        if fast_path is not None:
+                            try:
+                                if await asyncio.wait_for(fast_path(item), timeout):
+                                    stats["via_http"] += 1
+                                    fetched = True
+                            except Exception as e:
+                                logger.debug(f"Fast path failed for article #{idx} ({url}): {e}")
+                                run_report.count("retries")
+
+                        if not fetched:
+                            try:
+                                remaining = deadline - asyncio.get_running_loop().time()
+                                if remaining <= 0:
+                                    raise asyncio.TimeoutError()
+                                if page is None:
+                                    page = await context.new_page()
+                                await asyncio.wait_for(handler(page, item), remaining)
+                                fetched = True
+                            except asyncio.TimeoutError:
+                                stats["timed_out"] += 1
+                                logger.error(f"Article #{idx} timed out after {timeout}s ({url})")
+                            except Exception as e:
+                                stats["failed"] += 1
+                                logger.error(f"Failed to scrape article #{idx} ({url}): {e}")
+
+                            if not fetched:
+                                # The page may be mid-navigation or crashed; start clean.
+                                if page is not None:
+                                    try:
+                                        await page.close()
+                                    except Exception:
+                                        pass
+                                page = None
+            finally:
+                if shared is not None:
+                    shared.settle(key, item, before, fetched)
+            if fetched:
+                stats["fetched"] += 1
+
+        if page is not None:
+            # A crashed or already closed page must not fail the other workers.
+            try:
+                await page.close()
+            except Exception as e:
+                logger.warning(f"Failed to close article page: {e}")
+
+    workers = min(concurrency, queue.qsize())
+    if workers:
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+    logger.info(
+        f"Article fetch done: {stats['fetched']} fetched, "
+        f"{stats['failed']} failed, {stats['timed_out']} timed out "
+        f"({stats['via_http']} without the browser, {stats['shared']} from sibling regions, "
+        f"{stats['known']} already captured)"
+    )
+    return stats
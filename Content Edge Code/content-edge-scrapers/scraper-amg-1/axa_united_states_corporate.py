@@ -1,12 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
-from typing_extensions import type_repr
 from dateutil import parser
 import re 
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 
 site = "AXA Investment Managers"
@@ -40,39 +41,7 @@ class AxaScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                        ])
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                     )
@@ -96,14 +65,15 @@ class AxaScraper:
 
             # Step 1: Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            # Accept cookies if the OneTrust button exists
-            try:
-                logger.info("Confirming ")
-                await page.get_by_role("link", name="Confirm & continue").click()
-            except Exception as e:
-                logger.info(f"Error during confirming: {e}")
+            with run_report.span("consent"):
+                # Accept cookies if the OneTrust button exists
+                try:
+                    logger.info("Confirming ")
+                    await page.get_by_role("link", name="Confirm & continue").click()
+                except Exception as e:
+                    logger.info(f"Error during confirming: {e}")
 
             while True: #loop for loading insights 
                 cards= await page.locator("#insight-search-block--results .bk-article-card").all()
@@ -155,51 +125,47 @@ class AxaScraper:
             # Step 5: Visit each article
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
 
             return self.items
     async def scrape_article_pages(self, context):
         logger.debug("DEBUG: Starting to scrape individual articles")
-        for item in self.items:
-            url = item["article_url"]
-            #logger.debug(f"url:{url}")
-            if not url:
-                continue
+        await fetch_articles(context, self.items, self.scrape_article)
 
-            # Skip PDFs
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        #logger.debug(f"url:{url}")
+        if not url:
+            return
 
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        # Skip PDFs
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-                # Extract full content text
-                paragraphs = await page.locator(".main-content").all_text_contents()
-                full_text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = full_text
-                logger.debug(f"Succesfully scraped url:{url}")
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
 
-            except Exception as e:
-                logger.error(f"ERROR: Failed to scrape {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+            # Extract full content text
+            paragraphs = await page.locator(".main-content").all_text_contents()
+            full_text = " ".join(p.strip() for p in paragraphs if p.strip())
+            item["article_content"] = full_text
+            logger.debug(f"Succesfully scraped url:{url}")
+
+        except Exception as e:
+            logger.error(f"ERROR: Failed to scrape {url}: {e}")
+            item["article_content"] = None
 
 
 async def AxaUSCO(target_date):
     url = "https://www.axa-im-usa.com/investment-institute"
     scraper = AxaScraper(target_date)
     results = await scraper.scrape(url)
-    output_path=f"/tmp/{company_site_id}.json"
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f" Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
@@ -1,12 +1,14 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
-from typing_extensions import type_repr
 from dateutil import parser
 import re 
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from card_extraction import extract_cards
+from scrape_output import write_debug_output
 
 
 site = "BlackRock"
@@ -16,6 +18,15 @@ country = "United States"
 role = "Financial Professional"
 BASE_URL="https://www.blackrock.com"
 
+# Listing card fields, read in one round trip per page.
+CARD_FIELDS = {
+    "date": (".publication-date", "inner_text"),
+    "tags": (".eyebrow-text", "inner_text"),
+    "title": ("h3.item-title", "inner_text"),
+    "description": ("p.item-description", "inner_text"),
+    "href": ("a", "href"),
+}
+
 def extract_date(text):
     pattern = r"\b([A-Za-z]{3,9}\s+\d{1,2}\s*,?\s*\d{4})\b"
     match = re.search(pattern, text)
@@ -39,39 +50,7 @@ class BlackRockScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                        ])
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                     )
@@ -95,55 +74,50 @@ class BlackRockScraper:
 
             # Step 1: Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
-
-            # Accept cookies if the OneTrust button exists
-            cookie_button = page.locator("#onetrust-accept-btn-handler")
-
-            if await cookie_button.count() > 0:
-                try:
-                    await cookie_button.click(timeout=3000)
-                    logger.info("✓ Cookies accepted")
-                except Exception:
-                    print("Cookie button existed but could not click")
-            else:
-                logger.info("✓ No cookie banner found")
+            await wait_until_ready(page, self.sleep_time)
+
+            with run_report.span("consent"):
+                # Accept cookies if the OneTrust button exists
+                cookie_button = page.locator("#onetrust-accept-btn-handler")
+
+                if await cookie_button.count() > 0:
+                    try:
+                        await cookie_button.click(timeout=3000)
+                        logger.info("✓ Cookies accepted")
+                    except Exception:
+                        print("Cookie button existed but could not click")
+                else:
+                    logger.info("✓ No cookie banner found")
 
 
             while True: #loop for loading insights 
-                cards= await page.locator(".blk-ac-item-card").all()
-                last_card=cards[-1]
-                raw_date= await last_card.locator(".publication-date").inner_text()
-                date_text=extract_date(raw_date)
-                last_date= parser.parse(date_text.split("|")[0]).date()
+                dates = await extract_cards(page, ".blk-ac-item-card", {"date": (".publication-date", "inner_text")})
+                date_text = extract_date(dates[-1]["date"] or "")
+                last_date = parser.parse(date_text.split("|")[0]).date()
                 if last_date >= self.target_date:
                     await page.get_by_role("button", name="Load more").click()
-                    await asyncio.sleep(5)
+                    await wait_until_ready(page, 5, count_selector=".blk-ac-item-card", previous_count=len(dates))
                     logger.info("Clicking Load more")
                 else:
                     logger.info("Last date older than Target date")
                     break 
 
             await page.wait_for_selector(".blk-ac-item-card", timeout=15000)
-            cards = await page.locator(".blk-ac-item-card").all()
+            cards = await extract_cards(page, ".blk-ac-item-card", CARD_FIELDS)
             logger.debug(f"DEBUG: Found {len(cards)} articles")
             for idx, card in enumerate(cards, start=1):
                 try:
-                    raw_date = await card.locator(".publication-date").inner_text()
-                    date_text= extract_date(raw_date)
+                    date_text = extract_date(card["date"])
                     date = parser.parse(date_text.split("|")[0]).date()
                 except Exception:
                     date = ""
 
-                try:
-                    tag_text = await card.locator(".eyebrow-text").inner_text()
-                    tag = [x.strip() for x in tag_text.split("|")] if tag_text else []
-                except Exception:
-                    tag = []
+                tag_text = card["tags"]
+                tag = [x.strip() for x in tag_text.split("|")] if tag_text else []
 
-                title = await card.locator("h3.item-title").inner_text() or ""
-                description = await card.locator("p.item-description").inner_text() or ""
-                href = await card.locator("a").first.get_attribute("href")
+                title = card["title"] or ""
+                description = card["description"] or ""
+                href = card["href"]
                 slug = href.rstrip("/").split("/")[-1] if href else None
                 logger.debug(f"DEBUG: Article #{idx}: {title[:50]}...")
 
@@ -165,51 +139,47 @@ class BlackRockScraper:
             # Step 5: Visit each article
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             return [i for i in self.items if i["article_date"] and parser.parse(i["article_date"]).date() >= self.target_date]
 
     async def scrape_article_pages(self, context):
         logger.debug("DEBUG: Starting to scrape individual articles")
-        for item in self.items:
-            url = item["article_url"]
-            #logger.debug(f"url:{url}")
-            if not url:
-                continue
+        await fetch_articles(context, self.items, self.scrape_article)
 
-            # Skip PDFs
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        #logger.debug(f"url:{url}")
+        if not url:
+            return
 
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        # Skip PDFs
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-                # Extract full content text
-                paragraphs = await page.locator("p").all_text_contents()
-                full_text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = full_text
-                logger.debug(f"Succesfully scraped url:{url}")
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
+
+            # Extract full content text
+            paragraphs = await page.locator("p").all_text_contents()
+            full_text = " ".join(p.strip() for p in paragraphs if p.strip())
+            item["article_content"] = full_text
+            logger.debug(f"Succesfully scraped url:{url}")
 
-            except Exception as e:
-                logger.error(f"ERROR: Failed to scrape {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+        except Exception as e:
+            logger.error(f"ERROR: Failed to scrape {url}: {e}")
+            item["article_content"] = None
 
 
 async def BlackRockUSFP(target_date):
     url = "https://www.blackrock.com/us/financial-professionals/insights"
     scraper = BlackRockScraper(target_date)
     results = await scraper.scrape(url)
-    output_path=f"/tmp/{company_site_id}.json"
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f" Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
@@ -1,11 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
 import re
 from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "BNY Mellon Investment Management"
@@ -36,41 +38,7 @@ class BNYMIMScraperUS:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-            headless=False,
-            args=[
-                "--disable-gpu",
-                "--no-sandbox",
-                "--single-process",
-                "--disable-dev-shm-usage",
-                "--no-zygote",
-                "--disable-setuid-sandbox",
-                "--disable-accelerated-2d-canvas",
-                "--disable-dev-shm-usage",
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-background-networking",
-                "--disable-background-timer-throttling",
-                "--disable-client-side-phishing-detection",
-                "--disable-component-update",
-                "--disable-default-apps",
-                "--disable-domain-reliability",
-                "--disable-features=AudioServiceOutOfProcess",
-                "--disable-hang-monitor",
-                "--disable-ipc-flooding-protection",
-                "--disable-popup-blocking",
-                "--disable-prompt-on-repost",
-                "--disable-renderer-backgrounding",
-                "--disable-sync",
-                "--force-color-profile=srgb",
-                "--metrics-recording-only",
-                "--mute-audio",
-                "--no-pings",
-                "--use-gl=swiftshader",
-                "--window-size=1280,1696"
-            ]
-        )
+        async with browser_session(company_site_id, headless=False) as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
@@ -93,25 +61,26 @@ class BNYMIMScraperUS:
             await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
                 # Step 1: Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            # Step 2: Handle disclaimer
-            try:
-                await page.locator("#selector-form-confirm").click(timeout=5000)
-                await page.locator("#im-jurisdiction").click(timeout=5000)
-                await page.get_by_role("button", name="Proceed").click()
-                logger.debug("Disclaimer accepted successfully")
-                await asyncio.sleep(self.sleep_time)
-            except Exception as e:
-                logger.warning(f"Disclaimer skipped or not present: {e}")
+            with run_report.span("consent"):
+                # Step 2: Handle disclaimer
+                try:
+                    await page.locator("#selector-form-confirm").click(timeout=5000)
+                    await page.locator("#im-jurisdiction").click(timeout=5000)
+                    await page.get_by_role("button", name="Proceed").click()
+                    logger.debug("Disclaimer accepted successfully")
+                    await wait_until_ready(page, self.sleep_time)
+                except Exception as e:
+                    logger.warning(f"Disclaimer skipped or not present: {e}")
 
-            # Step 3: Close cookie banner
-            try:
-                await page.locator("#onetrust-close-btn-container").click(timeout=5000)
-                logger.debug("Cookie banner closed")
-                await asyncio.sleep(1)
-            except Exception as e:
-                logger.warning(f"Cookie banner not found: {e}")
+                # Step 3: Close cookie banner
+                try:
+                    await page.locator("#onetrust-close-btn-container").click(timeout=5000)
+                    logger.debug("Cookie banner closed")
+                    await asyncio.sleep(1)
+                except Exception as e:
+                    logger.warning(f"Cookie banner not found: {e}")
 
             # Step 4: Collect all article cards
             try:
@@ -122,7 +91,7 @@ class BNYMIMScraperUS:
                 logger.info(f"Found {len(cards)} article cards on the page")
             except Exception as e:
                 logger.error(f"Could not find article cards: {e}")
-                await browser.close()
+                await context.close()
                 return []
 
             # Step 5: Extract article summaries
@@ -168,7 +137,7 @@ class BNYMIMScraperUS:
             # Step 6: Scrape article pages for content
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             logger.info(f"Finished scraping {len(self.items)} total articles")
             self.items = [item for item in self.items if item["article_content"]]
             return self.items
@@ -191,7 +160,7 @@ class BNYMIMScraperUS:
 
             try:
                 await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
 
                 # Extract article content
                 content_el = await page.locator("div.cmp-text.wysiwyg").all_text_contents()
@@ -248,13 +217,10 @@ async def BNYMIMUSFA(target_date):
         scraper = BNYMIMScraperUS(target_date)
         results = await scraper.scrape(url)
 
-        output_path=f"/tmp/{company_site_id}.json"
-
-        with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} U.S. articles after {target_date}")
-        return 200
+        return results
     except Exception as error:
         logger.error(f"Error: {error}")
         return 500
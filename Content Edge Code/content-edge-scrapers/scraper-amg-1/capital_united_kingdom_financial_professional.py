@@ -1,9 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "Capital Group"
@@ -32,40 +35,7 @@ class CapitalScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper for: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                    ]
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -74,14 +44,15 @@ class CapitalScraper:
 
             # Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            # Disclaimer
-            try:
-                await page.locator("#attestationAccept").click(timeout=2000)
-                logger.debug("Accepted disclaimer")
-            except:
-                logger.debug("No disclaimer found")
+            with run_report.span("consent"):
+                # Disclaimer
+                try:
+                    await page.locator("#attestationAccept").click(timeout=2000)
+                    logger.debug("Accepted disclaimer")
+                except:
+                    logger.debug("No disclaimer found")
 
             # Pagination loop (BNY Mellon logic copied)
             while True:
@@ -107,7 +78,7 @@ class CapitalScraper:
                     if await load_btn.count() > 0:
                         logger.info("Clicking Load More")
                         await load_btn.first.click()
-                        await asyncio.sleep(self.sleep_time)
+                        await wait_until_ready(page, self.sleep_time)
                     else:
                         logger.info("Load More not found â€” scrolling...")
                         await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
@@ -116,7 +87,7 @@ class CapitalScraper:
                         if await load_btn.count() > 0:
                             logger.info("Load More appeared after scroll â€” clicking")
                             await load_btn.first.click()
-                            await asyncio.sleep(self.sleep_time)
+                            await wait_until_ready(page, self.sleep_time)
                         else:
                             logger.info("No more Load More button â€” stopping")
                             break
@@ -169,52 +140,47 @@ class CapitalScraper:
                 self.items.append(item)
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
             return self.items
 
     async def scrape_article_pages(self, context):
         logger.debug("Scraping individual articles...")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-        for item in self.items:
-            url = item["article_url"]
-            if not url:
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
 
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
 
-                await page.wait_for_selector(".text", timeout=5000)
+            await page.wait_for_selector(".text", timeout=5000)
 
-                paragraphs = await page.locator(".text p").all_text_contents()
+            paragraphs = await page.locator(".text p").all_text_contents()
 
-                full_text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = full_text
-                logger.debug(f"Succesfully scrape :{url}")
+            full_text = " ".join(p.strip() for p in paragraphs if p.strip())
+            item["article_content"] = full_text
+            logger.debug(f"Succesfully scrape :{url}")
 
-            except Exception as e:
-                logger.error(f"Failed to scrape {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+        except Exception as e:
+            logger.error(f"Failed to scrape {url}: {e}")
+            item["article_content"] = None
 
 
 async def CapitalUKFP(target_date):
     url = "https://www.capitalgroup.com/intermediaries/gb/en/insights.html"
     scraper = CapitalScraper(target_date)
     results = await scraper.scrape(url)
-    output_path=f"/tmp/{company_site_id}.json"
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f" Scraped {len(results)} articles after {target_date}")
-    return 200 
+    return results
 
 
 if __name__ == "__main__":
@@ -1,12 +1,11 @@
 import asyncio
-import json
 import logging
 import sys
-import re
-from datetime import datetime
-from typing import Awaitable
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "Capital Group"    
@@ -34,40 +33,7 @@ class CapitalScaper:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                        ]
-        )
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
@@ -104,75 +70,71 @@ class CapitalScaper:
                 if parser.parse(self.items[-1]["article_date"]).date() >= self.target_date :
                     logger.info("Clicking Next Button")
                     await page.get_by_role("button", name="Next").click()
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(page, self.sleep_time)
                     continue
                 else:
                     logger.info("No Pagination needed ")
                     break
 
-            await browser.close()
+            await context.close()
             return [i for i in self.items if i["article_date"] and parser.parse(i["article_date"]).date()>= self.target_date]
 
 
 
     async def scrape_article_pages(self,context):
         logger.debug("DEBUG: Starting to scrape individual articles")
-        for item in self.items:
-            #Add article date from url locator(cmp-articleDate)
-            url = item["article_url"]
-            #logger.debug(f"url:{url}")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-            if not url or item["article_content"]:
-                continue
+    async def scrape_article(self, page, item):
+        #Add article date from url locator(cmp-articleDate)
+        url = item["article_url"]
+        #logger.debug(f"url:{url}")
 
-            # Skip PDFs
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+        if not url or item["article_content"]:
+            return
 
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-                
-                date=await page.locator(".cmp-articleDate").text_content()
-                article_date=parser.parse(date, fuzzy=True).date()
-                item["article_date"]=article_date
-                if article_date <self.target_date:
-                    item["article_date"]=str(article_date)
-                    logger.info("Skippping : article older than target date")
-                    continue
+        # Skip PDFs
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-                # Extract full content text
-                date_text= await page.locator(".datedisplay").text_content()
-            
-                date= parser.parse(date_text, fuzzy= True).date()
-                if date < self.target_date:
-                    continue
-                paragraphs = await page.locator(".text p").all_text_contents()
-                full_text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = full_text
-                item["article_date"]= str(date)
-                logger.debug(f"Succesfully scraped url:{url}")
-
-            except Exception as e:
-                logger.error(f"ERROR: Failed to scrape {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
+
+            date=await page.locator(".cmp-articleDate").text_content()
+            article_date=parser.parse(date, fuzzy=True).date()
+            item["article_date"]=article_date
+            if article_date <self.target_date:
+                item["article_date"]=str(article_date)
+                logger.info("Skippping : article older than target date")
+                return
+
+            # Extract full content text
+            date_text= await page.locator(".datedisplay").text_content()
+
+            date= parser.parse(date_text, fuzzy= True).date()
+            if date < self.target_date:
+                return
+            paragraphs = await page.locator(".text p").all_text_contents()
+            full_text = " ".join(p.strip() for p in paragraphs if p.strip())
+            item["article_content"] = full_text
+            item["article_date"]= str(date)
+            logger.debug(f"Succesfully scraped url:{url}")
+
+        except Exception as e:
+            logger.error(f"ERROR: Failed to scrape {url}: {e}")
+            item["article_content"] = None
 
 # Final Scraper 
 async def CapitalUSFP(target_date):
     url="https://www.capitalgroup.com/advisor/insights.html"
     scraper =CapitalScaper(target_date)
     results = await scraper.scrape(url)
-    output_path=f"/tmp/{company_site_id}.json"
-
-    with open(output_path ,"w", encoding="utf-8") as f:
-        json.dump(results ,f , indent=4 , ensure_ascii=False)
+    write_debug_output(company_site_id, results)
     logger.info(f"Scraped {len(results)} articles after {target_date}")
 
-    return 200
+    return results
     
 
 if __name__=="__main__":
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from date_parsing import parse_date
+from paged_listing import PAGE_CONCURRENCY, PagedListing
+
+logger = logging.getLogger("COVEO_LISTING")
+
+# Search calls made by Coveo JSUI / Coveo for Sitecore / Coveo Headless pages.
+SEARCH_PATH_RE = re.compile(r"/rest/search(?:/v\d+)?/?$")
+# Headers worth replaying; cookies come from the browser context itself.
+REPLAYED_HEADERS = {"authorization", "content-type", "accept"}
+MAX_PAGES = 200
+# Set COVEO_API=0 to make scrapers page through the rendered listing instead
+# (the offline benchmarks do, as these calls bypass the browser's routing).
+COVEO_API_ENABLED = os.getenv("COVEO_API", "1") != "0"
+
+
+class CoveoSearchCapture:
+    """
+    Records the first Coveo search request a listing page makes.
+
+    Attach it before ``page.goto`` so the request the page fires on load is
+    seen; ``request`` stays None if the page never searched.
+    """
+
+    def __init__(self, page):
+        self.request = None
+        page.on("request", self._on_request)
+
+    def _on_request(self, request):
+        if self.request is None and request.method == "POST" and SEARCH_PATH_RE.search(urlparse(request.url).path):
+            self.request = request
+            logger.debug(f"Captured Coveo search request: {request.url}")
+
+
+def result_date(result, date_field):
+    """Publication date of a Coveo result from ``raw[date_field]`` (epoch ms or text)."""
+    raw = result.get("raw", {})
+    value = raw.get(date_field) or raw.get("date") or result.get("date")
+    if value in (None, ""):
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value / 1000, tz=timezone.utc).date()
+        return parse_date(value)
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+class CoveoListing:
+    """
+    Replays a listing page's own Coveo search call to page through results
+    as JSON, newest first, instead of rendering each results page.
+    """
+
+    def __init__(self, context, url, headers, body, sort_criteria=None, page_size=None):
+        self.context = context
+        self.url = url
+        self.headers = {k: v for k, v in headers.items() if k.lower() in REPLAYED_HEADERS}
+        try:
+            self._json_body = json.loads(body or "{}")
+            self._form_body = None
+            original = self._json_body
+        except ValueError:
+            self._json_body = None
+            self._form_body = dict(parse_qsl(body or "", keep_blank_values=True))
+            original = self._form_body
+        # Default to the sort and page size the page itself asked for.
+        self.sort_criteria = sort_criteria or original.get("sortCriteria")
+        self.page_size = int(page_size or original.get("numberOfResults") or 10)
+
+    @classmethod
+    async def from_request(cls, context, request, sort_criteria=None, page_size=None):
+        headers = await request.all_headers()
+        return cls(context, request.url, headers, request.post_data, sort_criteria, page_size)
+
+    def _body(self, first_result):
+        params = {"firstResult": first_result, "numberOfResults": self.page_size}
+        if self.sort_criteria:
+            params["sortCriteria"] = self.sort_criteria
+        if self._json_body is not None:
+            return json.dumps({**self._json_body, **params})
+        return urlencode({**self._form_body, **{k: str(v) for k, v in params.items()}})
+
+    async def search(self, first_result=0):
+        """One page of results starting at ``first_result``."""
+        if not COVEO_API_ENABLED:
+            raise RuntimeError("Coveo search API switched off (COVEO_API=0)")
+        response = await self.context.request.post(
+            self.url, headers=self.headers, data=self._body(first_result), timeout=30000
+        )
+        if not response.ok:
+            raise RuntimeError(f"Coveo search returned HTTP {response.status}")
+        return await response.json()
+
+    async def results_since(self, target_date, date_field, concurrency=PAGE_CONCURRENCY):
+        """
+        Every result dated on or after ``target_date``, as ``(result, date)``.
+
+        Pages are requested in the listing's sort order. The last page that
+        reaches back to ``target_date`` is found by probing (see
+        paged_listing.PagedListing) and the pages before it are requested
+        ``concurrency`` at a time.
+        """
+        async def fetch_page(page_no):
+            payload = await self.search(page_no * self.page_size)
+            results = payload.get("results", [])
+            logger.info(f"Coveo page {page_no + 1}: {len(results)} results (total {payload.get('totalCount')})")
+            return [(result, result_date(result, date_field)) for result in results]
+
+        listing = PagedListing(fetch_page, target_date, first_page=0, max_pages=MAX_PAGES, concurrency=concurrency)
+        return await listing.results_since()
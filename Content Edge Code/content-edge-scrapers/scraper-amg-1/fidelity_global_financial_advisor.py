@@ -1,12 +1,13 @@
 import asyncio
-from asyncio.timeouts import timeout
-import json
 import logging
 import sys
-from datetime import datetime
 from dateutil import parser
 
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from listing_boundary import ListingBoundary
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 
 site ="Fidelity International"
@@ -34,39 +35,7 @@ class FidelityScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                        ])
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                     )
@@ -90,26 +59,22 @@ class FidelityScraper:
 
             # Step 1: Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
-
+            await wait_until_ready(page, self.sleep_time)
+
+            # Date of the last loaded card from the listing or the article's
+            # metadata; its page is only rendered when neither has one
+            boundary = ListingBoundary(
+                context, self.target_date, site=company_site_id,
+                article_date_selector=".fxd-byline__date",
+                clean=lambda text: text.split(":")[-1].strip(),
+            )
             while True:
 
                 cards=await page.locator(".fxd-vCard").all()
                 last_card=cards[-1]
                 href=await last_card.locator("a").get_attribute("href")
                 last_url= href if href.startswith("http") else BASE_URL+href 
-                last_page= await context.new_page()
-                
-                await last_page.goto(last_url,timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-
-                try:
-                    date_text = (await last_page.locator(".fxd-byline__date").inner_text()).split(":")[-1].strip()
-                except:
-                    date_text=str(self.target_date)
-                await last_page.close()
-                last_date= parser.parse(date_text,fuzzy=True).date()
-                if last_date < self.target_date:
+                if await boundary.reached(last_url, card=last_card, page=page):
                     break
                 else:
                     await page.get_by_text("Load More", exact=True).click()
@@ -149,53 +114,49 @@ class FidelityScraper:
 
     async def scrape_article_pages(self,context):
         logger.debug("DEBUG: Starting to scrape individual articles")
-        for item in self.items:
-            url = item["article_url"]
-            #logger.debug(f"url:{url}")
-            if not url:
-                continue
+        await fetch_articles(context, self.items, self.scrape_article)
 
-            # Skip PDFs
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        #logger.debug(f"url:{url}")
+        if not url:
+            return
+
+        # Skip PDFs
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
+
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
 
-            page = await context.new_page()
             try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-
-                try:
-                    date_text = (await page.locator("div.fxd-byline__date").inner_text()).split(":")[-1].strip()
-                    date = parser.parse(date_text, fuzzy=True).date()
-                    if date<self.target_date:
-                        continue
-                except: 
-                    date_text=""
-                item["article_date"]=date_text
-
-                # Extract full content text
-                paragraphs = await page.locator("p").all_text_contents()
-                full_text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = full_text
-                logger.debug(f"Succesfully scraped url:{url}")
-
-            except Exception as e:
-                logger.error(f"ERROR: Failed to scrape {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+                date_text = (await page.locator("div.fxd-byline__date").inner_text()).split(":")[-1].strip()
+                date = parser.parse(date_text, fuzzy=True).date()
+                if date<self.target_date:
+                    return
+            except: 
+                date_text=""
+            item["article_date"]=date_text
+
+            # Extract full content text
+            paragraphs = await page.locator("p").all_text_contents()
+            full_text = " ".join(p.strip() for p in paragraphs if p.strip())
+            item["article_content"] = full_text
+            logger.debug(f"Succesfully scraped url:{url}")
+
+        except Exception as e:
+            logger.error(f"ERROR: Failed to scrape {url}: {e}")
+            item["article_content"] = None
 async def FidelityGlobalFA(target_date):
     url="https://institutional.fidelity.com/advisors/insights/topics"
     scraper=FidelityScraper(target_date)
     results= await scraper.scrape(url)
-    output_path =f"/tmp/{company_site_id}.json"
-
-    with open(output_path,"w",encoding="utf-8") as f:
-        json.dump(results,f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 if __name__=="__main__":
     target_date=sys.argv[1] if len(sys.argv) >1 else "2025-12-01"
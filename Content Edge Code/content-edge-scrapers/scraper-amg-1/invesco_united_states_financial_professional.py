@@ -1,10 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from article_fetch import fetch_articles
+import run_report
+from section_crawl import discover_sections
 
 # --- Site metadata ---
 site = "Invesco"
@@ -43,56 +46,33 @@ class InvescoScraperUSFP:
         self.target_date = parser.parse(target_date, fuzzy=True).date()
         self.sleep_time = sleep_time
 
-    async def scrape(self, url: str):
-        logger.info(f"Starting scraper for URL: {url}")
+    async def scrape(self, urls):
+        """
+        Expand every topic page in parallel, then fetch each distinct article once.
+        """
+        logger.info(f"Starting scraper for {len(urls)} topic pages")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--disable-dev-shm-usage",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent=(
                     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) ""AppleWebKit/537.36 (KHTML, like Gecko) ""Chrome/91.0.4472.124 Safari/537.36"))
-            page = await context.new_page()
-            await page.goto(url, timeout=60000)
+            items = await discover_sections(context, urls, self.scrape_section)
+            await self.scrape_article_pages(context, items)
+
+            await context.close()
+            logger.info(f"Finished scraping {len(items)} articles")
+            return items
+
+    async def scrape_section(self, page, url):
+        await page.goto(url, timeout=60000)
+        with run_report.span("consent"):
             try:
                 await page.get_by_role("button", name="Financial Professional").click()
                 logger.debug("Clicked Financial Professional")
             except :
                 logger.debug("Failed To click button")
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
             try:
                 cookie_accept = page.get_by_role("button", name="Accept")
                 if await cookie_accept.is_visible():
@@ -101,16 +81,12 @@ class InvescoScraperUSFP:
                     logger.debug("Cookie banner closed")
             except Exception as e:
                 logger.debug(f"No cookie banner handled: {e}")
-            try:
-                await page.wait_for_selector("article.content-card", state="attached", timeout=20000)
-            except Exception as e:
-                logger.error(f"No article cards found on page: {e}")
-            await self.load_all_cards(page)
-            items = await self.scrape_listing(page, context)
-
-            await browser.close()
-            logger.info(f"Finished scraping {len(items)} articles from: {url}")
-            return items
+        try:
+            await page.wait_for_selector("article.content-card", state="attached", timeout=20000)
+        except Exception as e:
+            logger.error(f"No article cards found on page: {e}")
+        await self.load_all_cards(page)
+        return await self.scrape_listing(page)
     async def get_last_card_date(self, page):
         """
         Return the date of the last (oldest) visible card, or None if not parseable.
@@ -165,7 +141,7 @@ class InvescoScraperUSFP:
                 logger.info(f"Load More button not clickable or missing; stopping pagination. {e}")
                 break
         logger.debug("Finished pagination loop.")
-    async def scrape_listing(self, page, context):
+    async def scrape_listing(self, page):
         """
         Scrape all currently loaded article cards on the listing page.
         Skip cards whose date < target_date.
@@ -237,74 +213,61 @@ class InvescoScraperUSFP:
                     }
                 )
             logger.info(f"Collected {len(items)} listing items (before article page scraping).")
-            await self.scrape_article_pages(context, items)
         except Exception as e:
             logger.error(f"Error scraping listing page: {e}")
         return items
     async def scrape_article_pages(self, context, items):
         logger.debug("Starting to scrape individual article pages...")
-        page = await context.new_page()
-        for idx, item in enumerate(items, start=1):
+        for item in items:
             url = item.get("article_url")
-            if not url:
-                continue
-            if url.lower().endswith(".pdf"):
+            if url and url.lower().endswith(".pdf"):
                 item["article_content"] = url
-                logger.debug(f"#{idx}: Skipped PDF -> {url}")
-                continue
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-                try:
-                    content_blocks = await page.locator(
-                        ".rich-text-editor, .rich-text-editor__inner"
-                    ).all_text_contents()
-                    full_text = " ".join(
-                        t.strip() for t in content_blocks if t and t.strip()
-                    ).strip()
-                    item["article_content"] = full_text if full_text else None
-                except Exception as e:
-                    logger.error(f"Error getting content for article #{idx}: {e}")
-                    item["article_content"] = None
-                try:
-                    tag_texts = await page.locator(".content-card__eyebrow").all_text_contents()
-                    tags = [t.strip() for t in tag_texts if t and t.strip()]
-                    item["article_tags"] = tags
-                except Exception as e:
-                    logger.error(f"Error getting tags for article #{idx}: {e}")
-                    item["article_tags"] = []
-                logger.debug(
-                    f"Scraped article #{idx}: "
-                    f"{(item.get('article_title') or '')[:60]} "
-                    f"URL: {url}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx} ({url}): {e}")
-        await page.close()
+                logger.debug(f"Skipped PDF -> {url}")
+        await fetch_articles(
+            context,
+            [item for item in items if item["article_content"] is None],
+            self.scrape_article,
+        )
         logger.debug("Finished scraping individual article pages.")
 
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        await page.goto(url, timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
+        try:
+            content_blocks = await page.locator(
+                ".rich-text-editor, .rich-text-editor__inner"
+            ).all_text_contents()
+            full_text = " ".join(
+                t.strip() for t in content_blocks if t and t.strip()
+            ).strip()
+            item["article_content"] = full_text if full_text else None
+        except Exception as e:
+            logger.error(f"Error getting content for article {url}: {e}")
+            item["article_content"] = None
+        try:
+            tag_texts = await page.locator(".content-card__eyebrow").all_text_contents()
+            tags = [t.strip() for t in tag_texts if t and t.strip()]
+            item["article_tags"] = tags
+        except Exception as e:
+            logger.error(f"Error getting tags for article {url}: {e}")
+            item["article_tags"] = []
+        logger.debug(
+            f"Scraped article: "
+            f"{(item.get('article_title') or '')[:60]} "
+            f"URL: {url}"
+        )
+
 async def InvescoUSFP(target_date: str):
-    results = []
     try:
-        for url in URL_LIST:
-            scraper = InvescoScraperUSFP(target_date)
-            items = await scraper.scrape(url)
-            results.extend(items)
-        unique = {}
-        for item in results:
-            key = item.get("article_url") or item.get("article_slug")
-            if key and key not in unique:
-                unique[key] = item
-        final_results = list(unique.values())
+        scraper = InvescoScraperUSFP(target_date)
+        final_results = await scraper.scrape(URL_LIST)
         logger.info(
             f"Total unique Invesco USFP articles after target_date filter: {len(final_results)}"
         )
 
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(final_results, f, indent=4, ensure_ascii=False)
-        logger.info(f"Saved results to {output_path}")
-        return 200
+        write_debug_output(company_site_id, final_results)
+        return final_results
     except Exception as error:
         logger.error(f"Error in InvescoUSFP: {error}")
         return 500
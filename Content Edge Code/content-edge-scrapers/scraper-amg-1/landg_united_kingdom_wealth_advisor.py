@@ -1,12 +1,14 @@
 import asyncio
-from asyncio.timeouts import timeout
-import json
 import logging
 import sys
 from dateutil import parser
 import random
 
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 
 site ="Legal & General Investment Management"
@@ -34,39 +36,7 @@ class LANDGScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                    headless=False,
-                    args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                        ])
+        async with browser_session(company_site_id, headless=False) as browser:
             context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                     )
@@ -81,14 +51,15 @@ class LANDGScraper:
 
             # Step 1: Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
-            try:
-                await page.get_by_role("button", name="Accept all cookies (").click()
-                await page.get_by_role("tabpanel", name="United Kingdom").locator("svg").click()
-                await page.get_by_role("button", name="Accept").click()
-                logger.info("Accepting Cookies and Disclaimer")
-            except :
-                logger.info("Error Accepting")
+            await wait_until_ready(page, self.sleep_time)
+            with run_report.span("consent"):
+                try:
+                    await page.get_by_role("button", name="Accept all cookies (").click()
+                    await page.get_by_role("tabpanel", name="United Kingdom").locator("svg").click()
+                    await page.get_by_role("button", name="Accept").click()
+                    logger.info("Accepting Cookies and Disclaimer")
+                except :
+                    logger.info("Error Accepting")
             while True:
 
                 cards=await page.locator(".article-card-container").all()
@@ -98,7 +69,7 @@ class LANDGScraper:
                 last_page= await context.new_page()
                 
                 await last_page.goto(last_url,timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(last_page, self.sleep_time)
 
                 try:
                     date_text = await last_page.locator(".article-page__date").inner_text()
@@ -148,55 +119,45 @@ class LANDGScraper:
 
     async def scrape_article_pages(self,context):
         logger.debug("DEBUG: Starting to scrape individual articles")
-        for item in self.items:
-            url = item["article_url"]
-            print(f"Beginning to scrape {url}") 
-            #logger.debug(f"url:{url}")
-            if not url:
-                continue
-
-            # Skip PDFs
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+        await fetch_articles(context, self.items, self.scrape_article)
 
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
 
-                try:
-                    date_text = await page.locator(".article-page__date").inner_text()
-                    date = parser.parse(date_text, fuzzy=True).date()
-                    if date<self.target_date:
-                        break
-                except: 
-                    date=""
+        # Skip PDFs
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
+
+        await page.goto(url, timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
+
+        try:
+            date_text = await page.locator(".article-page__date").inner_text()
+            date = parser.parse(date_text, fuzzy=True).date()
+            if date<self.target_date:
+                # Older than the window; dropped when results are returned.
                 item["article_date"]=str(date)
+                return
+        except: 
+            date=""
+        item["article_date"]=str(date)
+
+        # Extract full content text
+        paragraphs = await page.locator("p").all_text_contents()
+        full_text = " ".join(p.strip() for p in paragraphs if p.strip())
+        item["article_content"] = full_text
+        logger.debug(f"Succesfully scraped url:{url}")
 
-                # Extract full content text
-                paragraphs = await page.locator("p").all_text_contents()
-                full_text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = full_text
-                logger.debug(f"Succesfully scraped url:{url}")
-
-            except Exception as e:
-                logger.error(f"ERROR: Failed to scrape {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
 async def LANDGWMUK(target_date):
     url="https://am.landg.com/en-uk/adviser-wealth/insights/"
     scraper=LANDGScraper(target_date)
     results= await scraper.scrape(url)
     print(results)
-    output_path =f"/tmp/{company_site_id}.json"
-
-    with open(output_path,"w",encoding="utf-8") as f:
-        json.dump(results,f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 if __name__=="__main__":
     target_date=sys.argv[1] if len(sys.argv) >1 else "2025-10-01"
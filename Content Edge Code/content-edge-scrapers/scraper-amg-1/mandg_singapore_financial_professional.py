@@ -4,7 +4,11 @@ import logging
 import sys
 from datetime import date, datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 site = "M&G Investments"
 section = "Insights"
@@ -31,21 +35,21 @@ class MANDGScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-blink-features=AutomationControlled",
-                        "--disable-dev-shm-usage",
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--disable-setuid-sandbox",
-                        "--disable-infobars",
-                        "--window-size=1920,1080",
-                        "--start-maximized",
-                        "--single-process",
-                        "--no-zygote",
-                        ])
+        async with browser_session(
+            company_site_id,
+            args=[
+                "--disable-blink-features=AutomationControlled",
+                "--disable-dev-shm-usage",
+                "--disable-gpu",
+                "--no-sandbox",
+                "--disable-setuid-sandbox",
+                "--disable-infobars",
+                "--window-size=1920,1080",
+                "--start-maximized",
+                "--single-process",
+                "--no-zygote",
+            ],
+        ) as browser:
             context = await browser.new_context(
                 user_agent=(
                     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -57,14 +61,15 @@ class MANDGScraper:
 
             # Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            # Accept terms
-            try:
-                await page.get_by_role("button", name="Accept and continue").click()
-                await page.get_by_role("button", name="Submit").click()
-            except:
-                pass
+            with run_report.span("consent"):
+                # Accept terms
+                try:
+                    await page.get_by_role("button", name="Accept and continue").click()
+                    await page.get_by_role("button", name="Submit").click()
+                except:
+                    pass
 
             # --------------------------
             # Pagination Loop
@@ -126,31 +131,29 @@ class MANDGScraper:
 
     async def scrape_article_pages(self, context):
         logger.debug("DEBUG: Scraping individual articles")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-        for item in self.items:
-            url = item["article_url"]
-            if not url:
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
 
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-            page = await context.new_page()
-            logger.info(f"Scraping {item["article_title"]}")
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        logger.info(f"Scraping {item["article_title"]}")
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
 
-                paragraphs = await page.locator("p").all_text_contents()
-                text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = text
+            paragraphs = await page.locator("p").all_text_contents()
+            text = " ".join(p.strip() for p in paragraphs if p.strip())
+            item["article_content"] = text
 
-            except Exception as e:
-                logger.error(f"Failed to scrape {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+        except Exception as e:
+            logger.error(f"Failed to scrape {url}: {e}")
+            item["article_content"] = None
 
 
 async def MANDGSGFP(target_date):
@@ -158,12 +161,10 @@ async def MANDGSGFP(target_date):
     scraper = MANDGScraper(target_date)
     results = await scraper.scrape(url)
 
-    output_path = f"/tmp/{company_site_id}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+"""
+Compacts a day's or a month's scraper output into partitioned Parquet.
+
+Reads the ``output/website/YYYY/MM/DD/<company_site_id>.*`` objects of the
+period (any format or compression the output writer produces) one at a time
+and writes one Parquet file per date and site under
+``<export prefix>/run_date=YYYY-MM-DD/company_site_id=<id>/articles.parquet``.
+When a site has several outputs for a day (say ``.json`` from before the
+switch to ``.jsonl``), only the newest is exported. Every file is written with
+the same schema (``ARTICLE_SCHEMA``), so the partitioned export reads back as
+one table; fields outside it are kept as a JSON object in the ``extra``
+column. The low-cardinality columns are stored dictionary-encoded. Re-running
+a period overwrites its files, so the job is safe to repeat.
+
+Usage:
+    python parquet_export.py YYYY-MM[-DD] [--bucket BUCKET] [--prefix PREFIX]
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import re
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from date_parsing import parse_date
+from output_writer import get_s3_client, read_items
+
+logger = logging.getLogger("PARQUET_EXPORT")
+
+OUTPUT_PREFIX = "output/website"
+EXPORT_PREFIX = os.getenv("PARQUET_EXPORT_PREFIX", "analytics/articles")
+PARTITION_COLUMNS = ["run_date", "company_site_id"]
+# Few distinct values repeated on every row.
+DICTIONARY_COLUMNS = ["article_source", "company_site_country", "company_site_role", "article_section"]
+ARTICLE_COLUMNS = [
+    "article_source",
+    "company_site_country",
+    "company_site_role",
+    "article_section",
+    "article_title",
+    "article_slug",
+    "article_url",
+    "article_date",
+    "article_description",
+    "article_tags",
+    "article_content",
+]
+# Schema of every Parquet file; the partition columns live in the key.
+COLUMN_TYPES = {
+    "article_date": pa.date32(),
+    "article_tags": pa.list_(pa.string()),
+    **{column: pa.dictionary(pa.int32(), pa.string()) for column in DICTIONARY_COLUMNS},
+}
+ARTICLE_SCHEMA = pa.schema(
+    [pa.field(column, COLUMN_TYPES.get(column, pa.string())) for column in ARTICLE_COLUMNS]
+    + [pa.field("extra", pa.string())]
+)
+
+_OUTPUT_KEY_RE = re.compile(
+    r"(?P<year>\d{4})/(?P<month>\d{2})/(?P<day>\d{2})/(?P<site>[^/.]+)\.jsonl?(?:\.gz|\.zst)?$"
+)
+
+
+def period_prefix(period):
+    """``output/website/YYYY/MM[/DD]/`` for a ``YYYY-MM`` or ``YYYY-MM-DD`` period."""
+    parts = period.split("-")
+    if len(parts) not in (2, 3) or not all(part.isdigit() for part in parts):
+        raise ValueError(f"Period must be YYYY-MM or YYYY-MM-DD, got {period!r}")
+    return f"{OUTPUT_PREFIX}/{'/'.join(parts)}/"
+
+
+def list_output_keys(client, bucket, prefix):
+    """
+    Output object keys under ``prefix`` with their run date and site id,
+    sorted by date and site. A site with more than one output for a day
+    contributes only its most recently written one.
+    """
+    newest, token = {}, None
+    while True:
+        kwargs = {"Bucket": bucket, "Prefix": prefix}
+        if token:
+            kwargs["ContinuationToken"] = token
+        response = client.list_objects_v2(**kwargs)
+        for entry in response.get("Contents", []):
+            match = _OUTPUT_KEY_RE.search(entry["Key"])
+            if not match:
+                continue
+            partition = (f"{match['year']}-{match['month']}-{match['day']}", match["site"])
+            rank = (entry.get("LastModified") or "", entry["Key"])
+            if partition not in newest or rank > newest[partition][0]:
+                if partition in newest:
+                    logger.info(f"Skipping {newest[partition][1]}, superseded by {entry['Key']}")
+                newest[partition] = (rank, entry["Key"])
+            else:
+                logger.info(f"Skipping {entry['Key']}, superseded by {newest[partition][1]}")
+        if not response.get("IsTruncated"):
+            break
+        token = response["NextContinuationToken"]
+    return [(key, run_date, site) for (run_date, site), (_, key) in sorted(newest.items())]
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _as_string(value):
+    if _missing(value):
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _as_tags(value):
+    if _missing(value):
+        return None
+    if isinstance(value, (list, tuple)):
+        return [str(tag) for tag in value if not _missing(tag)]
+    return [str(value)]
+
+
+def _as_date(value):
+    if _missing(value) or value == "":
+        return None
+    return parse_date(value, fuzzy=False, relative=False)
+
+
+CONVERTERS = {"article_date": _as_date, "article_tags": _as_tags}
+
+
+def to_row(item):
+    """
+    An output item as a row of ``ARTICLE_SCHEMA``: the article fields
+    converted to their column type, any other fields as a JSON object in
+    ``extra`` with their values as scraped.
+    """
+    row = {column: CONVERTERS.get(column, _as_string)(item.get(column)) for column in ARTICLE_COLUMNS}
+    extra = {
+        name: value for name, value in item.items()
+        if name not in ARTICLE_COLUMNS and name not in PARTITION_COLUMNS and not _missing(value)
+    }
+    row["extra"] = json.dumps(extra, ensure_ascii=False, default=str) if extra else None
+    return row
+
+
+def to_parquet_bytes(items):
+    """Parquet file of a site's articles, written with ``ARTICLE_SCHEMA``."""
+    table = pa.Table.from_pylist([to_row(item) for item in items], schema=ARTICLE_SCHEMA)
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd", use_dictionary=DICTIONARY_COLUMNS)
+    return buffer.getvalue()
+
+
+def export_period(period, bucket, client=None, export_prefix=None):
+    """
+    Write the period's articles as Parquet partitioned by run date and site,
+    one output object in memory at a time.
+
+    Returns:
+        Dict with the number of articles, sites and files written
+    """
+    client = client or get_s3_client()
+    export_prefix = (export_prefix or EXPORT_PREFIX).rstrip("/")
+
+    articles, sites, files = 0, set(), 0
+    for key, run_date, company_site_id in list_output_keys(client, bucket, period_prefix(period)):
+        items = read_items(client.get_object(Bucket=bucket, Key=key)["Body"].read())
+        if not items:
+            continue
+        export_key = f"{export_prefix}/run_date={run_date}/company_site_id={company_site_id}/articles.parquet"
+        body = to_parquet_bytes(items)
+        client.put_object(Bucket=bucket, Key=export_key, Body=body, ContentType="application/vnd.apache.parquet")
+        articles += len(items)
+        sites.add(company_site_id)
+        files += 1
+        logger.info(f"Wrote {len(items)} articles from {key} ({len(body)} bytes) to {export_key}")
+
+    summary = {"period": period, "articles": articles, "sites": len(sites), "files": files}
+    logger.info(f"Parquet export of {period}: {articles} articles, {files} files")
+    return summary
+
+
+def export_handler(event, context):
+    """Lambda entry point: {"period": "YYYY-MM" | "YYYY-MM-DD", "bucket": optional}."""
+    bucket = event.get("bucket") or os.getenv("BUCKET_NAME")
+    try:
+        summary = export_period(event["period"], bucket)
+    except (KeyError, ValueError) as e:
+        return {"statusCode": 400, "body": str(e)}
+    return {"statusCode": 200, **summary}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    arguments = argparse.ArgumentParser(description="Compact scraper output into partitioned Parquet.")
+    arguments.add_argument("period", help="YYYY-MM or YYYY-MM-DD")
+    arguments.add_argument("--bucket", default=os.getenv("BUCKET_NAME"))
+    arguments.add_argument("--prefix", default=EXPORT_PREFIX, help="Parquet key prefix")
+    args = arguments.parse_args()
+    print(export_period(args.period, args.bucket, export_prefix=args.prefix))
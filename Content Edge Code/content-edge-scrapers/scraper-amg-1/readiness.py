@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import time
+import weakref
+
+logger = logging.getLogger("READINESS")
+
+# Quiet windows (ms) that count as "settled".
+NETWORK_QUIET_MS = 500
+DOM_QUIET_MS = 300
+POLL_INTERVAL = 0.05
+
+# Requests that stay open by design and would never let a page go quiet.
+LONG_LIVED_TYPES = {"eventsource", "websocket"}
+
+_DOM_LULL_JS = """
+([quietMs, maxMs]) => new Promise(resolve => {
+    const root = document.documentElement || document;
+    let timer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(() => finish(true), quietMs);
+    });
+    const cap = setTimeout(() => finish(false), maxMs);
+    function finish(settled) {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(cap);
+        resolve(settled);
+    }
+    observer.observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+    timer = setTimeout(() => finish(true), quietMs);
+})
+"""
+
+_COUNT_CHANGED_JS = "([selector, count]) => document.querySelectorAll(selector).length !== count"
+_TEXT_CHANGED_JS = """
+([selector, text]) => {
+    const el = document.querySelector(selector);
+    return !!el && el.textContent !== text;
+}
+"""
+
+
+class NetworkTracker:
+    """
+    In-flight request bookkeeping for one browser context, per page.
+
+    Installed on every context handed out by ``browser_session()`` so that
+    ``wait_for_network_quiet`` can tell when a page has stopped loading, also
+    after a click ("Load more", pagination) and not only after navigation.
+    """
+
+    def __init__(self):
+        self._inflight = weakref.WeakKeyDictionary()
+        self._last_activity = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _page_of(request):
+        try:
+            return request.frame.page
+        except Exception:
+            # Service-worker requests have no frame.
+            return None
+
+    def _on_request(self, request):
+        if request.resource_type in LONG_LIVED_TYPES:
+            return
+        page = self._page_of(request)
+        if page is None:
+            return
+        self._inflight[page] = self._inflight.get(page, 0) + 1
+        self._last_activity[page] = time.monotonic()
+
+    def _on_done(self, request):
+        if request.resource_type in LONG_LIVED_TYPES:
+            return
+        page = self._page_of(request)
+        if page is None or page not in self._inflight:
+            return
+        self._inflight[page] = max(0, self._inflight[page] - 1)
+        self._last_activity[page] = time.monotonic()
+
+    def install(self, context):
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_done)
+        context.on("requestfailed", self._on_done)
+        _trackers[context] = self
+        return self
+
+    def is_quiet(self, page, quiet_ms=NETWORK_QUIET_MS):
+        if self._inflight.get(page, 0) > 0:
+            return False
+        last = self._last_activity.get(page)
+        return last is None or (time.monotonic() - last) * 1000 >= quiet_ms
+
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+def track_network(context):
+    """Start tracking in-flight requests for every page of ``context``."""
+    return NetworkTracker().install(context)
+
+
+def _remaining(deadline):
+    return max(0.0, deadline - time.monotonic())
+
+
+async def wait_for_network_quiet(page, timeout, quiet_ms=NETWORK_QUIET_MS):
+    """Wait until ``page`` has had no request in flight for ``quiet_ms``. Returns False on timeout."""
+    if timeout <= 0:
+        return False
+    deadline = time.monotonic() + timeout
+    tracker = _trackers.get(page.context)
+    if tracker is None:
+        # Untracked context: fall back to Playwright's navigation-scoped idle state.
+        try:
+            await page.wait_for_load_state("networkidle", timeout=timeout * 1000)
+            return True
+        except Exception:
+            return False
+
+    while not tracker.is_quiet(page, quiet_ms):
+        if time.monotonic() >= deadline:
+            return False
+        await asyncio.sleep(POLL_INTERVAL)
+    return True
+
+
+async def wait_for_dom_quiet(page, timeout, quiet_ms=DOM_QUIET_MS):
+    """Wait until the DOM has not mutated for ``quiet_ms``. Returns False on timeout."""
+    if timeout <= 0:
+        return False
+    try:
+        return await page.evaluate(_DOM_LULL_JS, [quiet_ms, int(timeout * 1000)])
+    except Exception:
+        # Navigation destroyed the execution context; the caller's next wait covers it.
+        return False
+
+
+async def wait_for_selector(page, selector, timeout, state="attached"):
+    """Wait for ``selector`` to reach ``state``. Returns False on timeout."""
+    # Playwright reads a timeout of 0 as "wait forever".
+    if timeout <= 0:
+        return False
+    try:
+        await page.wait_for_selector(selector, state=state, timeout=timeout * 1000)
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_count_change(page, selector, previous_count, timeout):
+    """Wait until the number of ``selector`` matches differs from ``previous_count``."""
+    if timeout <= 0:
+        return False
+    try:
+        await page.wait_for_function(
+            _COUNT_CHANGED_JS,
+            arg=[selector, previous_count],
+            polling=int(POLL_INTERVAL * 1000),
+            timeout=timeout * 1000,
+        )
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_text_change(page, selector, previous_text, timeout):
+    """Wait until the text of the first ``selector`` match differs from ``previous_text``."""
+    if timeout <= 0:
+        return False
+    try:
+        await page.wait_for_function(
+            _TEXT_CHANGED_JS,
+            arg=[selector, previous_text],
+            polling=int(POLL_INTERVAL * 1000),
+            timeout=timeout * 1000,
+        )
+        return True
+    except Exception:
+        return False
+
+
+async def wait_until_ready(page, timeout,
+                           selector=None,
+                           count_selector=None,
+                           previous_count=None,
+                           text_selector=None,
+                           previous_text=None,
+                           network_quiet=True,
+                           dom_quiet=True):
+    """
+    Wait until ``page`` is ready, but never longer than ``timeout`` seconds.
+
+    The conditions are checked in order and share one deadline: a selector
+    appearing, a card count changing (or, for pagination that replaces the
+    cards, the first card's text), the network going quiet and finally a
+    DOM-mutation lull. A condition that is not met within the remaining time
+    is given up on, so the worst case equals the fixed sleep it replaces.
+
+    After a click, pass ``count_selector`` or ``text_selector``: the network
+    and DOM checks alone can pass before the click's request has started.
+
+    Args:
+        page: Playwright Page to watch
+        timeout: upper bound in seconds for all conditions together
+        selector: CSS selector that must be attached before continuing
+        count_selector: CSS selector whose match count should change
+        previous_count: match count of ``count_selector`` before the action
+        text_selector: CSS selector whose first match's text should change
+        previous_text: that text before the action
+        network_quiet: wait for no in-flight requests
+        dom_quiet: wait for a pause in DOM mutations
+
+    Returns:
+        True if every requested condition was met, False if any timed out
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    ready = True
+
+    if selector:
+        ready &= await wait_for_selector(page, selector, _remaining(deadline))
+    if count_selector and previous_count is not None:
+        ready &= await wait_for_count_change(page, count_selector, previous_count, _remaining(deadline))
+    if text_selector and previous_text is not None:
+        ready &= await wait_for_text_change(page, text_selector, previous_text, _remaining(deadline))
+    if network_quiet:
+        ready &= await wait_for_network_quiet(page, _remaining(deadline))
+    if dom_quiet:
+        ready &= await wait_for_dom_quiet(page, _remaining(deadline))
+
+    elapsed = time.monotonic() - start
+    if ready:
+        logger.debug(f"Page ready after {elapsed:.2f}s (bound {timeout}s)")
+    else:
+        logger.debug(f"Readiness bound of {timeout}s reached")
+    return ready
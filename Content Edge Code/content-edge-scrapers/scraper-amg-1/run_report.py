@@ -0,0 +1,190 @@
+import contextvars
+import functools
+import json
+import logging
+import math
+import time
+from collections import Counter, defaultdict
+
+logger = logging.getLogger("RUN_REPORT")
+
+# Report of the site whose scrape the running task belongs to. Tasks started
+# by a scraper (gather, fetch_articles workers) inherit it.
+_current = contextvars.ContextVar("run_report", default=None)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``; None when there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class SiteReport:
+    """
+    Timing spans and counters of one site's run.
+
+    ``spans`` holds the durations (seconds) recorded per phase, e.g.
+    browser_launch, consent, listing, listing_page, section_listing,
+    navigation, article, clean_data and save_json_to_s3; ``counters`` holds
+    pages visited, response bytes and retries.
+
+    ``listing`` is recorded for every scraper without it doing anything: it
+    runs from the browser session opening to the first article fetch (or
+    the session closing), so it includes consent and popup handling.
+    """
+
+    def __init__(self, company_site_id, target_date=None):
+        self.company_site_id = company_site_id
+        self.target_date = target_date
+        self.started = time.perf_counter()
+        self.spans = defaultdict(list)
+        self.counters = Counter()
+        self._open = {}
+
+    def add(self, phase, seconds):
+        self.spans[phase].append(seconds)
+
+    def begin(self, phase):
+        """Start an open-ended ``phase``; a phase already started keeps its start."""
+        self._open.setdefault(phase, time.perf_counter())
+
+    def end(self, phase):
+        """Record ``phase`` from its ``begin``; nothing if it was not started or has ended."""
+        started = self._open.pop(phase, None)
+        if started is not None:
+            self.add(phase, time.perf_counter() - started)
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def summary(self):
+        phases = {}
+        for phase, durations in self.spans.items():
+            phases[phase] = {
+                "count": len(durations),
+                "total_seconds": round(sum(durations), 3),
+                "p50_seconds": round(percentile(durations, 50), 3),
+                "p95_seconds": round(percentile(durations, 95), 3),
+                "max_seconds": round(max(durations), 3),
+            }
+        articles = self.spans.get("article", [])
+        return {
+            "company_site_id": self.company_site_id,
+            "target_date": self.target_date,
+            "seconds": round(time.perf_counter() - self.started, 2),
+            "article_latency": {
+                "count": len(articles),
+                "p50_seconds": round(percentile(articles, 50), 3) if articles else None,
+                "p95_seconds": round(percentile(articles, 95), 3) if articles else None,
+            },
+            "pages_visited": self.counters["pages_visited"],
+            "retries": self.counters["retries"],
+            "bytes": self.counters["bytes"],
+            "phases": phases,
+        }
+
+    def log(self):
+        logger.info(f"{self.company_site_id}: {json.dumps(self.summary())}")
+
+
+def activate(report):
+    """Make ``report`` current for this task and those it starts; returns a token for ``deactivate``."""
+    return _current.set(report)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def count(name, amount=1):
+    report = _current.get()
+    if report is not None:
+        report.count(name, amount)
+
+
+def begin(phase):
+    """``SiteReport.begin`` on the current site's report, if any."""
+    report = _current.get()
+    if report is not None:
+        report.begin(phase)
+
+
+def end(phase):
+    """``SiteReport.end`` on the current site's report, if any."""
+    report = _current.get()
+    if report is not None:
+        report.end(phase)
+
+
+class span:
+    """
+    ``with span("phase"):`` records the block's duration in the current
+    site's report; a no-op outside a reported run.
+    """
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.report = _current.get()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.report is not None:
+            self.report.add(self.phase, time.perf_counter() - self.started)
+        return False
+
+
+def timed(phase):
+    """Decorator recording each call of a coroutine function as a ``phase`` span."""
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(phase):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def track_context(context):
+    """
+    Count the pages visited and response bytes (from Content-Length) of a
+    browser context, and record a navigation span per main-frame document,
+    against the report current when the context is created.
+    """
+    report = _current.get()
+    if report is None:
+        return
+
+    def is_page_load(request):
+        try:
+            return request.is_navigation_request() and request.frame.parent_frame is None
+        except Exception:
+            return False
+
+    def on_request(request):
+        if is_page_load(request):
+            report.count("pages_visited")
+
+    def on_response(response):
+        try:
+            report.count("bytes", int(response.headers.get("content-length", 0)))
+        except (TypeError, ValueError):
+            pass
+
+    def on_finished(request):
+        if is_page_load(request):
+            response_end = request.timing.get("responseEnd", -1)
+            if response_end >= 0:
+                report.add("navigation", response_end / 1000)
+
+    context.on("request", on_request)
+    context.on("response", on_response)
+    context.on("requestfinished", on_finished)
@@ -0,0 +1,28 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger("SCRAPE_OUTPUT")
+
+# Scrapers hand their items straight back to the caller. The old
+# /tmp/<company_site_id>.json file is only written for debugging: always when
+# DEBUG_OUTPUT=1, and by default outside Lambda so local runs keep it.
+DEBUG_OUTPUT = os.getenv(
+    "DEBUG_OUTPUT", "0" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "1"
+) == "1"
+DEBUG_OUTPUT_DIR = os.getenv("DEBUG_OUTPUT_DIR", "/tmp")
+
+
+def debug_output_path(company_site_id):
+    return os.path.join(DEBUG_OUTPUT_DIR, f"{company_site_id}.json")
+
+
+def write_debug_output(company_site_id, items):
+    """Write the scraped items to the debug JSON file when DEBUG_OUTPUT is on."""
+    if not DEBUG_OUTPUT:
+        return None
+    output_path = debug_output_path(company_site_id)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(items, f, indent=4, ensure_ascii=False)
+    logger.debug(f"Wrote {len(items)} items to {output_path}")
+    return output_path
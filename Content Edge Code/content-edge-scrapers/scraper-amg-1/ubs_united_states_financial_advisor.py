@@ -1,13 +1,13 @@
 import asyncio
-from asyncio.timeouts import timeout
-import json
 import logging
 import sys
-from datetime import datetime, time
-from typing_extensions import type_repr
 from dateutil import parser
 import re 
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 
 site = "UBS Asset Management"
@@ -40,39 +40,7 @@ class UBSScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                        ])
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                     )
@@ -96,25 +64,26 @@ class UBSScraper:
 
             # Step 1: Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
-            try:
-                logger.info("Selecting US + Financial Advisor")
-                await page.get_by_text("Financial advisors").click()
-                await page.get_by_role("button", name="Accept and continue").click()
-            except:
-                logger.info("Error selecting")
-
-            # Accept cookies if the OneTrust button exists
-            cookie_button = page.locator("button.privacysettings__bannerButton").first
-
-            if await cookie_button.count() > 0:
+            await wait_until_ready(page, self.sleep_time)
+            with run_report.span("consent"):
                 try:
-                    await cookie_button.click(timeout=3000)
-                    logger.info("✓ Cookies accepted")
-                except Exception as e:
-                    logger.info(f"Cookie button existed but could not click: {e}")
-            else:
-                logger.info("✓ No cookie banner found")
+                    logger.info("Selecting US + Financial Advisor")
+                    await page.get_by_text("Financial advisors").click()
+                    await page.get_by_role("button", name="Accept and continue").click()
+                except:
+                    logger.info("Error selecting")
+
+                # Accept cookies if the OneTrust button exists
+                cookie_button = page.locator("button.privacysettings__bannerButton").first
+
+                if await cookie_button.count() > 0:
+                    try:
+                        await cookie_button.click(timeout=3000)
+                        logger.info("✓ Cookies accepted")
+                    except Exception as e:
+                        logger.info(f"Cookie button existed but could not click: {e}")
+                else:
+                    logger.info("✓ No cookie banner found")
 
             await asyncio.sleep(5)
             while True: #loop for loading insights 
@@ -174,59 +143,54 @@ class UBSScraper:
             # Step 5: Visit each article
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             return [i for i in self.items if i["article_date"] and parser.parse(i["article_date"]).date() >= self.target_date]
 
     async def scrape_article_pages(self, context):
         logger.debug("DEBUG: Starting to scrape individual articles")
-        for item in self.items:
-            url = item["article_url"]
-            #logger.debug(f"url:{url}")
-            if not url:
-                continue
+        await fetch_articles(context, self.items, self.scrape_article)
 
-            # Skip PDFs
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        #logger.debug(f"url:{url}")
+        if not url:
+            return
 
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        # Skip PDFs
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-                try:
-                    desc_p = await page.locator(
-                        "div.textimage__richtext.richtext__base p"
-                    ).first.text_content()
-                    item["article_description"] = desc_p.strip() if desc_p else ""
-                except Exception:
-                    item["article_description"] = ""
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
 
+            try:
+                desc_p = await page.locator(
+                    "div.textimage__richtext.richtext__base p"
+                ).first.text_content()
+                item["article_description"] = desc_p.strip() if desc_p else ""
+            except Exception:
+                item["article_description"] = ""
 
-                paragraphs = await page.locator("div.container__content").all_inner_texts()
-                full_text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = full_text
-                logger.debug(f"Succesfully scraped url:{url}")
+            paragraphs = await page.locator("div.container__content").all_inner_texts()
+            full_text = " ".join(p.strip() for p in paragraphs if p.strip())
+            item["article_content"] = full_text
+            logger.debug(f"Succesfully scraped url:{url}")
 
-            except Exception as e:
-                logger.error(f"ERROR: Failed to scrape {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+        except Exception as e:
+            logger.error(f"ERROR: Failed to scrape {url}: {e}")
+            item["article_content"] = None
 
 
 async def UBSUSFA(target_date):
     url = "https://www.ubs.com/us/en/assetmanagement/insights.html"
     scraper = UBSScraper(target_date)
     results = await scraper.scrape(url)
-    output_path=f"/tmp/{company_site_id}.json"
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f" Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
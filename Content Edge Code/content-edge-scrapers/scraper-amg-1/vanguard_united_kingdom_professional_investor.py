@@ -1,10 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
-import re
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from readiness import wait_until_ready
+from card_extraction import extract_cards
+from scrape_output import write_debug_output
 
 site = "Vanguard"
 section = "Insights"
@@ -12,6 +14,15 @@ country = "United Kingdom"
 role = "Professional Investor"
 company_site_id = "am-206"
 
+# Listing card fields, read in one round trip per page.
+CARD_FIELDS = {
+    "href": ("a.nds-base-card-article-link-wrapper", "href"),
+    "date": "span.nds-card-content-header__date",
+    "title": "h3.nds-base-card__title",
+    "description": "div.nds-base-card__body.with-tags",
+    "tags": {"selector": "div.nds-card-content-tags__tags span.nds-tag-text", "all": True},
+}
+
 # Logging setup
 logging.basicConfig(
     level=logging.DEBUG,
@@ -32,40 +43,7 @@ class VanguardScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696"
-                ]
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -86,7 +64,7 @@ class VanguardScraper:
             })
 
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             seen_urls = set()
             stop = False
@@ -99,14 +77,13 @@ class VanguardScraper:
 
                 # Wait for UK article cards
                 await page.wait_for_selector("nds-base-card-article", timeout=10000)
-                cards = await page.locator("nds-base-card-article").all()
+                cards = await extract_cards(page, "nds-base-card-article", CARD_FIELDS)
 
                 logger.info(f"Page {page_count}: Found {len(cards)} article cards")
 
                 for card in cards:
                     try:
-                        link_el = card.locator("a.nds-base-card-article-link-wrapper")
-                        href = await link_el.get_attribute("href")
+                        href = card["href"]
                         if not href:
                             continue
 
@@ -119,11 +96,7 @@ class VanguardScraper:
                             continue
                         seen_urls.add(article_url)
 
-                        raw_date = None
-                        date_node = card.locator("span.nds-card-content-header__date")
-
-                        if await date_node.count():
-                            raw_date = (await date_node.text_content()).strip()
+                        raw_date = card["date"]
 
                         parsed_date = None
                         if raw_date:
@@ -140,20 +113,9 @@ class VanguardScraper:
                             stop = True
                             break
 
-                        title_el = card.locator("h3.nds-base-card__title")
-                        title = (await title_el.text_content()).strip() if await title_el.count() else None
-
-                        # DESCRIPTION
-                        desc_el = card.locator("div.nds-base-card__body.with-tags")
-                        description = (await desc_el.text_content()).strip() if await desc_el.count() else None
-
-                        # TAGS
-                        tags = await card.locator(
-                            "div.nds-card-content-tags__tags span.nds-tag-text"
-                        ).all_text_contents()
-
-                        # ARTICLE CONTENT
-                        content = await self.scrape_article(context, article_url)
+                        title = card["title"]
+                        description = card["description"]
+                        tags = card["tags"]
 
                         self.items.append({
                             "company_site_id": company_site_id,
@@ -164,7 +126,7 @@ class VanguardScraper:
                             "article_date": str(parsed_date) if parsed_date else None,
                             "article_title": title,
                             "article_description": description,
-                            "article_content": content,
+                            "article_content": None,
                             "article_tags": tags,
                             "article_slug": article_url.rstrip("/").split("/")[-1],
                             "article_url": article_url,
@@ -193,59 +155,55 @@ class VanguardScraper:
 
                 logger.info(f"Clicking next page button (page {page_count + 1})")
                 await next_button.first.click()
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
                 page_count += 1
 
-            await browser.close()
+            await page.close()
+            # Article pages are rendered client-side, so every one goes through the browser.
+            await fetch_articles(context, self.items, self.scrape_article)
+            await context.close()
             logger.info(f"Scraping complete — total {len(self.items)} articles collected")
             return self.items
 
-    async def scrape_article(self, context, url):
-        try:
-            page = await context.new_page()
-            await page.goto(url, timeout=60000)
-
-            # Allow JS hydration
-            await page.wait_for_load_state("networkidle")
-            await asyncio.sleep(1)
-
-            content_list = []
-
-            # ----------------------------
-            # 1) Extract heading section
-            # ----------------------------
-            try:
-                heading_blocks = await page.locator("nds-base-article-heading div").all()
-                for block in heading_blocks:
-                    txt = await block.text_content()
-                    if txt and txt.strip():
-                        content_list.append(txt.strip())
-            except Exception as e:
-                logger.debug(f"Heading extraction failed for {url}: {e}")
-
-            # ----------------------------
-            # 2) Extract main blog content
-            # ----------------------------
-            try:
-                body_blocks = await page.locator("nds-aem-blog-post-container div").all()
-                for block in body_blocks:
-                    txt = await block.text_content()
-                    if txt and txt.strip():
-                        content_list.append(txt.strip())
-            except Exception as e:
-                logger.debug(f"Body extraction failed for {url}: {e}")
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        await page.goto(url, timeout=60000)
 
-            await page.close()
+        # Allow JS hydration
+        await page.wait_for_load_state("networkidle")
+        await asyncio.sleep(1)
 
-            if not content_list:
-                logger.warning(f"No article content extracted for {url}")
-                return None
+        content_list = []
 
-            return "\n".join(content_list)
+        # ----------------------------
+        # 1) Extract heading section
+        # ----------------------------
+        try:
+            heading_blocks = await page.locator("nds-base-article-heading div").all()
+            for block in heading_blocks:
+                txt = await block.text_content()
+                if txt and txt.strip():
+                    content_list.append(txt.strip())
+        except Exception as e:
+            logger.debug(f"Heading extraction failed for {url}: {e}")
 
+        # ----------------------------
+        # 2) Extract main blog content
+        # ----------------------------
+        try:
+            body_blocks = await page.locator("nds-aem-blog-post-container div").all()
+            for block in body_blocks:
+                txt = await block.text_content()
+                if txt and txt.strip():
+                    content_list.append(txt.strip())
         except Exception as e:
-            logger.error(f"Error scraping article {url}: {e}")
-            return None
+            logger.debug(f"Body extraction failed for {url}: {e}")
+
+        if not content_list:
+            logger.warning(f"No article content extracted for {url}")
+            return
+
+        item["article_content"] = "\n".join(content_list)
 
 
 async def VanguardUKPI(target_date):
@@ -254,13 +212,9 @@ async def VanguardUKPI(target_date):
         url = "https://www.vanguard.co.uk/professional/insights"
         scraper = VanguardScraper(target_date)
         results = await scraper.scrape(url)
-        output_path = f"/tmp/{company_site_id}.json"
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
-        logger.info(f"Scraped {len(results)} articles → {output_path}")
-        return 200
+        return results
 
     except Exception as e:
         logger.error(f"Error: {e}")
@@ -1,10 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
-import re
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from http_articles import HttpArticleReader
+from readiness import wait_until_ready
+from card_extraction import extract_cards
+from scrape_output import write_debug_output
 
 site = "Vanguard"
 section = "Insights"
@@ -12,6 +15,18 @@ company_site_id = "am-205"
 country = "United States"
 role = "Financial Advisor"
 
+# Listing card fields, read in one round trip per page.
+CARD_FIELDS = {
+    "href": ("a.article-card__title-link", "href"),
+    "title": "a.article-card__title-link",
+    "date": "p.article-card__date time",
+    "description": "p.article-card__description",
+    "category": "div.article-card__categories li a.tag",
+}
+
+# Article copy, in the static HTML and in the rendered page.
+ARTICLE_PARAGRAPHS = "div.vg-article-content p, article p"
+
 # Logging setup
 logging.basicConfig(
     level=logging.DEBUG,
@@ -32,40 +47,7 @@ class VanguardScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                        ]
-            )
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                     user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                     )
@@ -88,7 +70,7 @@ class VanguardScraper:
             await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
 
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             seen_urls = set()
             stop = False
@@ -98,14 +80,13 @@ class VanguardScraper:
 
                 # Wait for article cards
                 await page.wait_for_selector("section.article-card", timeout=8000)
-                cards = await page.locator("section.article-card").all()
+                cards = await extract_cards(page, "section.article-card", CARD_FIELDS)
 
                 logger.info(f"Page {page_count}: Found {len(cards)} article cards")
 
                 for card in cards:
 
-                    link_el = card.locator("a.article-card__title-link").first
-                    href = await link_el.get_attribute("href")
+                    href = card["href"]
                     if not href:
                         continue
 
@@ -115,7 +96,7 @@ class VanguardScraper:
                         continue
                     seen_urls.add(article_url)
 
-                    raw_date = await card.locator("p.article-card__date time").first.text_content()
+                    raw_date = card["date"]
 
                     try:
                         parsed_date = parser.parse(raw_date.split("|")[0]).date()
@@ -132,15 +113,10 @@ class VanguardScraper:
                         stop = True
                         break
 
-                    title = (await link_el.text_content()).strip()
-
-                    description_el = card.locator("p.article-card__description").first
-                    description = (await description_el.text_content()).strip()
-
-                    category_el = card.locator("div.article-card__categories li a.tag").first
-                    category = await category_el.text_content() if await category_el.count() > 0 else None
+                    title = card["title"]
+                    description = card["description"]
+                    category = card["category"]
 
-                    content = await self.scrape_article(context, article_url)
                     self.items.append({
                         "company_site_id": company_site_id,
                         "company_site_country": country,
@@ -150,7 +126,7 @@ class VanguardScraper:
                         "article_date": str(parsed_date),
                         "article_title": title,
                         "article_description": description,
-                        "article_content": content,
+                        "article_content": None,
                         "article_tags": [category] if category else [],
                         "article_slug": article_url.rstrip("/").split("/")[-1],
                         "article_url": article_url,
@@ -176,37 +152,31 @@ class VanguardScraper:
                 await next_button.click()
 
                 # Allow content to load
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
                 page_count += 1
 
-            await browser.close()
+            await page.close()
+            await self.scrape_article_pages(context)
+            await context.close()
             logger.info(f"Scraping complete — total {len(self.items)} articles collected")
             return self.items
 
-    async def scrape_article(self, context, url):
-        """Scrape full article content from detail page."""
-        try:
-            page = await context.new_page()
-            await page.goto(url, timeout=60000)
-
-            await page.wait_for_selector("div.vg-article-content, article", timeout=8000)
-
-            paragraphs = await page.locator(
-                "div.vg-article-content p, article p"
-            ).all()
+    async def scrape_article_pages(self, context):
+        # Article bodies are server-rendered; only render when they are not.
+        reader = HttpArticleReader(context, ARTICLE_PARAGRAPHS, self.parse_article)
+        await fetch_articles(context, self.items, self.scrape_article, fast_path=reader)
 
-            content_list = []
-            for p in paragraphs:
-                txt = await p.text_content()
-                if txt and txt.strip():
-                    content_list.append(txt.strip())
+    def parse_article(self, doc, item):
+        paragraphs = doc.all_text_contents(ARTICLE_PARAGRAPHS)
+        item["article_content"] = "\n".join(txt.strip() for txt in paragraphs if txt and txt.strip())
 
-            await page.close()
-            return "\n".join(content_list)
+    async def scrape_article(self, page, item):
+        """Scrape full article content from detail page."""
+        await page.goto(item["article_url"], timeout=60000)
+        await page.wait_for_selector("div.vg-article-content, article", timeout=8000)
 
-        except Exception as e:
-            logger.error(f"Error scraping article {url}: {e}")
-            return None
+        paragraphs = await page.locator(ARTICLE_PARAGRAPHS).all_text_contents()
+        item["article_content"] = "\n".join(txt.strip() for txt in paragraphs if txt and txt.strip())
 
 async def VanguardUSFA(target_date):
     results=[]
@@ -214,12 +184,9 @@ async def VanguardUSFA(target_date):
         url = "https://advisors.vanguard.com/insights/all"
         scraper = VanguardScraper(target_date)
         results = await scraper.scrape(url)
-        output_path=f"/tmp/{company_site_id}.json"
-
-        with open(output_path,"w", encoding="utf-8") as f:
-            json.dump(results, f , indent=4 , ensure_ascii=False)
+        write_debug_output(company_site_id, results)
         logger.info(f"Scraped {len(results)} articles")
-        return 200
+        return results
     except Exception as error:
         logger.error(f"Error{error}")
         return 500
@@ -1,11 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
 from dateutil import parser
 import re
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 site = "Alliance Bernstein"
 section = "Insights"
@@ -42,45 +43,13 @@ class AllianceScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696"
-                ])
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
             page = await context.new_page()
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             try:
                 await page.get_by_role("link", name="View All Insights").click()
@@ -148,7 +117,7 @@ class AllianceScraper:
                 await asyncio.sleep(5)
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
             return [
                 i for i in self.items
                 if i["article_date"]
@@ -157,42 +126,37 @@ class AllianceScraper:
 
     async def scrape_article_pages(self, context):
         logger.debug("DEBUG: Scraping individual articles")
+        await fetch_articles(context, self.items, self.scrape_article)
+
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
+        logger.info(f"Scraping url :{url}")
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
 
-        for item in self.items:
-            url = item["article_url"]
-            if not url:
-                continue
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
-            logger.info(f"Scraping url :{url}")
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-
-                paragraphs = await page.locator("div.ab-title-teaser p").all_text_contents()
-                full_text = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = full_text
-
-            except Exception as e:
-                logger.error(f"ERROR scraping article {url}: {e}")
-                item["article_content"] = None
+            paragraphs = await page.locator("div.ab-title-teaser p").all_text_contents()
+            full_text = " ".join(p.strip() for p in paragraphs if p.strip())
+            item["article_content"] = full_text
 
-            finally:
-                await page.close()
+        except Exception as e:
+            logger.error(f"ERROR scraping article {url}: {e}")
+            item["article_content"] = None
 
 async def ABUSFP(target_date):
     url = "https://www.alliancebernstein.com/us/en-us/investments/insights-landing.html"
     scraper = AllianceScraper(target_date)
     results = await scraper.scrape(url)
     print(results)
-    output_path = f"/tmp/{company_site_id}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles newer than {target_date}")
-    return 200
+    return results
 
 if __name__ == "__main__":
     target_date = sys.argv[1] if len(sys.argv) > 1 else "2025-12-01"
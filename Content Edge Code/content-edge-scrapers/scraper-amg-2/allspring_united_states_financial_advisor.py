@@ -1,11 +1,17 @@
 import asyncio
-import json
 import logging
 import sys
 import re
 from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from http_articles import HttpArticleReader
+from paged_listing import PagedListing
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 # --- Site metadata ---
 site = "Allspring Global Investments"
@@ -35,48 +41,13 @@ class AllSpringScraperGlobal:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--disable-dev-shm-usage",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696"
-                ]
-            )
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
-            page = await context.new_page()
 
-            # Headers
-            await page.set_extra_http_headers({
+            # Headers for every tab, since listing pages load in tabs of their own
+            await context.set_extra_http_headers({
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
                 "Accept-Language": "en-US,en;q=0.5",
                 "Accept-Encoding": "gzip, deflate, br",
@@ -89,181 +60,183 @@ class AllSpringScraperGlobal:
                 "Cache-Control": "max-age=0",
             })
 
-            await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
+            # ?page=N listing: find the last page back to target_date, then
+            # read the pages up to it in parallel
+            listing = PagedListing(
+                lambda page_number: self.scrape_listing_page(context, url, page_number),
+                self.target_date,
+                first_page=0,
+            )
+            self.items.extend(item for item, _ in await listing.results_since())
+
+            await self.scrape_article_pages(context)
+
+            await context.close()
 
-            # --- PAGINATION LOOP ---
-            page_number = 0
-            while True:
+            self.items = [item for item in self.items if item["article_content"]]
+            return self.items
 
-                paged_url = f"{url}?page={page_number}" if page_number > 0 else url
-                logger.info(f"Scraping listing page: {paged_url}")
+    async def scrape_listing_page(self, context, url, page_number):
+        """Cards on listing page ``page_number`` as ``(item, date)``, read in a tab of its own."""
+        paged_url = f"{url}?page={page_number}" if page_number > 0 else url
+        logger.info(f"Scraping listing page: {paged_url}")
 
-                await page.goto(paged_url, timeout=120000)
-                await asyncio.sleep(self.sleep_time)
+        page = await context.new_page()
+        try:
+            response = await page.goto(paged_url, timeout=120000)
+            if response is not None and not response.ok:
+                raise RuntimeError(f"Listing page {paged_url} returned HTTP {response.status}")
+            await wait_until_ready(page, self.sleep_time, selector="a.card.insight-card")
 
+            with run_report.span("consent"):
                 try:
+                    # click() waits for each option to become actionable, so
+                    # the self-ID steps need no pauses in between.
                     # Open country dropdown
                     await page.locator("#dropdown-location-button").click()
-                    await asyncio.sleep(1)
 
                     # Select United States
                     await page.locator("#dropdown-location-option-us").click()
-                    await asyncio.sleep(1)
 
                     # Select Financial Advisor
                     await page.locator("button.self-id__role:has(div.self-id__role-title:has-text('Financial Advisor'))").click()
-                    await asyncio.sleep(1)
 
                     # Click Accept
                     await page.locator("button.self-id__footer-terms-actions--submit").click()
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(page, self.sleep_time)
 
                 except Exception as e:
                     logger.debug(f"Self-ID popup not shown or already accepted: {e}")
 
                 try:
                     await page.locator("#selector-form-confirm").click(timeout=3000)
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(page, self.sleep_time)
                 except:
                     pass
 
                 try:
                     await page.locator("#onetrust-close-btn-container").click(timeout=3000)
-                    await asyncio.sleep(1)
+                    await wait_until_ready(page, 1, network_quiet=False)
                 except:
                     pass
 
+            try:
+                await page.wait_for_selector("a.card.insight-card", state="attached", timeout=15000)
+                cards = await page.locator("a.card.insight-card").all()
+            except:
+                # The page loaded (see above), so no cards means past the last page
+                logger.info(f"No cards found on page {page_number}")
+                return []
+
+            entries = []
+            for card in cards:
+
                 try:
-                    await page.wait_for_selector("a.card.insight-card", state="attached", timeout=15000)
-                    cards = await page.locator("a.card.insight-card").all()
+                    title = await card.locator("p.card__heading").text_content()
                 except:
-                    logger.info("No more cards found — stopping pagination.")
-                    break
-
-                if not cards:
-                    break
-
-                stop_pagination = False
-                seen_newer = False
-
-                for idx, card in enumerate(cards, start=1):
-
-                    try:
-                        title = await card.locator("p.card__heading").text_content()
-                    except:
-                        title = None
-
-                    try:
-                        href = await card.get_attribute("href")
-                        url_full = BASE_URL + href if href and not href.startswith("http") else href
-                        slug = href.rstrip("/").split("/")[-1] if href else None
-                    except:
-                        url_full = slug = None
-
-                    # Correct date selector
-                    try:
-                        date_text = await card.locator("span.article__date").text_content()
-                        parsed_listing_date = parser.parse(date_text, fuzzy=True).date()
-                        parsed_listing_date_str = str(parsed_listing_date)
-                    except:
-                        parsed_listing_date = self.target_date
-                        parsed_listing_date_str = str(self.target_date)
-
-                    if parsed_listing_date < self.target_date and not seen_newer:
-                        logger.info(f"Skipping early old article ({parsed_listing_date})")
-                        continue
-
-                    if parsed_listing_date < self.target_date and seen_newer:
-                        logger.info(f"Hit old article ({parsed_listing_date}) < target → STOP")
-                        stop_pagination = True
-                        break
-
-                    if parsed_listing_date >= self.target_date:
-                        seen_newer = True
-
-                    try:
-                        description = await card.locator("div.card__sub-body p").text_content()
-                    except:
-                        description = None
-
-                    try:
-                        tag = await card.locator("span.article__topic").text_content()
-                    except:
-                        tag = None
-
-                    self.items.append({
-                        "company_site_id": company_site_id,
-                        "company_site_country": country,
-                        "company_site_role": role,
-                        "article_source": site,
-                        "article_section": section,
-                        "article_date": parsed_listing_date_str,
-                        "article_title": title,
-                        "article_description": description,
-                        "article_content": None,
-                        "article_tags": [tag] if tag else [],
-                        "article_slug": slug,
-                        "article_url": url_full
-                    })
-
-                if stop_pagination:
-                    break
-
-                page_number += 1
+                    title = None
 
-            await self.scrape_article_pages(context)
+                try:
+                    href = await card.get_attribute("href")
+                    url_full = BASE_URL + href if href and not href.startswith("http") else href
+                    slug = href.rstrip("/").split("/")[-1] if href else None
+                except:
+                    url_full = slug = None
+
+                # Correct date selector; older cards pinned at the top of a
+                # page are dropped by date, they do not end the listing
+                try:
+                    date_text = await card.locator("span.article__date").text_content()
+                    parsed_listing_date = parse_date(date_text, site=company_site_id) or self.target_date
+                except:
+                    parsed_listing_date = self.target_date
 
-            await browser.close()
+                try:
+                    description = await card.locator("div.card__sub-body p").text_content()
+                except:
+                    description = None
 
-            self.items = [item for item in self.items if item["article_content"]]
-            return self.items
+                try:
+                    tag = await card.locator("span.article__topic").text_content()
+                except:
+                    tag = None
+
+                entries.append(({
+                    "company_site_id": company_site_id,
+                    "company_site_country": country,
+                    "company_site_role": role,
+                    "article_source": site,
+                    "article_section": section,
+                    "article_date": str(parsed_listing_date),
+                    "article_title": title,
+                    "article_description": description,
+                    "article_content": None,
+                    "article_tags": [tag] if tag else [],
+                    "article_slug": slug,
+                    "article_url": url_full
+                }, parsed_listing_date))
+            return entries
+        finally:
+            await page.close()
 
     async def scrape_article_pages(self, context):
-        page = await context.new_page()
+        # Article bodies are server-rendered; the browser is only a fallback.
+        reader = HttpArticleReader(context, "div.richtext__content", self.parse_article)
+        await fetch_articles(context, self.items, self.scrape_article, fast_path=reader)
 
-        for idx, item in enumerate(self.items, start=1):
-            url = item["article_url"]
-            if not url:
-                continue
+    def parse_article(self, doc, item):
+        self.apply_article(
+            item,
+            doc.all_text_contents("div.richtext__content"),
+            doc.all_text_contents("div.terms-normal p"),
+        )
 
-            if url.lower().endswith(".pdf"):
-                item["article_content"] = url
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
 
-            try:
-                await page.goto(url, timeout=120000)
-                await asyncio.sleep(self.sleep_time)
+        if url.lower().endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-                try:
-                    content_el = await page.locator("div.richtext__content").all_text_contents()
-                    full_text = " ".join(map(str.strip, content_el)).strip()
-                except:
-                    full_text = ""
+        await page.goto(url, timeout=120000)
+        await wait_until_ready(page, self.sleep_time, selector="div.richtext__content")
 
-                try:
-                    mark_paras = await page.locator("div.terms-normal p").all_text_contents()
-                    mark_line = next((p.strip() for p in mark_paras if p.strip().startswith("MARK")), None)
-
-                    if mark_line:
-                        match = re.search(r"MARK-[\w-]*?(\d{4}-\d{2}-\d{2})", mark_line)
-                        if match:
-                            parsed_date = datetime.strptime(match.group(1), "%Y-%m-%d").date()
-                        else:
-                            dt = parser.parse(mark_line, fuzzy=True)
-                            parsed_date = datetime(dt.year, dt.month, 1).date()
-                    else:
-                        parsed_date = parser.parse(item["article_date"], fuzzy=True).date()
+        try:
+            content_el = await page.locator("div.richtext__content").all_text_contents()
+        except:
+            content_el = []
 
-                except:
-                    parsed_date = parser.parse(item["article_date"], fuzzy=True).date()
+        try:
+            mark_paras = await page.locator("div.terms-normal p").all_text_contents()
+        except:
+            mark_paras = []
+
+        self.apply_article(item, content_el, mark_paras)
+
+    def apply_article(self, item, content_el, mark_paras):
+        """Set content and the MARK-code publication date from the article's text blocks."""
+        full_text = " ".join(map(str.strip, content_el)).strip()
+
+        try:
+            mark_line = next((p.strip() for p in mark_paras if p.strip().startswith("MARK")), None)
 
-                item["article_date"] = str(parsed_date)
-                item["article_content"] = full_text
+            if mark_line:
+                match = re.search(r"MARK-[\w-]*?(\d{4}-\d{2}-\d{2})", mark_line)
+                if match:
+                    parsed_date = datetime.strptime(match.group(1), "%Y-%m-%d").date()
+                else:
+                    dt = parser.parse(mark_line, fuzzy=True)
+                    parsed_date = datetime(dt.year, dt.month, 1).date()
+            else:
+                parsed_date = parser.parse(item["article_date"], fuzzy=True).date()
 
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx}: {e}")
+        except:
+            parsed_date = parser.parse(item["article_date"], fuzzy=True).date()
 
-        await page.close()
+        item["article_date"] = str(parsed_date)
+        item["article_content"] = full_text
 
 
 async def ASGIUSFA(target_date):
@@ -273,12 +246,10 @@ async def ASGIUSFA(target_date):
         scraper = AllSpringScraperGlobal(target_date)
         results = await scraper.scrape(url)
 
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} Global articles after {target_date}")
-        return 200
+        return results
 
     except Exception as error:
         logger.error(f"Error: {error}")
@@ -1,11 +1,16 @@
 import asyncio
-import json
 import logging
 import sys
 import re
 from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from paged_listing import PagedListing
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 # --- Site metadata ---
 site = "Ares Management"
@@ -36,48 +41,13 @@ class AresScraperGlobal:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                "--disable-gpu",
-                "--no-sandbox",
-                "--single-process",
-                "--disable-dev-shm-usage",
-                "--no-zygote",
-                "--disable-setuid-sandbox",
-                "--disable-accelerated-2d-canvas",
-                "--disable-dev-shm-usage",
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-background-networking",
-                "--disable-background-timer-throttling",
-                "--disable-client-side-phishing-detection",
-                "--disable-component-update",
-                "--disable-default-apps",
-                "--disable-domain-reliability",
-                "--disable-features=AudioServiceOutOfProcess",
-                "--disable-hang-monitor",
-                "--disable-ipc-flooding-protection",
-                "--disable-popup-blocking",
-                "--disable-prompt-on-repost",
-                "--disable-renderer-backgrounding",
-                "--disable-sync",
-                "--force-color-profile=srgb",
-                "--metrics-recording-only",
-                "--mute-audio",
-                "--no-pings",
-                "--use-gl=swiftshader",
-                "--window-size=1280,1696"
-            ]
-        )
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
-            page = await context.new_page()
 
-            # Set headers
-            await page.set_extra_http_headers({
+            # Set headers for every tab, since listing pages load in tabs of their own
+            await context.set_extra_http_headers({
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
                 "Accept-Language": "en-US,en;q=0.5",
                 "Accept-Encoding": "gzip, deflate, br",
@@ -90,24 +60,41 @@ class AresScraperGlobal:
                 "Cache-Control": "max-age=0",
             })
 
-            await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
+            # ?page=N listing: find the last page back to target_date, then
+            # read the pages up to it in parallel
+            listing = PagedListing(
+                lambda page_number: self.scrape_listing_page(context, url, page_number),
+                self.target_date,
+                first_page=0,
+            )
+            self.items.extend(item for item, _ in await listing.results_since() if item["article_url"])
+
+            # Step 6: Scrape article pages for content
+            await self.scrape_article_pages(context)
 
-            # --- PAGINATION LOOP ---
-            page_number = 0
-            while True:
+            await context.close()
+            self.items = [item for item in self.items if item["article_content"]]
+            return self.items
 
-                paged_url = f"{url}?page={page_number}" if page_number > 0 else url
-                logger.info(f"Scraping listing page: {paged_url}")
+    async def scrape_listing_page(self, context, url, page_number):
+        """Cards on listing page ``page_number`` as ``(item, date)``, read in a tab of its own."""
+        paged_url = f"{url}?page={page_number}" if page_number > 0 else url
+        logger.info(f"Scraping listing page: {paged_url}")
 
-                await page.goto(paged_url, timeout=120000)
-                await asyncio.sleep(self.sleep_time)
+        page = await context.new_page()
+        try:
+            response = await page.goto(paged_url, timeout=120000)
+            if response is not None and not response.ok:
+                raise RuntimeError(f"Listing page {paged_url} returned HTTP {response.status}")
+            await wait_until_ready(page, self.sleep_time)
 
+            with run_report.span("consent"):
                 # Step 2: Disclaimer (kept for template)
                 try:
                     await page.locator("#selector-form-confirm").click(timeout=3000)
                     await page.locator("#im-jurisdiction").click(timeout=3000)
                     await page.get_by_role("button", name="Proceed").click()
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(page, self.sleep_time)
                 except:
                     pass
 
@@ -118,140 +105,110 @@ class AresScraperGlobal:
                 except:
                     pass
 
-                # Step 4: Collect article cards
+            # Step 4: Collect article cards
+            try:
+                await page.wait_for_selector(".featured-post-box.views-row",
+                                             state="attached", timeout=15000)
+                cards = await page.locator(".featured-post-box.views-row").all()
+            except:
+                # The page loaded (see above), so no cards means past the last page
+                logger.info(f"No cards found on page {page_number}")
+                return []
+
+            # Step 5: Extract article summaries
+            entries = []
+            for card in cards:
+
                 try:
-                    await page.wait_for_selector(".featured-post-box.views-row",
-                                                 state="attached", timeout=15000)
-                    cards = await page.locator(".featured-post-box.views-row").all()
+                    title = await card.locator("h4 a").text_content()
                 except:
-                    logger.info("No more cards found — stopping pagination.")
-                    break
-
-                if not cards:
-                    break
-
-                stop_pagination = False
-
-                # Step 5: Extract article summaries
-                for idx, card in enumerate(cards, start=1):
-
-                    try:
-                        title = await card.locator("h4 a").text_content()
-                    except:
-                        title = None
-
-                    try:
-                        href = await card.locator("h4 a").get_attribute("href")
-                        slug = href.rstrip("/").split("/")[-1] if href else None
-                    except:
-                        href = slug = None
-
-                    try:
-                        date_text = await card.locator("div.date-read-time span").nth(0).text_content()
-                        parsed_listing_date = parser.parse(date_text, fuzzy=True).date()
-                        parsed_listing_date_str = str(parsed_listing_date)
-                    except:
-                        parsed_listing_date_str = None
-                        parsed_listing_date = self.target_date
-
-                    # --- STOP PAGINATION IF DATE IS OLD ---
-                    if parsed_listing_date < self.target_date:
-                        logger.info(f"Hit old article ({parsed_listing_date}) < target ({self.target_date}) → STOP")
-                        stop_pagination = True
-                        break
-
-                    try:
-                        description = await card.locator("div.content-description").text_content()
-                    except:
-                        description = None
-
-                    if not href:
-                        continue
-
-                    url_full = href if href.startswith("http") else BASE_URL + href
-
-                    self.items.append({
-                        "company_site_id": company_site_id,
-                        "company_site_country": country,
-                        "company_site_role": role,
-                        "article_source": site,
-                        "article_section": section,
-                        "article_date": parsed_listing_date_str,
-                        "article_title": title,
-                        "article_description": description,
-                        "article_content": None,
-                        "article_tags": [],
-                        "article_slug": slug,
-                        "article_url": url_full
-                    })
-
-                if stop_pagination:
-                    break
-
-                page_number += 1  # next page
-
-            # Step 6: Scrape article pages for content
-            await self.scrape_article_pages(context)
+                    title = None
 
-            await browser.close()
-            self.items = [item for item in self.items if item["article_content"]]
-            return self.items
-
-    async def scrape_article_pages(self, context):
-        page = await context.new_page()
+                try:
+                    href = await card.locator("h4 a").get_attribute("href")
+                    slug = href.rstrip("/").split("/")[-1] if href else None
+                except:
+                    href = slug = None
 
-        for idx, item in enumerate(self.items, start=1):
-            url = item["article_url"]
-            if not url:
-                continue
+                try:
+                    date_text = await card.locator("div.date-read-time span").nth(0).text_content()
+                    parsed_listing_date = parse_date(date_text, site=company_site_id)
+                except:
+                    parsed_listing_date = None
 
-            if url.lower().endswith(".pdf"):
-                item["article_content"] = url
                 try:
-                    item["article_date"] = str(parser.parse(item["article_date"]).date())
+                    description = await card.locator("div.content-description").text_content()
                 except:
-                    item["article_date"] = str(self.target_date)
-                continue
+                    description = None
 
-            try:
-                await page.goto(url, timeout=120000)
-                await asyncio.sleep(self.sleep_time)
+                url_full = None
+                if href:
+                    url_full = href if href.startswith("http") else BASE_URL + href
 
-                content_el = await page.locator("div.rich-text-inner-content").all_text_contents()
-                full_text = " ".join(map(str.strip, content_el)).strip()
+                entries.append(({
+                    "company_site_id": company_site_id,
+                    "company_site_country": country,
+                    "company_site_role": role,
+                    "article_source": site,
+                    "article_section": section,
+                    "article_date": str(parsed_listing_date) if parsed_listing_date else None,
+                    "article_title": title,
+                    "article_description": description,
+                    "article_content": None,
+                    "article_tags": [],
+                    "article_slug": slug,
+                    "article_url": url_full
+                }, parsed_listing_date))
+            return entries
+        finally:
+            await page.close()
 
-                # MARK logic (template retained)
-                try:
-                    mark_paras = await page.locator("div.terms-normal p").all_text_contents()
-                    mark_line = next((p.strip() for p in mark_paras if p.strip().startswith("MARK")), None)
-
-                    if mark_line:
-                        match = re.search(r"MARK-[\w-]*?(\d{4}-\d{2}-\d{2})", mark_line)
-                        if match:
-                            parsed_date = datetime.strptime(match.group(1), "%Y-%m-%d").date()
-                        else:
-                            dt = parser.parse(mark_line, fuzzy=True)
-                            parsed_date = datetime(dt.year, dt.month, 1).date()
-                    else:
-                        # --- PATCH APPLIED HERE ---
-                        try:
-                            parsed_date = parser.parse(item["article_date"], fuzzy=True).date()
-                        except:
-                            parsed_date = self.target_date
+    async def scrape_article_pages(self, context):
+        await fetch_articles(context, self.items, self.scrape_article)
 
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if url.lower().endswith(".pdf"):
+            item["article_content"] = url
+            try:
+                item["article_date"] = str(parser.parse(item["article_date"]).date())
+            except:
+                item["article_date"] = str(self.target_date)
+            return
+
+        await page.goto(url, timeout=120000)
+        await wait_until_ready(page, self.sleep_time)
+
+        content_el = await page.locator("div.rich-text-inner-content").all_text_contents()
+        full_text = " ".join(map(str.strip, content_el)).strip()
+
+        # MARK logic (template retained)
+        try:
+            mark_paras = await page.locator("div.terms-normal p").all_text_contents()
+            mark_line = next((p.strip() for p in mark_paras if p.strip().startswith("MARK")), None)
+
+            if mark_line:
+                match = re.search(r"MARK-[\w-]*?(\d{4}-\d{2}-\d{2})", mark_line)
+                if match:
+                    parsed_date = datetime.strptime(match.group(1), "%Y-%m-%d").date()
+                else:
+                    dt = parser.parse(mark_line, fuzzy=True)
+                    parsed_date = datetime(dt.year, dt.month, 1).date()
+            else:
+                # --- PATCH APPLIED HERE ---
+                try:
+                    parsed_date = parser.parse(item["article_date"], fuzzy=True).date()
                 except:
                     parsed_date = self.target_date
 
-                if parsed_date < self.target_date:
-                    break
-
-                item["article_date"] = str(parsed_date)
-                item["article_content"] = full_text
+        except:
+            parsed_date = self.target_date
 
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx}: {e}")
+        if parsed_date < self.target_date:
+            return
 
-        await page.close()
+        item["article_date"] = str(parsed_date)
+        item["article_content"] = full_text
 
 
 async def ARESGCO(target_date):
@@ -261,12 +218,10 @@ async def ARESGCO(target_date):
         scraper = AresScraperGlobal(target_date)
         results = await scraper.scrape(url)
 
-        output_path=f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} Global articles after {target_date}")
-        return 200
+        return results
 
     except Exception as error:
         logger.error(f"Error: {error}")
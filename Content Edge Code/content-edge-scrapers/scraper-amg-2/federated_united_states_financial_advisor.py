@@ -1,11 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
 import re
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "Federated Hermes"
@@ -35,41 +36,39 @@ class FederatedHermesScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--disable-dev-shm-usage",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ]
-            )
+        async with browser_session(
+            company_site_id,
+            args=[
+                "--disable-gpu",
+                "--no-sandbox",
+                "--single-process",
+                "--disable-dev-shm-usage",
+                "--no-zygote",
+                "--disable-setuid-sandbox",
+                "--disable-accelerated-2d-canvas",
+                "--disable-dev-shm-usage",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "--disable-background-networking",
+                "--disable-background-timer-throttling",
+                "--disable-client-side-phishing-detection",
+                "--disable-component-update",
+                "--disable-default-apps",
+                "--disable-domain-reliability",
+                "--disable-hang-monitor",
+                "--disable-ipc-flooding-protection",
+                "--disable-popup-blocking",
+                "--disable-prompt-on-repost",
+                "--disable-renderer-backgrounding",
+                "--disable-sync",
+                "--force-color-profile=srgb",
+                "--metrics-recording-only",
+                "--mute-audio",
+                "--no-pings",
+                "--use-gl=swiftshader",
+                "--window-size=1280,1696",
+            ],
+        ) as browser:
 
             context = await browser.new_context(
                 user_agent=(
@@ -81,7 +80,7 @@ class FederatedHermesScraper:
             page = await context.new_page()
 
             await page.goto(url, timeout=120000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             logger.info("Starting infinite scroll…")
 
@@ -190,41 +189,35 @@ class FederatedHermesScraper:
 
                 last_height = new_height
                 await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
 
             self.items = [x for x in self.items if x["article_content"]]
             return self.items
 
     async def scrape_article_pages(self, context):
-        page = await context.new_page()
-
-        for idx, item in enumerate(self.items, start=1):
-            url = item["article_url"]
-
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+        await fetch_articles(context, self.items, self.scrape_article)
 
-            try:
-                logger.info(f"Scraping article #{idx}: {url}")
-                await page.goto(url, timeout=120000)
-                await asyncio.sleep(self.sleep_time)
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
 
-                try:
-                    content_blocks = await page.locator("div.teamsite.html").all_text_contents()
-                    content = " ".join([c.strip() for c in content_blocks if c.strip()])
-                except:
-                    content = ""
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-                item["article_content"] = content
+        logger.info(f"Scraping article: {url}")
+        await page.goto(url, timeout=120000)
+        await wait_until_ready(page, self.sleep_time)
 
-            except Exception as e:
-                logger.error(f"Failed scraping article #{idx}: {e}")
+        try:
+            content_blocks = await page.locator("div.teamsite.html").all_text_contents()
+            content = " ".join([c.strip() for c in content_blocks if c.strip()])
+        except:
+            content = ""
 
-        await page.close()
+        item["article_content"] = content
 
 
 async def FHUSFA(target_date):
@@ -234,12 +227,10 @@ async def FHUSFA(target_date):
         scraper = FederatedHermesScraper(target_date)
         results = await scraper.scrape(url)
 
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} Federated Hermes articles after {target_date}")
-        return 200
+        return results
 
     except Exception as error:
         logger.error(f"Error: {error}")
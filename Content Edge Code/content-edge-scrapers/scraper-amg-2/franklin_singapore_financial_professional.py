@@ -1,11 +1,14 @@
 import asyncio
-import json
 import logging
 import sys
 import re
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 site = "Franklin Templeton"
 section = "Insights"
@@ -32,53 +35,18 @@ class FTScraperSG:
 
 
     def normalize_date(self, raw):
-        try:
-            raw = raw.strip()
-            if re.match(r"^[A-Za-z]+\s+\d{4}$", raw):
-                dt = parser.parse(raw, fuzzy=True)
-                return datetime(dt.year, dt.month, 1).date()
-            return parser.parse(raw, fuzzy=True).date()
-        except:
+        parsed = parse_date(raw, site=company_site_id)
+        if not parsed:
             return self.target_date
+        # "March 2025" is dated the first of the month
+        if re.match(r"^[A-Za-z]+\s+\d{4}$", raw.strip()):
+            return parsed.replace(day=1)
+        return parsed
 
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696"
-                ]
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent=(
@@ -104,21 +72,22 @@ class FTScraperSG:
 
             await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
-
-            try:
-                await page.wait_for_selector("#btnTermsAccept", timeout=5000)
-                logger.info("Gateway modal detected — clicking ACCEPT")
-                await page.locator("#btnTermsAccept").click()
-                await asyncio.sleep(2)
-            except Exception as e:
-                logger.debug(f"Gateway modal not shown or already accepted: {e}")
-
-            try:
-                await page.locator("#onetrust-accept-btn-handler").click(timeout=3000)
-                logger.debug("Cookie banner accepted")
-            except:
-                logger.debug("No cookie banner")
+            await wait_until_ready(page, self.sleep_time)
+
+            with run_report.span("consent"):
+                try:
+                    await page.wait_for_selector("#btnTermsAccept", timeout=5000)
+                    logger.info("Gateway modal detected — clicking ACCEPT")
+                    await page.locator("#btnTermsAccept").click()
+                    await asyncio.sleep(2)
+                except Exception as e:
+                    logger.debug(f"Gateway modal not shown or already accepted: {e}")
+
+                try:
+                    await page.locator("#onetrust-accept-btn-handler").click(timeout=3000)
+                    logger.debug("Cookie banner accepted")
+                except:
+                    logger.debug("No cookie banner")
 
             while True:
                 if self.stop_pagination:
@@ -183,41 +152,35 @@ class FTScraperSG:
                 if await next_btn.count() > 0 and await next_btn.is_visible():
                     try:
                         await next_btn.click()
-                        await asyncio.sleep(self.sleep_time)
+                        await wait_until_ready(page, self.sleep_time)
                     except:
                         break
                 else:
                     break
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
 
             logger.info(f"Finished scraping {len(self.items)} total articles")
             return self.items
 
     async def scrape_article_pages(self, context):
-        page = await context.new_page()
-
-        for idx, item in enumerate(self.items, start=1):
-            url = item["article_url"]
-
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
+        await fetch_articles(context, self.items, self.scrape_article)
 
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
 
-                contents = await page.locator(".articles-promo__glance-content").all_text_contents()
-                content = " ".join([c.strip() for c in contents])
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-                item["article_content"] = content
+        await page.goto(url, timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
 
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx}: {e}")
+        contents = await page.locator(".articles-promo__glance-content").all_text_contents()
+        content = " ".join([c.strip() for c in contents])
 
-        await page.close()
+        item["article_content"] = content
 
 async def FTSGFP(target_date):
     try:
@@ -225,12 +188,10 @@ async def FTSGFP(target_date):
         scraper = FTScraperSG(target_date)
         results = await scraper.scrape(url)
 
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} SG articles after {target_date}")
-        return 200
+        return results
 
     except Exception as e:
         logger.error(f"Error: {e}")
@@ -1,11 +1,14 @@
 import asyncio
-import json
 import logging
 import sys
 import re
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 site = "Franklin Templeton"
 section = "Insights"
@@ -31,15 +34,15 @@ class FTScraperUS:
         self.stop_pagination = False
 
     def normalize_date(self, raw):
-        try:
-            raw = raw.strip()
-            if re.match(r"^[A-Za-z]+\s+\d{4}$", raw):
-                dt = parser.parse(raw, fuzzy=True)
-                return datetime(dt.year, dt.month, 1).date()
-            return parser.parse(raw, fuzzy=True).date()
-        except:
+        parsed = parse_date(raw, site=company_site_id)
+        if not parsed:
             return self.target_date
+        # "March 2025" is dated the first of the month
+        if re.match(r"^[A-Za-z]+\s+\d{4}$", raw.strip()):
+            return parsed.replace(day=1)
+        return parsed
 
+    @run_report.timed("consent")
     async def handle_feedback_survey(self, page):
         try:
             await page.wait_for_timeout(1000)
@@ -60,41 +63,7 @@ class FTScraperUS:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696"
-                ]
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent=(
@@ -120,13 +89,14 @@ class FTScraperUS:
 
             await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            try:
-                await page.locator("#onetrust-accept-btn-handler").click(timeout=3000)
-                logger.debug("Cookie banner accepted")
-            except:
-                logger.debug("No cookie banner")
+            with run_report.span("consent"):
+                try:
+                    await page.locator("#onetrust-accept-btn-handler").click(timeout=3000)
+                    logger.debug("Cookie banner accepted")
+                except:
+                    logger.debug("No cookie banner")
             await self.handle_feedback_survey(page)
             while True:
                 if self.stop_pagination:
@@ -192,7 +162,7 @@ class FTScraperUS:
                 if await next_btn.count() > 0 and await next_btn.is_visible():
                     try:
                         await next_btn.click()
-                        await asyncio.sleep(self.sleep_time)
+                        await wait_until_ready(page, self.sleep_time)
                         await self.handle_feedback_survey(page)
                     except:
                         break
@@ -201,36 +171,29 @@ class FTScraperUS:
 
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
 
             logger.info(f"Finished scraping {len(self.items)} total articles")
             return self.items
 
     async def scrape_article_pages(self, context):
         logger.debug("Scraping article detail pages...")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-        page = await context.new_page()
-
-        for idx, item in enumerate(self.items, start=1):
-            url = item["article_url"]
-
-            if url.endswith(".pdf"):
-                item["article_content"] = url
-                continue
-
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
 
-                contents = await page.locator(".articles-promo__glance-content").all_text_contents()
-                content = " ".join([c.strip() for c in contents])
+        if url.endswith(".pdf"):
+            item["article_content"] = url
+            return
 
-                item["article_content"] = content
+        await page.goto(url, timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
 
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx}: {e}")
+        contents = await page.locator(".articles-promo__glance-content").all_text_contents()
+        content = " ".join([c.strip() for c in contents])
 
-        await page.close()
+        item["article_content"] = content
 
 async def FTUSFP(target_date):
     try:
@@ -238,14 +201,11 @@ async def FTUSFP(target_date):
         scraper = FTScraperUS(target_date)
         results = await scraper.scrape(url)
 
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} U.S. articles after {target_date}")
-        logger.info(f"Saved JSON to: {output_path}")
 
-        return 200
+        return results
 
     except Exception as e:
         logger.error(f"Error: {e}")
@@ -1,9 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from listing_boundary import ListingBoundary
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "Goldman Sachs AM International"
@@ -12,6 +16,8 @@ company_site_id = "am-269"
 country = "United States"
 role = "Financial Intermediary"
 BASE_URL = "https://am.gs.com"
+# Publication date on an article page, as "Mar 3, 2025 | 5 min read".
+ARTICLE_DATE_SELECTOR = "span.gs-text.gs-uitk-c-lkyj7q--text-root"
 
 # --- Logging setup ---
 logging.basicConfig(
@@ -31,6 +37,7 @@ class GSAMScraperGlobal:
         self.items = []
         self.seen_slugs = set()
 
+    @run_report.timed("consent")
     async def handle_audience_popup(self, page):
         try:
             await page.wait_for_timeout(1500)
@@ -57,39 +64,38 @@ class GSAMScraperGlobal:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(
+            company_site_id,
+            args=[
+                "--disable-gpu",
+                "--no-sandbox",
+                "--disable-dev-shm-usage",
+                "--no-zygote",
+                "--disable-setuid-sandbox",
+                "--disable-accelerated-2d-canvas",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "--disable-background-networking",
+                "--disable-background-timer-throttling",
+                "--disable-client-side-phishing-detection",
+                "--disable-component-update",
+                "--disable-default-apps",
+                "--disable-domain-reliability",
+                "--disable-features=AudioServiceOutOfProcess",
+                "--disable-hang-monitor",
+                "--disable-ipc-flooding-protection",
+                "--disable-popup-blocking",
+                "--disable-prompt-on-repost",
+                "--disable-renderer-backgrounding",
+                "--disable-sync",
+                "--force-color-profile=srgb",
+                "--metrics-recording-only",
+                "--mute-audio",
+                "--no-pings",
+                "--use-gl=swiftshader",
+                "--window-size=1280,1696",
+            ],
+        ) as browser:
             context = await browser.new_context(
                 user_agent=(
                     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -98,13 +104,18 @@ class GSAMScraperGlobal:
                 )
             )
             page = await context.new_page()
-            article_page = await context.new_page() 
 
             await page.goto(url, timeout=120000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
             await self.handle_audience_popup(page)
 
-            stop_all = False
+            # Cards are read from the listing; only the last card's date
+            # decides whether to load more, and articles are fetched after.
+            boundary = ListingBoundary(
+                context, self.target_date, site=company_site_id,
+                article_date_selector=ARTICLE_DATE_SELECTOR,
+                clean=lambda text: text.split("|")[0].strip(),
+            )
 
             while True:
                 cards = await page.locator(
@@ -130,54 +141,23 @@ class GSAMScraperGlobal:
                     except:
                         title = None
 
-                    await article_page.goto(article_url, timeout=120000)
-                    await asyncio.sleep(self.sleep_time)
-
-                    try:
-                        raw_date = await article_page.locator(
-                            "span.gs-text.gs-uitk-c-lkyj7q--text-root"
-                        ).first.text_content()
-                        raw_date = raw_date.split("|")[0].strip()
-                        article_date = parser.parse(raw_date).date()
-                    except:
-                        article_date = None
-
-                    if article_date and article_date < self.target_date:
-                        stop_all = True
-                        break
-
-                    try:
-                        description = await article_page.locator(
-                            "span.gs-text.gs-uitk-c-13zhy10--text-root--text"
-                        ).first.text_content()
-                        description = description.strip()
-                    except:
-                        description = None
-
-                    try:
-                        blocks = await article_page.locator(
-                            "div[data-testid='rich-text-component']"
-                        ).all_text_contents()
-                        content = " ".join(x.strip() for x in blocks if x.strip())
-                    except:
-                        content = ""
-
                     self.items.append({
                         "company_site_id": company_site_id,
                         "company_site_country": country,
                         "company_site_role": role,
                         "article_source": site,
                         "article_section": section,
-                        "article_date": str(article_date) if article_date else None,
+                        "article_date": None,
                         "article_title": title,
-                        "article_description": description,
-                        "article_content": content,
+                        "article_description": None,
+                        "article_content": None,
                         "article_tags": [],
                         "article_slug": slug,
                         "article_url": article_url,
                     })
 
-                if stop_all:
+                last_href = await cards[-1].get_attribute("href") if cards else None
+                if not last_href or await boundary.reached(BASE_URL + last_href, card=cards[-1], page=page):
                     break
 
                 load_more = page.locator(
@@ -185,16 +165,54 @@ class GSAMScraperGlobal:
                 )
                 if await load_more.count() > 0 and await load_more.is_visible():
                     await load_more.click()
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(
+                        page, self.sleep_time,
+                        count_selector="a[data-gs-uitk-component='link'][data-analytics-component-name='insight card']",
+                        previous_count=len(cards),
+                    )
                 else:
                     break
 
-            await article_page.close()
             await page.close()
+            await fetch_articles(context, self.items, self.scrape_article)
             await context.close()
-            await browser.close()
 
-            return self.items
+            # Undated articles are kept, as before
+            return [
+                item for item in self.items
+                if not item["article_date"] or item["article_date"] >= str(self.target_date)
+            ]
+
+    async def scrape_article(self, page, item):
+        await page.goto(item["article_url"], timeout=120000)
+        await wait_until_ready(page, self.sleep_time)
+
+        try:
+            raw_date = await page.locator(ARTICLE_DATE_SELECTOR).first.text_content()
+            raw_date = raw_date.split("|")[0].strip()
+            article_date = parser.parse(raw_date).date()
+        except:
+            article_date = None
+
+        try:
+            description = await page.locator(
+                "span.gs-text.gs-uitk-c-13zhy10--text-root--text"
+            ).first.text_content()
+            description = description.strip()
+        except:
+            description = None
+
+        try:
+            blocks = await page.locator(
+                "div[data-testid='rich-text-component']"
+            ).all_text_contents()
+            content = " ".join(x.strip() for x in blocks if x.strip())
+        except:
+            content = ""
+
+        item["article_date"] = str(article_date) if article_date else None
+        item["article_description"] = description
+        item["article_content"] = content
 
 
 async def GSAMUSFI(target_date):
@@ -203,11 +221,10 @@ async def GSAMUSFI(target_date):
         "https://am.gs.com/en-us/advisors/insights/list"
     )
 
-    with open(f"/tmp/{company_site_id}.json", "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} GSAM articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
@@ -0,0 +1,293 @@
+import logging
+import os
+import re
+from html.parser import HTMLParser
+
+logger = logging.getLogger("HTTP_ARTICLES")
+
+# Set HTTP_ARTICLES=0 to send every article through the browser again.
+HTTP_ARTICLES_ENABLED = os.getenv("HTTP_ARTICLES", "1") != "0"
+HTTP_ARTICLE_TIMEOUT = float(os.getenv("HTTP_ARTICLE_TIMEOUT", "30"))
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+# Text under these never shows up as article copy.
+SKIPPED_TEXT_TAGS = {"script", "style", "template", "noscript"}
+
+# HTML5 end tags a browser implies: a start tag of these closes an open <p>.
+P_CLOSING_TAGS = {
+    "address", "article", "aside", "blockquote", "details", "dialog", "div",
+    "dl", "dd", "dt", "fieldset", "figcaption", "figure", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hgroup", "hr", "li",
+    "main", "menu", "nav", "ol", "p", "pre", "section", "summary", "table", "ul",
+}
+# Elements an implied end tag never looks past.
+SCOPE_TAGS = {"applet", "button", "caption", "html", "marquee", "object", "table", "td", "th", "template"}
+# Start tag -> (open tags it closes, tags the search for them stops at).
+IMPLIED_END_TAGS = {
+    "li": ({"li"}, SCOPE_TAGS | {"ol", "ul"}),
+    "dt": ({"dt", "dd"}, SCOPE_TAGS | {"dl"}),
+    "dd": ({"dt", "dd"}, SCOPE_TAGS | {"dl"}),
+    "option": ({"option"}, SCOPE_TAGS | {"select", "datalist", "optgroup"}),
+    "optgroup": ({"option", "optgroup"}, SCOPE_TAGS | {"select"}),
+    "tr": ({"tr"}, {"table", "thead", "tbody", "tfoot"}),
+    "td": ({"td", "th"}, {"table", "tr"}),
+    "th": ({"td", "th"}, {"table", "tr"}),
+    "thead": ({"thead", "tbody", "tfoot"}, {"table"}),
+    "tbody": ({"thead", "tbody", "tfoot"}, {"table"}),
+    "tfoot": ({"thead", "tbody", "tfoot"}, {"table"}),
+}
+
+_COMPOUND_RE = re.compile(r"^(?P<tag>[\w-]+|\*)?(?P<rest>(?:[.#][\w-]+|\[[^\]]+\])*)$")
+_PART_RE = re.compile(r"([.#])([\w-]+)|\[\s*([\w-]+)\s*(?:=\s*(?:'([^']*)'|\"([^\"]*)\"|([^'\"\]\s]*)))?\s*\]")
+
+
+class _Node:
+    __slots__ = ("tag", "attrs", "classes", "parent", "children")
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = set((attrs.get("class") or "").split())
+        self.parent = parent
+        self.children = []
+
+    def iter(self):
+        for child in self.children:
+            if isinstance(child, _Node):
+                yield child
+                yield from child.iter()
+
+    def text_content(self):
+        parts = []
+        for child in self.children:
+            if isinstance(child, _Node):
+                if child.tag not in SKIPPED_TEXT_TAGS:
+                    parts.append(child.text_content())
+            else:
+                parts.append(child)
+        return "".join(parts)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#document", {}, None)
+        self._current = self.root
+
+    def _close_open(self, tags, boundaries):
+        """Close the innermost open element in ``tags``, unless a boundary comes first."""
+        node = self._current
+        while node is not self.root and node.tag not in boundaries:
+            if node.tag in tags:
+                self._current = node.parent
+                return
+            node = node.parent
+
+    def handle_starttag(self, tag, attrs):
+        if tag in P_CLOSING_TAGS:
+            self._close_open({"p"}, SCOPE_TAGS)
+        if tag in IMPLIED_END_TAGS:
+            closed, boundaries = IMPLIED_END_TAGS[tag]
+            self._close_open(closed, boundaries)
+        node = _Node(tag, {k: v or "" for k, v in attrs}, self._current)
+        self._current.children.append(node)
+        if tag not in VOID_TAGS:
+            self._current = node
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in P_CLOSING_TAGS:
+            self._close_open({"p"}, SCOPE_TAGS)
+        self._current.children.append(_Node(tag, {k: v or "" for k, v in attrs}, self._current))
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open tag; stray end tags are ignored.
+        node = self._current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self._current = node.parent
+
+    def handle_data(self, data):
+        self._current.children.append(data)
+
+
+def _parse_compound(text):
+    match = _COMPOUND_RE.match(text)
+    if not match:
+        raise ValueError(f"Unsupported selector: {text!r}")
+    tag = match.group("tag")
+    checks = []
+    for kind, name, attr, single, double, bare in _PART_RE.findall(match.group("rest")):
+        value = single or double or bare
+        if kind == ".":
+            checks.append(("class", name, None))
+        elif kind == "#":
+            checks.append(("attr", "id", name))
+        else:
+            checks.append(("attr", attr, value if value else None))
+    return (None if tag in (None, "*") else tag.lower()), checks
+
+
+def _tokenize(selector):
+    """
+    Split a selector list into groups of tokens (compound selectors and
+    ">"), leaving quoted attribute values whole.
+    """
+    groups, tokens, token = [], [], []
+    quote, in_brackets = None, False
+    for char in selector:
+        if quote:
+            token.append(char)
+            if char == quote:
+                quote = None
+            continue
+        if in_brackets:
+            token.append(char)
+            if char in "'\"":
+                quote = char
+            elif char == "]":
+                in_brackets = False
+            continue
+        if char.isspace() or char in ">,":
+            if token:
+                tokens.append("".join(token))
+                token = []
+            if char == ">":
+                tokens.append(">")
+            elif char == ",":
+                groups.append(tokens)
+                tokens = []
+            continue
+        token.append(char)
+        in_brackets = char == "["
+    if quote or in_brackets:
+        raise ValueError(f"Unsupported selector: {selector!r}")
+    if token:
+        tokens.append("".join(token))
+    groups.append(tokens)
+    return groups
+
+
+def _parse_selector(selector):
+    """Split a selector list into chains of (combinator, compound) from left to right."""
+    chains = []
+    for tokens in _tokenize(selector):
+        chain, combinator = [], " "
+        for token in tokens:
+            if token == ">":
+                combinator = ">"
+                continue
+            chain.append((combinator, _parse_compound(token)))
+            combinator = " "
+        if chain:
+            chains.append(chain)
+    return chains
+
+
+def _matches_compound(node, compound):
+    tag, checks = compound
+    if tag is not None and node.tag != tag:
+        return False
+    for kind, name, value in checks:
+        if kind == "class":
+            if name not in node.classes:
+                return False
+        elif name not in node.attrs or (value is not None and node.attrs[name] != value):
+            return False
+    return True
+
+
+def _matches_chain(node, chain, index=None):
+    index = len(chain) - 1 if index is None else index
+    combinator, compound = chain[index]
+    if not _matches_compound(node, compound):
+        return False
+    if index == 0:
+        return True
+    parent = node.parent
+    if combinator == ">":
+        return parent is not None and parent.tag != "#document" and _matches_chain(parent, chain, index - 1)
+    while parent is not None and parent.tag != "#document":
+        if _matches_chain(parent, chain, index - 1):
+            return True
+        parent = parent.parent
+    return False
+
+
+class HtmlDocument:
+    """
+    Parsed static HTML with the small slice of the Playwright locator API the
+    article handlers use. Supports tag, class, id and attribute selectors,
+    descendant and child combinators, and selector lists. End tags HTML5
+    lets pages omit (</p>, </li>, table cells) are implied as a browser does.
+    """
+
+    def __init__(self, html):
+        builder = _TreeBuilder()
+        builder.feed(html)
+        builder.close()
+        self.root = builder.root
+
+    def query_all(self, selector):
+        chains = _parse_selector(selector)
+        return [
+            node for node in self.root.iter()
+            if any(_matches_chain(node, chain) for chain in chains)
+        ]
+
+    def all_text_contents(self, selector):
+        return [node.text_content() for node in self.query_all(selector)]
+
+    def has_text(self, selector):
+        return any(text.strip() for text in self.all_text_contents(selector))
+
+
+class HttpArticleReader:
+    """
+    Fetches article pages without rendering them.
+
+    Requests go through the browser context's request client, which keeps
+    connections alive and shares the context's cookies, user agent and
+    headers. The page counts as server-rendered when ``required_selector``
+    has text in the raw HTML; otherwise the caller falls back to the browser.
+
+    Called with an item it is a ``fast_path`` for ``fetch_articles``:
+    ``parse(doc, item)`` fills the item and the call returns True.
+    """
+
+    def __init__(self, context, required_selector, parse=None, timeout=None):
+        self.context = context
+        self.required_selector = required_selector
+        self.parse = parse
+        self.timeout = timeout or HTTP_ARTICLE_TIMEOUT
+
+    async def fetch(self, url):
+        """Return the parsed page, or None if it has to be rendered in the browser."""
+        if not HTTP_ARTICLES_ENABLED or not url or url.lower().endswith(".pdf"):
+            return None
+        try:
+            response = await self.context.request.get(
+                url, timeout=self.timeout * 1000, fail_on_status_code=False
+            )
+            if not response.ok or "html" not in response.headers.get("content-type", "html"):
+                logger.debug(f"HTTP {response.status} for {url}, using browser")
+                return None
+            doc = HtmlDocument(await response.text())
+        except Exception as e:
+            logger.debug(f"HTTP fetch failed for {url} ({e}), using browser")
+            return None
+
+        if not doc.has_text(self.required_selector):
+            logger.debug(f"{self.required_selector} not in static HTML of {url}, using browser")
+            return None
+        return doc
+
+    async def __call__(self, item):
+        doc = await self.fetch(item.get("article_url"))
+        if doc is None:
+            return False
+        self.parse(doc, item)
+        return True
@@ -1,11 +1,14 @@
 import asyncio
-import json
 import logging
 import sys
-import re
-from datetime import datetime, timedelta
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from section_crawl import discover_sections
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 # --- Site metadata ---
 site = "J.P. Morgan Asset Management"
@@ -32,15 +35,8 @@ class JPMScraperGlobal:
         self.target_date = parser.parse(target_date, fuzzy=True).date()
         self.sleep_time = sleep_time
         self.items = []
-        self.seen_slugs = set()
-
-    def parse_relative_date(self, raw):
-        raw = raw.lower().strip()
-        m = re.search(r"(\d+)\s+day", raw)
-        if m:
-            return datetime.today().date() - timedelta(days=int(m.group(1)))
-        return None
 
+    @run_report.timed("consent")
     async def handle_popups(self, page):
         try:
             await page.wait_for_timeout(1000)
@@ -62,197 +58,149 @@ class JPMScraperGlobal:
                     continue
         except:
             pass
-    async def scrape(self, url):
-        logger.info(f"Starting scraper for URL: {url}")
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=False,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--disable-dev-shm-usage",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696"
-                ]
-            )
+    async def scrape(self, urls):
+        logger.info(f"Starting scraper for {len(urls)} sections")
+
+        async with browser_session(company_site_id, headless=False) as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
-            page = await context.new_page()
-
-            await page.set_extra_http_headers({
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Connection": "keep-alive",
-            })
-
-            await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
 
-            logger.info(f"Scraping listing page: {url}")
-            await page.goto(url, timeout=120000)
-            await asyncio.sleep(self.sleep_time)
-
-            await self.handle_popups(page)
-            while True:
-                await asyncio.sleep(2)
+            self.items = await discover_sections(context, urls, self.scrape_section)
+            await self.scrape_article_pages(context)
+            await context.close()
 
-                try:
-                    cards = await page.locator("div.AMCard").all()
+            self.items = [item for item in self.items if item["article_content"]]
+            return self.items
 
-                    if cards:
-                        logger.info(f"Currently loaded cards: {len(cards)}")
+    async def scrape_section(self, page, url):
+        await page.set_extra_http_headers({
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.5",
+            "Connection": "keep-alive",
+        })
 
-                        last_raw = await cards[-1].locator(
-                            "span.EditorialLandingPage_tileFooterDate"
-                        ).text_content()
+        await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
 
-                        last_raw = last_raw.strip()
+        logger.info(f"Scraping listing page: {url}")
+        await page.goto(url, timeout=120000)
+        await wait_until_ready(page, self.sleep_time)
 
-                        if "-" in last_raw:
-                            last_date = parser.parse(last_raw).date()
-                        else:
-                            last_date = self.parse_relative_date(last_raw) or self.target_date
+        await self.handle_popups(page)
+        while True:
+            await asyncio.sleep(2)
 
-                        if last_date < self.target_date:
-                            logger.info(f"Stopping View More — hit old article ({last_date})")
-                            break
+            try:
+                cards = await page.locator("div.AMCard").all()
 
-                    try:
-                        view_more_btn = page.get_by_role("button", name="View more")
-                        if await view_more_btn.is_visible():
-                            logger.info("Clicking VIEW MORE button")
-                            await view_more_btn.click()
-                            await asyncio.sleep(self.sleep_time)
-                            await self.handle_popups(page)
-                            continue
-                    except:
-                        pass
+                if cards:
+                    logger.info(f"Currently loaded cards: {len(cards)}")
 
-                    logger.info("No more View More button visible — stop loading.")
-                    break
+                    last_raw = await cards[-1].locator(
+                        "span.EditorialLandingPage_tileFooterDate"
+                    ).text_content()
 
-                except Exception as e:
-                    logger.error(f"Error while expanding results: {e}")
-                    break
+                    last_raw = last_raw.strip()
 
-            cards = await page.locator("div.AMCard").all()
+                    last_date = parse_date(last_raw, site=company_site_id, fuzzy=False) or self.target_date
 
-            for card in cards:
-                try:
-                    title = await card.locator("div.AMCard_title div").text_content()
-                    title = title.strip()
-                except:
-                    title = None
+                    if last_date < self.target_date:
+                        logger.info(f"Stopping View More — hit old article ({last_date})")
+                        break
 
                 try:
-                    href = await card.locator("a.AMCard_button").get_attribute("href")
-                    slug = href.rstrip("/").split("/")[-1] if href else None
+                    view_more_btn = page.get_by_role("button", name="View more")
+                    if await view_more_btn.is_visible():
+                        logger.info("Clicking VIEW MORE button")
+                        await view_more_btn.click()
+                        await wait_until_ready(page, self.sleep_time)
+                        await self.handle_popups(page)
+                        continue
                 except:
-                    href = slug = None
-
-                if not href:
-                    continue
+                    pass
 
-                url_full = href if href.startswith("http") else BASE_URL + href
+                logger.info("No more View More button visible — stop loading.")
+                break
 
-                if slug in self.seen_slugs:
-                    continue
-                self.seen_slugs.add(slug)
+            except Exception as e:
+                logger.error(f"Error while expanding results: {e}")
+                break
 
-                try:
-                    description = await card.locator("div.AMCard_description div").text_content()
-                    description = description.strip()
-                except:
-                    description = None
+        cards = await page.locator("div.AMCard").all()
 
-                try:
-                    raw_date = await card.locator("span.EditorialLandingPage_tileFooterDate").text_content()
-                    raw_date = raw_date.strip()
-                except:
-                    raw_date = ""
+        items = []
+        for card in cards:
+            try:
+                title = await card.locator("div.AMCard_title div").text_content()
+                title = title.strip()
+            except:
+                title = None
 
-                if "-" in raw_date:
-                    parsed_date = parser.parse(raw_date).date()
-                else:
-                    parsed_date = self.parse_relative_date(raw_date) or self.target_date
+            try:
+                href = await card.locator("a.AMCard_button").get_attribute("href")
+                slug = href.rstrip("/").split("/")[-1] if href else None
+            except:
+                href = slug = None
 
-                if parsed_date < self.target_date:
-                    continue
+            if not href:
+                continue
 
-                self.items.append({
-                    "company_site_id": company_site_id,
-                    "company_site_country": country,
-                    "company_site_role": role,
-                    "article_source": site,
-                    "article_section": section,
-                    "article_date": str(parsed_date),
-                    "article_title": title,
-                    "article_description": description,
-                    "article_content": None,
-                    "article_tags": [],
-                    "article_slug": slug,
-                    "article_url": url_full
-                })
+            url_full = href if href.startswith("http") else BASE_URL + href
 
-            await self.scrape_article_pages(context)
-            await browser.close()
+            try:
+                description = await card.locator("div.AMCard_description div").text_content()
+                description = description.strip()
+            except:
+                description = None
 
-            self.items = [item for item in self.items if item["article_content"]]
-            return self.items
+            try:
+                raw_date = await card.locator("span.EditorialLandingPage_tileFooterDate").text_content()
+                raw_date = raw_date.strip()
+            except:
+                raw_date = ""
 
-    async def scrape_article_pages(self, context):
-        page = await context.new_page()
+            parsed_date = parse_date(raw_date, site=company_site_id, fuzzy=False) or self.target_date
 
-        for idx, item in enumerate(self.items, start=1):
-            url = item["article_url"]
-            if not url:
+            if parsed_date < self.target_date:
                 continue
 
-            try:
-                await page.goto(url, timeout=120000)
-                await asyncio.sleep(self.sleep_time)
+            items.append({
+                "company_site_id": company_site_id,
+                "company_site_country": country,
+                "company_site_role": role,
+                "article_source": site,
+                "article_section": section,
+                "article_date": str(parsed_date),
+                "article_title": title,
+                "article_description": description,
+                "article_content": None,
+                "article_tags": [],
+                "article_slug": slug,
+                "article_url": url_full
+            })
+        return items
 
-                try:
-                    blocks = await page.locator("div.jpm-am-editorial-rich-text-field").all_text_contents()
-                    full_text = " ".join([x.strip() for x in blocks if x.strip()])
-                except:
-                    full_text = ""
+    async def scrape_article_pages(self, context):
+        await fetch_articles(context, self.items, self.scrape_article)
 
-                item["article_content"] = full_text
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
 
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx}: {e}")
+        await page.goto(url, timeout=120000)
+        await wait_until_ready(page, self.sleep_time)
 
-        await page.close()
+        try:
+            blocks = await page.locator("div.jpm-am-editorial-rich-text-field").all_text_contents()
+            full_text = " ".join([x.strip() for x in blocks if x.strip()])
+        except:
+            full_text = ""
+
+        item["article_content"] = full_text
 
 
 async def JPMUKFA(target_date):
-    results = []
     try:
         urls = [
             "https://am.jpmorgan.com/gb/en/asset-management/adv/insights/market-insights/",
@@ -262,23 +210,11 @@ async def JPMUKFA(target_date):
         ]
 
         scraper = JPMScraperGlobal(target_date)
-        for url in urls:
-            logger.info(f"Starting scrape for: {url}")
-            try:
-                part_results = await scraper.scrape(url)
-                results.extend(part_results)
-            except Exception as e:
-                logger.error(f"Failed scraping {url}: {e}")
-        dedup = {}
-        for item in results:
-            dedup[item["article_slug"]] = item
-        final_results = list(dedup.values())
-
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(final_results, f, indent=4, ensure_ascii=False)
+        final_results = await scraper.scrape(urls)
+
+        write_debug_output(company_site_id, final_results)
         logger.info(f"Scraped {len(final_results)} JPM articles after {target_date}")
-        return 200
+        return final_results
 
     except Exception as error:
         logger.error(f"Error: {error}")
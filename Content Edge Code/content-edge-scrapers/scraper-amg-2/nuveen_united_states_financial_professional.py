@@ -1,11 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
-import os
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "Nuveen Investments"
@@ -35,40 +36,7 @@ class NuveenScraperUS:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=False,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696"
-                ]
-            )
+        async with browser_session(company_site_id, headless=False) as browser:
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
@@ -89,15 +57,16 @@ class NuveenScraperUS:
             })
             await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            # Accept cookies if present
-            try:
-                await page.locator("button#onetrust-accept-btn-handler").click(timeout=5000)
-                logger.debug("Cookie accept clicked")
-                await asyncio.sleep(1)
-            except:
-                pass
+            with run_report.span("consent"):
+                # Accept cookies if present
+                try:
+                    await page.locator("button#onetrust-accept-btn-handler").click(timeout=5000)
+                    logger.debug("Cookie accept clicked")
+                    await asyncio.sleep(1)
+                except:
+                    pass
 
             # Determine total pages 
             total_pages = 1
@@ -135,7 +104,7 @@ class NuveenScraperUS:
                         # Wait for the new results to load
                         await page.wait_for_selector(".nuv-search-results__list-item", timeout=15000)
                         await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                        await asyncio.sleep(self.sleep_time) # Wait for page stability
+                        await wait_until_ready(page, self.sleep_time) # Wait for page stability
 
                     except Exception as e:
                         logger.warning(f"Failed to click or load page {p_no}: {e}. Stopping pagination.")
@@ -193,7 +162,7 @@ class NuveenScraperUS:
             # --- Scrape individual article pages ---
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             logger.info(f"Finished scraping {len(self.items)} total articles")
             # Filter out articles that failed to get content
             self.items = [item for item in self.items if item["article_content"]] 
@@ -201,74 +170,68 @@ class NuveenScraperUS:
 
     async def scrape_article_pages(self, context):
         logger.debug("Starting to scrape individual article pages...")
-
-        page = await context.new_page()
-        for idx, item in enumerate(self.items, start=1):
-            url = item["article_url"]
-            if not url:
-                continue
-
-            try:
-                # Add a conditional to skip if content is already present (e.g., if you run the scraper multiple times)
-                if item.get("article_content") and item["article_content"] is not None:
-                    continue
-                    
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-
-                # Extract description
-                try:
-                    desc_locator = page.locator('meta[name="description"]')
-                    # Check if the locator exists before trying to get attribute
-                    if await desc_locator.count() > 0:
-                        desc = await desc_locator.get_attribute("content")
-                        item["article_description"] = desc
-                except:
-                    item["article_description"] = None
-
-                # Extract tags
-                try:
-                    tags = await page.locator(".nuv-header-article__tout").all_text_contents()
-                    item["article_tags"] = [t.strip() for t in tags if t.strip()]
-                except:
-                    item["article_tags"] = []
-
-                # Extract main content
-                content_text = None
-                try:
-                    sel_candidates = [".nuv-article-content--center", "article", "main"]
-                    texts = []
-                    for sel in sel_candidates:
-                        # Use a stricter locator to avoid capturing header/footer content outside the main article body
-                        locator = page.locator(sel)
-                        if await locator.count() > 0:
-                             parts = await locator.all_text_contents()
-                             texts.extend([p.strip() for p in parts if p.strip()])
-                    
-                    # Remove duplicates and join
-                    content_text = " ".join(texts).strip()
-                    # Simple cleanup to remove excess whitespace
-                    content_text = ' '.join(content_text.split())
-                except:
-                    content_text = None
-                
-                item["article_content"] = content_text
-
-                # Attempt to get exact article date from page
-                try:
-                    time_el = page.locator("time").first
-                    if await time_el.count() > 0:
-                        time_attr = await time_el.get_attribute("datetime")
-                        if time_attr:
-                            parsed_date = parser.parse(time_attr, fuzzy=True).date()
-                            item["article_date"] = str(parsed_date)
-                except:
-                    pass
-
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx} ({url}): {e}")
-
-        await page.close()
+        await fetch_articles(context, self.items, self.scrape_article)
+
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
+
+        # Add a conditional to skip if content is already present (e.g., if you run the scraper multiple times)
+        if item.get("article_content") and item["article_content"] is not None:
+            return
+
+        await page.goto(url, timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
+
+        # Extract description
+        try:
+            desc_locator = page.locator('meta[name="description"]')
+            # Check if the locator exists before trying to get attribute
+            if await desc_locator.count() > 0:
+                desc = await desc_locator.get_attribute("content")
+                item["article_description"] = desc
+        except:
+            item["article_description"] = None
+
+        # Extract tags
+        try:
+            tags = await page.locator(".nuv-header-article__tout").all_text_contents()
+            item["article_tags"] = [t.strip() for t in tags if t.strip()]
+        except:
+            item["article_tags"] = []
+
+        # Extract main content
+        content_text = None
+        try:
+            sel_candidates = [".nuv-article-content--center", "article", "main"]
+            texts = []
+            for sel in sel_candidates:
+                # Use a stricter locator to avoid capturing header/footer content outside the main article body
+                locator = page.locator(sel)
+                if await locator.count() > 0:
+                     parts = await locator.all_text_contents()
+                     texts.extend([p.strip() for p in parts if p.strip()])
+
+            # Remove duplicates and join
+            content_text = " ".join(texts).strip()
+            # Simple cleanup to remove excess whitespace
+            content_text = ' '.join(content_text.split())
+        except:
+            content_text = None
+
+        item["article_content"] = content_text
+
+        # Attempt to get exact article date from page
+        try:
+            time_el = page.locator("time").first
+            if await time_el.count() > 0:
+                time_attr = await time_el.get_attribute("datetime")
+                if time_attr:
+                    parsed_date = parser.parse(time_attr, fuzzy=True).date()
+                    item["article_date"] = str(parsed_date)
+        except:
+            pass
 
 
 async def NuveenUSFA(target_date):
@@ -276,12 +239,9 @@ async def NuveenUSFA(target_date):
         url = "https://www.nuveen.com/en-us/insights?type=us"
         scraper = NuveenScraperUS(target_date)
         results = await scraper.scrape(url)
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
         logger.info(f"Scraped {len(results)} U.S. articles after {target_date}")
-        logger.info(f"Saved JSON at: {output_path}")
-        return 200
+        return results
     except Exception as error:
         logger.error(f"Error: {error}")
         return 500
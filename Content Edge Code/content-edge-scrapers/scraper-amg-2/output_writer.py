@@ -0,0 +1,242 @@
+import json
+import logging
+import os
+import zlib
+
+logger = logging.getLogger("OUTPUT_WRITER")
+
+# OUTPUT_FORMAT=jsonl (one article per line, default) or json (the original
+# pretty-printed array).
+OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "jsonl")
+# OUTPUT_COMPRESSION=none (default), gzip or zstd (needs the zstandard package).
+OUTPUT_COMPRESSION = os.getenv("OUTPUT_COMPRESSION", "none")
+# S3 multipart parts must be at least 5 MiB, except the last one.
+MULTIPART_PART_BYTES = max(int(os.getenv("MULTIPART_PART_BYTES", str(8 * 1024 * 1024))), 5 * 1024 * 1024)
+
+FORMATS = {
+    "jsonl": (".jsonl", "application/x-ndjson"),
+    "json": (".json", "application/json"),
+}
+
+
+# Content-Encoding, key suffix and leading magic bytes of each compression.
+COMPRESSIONS = {
+    "gzip": ("gzip", ".gz", b"\x1f\x8b"),
+    "zstd": ("zstd", ".zst", b"\x28\xb5\x2f\xfd"),
+}
+
+
+def output_extension(fmt=None, compression=None):
+    compression = compression or OUTPUT_COMPRESSION
+    suffix = COMPRESSIONS[compression][1] if compression in COMPRESSIONS else ""
+    return FORMATS[fmt or OUTPUT_FORMAT][0] + suffix
+
+
+class CompressedStream:
+    """Compresses everything written to it before passing it on to ``stream``."""
+
+    def __init__(self, stream, compression):
+        self.stream = stream
+        if compression == "gzip":
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        elif compression == "zstd":
+            import zstandard
+
+            self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        else:
+            raise ValueError(f"Unknown compression: {compression}")
+
+    def write(self, data):
+        chunk = self._compressor.compress(data)
+        if chunk:
+            self.stream.write(chunk)
+
+    def flush(self):
+        chunk = self._compressor.flush()
+        if chunk:
+            self.stream.write(chunk)
+
+
+class S3StreamUpload:
+    """
+    File-like sink that uploads to S3 as it is written.
+
+    Bytes are buffered until a part is full and then sent with
+    ``upload_part``; ``close`` sends the rest and completes the upload.
+    Output that never fills a part goes up with a single ``put_object``.
+    """
+
+    def __init__(self, client, bucket, key, content_type, part_size=None, content_encoding=None):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+        self.part_size = part_size or MULTIPART_PART_BYTES
+        self.bytes_written = 0
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._parts = []
+
+    def write(self, data):
+        self._buffer += data
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._send_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+
+    def _metadata(self):
+        metadata = {"ContentType": self.content_type}
+        if self.content_encoding:
+            metadata["ContentEncoding"] = self.content_encoding
+        return metadata
+
+    def _send_part(self, body):
+        if self._upload_id is None:
+            response = self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, **self._metadata()
+            )
+            self._upload_id = response["UploadId"]
+        number = len(self._parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id, PartNumber=number, Body=body
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": number})
+
+    def close(self):
+        if self._upload_id is None:
+            self.client.put_object(
+                Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer), **self._metadata()
+            )
+        else:
+            if self._buffer:
+                self._send_part(bytes(self._buffer))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        self._buffer.clear()
+
+    def abort(self):
+        if self._upload_id is not None:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            self._upload_id = None
+        self._buffer.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class JsonLinesWriter:
+    """Writes one compact JSON object per line."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def write(self, item):
+        line = json.dumps(item, ensure_ascii=False, default=str) + "\n"
+        self.stream.write(line.encode("utf-8"))
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+class JsonArrayWriter:
+    """
+    Writes items as one JSON array, item by item; the bytes match
+    ``json.dumps(items, indent=2, default=str)``.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def write(self, item):
+        text = json.dumps(item, indent=2, default=str).replace("\n", "\n  ")
+        self.stream.write((("[\n  " if self.count == 0 else ",\n  ") + text).encode("utf-8"))
+        self.count += 1
+
+    def close(self):
+        self.stream.write(b"\n]" if self.count else b"[]")
+
+
+WRITERS = {"jsonl": JsonLinesWriter, "json": JsonArrayWriter}
+
+
+def write_items(stream, items, fmt=None):
+    """Serialise ``items`` (any iterable) into ``stream`` one at a time; returns the item count."""
+    writer = WRITERS[fmt or OUTPUT_FORMAT](stream)
+    for item in items:
+        writer.write(item)
+    writer.close()
+    return writer.count
+
+
+def upload_items(client, items, bucket, key, fmt=None, part_size=None, compression=None):
+    """
+    Stream ``items`` to ``s3://bucket/key``, compressed when OUTPUT_COMPRESSION
+    (or ``compression``) says so; returns the number of bytes uploaded.
+    """
+    fmt = fmt or OUTPUT_FORMAT
+    compression = compression or OUTPUT_COMPRESSION
+    content_encoding = COMPRESSIONS[compression][0] if compression in COMPRESSIONS else None
+    with S3StreamUpload(client, bucket, key, FORMATS[fmt][1], part_size, content_encoding) as upload:
+        if content_encoding:
+            stream = CompressedStream(upload, compression)
+            count = write_items(stream, items, fmt)
+            stream.flush()
+        else:
+            count = write_items(upload, items, fmt)
+    logger.info(f"Uploaded {count} items ({upload.bytes_written} bytes) to s3://{bucket}/{key}")
+    return upload.bytes_written
+
+
+def decompress(body):
+    """Undo gzip or zstd compression, recognised by the magic bytes; other bytes pass through."""
+    if body.startswith(COMPRESSIONS["gzip"][2]):
+        return zlib.decompress(body, 47)
+    if body.startswith(COMPRESSIONS["zstd"][2]):
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return body
+
+
+def read_items(body):
+    """Items from an output object's bytes or text, in either format, compressed or not."""
+    if isinstance(body, bytes):
+        body = decompress(body).decode("utf-8")
+    text = body.lstrip()
+    if not text:
+        return []
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def read_output(client, bucket, key):
+    """Items of the output object at ``s3://bucket/key``."""
+    return read_items(client.get_object(Bucket=bucket, Key=key)["Body"].read())
+
+
+def get_s3_client():
+    """boto3's S3 client, or the on-disk stand-in when LOCAL_S3_DIR is set."""
+    local_dir = os.getenv("LOCAL_S3_DIR")
+    if local_dir:
+        from local_s3 import LocalS3Client
+
+        return LocalS3Client(local_dir)
+    import boto3
+
+    return boto3.client("s3")
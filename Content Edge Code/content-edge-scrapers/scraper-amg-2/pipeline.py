@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import os
+import time
+
+import crawl_state
+import run_report
+import sibling_articles
+from normalise import clean_data
+from output_writer import output_extension
+from sibling_articles import SIBLING_GROUPS, SharedArticles
+
+logger = logging.getLogger("PIPELINE")
+
+# Sites scraped at the same time in one batch invocation.
+SITES_IN_FLIGHT = int(os.getenv("SITES_IN_FLIGHT", "3"))
+
+
+class SitePipeline:
+    """
+    Runs scrapers from a registry and ships their output.
+
+    For each site: load its crawl state, run the scraper, clean the items it
+    returns, drop the ones captured before, upload to S3 and save the state.
+    Several sites can run in one process; they share the warm browser, the
+    event loop and the AWS clients.
+    """
+
+    def __init__(self, registry, bucket_name, upload, crawl_store=None, group=None, upload_report=None):
+        self.registry = registry
+        self.bucket_name = bucket_name
+        self.upload = upload
+        self.crawl_store = crawl_store
+        self.group = group
+        self.upload_report = upload_report
+
+    @staticmethod
+    def output_key(company_site_id, target_date, fmt=None):
+        target_date_str = "/".join(target_date.split("-"))
+        return f"output/website/{target_date_str}/{company_site_id}{output_extension(fmt)}"
+
+    @staticmethod
+    def report_key(company_site_id, target_date):
+        target_date_str = "/".join(target_date.split("-"))
+        return f"output/website/{target_date_str}/{company_site_id}.report.json"
+
+    async def run_site(self, company_site_id, target_date, full_crawl=False):
+        """
+        Scrape and upload one site.
+
+        Returns:
+            Dict with the site id, statusCode, number of articles uploaded,
+            the time taken in seconds and the run report (see ``run_report``)
+        """
+        report = run_report.SiteReport(company_site_id, target_date)
+        token = run_report.activate(report)
+        try:
+            result = await self._run_site(company_site_id, target_date, full_crawl)
+        finally:
+            run_report.deactivate(token)
+
+        result["report"] = report.summary()
+        report.log()
+        if self.upload_report is not None and result["statusCode"] == 200:
+            self.upload_report(result["report"], self.bucket_name, self.report_key(company_site_id, target_date))
+        return result
+
+    async def _run_site(self, company_site_id, target_date, full_crawl):
+        started = time.perf_counter()
+        result = {"company_site_id": company_site_id, "statusCode": 400, "articles": 0}
+
+        scraper_func = self.registry.get(company_site_id)
+        if scraper_func is None:
+            logger.error(f"Unknown company_site_id: {company_site_id}")
+            result["body"] = "Unknown company_site_id"
+            result["seconds"] = 0.0
+            return result
+
+        # Resume from what earlier runs captured unless a full crawl is asked for
+        state = None
+        if self.crawl_store is not None and not full_crawl:
+            state = self.crawl_store.load(company_site_id)
+        scrape_from = state.listing_start(target_date) if state else target_date
+
+        token = crawl_state.activate(company_site_id, state)
+        try:
+            response = await scraper_func(scrape_from)
+        finally:
+            crawl_state.deactivate(token)
+
+        # Scrapers return their items; anything else (a bare status code,
+        # None) means the site failed.
+        if isinstance(response, list):
+            data = response
+            result["statusCode"] = 200
+        else:
+            data = None
+            result["statusCode"] = response if isinstance(response, int) and response >= 400 else 500
+            result["body"] = f"Scraper returned {response!r} instead of a list of articles"
+            logger.error(f"{company_site_id}: {result['body']}")
+
+        if data is not None:
+            with run_report.span("clean_data"):
+                data = clean_data(data)
+            if state is not None:
+                data = state.new_items(data)
+
+            file_key = self.output_key(company_site_id, target_date)
+            with run_report.span("save_json_to_s3"):
+                uploaded = self.upload(data, self.bucket_name, file_key)
+            if not uploaded:
+                result["statusCode"] = 500
+                result["body"] = f"Upload to s3://{self.bucket_name}/{file_key} failed"
+            elif state is not None:
+                state.record(data, target_date)
+                self.crawl_store.save(state)
+            result["articles"] = len(data)
+
+        result["seconds"] = round(time.perf_counter() - started, 2)
+        logger.info(
+            f"{company_site_id}: status {result['statusCode']}, "
+            f"{result['articles']} articles in {result['seconds']}s"
+        )
+        return result
+
+    async def run_sites(self, site_ids, target_date, sites_in_flight=None, full_crawl=False):
+        """Run several sites with at most ``sites_in_flight`` at a time; one failure does not stop the rest."""
+        limit = asyncio.Semaphore(sites_in_flight or SITES_IN_FLIGHT)
+
+        async def run_one(company_site_id):
+            async with limit:
+                started = time.perf_counter()
+                try:
+                    return await self.run_site(company_site_id, target_date, full_crawl)
+                except Exception as e:
+                    logger.exception(f"{company_site_id} failed: {e}")
+                    return {
+                        "company_site_id": company_site_id,
+                        "statusCode": 500,
+                        "articles": 0,
+                        "body": str(e),
+                        "seconds": round(time.perf_counter() - started, 2),
+                    }
+
+        return await asyncio.gather(*(run_one(site_id) for site_id in site_ids))
+
+    def sibling_groups(self, names):
+        """Sibling groups named by a batch event ("all" for every group) with their sites in this registry."""
+        if names == "all":
+            names = list(SIBLING_GROUPS)
+        groups = {}
+        for name in names:
+            if name not in SIBLING_GROUPS:
+                raise ValueError(f"Unknown sibling group: {name}")
+            site_ids = [site_id for site_id in SIBLING_GROUPS[name] if site_id in self.registry]
+            if site_ids:
+                groups[name] = site_ids
+        return groups
+
+    async def run_siblings(self, group, site_ids, target_date, full_crawl=False):
+        """
+        Run the regional sites of one sibling group at the same time, so their
+        listings are discovered together and an article they share is fetched
+        once (see ``sibling_articles``). Each site still gets its own items.
+
+        Returns:
+            Per-site results and the group's fetched/shared article counts
+        """
+        shared = SharedArticles(group, site_ids)
+        sibling_articles.activate(shared)
+        try:
+            results = await self.run_sites(site_ids, target_date, len(site_ids), full_crawl)
+        finally:
+            sibling_articles.deactivate(shared)
+        logger.info(
+            f"Sibling group {group}: {shared.stats['fetched']} articles fetched, "
+            f"{shared.stats['shared']} reused across regions"
+        )
+        return results, dict(shared.stats)
+
+    def resolve_sites(self, event):
+        """
+        Site ids named by a batch event: ``company_site_ids`` (a list) or
+        ``site_group`` (this dispatcher's group name, or "all").
+        """
+        if event.get("company_site_ids"):
+            return list(dict.fromkeys(event["company_site_ids"]))
+
+        group = event.get("site_group")
+        if group in ("all", self.group):
+            return list(self.registry)
+        raise ValueError(f"Unknown site_group: {group}")
+
+    @staticmethod
+    def is_batch(event):
+        return "company_site_ids" in event or "site_group" in event or "sibling_groups" in event
+
+    async def run_batch(self, event, target_date):
+        """Handle a batch event and return the per-site results with overall timing."""
+        started = time.perf_counter()
+        if "sibling_groups" in event:
+            return await self.run_sibling_batch(event, target_date)
+        try:
+            site_ids = self.resolve_sites(event)
+        except ValueError as e:
+            logger.error(str(e))
+            return {"statusCode": 400, "body": str(e)}
+
+        logger.info(f"Batch of {len(site_ids)} sites for {target_date}")
+        results = await self.run_sites(
+            site_ids,
+            target_date,
+            sites_in_flight=event.get("sites_in_flight"),
+            full_crawl=event.get("full_crawl", False),
+        )
+        failed = [r["company_site_id"] for r in results if r["statusCode"] != 200]
+        return {
+            "statusCode": 200 if not failed else 207,
+            "target_date": target_date,
+            "sites": len(results),
+            "failed": failed,
+            "seconds": round(time.perf_counter() - started, 2),
+            "results": results,
+        }
+
+    async def run_sibling_batch(self, event, target_date):
+        """Handle a ``sibling_groups`` batch event: one group after another, each group's sites together."""
+        started = time.perf_counter()
+        try:
+            groups = self.sibling_groups(event["sibling_groups"])
+        except ValueError as e:
+            logger.error(str(e))
+            return {"statusCode": 400, "body": str(e)}
+
+        logger.info(f"Batch of {len(groups)} sibling groups for {target_date}")
+        results, articles = [], {}
+        for group, site_ids in groups.items():
+            group_results, articles[group] = await self.run_siblings(
+                group, site_ids, target_date, event.get("full_crawl", False)
+            )
+            results.extend(group_results)
+        failed = [r["company_site_id"] for r in results if r["statusCode"] != 200]
+        return {
+            "statusCode": 200 if not failed else 207,
+            "target_date": target_date,
+            "sites": len(results),
+            "failed": failed,
+            "sibling_groups": articles,
+            "seconds": round(time.perf_counter() - started, 2),
+            "results": results,
+        }
@@ -1,12 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
-import re
-import os
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from article_fetch import fetch_articles
+import run_report
+from date_parsing import parse_date
 
 # --- Site metadata ---
 site = "Robeco"
@@ -14,6 +15,7 @@ section = "Insights"
 country = "United Kingdom"
 role = "Corporate"
 company_site_id = "am-233"
+DATE_FORMATS = ("%d-%m-%Y",)
 BASE_URL = "https://www.robeco.com"
 
 logging.basicConfig(
@@ -34,64 +36,22 @@ class RobecoScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper for: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
             context = await browser.new_context(
                 user_agent=(
                     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) ""AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                 )
             )
 
-            async def route_handler(route, request):
-                if request.resource_type in ("image", "font", "stylesheet", "media"):
-                    await route.abort()
-                else:
-                    await route.continue_()
-            try:
-                await context.route("**/*", route_handler)
-            except Exception:
-                pass
-
             page = await context.new_page()
 
             await page.goto(url, timeout=120000, wait_until="domcontentloaded")
-            await asyncio.sleep(self.sleep_time)
-            try:
-                await page.locator("#attestationAccept").click(timeout=3000)
-            except:
-                pass
+            await wait_until_ready(page, self.sleep_time)
+            with run_report.span("consent"):
+                try:
+                    await page.locator("#attestationAccept").click(timeout=3000)
+                except:
+                    pass
             try:
                 while True:
                     try:
@@ -109,10 +69,7 @@ class RobecoScraper:
 
                     if date_nodes:
                         last_date_raw = date_nodes[-1].strip()
-                        try:
-                            last_date = datetime.strptime(last_date_raw, "%d-%m-%Y").date()
-                        except:
-                            last_date = parser.parse(last_date_raw, fuzzy=True).date()
+                        last_date = parse_date(last_date_raw, site=company_site_id, formats=DATE_FORMATS, dayfirst=True)
                     else:
                         last_date_raw = None
                         last_date = None
@@ -128,16 +85,16 @@ class RobecoScraper:
                         if await load_more_btn.count() > 0:
                             logger.info("Clicking 'Show more'")
                             await load_more_btn.first.click(timeout=15000)
-                            await asyncio.sleep(self.sleep_time)
+                            await wait_until_ready(page, self.sleep_time, count_selector="time[data-testid='app-date']", previous_count=len(date_nodes))
                             continue
                         else:
                             logger.info("Scrolling bottom — trying lazy load")
                             await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                            await asyncio.sleep(self.sleep_time + 0.5)
+                            await wait_until_ready(page, self.sleep_time + 0.5)
 
                             if await page.locator("button[data-testid='app-button']:has-text('Show more')").count() > 0:
                                 await page.locator("button[data-testid='app-button']:has-text('Show more')").first.click()
-                                await asyncio.sleep(self.sleep_time)
+                                await wait_until_ready(page, self.sleep_time, count_selector="time[data-testid='app-date']", previous_count=len(date_nodes))
                                 continue
                             else:
                                 logger.info("No more content to load — ending pagination")
@@ -196,10 +153,7 @@ class RobecoScraper:
                         except:
                             date_raw = None
                         if date_raw:
-                            try:
-                                card_date = datetime.strptime(date_raw.strip(), "%d-%m-%Y").date()
-                            except:
-                                card_date = parser.parse(date_raw.strip(), fuzzy=True).date()
+                            card_date = parse_date(date_raw, site=company_site_id, formats=DATE_FORMATS, dayfirst=True)
                         try:
                             card_description = await container.eval_on_selector(
                                 "p", "el => el?.textContent?.trim()"
@@ -239,70 +193,56 @@ class RobecoScraper:
                         pass
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
             return [it for it in self.items if it.get("article_content")]
         
     async def scrape_article_pages(self, context):
         logger.debug("Scraping individual articles...")
-        page = await context.new_page()
-        async def route_handler(route, request):
-            if request.resource_type in ("image", "font", "stylesheet", "media"):
-                await route.abort()
-            else:
-                await route.continue_()
+        for item in self.items:
+            url = item.get("article_url")
+            if url and url.lower().endswith(".pdf"):
+                item["article_content"] = url
+        await fetch_articles(
+            context,
+            [item for item in self.items if not item.get("article_content")],
+            self.scrape_article,
+        )
+
+    async def scrape_article(self, page, item):
+        await page.goto(item["article_url"], timeout=120000, wait_until="domcontentloaded")
+        await wait_until_ready(page, self.sleep_time)
+        content_texts = []
         try:
-            await context.route("**/*", route_handler)
+            blocks = await page.locator(
+                "div.grid-100-center, div.content, div[data-testid='foldable-wrapper']"
+            ).all_text_contents()
+            content_texts.extend([b.strip() for b in blocks if b.strip()])
         except:
             pass
-        for idx, item in enumerate(self.items, start=1):
-            url = item.get("article_url")
-            if not url:
-                continue
-            if url.lower().endswith(".pdf"):
-                item["article_content"] = url
-                continue
+        if not content_texts:
             try:
-                await page.goto(url, timeout=120000, wait_until="domcontentloaded")
-                await asyncio.sleep(self.sleep_time)
-                content_texts = []
-                try:
-                    blocks = await page.locator(
-                        "div.grid-100-center, div.content, div[data-testid='foldable-wrapper']"
-                    ).all_text_contents()
-                    content_texts.extend([b.strip() for b in blocks if b.strip()])
-                except:
-                    pass
-                if not content_texts:
-                    try:
-                        paras = await page.locator(
-                            "article p, .content p, .grid-100-center p"
-                        ).all_text_contents()
-                        content_texts.extend([p.strip() for p in paras if p.strip()])
-                    except:
-                        pass
-                full_text = " ".join(content_texts).strip()
-                item["article_content"] = full_text
-                try:
-                    desc_paras = await page.locator(
-                        'div[data-testid="foldable-wrapper"] p'
-                    ).all_text_contents()
-                    desc_paras = [p.strip() for p in desc_paras if p.strip()]
-                    if desc_paras:
-                        item["article_description"] = desc_paras[0]
-                except:
-                    pass
-                try:
-                    tags = await page.locator(
-                        'a[data-testid="pill"]'
-                    ).all_text_contents()
-                    item["article_tags"] = [t.strip() for t in tags if t.strip()]
-                except:
-                    pass
-            except Exception as e:
-                logger.error(f"Failed to scrape {url}: {e}")
-                item["article_content"] = None
+                paras = await page.locator(
+                    "article p, .content p, .grid-100-center p"
+                ).all_text_contents()
+                content_texts.extend([p.strip() for p in paras if p.strip()])
+            except:
+                pass
+        full_text = " ".join(content_texts).strip()
+        item["article_content"] = full_text
+        try:
+            desc_paras = await page.locator(
+                'div[data-testid="foldable-wrapper"] p'
+            ).all_text_contents()
+            desc_paras = [p.strip() for p in desc_paras if p.strip()]
+            if desc_paras:
+                item["article_description"] = desc_paras[0]
+        except:
+            pass
         try:
-            await page.close()
+            tags = await page.locator(
+                'a[data-testid="pill"]'
+            ).all_text_contents()
+            item["article_tags"] = [t.strip() for t in tags if t.strip()]
         except:
             pass
 
@@ -310,12 +250,9 @@ async def RobecoUKC(target_date):
     url = "https://www.robeco.com/en-uk/insights/latest-insights"
     scraper = RobecoScraper(target_date)
     results = await scraper.scrape(url)
-    output_path = f"/tmp/{company_site_id}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
-    logger.info(f"Saved JSON at: {output_path}")
+    write_debug_output(company_site_id, results)
     logger.info(f"Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 if __name__ == "__main__":
     target_date = sys.argv[1] if len(sys.argv) > 1 else "2026-01-01"
@@ -1,12 +1,15 @@
 import asyncio
-import json
 import logging
 import sys
 import re
-import os
 from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 # --- Site metadata ---
 site = "Schroders"
@@ -15,6 +18,8 @@ company_site_id = "am-230"
 country = "United Kingdom"
 role = "Intermediary"
 BASE_URL = "https://www.schroders.com"
+# Card headings; pagination replaces them in place.
+HEADING_SELECTOR = "span.CardHeading__StyledHeading-sc-2flmla-0"
 
 # --- Logging setup ---
 logging.basicConfig(
@@ -28,29 +33,15 @@ logger = logging.getLogger(company_site_id)
 def _normalize_date_text(date_text: str):
     if not date_text:
         return None
-    date_text = date_text.strip()
-    date_text = re.sub(r"[^\w\s\/\-,]", " ", date_text).strip()
-    try:
-        if re.match(r"^\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4}$", date_text):
-            dt = parser.parse(date_text, dayfirst=True, fuzzy=True)
-            return dt.date()
-        if re.search(r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|\w+ember)\b", date_text, re.I):
-            try:
-                dt = parser.parse(date_text, fuzzy=True)
-                if not re.search(r"\b\d{1,2}\b", date_text):
-                    return datetime(dt.year, dt.month, 1).date()
-                return dt.date()
-            except Exception:
-                return None
-        if re.match(r"^\d{4}$", date_text):
-            return datetime(int(date_text), 1, 1).date()
-        try:
-            dt = parser.parse(date_text, dayfirst=True, fuzzy=True)
-            return dt.date()
-        except Exception:
-            return None
-    except Exception:
-        return None
+    date_text = re.sub(r"[^\w\s\/\-,]", " ", date_text.strip()).strip()
+    if re.match(r"^\d{4}$", date_text):
+        return datetime(int(date_text), 1, 1).date()
+    parsed = parse_date(date_text, site=company_site_id, formats=("%d/%m/%Y",), dayfirst=True)
+    # "March 2025" means the start of the month, not today's day of it
+    if parsed and re.search(r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|\w+ember)\b", date_text, re.I) \
+            and not re.search(r"\b\d{1,2}\b", date_text):
+        return parsed.replace(day=1)
+    return parsed
 
 
 # --- Scraper class ---
@@ -64,40 +55,7 @@ class SchrodersScraperUK:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url} with target_date={self.target_date}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -115,26 +73,27 @@ class SchrodersScraperUK:
 
             # Load initial page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
-
-            # Accept cookies if present (best-effort)
-            try:
-                await page.locator("#onetrust-accept-btn-handler").click(timeout=5000)
-                logger.debug("Cookie accept clicked")
-                await asyncio.sleep(0.8)
-            except Exception:
-                pass
+            await wait_until_ready(page, self.sleep_time)
+
+            with run_report.span("consent"):
+                # Accept cookies if present (best-effort)
+                try:
+                    await page.locator("#onetrust-accept-btn-handler").click(timeout=5000)
+                    logger.debug("Cookie accept clicked")
+                    await asyncio.sleep(0.8)
+                except Exception:
+                    pass
             current_page_index = 1
             keep_paginating = True
 
             while keep_paginating:
                 logger.info(f"Processing listing page index: {current_page_index}")
                 try:
-                    await page.wait_for_selector("span.CardHeading__StyledHeading-sc-2flmla-0", state="attached", timeout=10000)
+                    await page.wait_for_selector(HEADING_SELECTOR, state="attached", timeout=10000)
                 except Exception:
                     logger.warning(f"No article headings found on page {current_page_index}")
                     break
-                title_spans = await page.locator("span.CardHeading__StyledHeading-sc-2flmla-0").all()
+                title_spans = await page.locator(HEADING_SELECTOR).all()
 
                 logger.info(f"Found {len(title_spans)} title nodes on page {current_page_index}")
 
@@ -270,6 +229,7 @@ class SchrodersScraperUK:
                     logger.info("Stopping pagination due to older article found on current page.")
                     break
                 current_page_index += 1
+                previous_text = await title_spans[0].text_content() if title_spans else None
                 try:
                     sel_btn = f'button[data-index="{current_page_index}"]'
                     btn = page.locator(sel_btn)
@@ -277,7 +237,7 @@ class SchrodersScraperUK:
                         logger.info(f"Clicking pagination button for page {current_page_index}")
                         try:
                             await btn.first.click(timeout=8000)
-                            await asyncio.sleep(self.sleep_time)
+                            await wait_until_ready(page, self.sleep_time, text_selector=HEADING_SELECTOR, previous_text=previous_text)
                             continue
                         except Exception as ex_click:
                             logger.warning(f"Failed to click page {current_page_index} button: {ex_click}")
@@ -288,7 +248,7 @@ class SchrodersScraperUK:
                         if await next_btn.count() > 0:
                             try:
                                 await next_btn.first.click(timeout=8000)
-                                await asyncio.sleep(self.sleep_time)
+                                await wait_until_ready(page, self.sleep_time, text_selector=HEADING_SELECTOR, previous_text=previous_text)
                                 continue
                             except Exception:
                                 break
@@ -299,100 +259,94 @@ class SchrodersScraperUK:
                     break
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             logger.info(f"Finished scraping {len(self.items)} total articles")
             return self.items
 
     async def scrape_article_pages(self, context):
         logger.debug("Starting to scrape individual article pages...")
-        page = await context.new_page()
-
-        for idx, item in enumerate(self.items, start=1):
-            url = item.get("article_url")
-            if not url:
-                continue
-            if url.lower().endswith(".pdf"):
-                item["article_content"] = url
-                if not item.get("article_date"):
-                    item["article_date"] = str(self.target_date)
-                logger.debug(f"#{idx}: Skipped PDF -> {url}")
-                continue
-
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        await fetch_articles(context, self.items, self.scrape_article)
+
+    async def scrape_article(self, page, item):
+        url = item.get("article_url")
+        if not url:
+            return
+        if url.lower().endswith(".pdf"):
+            item["article_content"] = url
+            if not item.get("article_date"):
+                item["article_date"] = str(self.target_date)
+            logger.debug(f"Skipped PDF -> {url}")
+            return
+
+        await page.goto(url, timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
+        try:
+            desc = await page.locator('meta[name="description"]').get_attribute("content")
+            if desc:
+                item["article_description"] = desc
+        except Exception:
+            pass
+        item["article_tags"] = item.get("article_tags", [section])
+        content_text = None
+        try:
+            # Prefer data-testid article body
+            if await page.locator("div[data-testid='article-body']").count() > 0:
+                parts = await page.locator("div[data-testid='article-body'] p, div[data-testid='article-body'] h2, div[data-testid='article-body'] li").all_text_contents()
+                content_text = " ".join([p.strip() for p in parts if p and p.strip()]).strip()
+            else:
+
+                parts = await page.locator("div.ModularBody__ModularBodyWrapper-sc-1nacfb7-1 p, div.RTEFieldstyled__BodyWrapper-sc-1k6weum-0 p, div.RTEFieldstyled__BodyWrapper-sc-1k6weum-0 li, article p, article li").all_text_contents()
+                if parts:
+                    content_text = " ".join([p.strip() for p in parts if p and p.strip()]).strip()
+                else:
+                    # fallback to larger containers
+                    parts = await page.locator("main p, main li, main h2").all_text_contents()
+                    content_text = " ".join([p.strip() for p in parts if p and p.strip()]).strip()
+        except Exception as e:
+            logger.warning(f"Content extraction warning for {url}: {e}")
+            content_text = None
+        parsed_date = None
+        try:
+            if await page.locator("time").count() > 0:
+                time_el = page.locator("time").first
                 try:
-                    desc = await page.locator('meta[name="description"]').get_attribute("content")
-                    if desc:
-                        item["article_description"] = desc
+                    time_attr = await time_el.get_attribute("datetime")
+                    if time_attr:
+                        dt = parser.parse(time_attr, fuzzy=True)
+                        parsed_date = dt.date()
                 except Exception:
-                    pass
-                item["article_tags"] = item.get("article_tags", [section])
-                content_text = None
-                try:
-                    # Prefer data-testid article body
-                    if await page.locator("div[data-testid='article-body']").count() > 0:
-                        parts = await page.locator("div[data-testid='article-body'] p, div[data-testid='article-body'] h2, div[data-testid='article-body'] li").all_text_contents()
-                        content_text = " ".join([p.strip() for p in parts if p and p.strip()]).strip()
-                    else:
+                    try:
+                        txt = await time_el.text_content()
+                        parsed_date = _normalize_date_text(txt)
+                    except Exception:
+                        parsed_date = None
 
-                        parts = await page.locator("div.ModularBody__ModularBodyWrapper-sc-1nacfb7-1 p, div.RTEFieldstyled__BodyWrapper-sc-1k6weum-0 p, div.RTEFieldstyled__BodyWrapper-sc-1k6weum-0 li, article p, article li").all_text_contents()
-                        if parts:
-                            content_text = " ".join([p.strip() for p in parts if p and p.strip()]).strip()
-                        else:
-                            # fallback to larger containers
-                            parts = await page.locator("main p, main li, main h2").all_text_contents()
-                            content_text = " ".join([p.strip() for p in parts if p and p.strip()]).strip()
-                except Exception as e:
-                    logger.warning(f"Content extraction warning for #{idx}: {e}")
-                    content_text = None
-                parsed_date = None
+            if not parsed_date:
                 try:
-                    if await page.locator("time").count() > 0:
-                        time_el = page.locator("time").first
-                        try:
-                            time_attr = await time_el.get_attribute("datetime")
-                            if time_attr:
-                                dt = parser.parse(time_attr, fuzzy=True)
-                                parsed_date = dt.date()
-                        except Exception:
-                            try:
-                                txt = await time_el.text_content()
-                                parsed_date = _normalize_date_text(txt)
-                            except Exception:
-                                parsed_date = None
-
-                    if not parsed_date:
-                        try:
-                            txt = await page.locator(".CardFooter__FooterLabel-sc-t8rxlh-3").first.text_content()
-                            parsed_date = _normalize_date_text(txt)
-                        except Exception:
-                            parsed_date = None
-
-                    if not parsed_date:
-                        paras = await page.locator("p").all_text_contents()
-                        mark_line = next((p.strip() for p in paras if re.search(r"\b(19|20)\d{2}\b", p)), None)
-                        if mark_line:
-                            parsed_date = _normalize_date_text(mark_line)
-
-                    if not parsed_date:
-                        parsed_date = self.target_date
-                except Exception as e:
-                    logger.warning(f"Date parse failed for article #{idx}: {e}")
-                    parsed_date = self.target_date
-                if parsed_date < self.target_date:
-                    logger.info(f"Skipping article {item.get('article_title')} as {parsed_date} < {self.target_date}")
-                    continue
+                    txt = await page.locator(".CardFooter__FooterLabel-sc-t8rxlh-3").first.text_content()
+                    parsed_date = _normalize_date_text(txt)
+                except Exception:
+                    parsed_date = None
 
-                item["article_date"] = str(parsed_date)
-                item["article_content"] = content_text
+            if not parsed_date:
+                paras = await page.locator("p").all_text_contents()
+                mark_line = next((p.strip() for p in paras if re.search(r"\b(19|20)\d{2}\b", p)), None)
+                if mark_line:
+                    parsed_date = _normalize_date_text(mark_line)
 
-                logger.debug(f"Scraped article #{idx}: {item.get('article_title', '')[:60]} ({parsed_date})")
+            if not parsed_date:
+                parsed_date = self.target_date
+        except Exception as e:
+            logger.warning(f"Date parse failed for {url}: {e}")
+            parsed_date = self.target_date
+        if parsed_date < self.target_date:
+            logger.info(f"Skipping article {item.get('article_title')} as {parsed_date} < {self.target_date}")
+            return
 
-            except Exception as e:
-                logger.error(f"Failed to scrape article #{idx} ({url}): {e}")
+        item["article_date"] = str(parsed_date)
+        item["article_content"] = content_text
 
-        await page.close()
+        logger.debug(f"Scraped article: {item.get('article_title', '')[:60]} ({parsed_date})")
 
 async def SIMUKI(target_date):
     results = []
@@ -400,12 +354,9 @@ async def SIMUKI(target_date):
         url = "https://www.schroders.com/en-gb/uk/intermediary/insights/"
         scraper = SchrodersScraperUK(target_date)
         results = await scraper.scrape(url)
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
         logger.info(f"Scraped {len(results)} articles after {target_date}")
-        logger.info(f"Saved JSON at: {output_path}")
-        return 200
+        return results
     except Exception as error:
         logger.error(f"Error: {error}")
         return 500
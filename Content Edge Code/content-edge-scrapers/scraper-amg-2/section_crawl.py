@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import os
+from urllib.parse import urlsplit, urlunsplit
+
+import run_report
+
+logger = logging.getLogger("SECTION_CRAWL")
+
+# Section listings expanded at once, each in its own tab.
+SECTION_CONCURRENCY = int(os.getenv("SECTION_CONCURRENCY", "3"))
+
+
+def canonical_url(url):
+    """Article URL without query, fragment or trailing slash, host lower-cased."""
+    parts = urlsplit(url or "")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+
+def article_key(item):
+    """Identity of a listing item: its canonical URL, else its slug."""
+    return canonical_url(item.get("article_url")) or item.get("article_slug")
+
+
+def dedupe_items(items, key=article_key):
+    """Items in order, keeping the first of each key; items without a key are all kept."""
+    seen = set()
+    unique = []
+    for item in items:
+        item_key = key(item)
+        if item_key:
+            if item_key in seen:
+                continue
+            seen.add(item_key)
+        unique.append(item)
+    return unique
+
+
+async def discover_sections(context, urls, scrape_section, concurrency=SECTION_CONCURRENCY, key=article_key):
+    """
+    Expand a site's section listings in parallel and merge them into one
+    list of items, each article once.
+
+    ``scrape_section(page, url)`` loads one section on a fresh tab and
+    returns its listing items, content not yet fetched. Sections run
+    ``concurrency`` at a time; one that fails is logged and contributes
+    nothing. The merged list keeps section order, so the article pass that
+    follows fetches every article once however many sections list it.
+
+    Args:
+        context: Playwright BrowserContext to open section tabs in
+        urls: section listing URLs
+        scrape_section: async callable ``(page, url) -> list of items``
+        concurrency: sections loading at once
+        key: callable giving an item's identity for deduplication
+
+    Returns:
+        List of unique listing items
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(url):
+        async with semaphore:
+            page = await context.new_page()
+            try:
+                with run_report.span("section_listing"):
+                    items = await scrape_section(page, url)
+                logger.info(f"Section {url}: {len(items)} items")
+                return items
+            except Exception as e:
+                logger.error(f"Failed scraping section {url}: {e}")
+                return []
+            finally:
+                await page.close()
+
+    sections = await asyncio.gather(*(run(url) for url in urls))
+    listed = [item for items in sections for item in items]
+    unique = dedupe_items(listed, key)
+    logger.info(f"{len(urls)} sections listed {len(listed)} items, {len(unique)} unique")
+    return unique
@@ -1,54 +1,51 @@
-import asyncio
 from datetime import date
 import logging
 import json
 import os
-from unittest import case
 from dotenv import load_dotenv
 import boto3
+from botocore.config import Config
 
 load_dotenv()
 
-# --- Normaliser ---
-from normalise import clean_data
-
-# --- Scraper Imports ---
-from metlife_investment_management import (METLIFEIMCO)
-
-from rbc_singapore_global_asset_management import (RBCSGIP)
-from rbc_united_kingdom_global_asset_management import (RBCUKIP)
-from rbc_united_state_global_asset_management import (RBCUSIM)
-
-from aberdeen_united_states_financial_advisor import (ABUSFA)
-from aberdeen_united_kingdom_intermediary import (ABUKI)
-from aberdeen_singapore_intermediary import (ABSGI)
-
-from baillie_gifford_united_state_intermediary import (BGUSI)
-from baillie_gifford_united_kingdom_intermediary import (BGUKI) 
-
-from pinebridge_investments_singapore_intermediary import (PBISGI)
-from pinebridge_investments_united_kingdom_intermediary import (PBIUKI)
-from pinebridge_investments_united_state_intermediary import (PBIUSI)
-
-from dimensional_fund_advisors_singapore_finance_professional import (DFASGFP)
-from dimensional_fund_advisors_united_kingdom_finance_professional import (DFAUKFP)
-from dimensional_fund_advisors_united_state_finance_professional import (DFAUSFP)
-
-from charles_schwab_investment_management_global_corporate import (CSIMGC)
-
-from janus_henderson_investors_united_kingdom_financial_professional import (JHIUKFP)
-from janus_henderson_investors_united_state_financial_professional import (JHIUSFP)
-
-from pgim_singapore_intermediary import (PGIMSGI)
-from pgim_united_kingdom_intermediary import (PGIMUKI)
-from pgim_united_state_intermediary import (PGIMUSI)
-
-from mfs_investment_management_united_kingdom_investment_professional import (MFSUKIP)
-from mfs_investment_management_united_state_investment_professional import (MFSUSIP)
+# --- Browser runtime (kept warm across invocations) ---
+from browser_runtime import runtime
+from scraper_registry import ScraperRegistry
+import crawl_state
+from pipeline import SitePipeline
+from output_writer import get_s3_client, upload_items
+from orchestrator import INVOKE_TIMEOUT, FanOutOrchestrator, LambdaInvoker, worker_functions_from_env
+
+# --- Scraper registry (modules are imported on first use) ---
+registry = ScraperRegistry({
+    "am-400": ("metlife_investment_management", "METLIFEIMCO", "MetLife Investment Management"),
+    "am-406": ("rbc_singapore_global_asset_management", "RBCSGIP", "RBC Singapore Global Asset Management"),
+    "am-404": ("rbc_united_state_global_asset_management", "RBCUSIM", "RBC United States Global Asset Management"),
+    "am-405": ("rbc_united_kingdom_global_asset_management", "RBCUKIP", "RBC United Kingdom Global Asset Management"),
+    "am-407": ("aberdeen_united_states_financial_advisor", "ABUSFA", "Aberdeen United States Financial Advisor"),
+    "am-408": ("aberdeen_united_kingdom_intermediary", "ABUKI", "Aberdeen United Kingdom Intermediary"),
+    "am-409": ("aberdeen_singapore_intermediary", "ABSGI", "Aberdeen Singapore Intermediary"),
+    "am-411": ("baillie_gifford_united_state_intermediary", "BGUSI", "Baillie Gifford United States Intermediary"),
+    "am-412": ("baillie_gifford_united_kingdom_intermediary", "BGUKI", "Baillie Gifford United Kingdom Intermediary"),
+    "am-414": ("pinebridge_investments_singapore_intermediary", "PBISGI", "PineBridge Investments Singapore Intermediary"),
+    "am-415": ("pinebridge_investments_united_kingdom_intermediary", "PBIUKI", "PineBridge Investments United Kingdom Intermediary"),
+    "am-416": ("pinebridge_investments_united_state_intermediary", "PBIUSI", "PineBridge Investments United States Intermediary"),
+    "am-418": ("dimensional_fund_advisors_singapore_finance_professional", "DFASGFP", "Dimensional Fund Advisors Singapore Finance Professional"),
+    "am-419": ("dimensional_fund_advisors_united_kingdom_finance_professional", "DFAUKFP", "Dimensional Fund Advisors United Kingdom Finance Professional"),
+    "am-420": ("dimensional_fund_advisors_united_state_finance_professional", "DFAUSFP", "Dimensional Fund Advisors United States Finance Professional"),
+    "am-424": ("charles_schwab_investment_management_global_corporate", "CSIMGC", "Charles Schwab Investment Management Global Corporate"),
+    "am-427": ("janus_henderson_investors_united_kingdom_financial_professional", "JHIUKFP", "Janus Henderson Investors United Kingdom Financial Professional"),
+    "am-426": ("janus_henderson_investors_united_state_financial_professional", "JHIUSFP", "Janus Henderson Investors United States Financial Professional"),
+    "am-430": ("pgim_singapore_intermediary", "PGIMSGI", "PGIM Singapore Intermediary"),
+    "am-429": ("pgim_united_kingdom_intermediary", "PGIMUKI", "PGIM United Kingdom Intermediary"),
+    "am-428": ("pgim_united_state_intermediary", "PGIMUSI", "PGIM United States Intermediary"),
+    "am-433": ("mfs_investment_management_united_kingdom_investment_professional", "MFSUKIP", "MFS Investment Management United Kingdom Investment Professional"),
+    "am-432": ("mfs_investment_management_united_state_investment_professional", "MFSUSIP", "MFS Investment Management United States Investment Professional"),
+})
 
 # --- AWS Setup ---
-s3 = boto3.resource("s3")
-lambda_client = boto3.client("lambda")
+# Synchronous worker invokes are given up after INVOKE_TIMEOUT seconds
+lambda_client = boto3.client("lambda", config=Config(read_timeout=INVOKE_TIMEOUT, retries={"max_attempts": 0}))
 
 logging.basicConfig(
     level=logging.INFO,
@@ -58,128 +55,79 @@ logging.basicConfig(
 logger = logging.getLogger("LAMBDA_HANDLER")
 bucket_name = os.getenv("BUCKET_NAME")
 
+# --- Crawl state (what earlier runs already captured) ---
+crawl_store = crawl_state.get_state_store(bucket_name)
+
 
 def save_json_to_s3(data, bucket_name, file_key):
     try:
-        client = boto3.client("s3")
-        json_data = json.dumps(data, indent=2, default=str)
+        upload_items(get_s3_client(), data, bucket_name, file_key)
+        return True
 
-        client.put_object(
+    except Exception as e:
+        logger.error(f"Error uploading to S3: {e}")
+        return False
+
+
+def save_report_to_s3(report, bucket_name, file_key):
+    try:
+        get_s3_client().put_object(
             Bucket=bucket_name,
             Key=file_key,
-            Body=json_data,
+            Body=json.dumps(report, indent=2).encode("utf-8"),
             ContentType="application/json",
         )
         return True
 
     except Exception as e:
-        logger.error(f"Error uploading to S3: {e}")
+        logger.error(f"Error uploading run report to S3: {e}")
         return False
 
 
+# --- Pipeline: scrape, clean, dedupe against crawl state, upload ---
+pipeline = SitePipeline(registry, bucket_name, save_json_to_s3, crawl_store, group="amg-4", upload_report=save_report_to_s3)
+
+
 def lambda_handler(event, context):
+    """
+    Single site: {"company_site_id": "am-xxx", "target_date": "YYYY-MM-DD"}
+    Batch: {"company_site_ids": [...]} or {"site_group": "amg-4"}, optionally
+    with "sites_in_flight"; returns per-site status codes and timings.
+    Sibling groups: {"sibling_groups": ["pimco", ...]} or "all" runs each
+    group's regional sites together, fetching shared articles once.
+    List sites: {"action": "list_sites"} (used by the orchestrator)
+    Each site result carries a run report (phase timings, article latency
+    p50/p95, pages, retries, bytes), also uploaded next to its output; a
+    single-site event with "report": true returns the whole result.
+    """
+    target_date = event.get("target_date", str(date.today()))
+
+    if event.get("action") == "list_sites":
+        return {"statusCode": 200, "site_group": pipeline.group, "company_site_ids": list(registry)}
+
+    if pipeline.is_batch(event):
+        return runtime.run(pipeline.run_batch(event, target_date))
+
     company_site_id = event.get("company_site_id")
+    if company_site_id not in registry:
+        logger.error(f"Unknown company_site_id: {company_site_id}")
+        return {"statusCode": 400, "body": "Unknown company_site_id"}
+
+    result = runtime.run(pipeline.run_site(company_site_id, target_date, event.get("full_crawl", False)))
+    if event.get("report"):
+        return result
+    return result["statusCode"]
+
+
+def orchestrator_handler(event, context):
+    """
+    Fan the daily crawl out to the worker Lambdas of several site groups.
+    Event: {"target_date": "YYYY-MM-DD", "site_groups": ["amg-1", "amg-2"],
+    "max_concurrency": 10}. Worker function names come from WORKER_FUNCTIONS.
+    """
+    function_names = worker_functions_from_env()
     target_date = event.get("target_date", str(date.today()))
+    groups = event.get("site_groups") or list(function_names)
 
-    match company_site_id:
-     
-        case "am-400":
-            logger.info("am-400 | MetLife Investment Management")
-            scraper_func = METLIFEIMCO
-
-        case "am-406":
-            logger.info("am-406 | RBC Singapore Global Asset Management")
-            scraper_func = RBCSGIP
-        case "am-404":
-            logger.info("am-404 | RBC United States Global Asset Management")
-            scraper_func = RBCUSIM
-        case "am-405":
-            logger.info("am-405 | RBC United Kingdom Global Asset Management")
-            scraper_func = RBCUKIP
-
-        case "am-407":
-            logger.info("am-407 | Aberdeen United States Financial Advisor")
-            scraper_func = ABUSFA
-        case "am-408":
-            logger.info("am-408 | Aberdeen United Kingdom Intermediary")
-            scraper_func = ABUKI
-        case "am-409":
-            logger.info("am-409 | Aberdeen Singapore Intermediary")
-            scraper_func = ABSGI
-        
-        case "am-411":
-            logger.info("am-411 | Baillie Gifford United States Intermediary")
-            scraper_func = BGUSI
-        case "am-412":
-            logger.info("am-412 | Baillie Gifford United Kingdom Intermediary")
-            scraper_func = BGUKI
-
-        case "am-414":
-            logger.info("am-414 | PineBridge Investments Singapore Intermediary")
-            scraper_func = PBISGI
-        case "am-415":
-            logger.info("am-415 | PineBridge Investments United Kingdom Intermediary")
-            scraper_func = PBIUKI
-        case "am-416":
-            logger.info("am-416 | PineBridge Investments United States Intermediary")
-            scraper_func = PBIUSI
-
-        case "am-418":
-            logger.info("am-421 | Dimensional Fund Advisors Singapore Finance Professional")
-            scraper_func = DFASGFP
-        case "am-419":
-            logger.info("am-420 | Dimensional Fund Advisors United Kingdom Finance Professional")
-            scraper_func = DFAUKFP
-        case "am-420":
-            logger.info("am-419 | Dimensional Fund Advisors United States Finance Professional")
-            scraper_func = DFAUSFP      
-
-        case "am-424":
-            logger.info("am-424 | Charles Schwab Investment Management Global Corporate")
-            scraper_func = CSIMGC
-
-        case "am-427":
-            logger.info("am-427 | Janus Henderson Investors United Kingdom Financial Professional")
-            scraper_func = JHIUKFP
-        case "am-426":
-            logger.info("am-426 | Janus Henderson Investors United States Financial Professional")
-            scraper_func = JHIUSFP
-            
-        case "am-430":
-            logger.info("am-430 | PGIM Singapore Intermediary")
-            scraper_func = PGIMSGI
-        case "am-429":  
-            logger.info("am-429 | PGIM United Kingdom Intermediary")
-            scraper_func = PGIMUKI
-        case "am-428":
-            logger.info("am-428 | PGIM United States Intermediary")
-            scraper_func = PGIMUSI
-            
-        case "am-433":
-            logger.info("am-433 | MFS Investment Management United Kingdom Investment Professional")
-            scraper_func = MFSUKIP
-        case "am-432":
-            logger.info("am-432 | MFS Investment Management United States Investment Professional")
-            scraper_func = MFSUSIP
-            
-
-        case _:
-            logger.error(f"Unknown company_site_id: {company_site_id}")
-            return {"statusCode": 400, "body": "Unknown company_site_id"}
-
-    response = asyncio.run(scraper_func(target_date))
-
-    if response == 200:
-        output_path = f"/tmp/{company_site_id}.json"
-
-        with open(output_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
-
-        data = clean_data(data)
-
-        target_date_str = "/".join(target_date.split("-"))
-        file_key = f"output/website/{target_date_str}/{company_site_id}.json"
-
-        save_json_to_s3(data, bucket_name, file_key)
-
-    return response
+    orchestrator = FanOutOrchestrator(LambdaInvoker(lambda_client, function_names), event.get("max_concurrency"))
+    return orchestrator.run(target_date, groups, full_crawl=event.get("full_crawl", False))
@@ -1,11 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
 from dateutil import parser
-import re
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 
 site = "Baillie Gifford"
@@ -17,10 +18,7 @@ BASE_URL = "https://www.bailliegifford.com"
 
 
 def extract_date(text):
-    try:
-        return parser.parse(text, fuzzy=True).date()
-    except Exception:
-        return None
+    return parse_date(text, site=company_site_id)
 
 
 logging.basicConfig(
@@ -42,40 +40,7 @@ class BaillieGiffordScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -83,12 +48,12 @@ class BaillieGiffordScraper:
 
             page = await context.new_page()
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             # ---- CLICK VIEW ALL INSIGHTS ----
             try:
                 await page.get_by_role("button", name="View all insights").click()
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
             except Exception:
                 pass
 
@@ -122,7 +87,7 @@ class BaillieGiffordScraper:
                     if await load_more.count() > 0:
                         logger.info("Clicking Load More")
                         await load_more.first.click()
-                        await asyncio.sleep(self.sleep_time)
+                        await wait_until_ready(page, self.sleep_time)
                     else:
                         logger.info("No Load More button — stopping.")
                         break
@@ -178,7 +143,7 @@ class BaillieGiffordScraper:
                 })
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
 
             return [
                 i for i in self.items
@@ -188,30 +153,28 @@ class BaillieGiffordScraper:
 
     async def scrape_article_pages(self, context):
         logger.debug("DEBUG: Starting to scrape individual articles")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-        for item in self.items:
-            url = item["article_url"]
-            if not url:
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
 
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
 
-                paragraphs = await page.locator(
-                    "div.GenericRichTextItem_body-text__1W87t p"
-                ).all_text_contents()
+            paragraphs = await page.locator(
+                "div.GenericRichTextItem_body-text__1W87t p"
+            ).all_text_contents()
 
-                item["article_content"] = " ".join(
-                    p.strip() for p in paragraphs if p.strip()
-                )
+            item["article_content"] = " ".join(
+                p.strip() for p in paragraphs if p.strip()
+            )
 
-            except Exception as e:
-                logger.error(f"ERROR scraping {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+        except Exception as e:
+            logger.error(f"ERROR scraping {url}: {e}")
+            item["article_content"] = None
 
 
 async def BGUSI(target_date):
@@ -219,12 +182,10 @@ async def BGUSI(target_date):
     scraper = BaillieGiffordScraper(target_date)
     results = await scraper.scrape(url)
 
-    output_path = f"/tmp/{company_site_id}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f" Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
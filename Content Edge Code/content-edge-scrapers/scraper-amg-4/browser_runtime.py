@@ -0,0 +1,261 @@
+import asyncio
+import logging
+import os
+import signal
+from contextlib import asynccontextmanager
+
+import run_report
+from readiness import track_network
+from resource_blocking import BLOCKING_ENABLED, ResourceBlocker, merge_stats
+
+logger = logging.getLogger("BROWSER_RUNTIME")
+
+# Launch flags shared by every scraper (tuned for the Lambda container).
+# --single-process is left out by default: the warm browser serves several
+# contexts and article pages at once, and in a single process one renderer
+# crash takes them all down. CHROMIUM_SINGLE_PROCESS=1 puts it back.
+CHROMIUM_ARGS = [
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--no-zygote",
+    "--disable-setuid-sandbox",
+    "--disable-accelerated-2d-canvas",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-client-side-phishing-detection",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-domain-reliability",
+    "--disable-features=AudioServiceOutOfProcess",
+    "--disable-hang-monitor",
+    "--disable-ipc-flooding-protection",
+    "--disable-popup-blocking",
+    "--disable-prompt-on-repost",
+    "--disable-renderer-backgrounding",
+    "--disable-sync",
+    "--force-color-profile=srgb",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-pings",
+    "--use-gl=swiftshader",
+    "--window-size=1280,1696",
+]
+if os.getenv("CHROMIUM_SINGLE_PROCESS", "0") == "1":
+    CHROMIUM_ARGS.append("--single-process")
+
+
+def _driver_pid(playwright):
+    """Process id of a Playwright driver, or None if it cannot be found."""
+    try:
+        return playwright._impl_obj._connection._transport._proc.pid
+    except AttributeError:
+        return None
+
+
+class BrowserLease:
+    """
+    Handle on the shared browser given to a scraper for one run.
+
+    Behaves like a Playwright ``Browser`` but tracks the contexts it creates,
+    and ``close()`` closes only those contexts so the browser stays warm.
+    New contexts get the resource blocker for ``site_id`` unless
+    ``block_resources`` is False, then each of ``context_hooks``.
+    """
+
+    def __init__(self, browser, site_id=None, block_resources=True, context_hooks=()):
+        self._browser = browser
+        self._contexts = []
+        self.site_id = site_id
+        self.block_resources = block_resources and BLOCKING_ENABLED
+        self.context_hooks = list(context_hooks)
+        self.blockers = []
+
+    async def new_context(self, **kwargs):
+        for hook in self.context_hooks:
+            kwargs.update(hook.context_options(self.site_id))
+        context = await self._browser.new_context(**kwargs)
+        self._contexts.append(context)
+        track_network(context)
+        run_report.track_context(context)
+        if self.block_resources:
+            blocker = ResourceBlocker(self.site_id)
+            await blocker.install(context)
+            self.blockers.append(blocker)
+        for hook in self.context_hooks:
+            await hook.install(context, self.site_id)
+        return context
+
+    def network_stats(self):
+        return merge_stats(b.stats for b in self.blockers)
+
+    async def close(self):
+        contexts, self._contexts = self._contexts, []
+        for context in contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+
+class BrowserRuntime:
+    """
+    Process-wide Playwright driver and Chromium instances.
+
+    The runtime lives at module scope, so on a warm Lambda container the driver
+    and browser started by a previous invocation are reused. A browser is only
+    relaunched when it has disconnected (crashed or was killed).
+
+    ``context_hooks`` are applied to every context a scraper creates: each
+    hook's ``context_options(site_id)`` is merged into the new_context()
+    options and ``install(context, site_id)`` is awaited on the new context
+    (the offline benchmarks record and replay traffic this way).
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._bound_loop = None
+        self._lock = None
+        self._playwright = None
+        self._browsers = {}
+        self.launches = 0
+        self.network_stats = {}
+        self.context_hooks = []
+
+    def run(self, coro):
+        """Run a coroutine on the runtime's persistent event loop."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        return self._loop.run_until_complete(coro)
+
+    def _bind_to_running_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._bound_loop is loop:
+            return
+        if self._playwright is not None:
+            # Playwright objects are tied to the loop that created them; a
+            # standalone asyncio.run() gets its own driver.
+            logger.info("Event loop changed, starting a new Playwright driver")
+            self._stop_abandoned_driver()
+        self._bound_loop = loop
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browsers = {}
+
+    def _stop_abandoned_driver(self):
+        """
+        Stop the driver (and with it the browsers it launched) left behind on
+        a previous event loop. Its objects cannot be awaited from this loop,
+        so the driver process is sent SIGTERM; Playwright closes the browsers
+        it launched when it gets SIGTERM.
+        """
+        pid = _driver_pid(self._playwright)
+        if pid is None:
+            logger.warning(f"Could not find the old Playwright driver; {len(self._browsers)} browsers may be left running")
+            return
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not stop the old Playwright driver (pid {pid}): {e}")
+
+    async def _start_playwright(self):
+        if self._playwright is None:
+            # Imported here so app.py stays cheap to import on a cold start.
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def get_browser(self, headless=True, args=None, **launch_options):
+        """Return a connected browser for the given launch options, launching it if needed."""
+        self._bind_to_running_loop()
+        args = list(CHROMIUM_ARGS if args is None else args)
+        key = (headless, tuple(args), tuple(sorted(launch_options.items())))
+
+        async with self._lock:
+            browser = self._browsers.get(key)
+            if browser is not None and browser.is_connected():
+                logger.debug("Reusing warm browser")
+                return browser
+
+            if browser is not None:
+                logger.warning("Browser disconnected, relaunching")
+
+            with run_report.span("browser_launch"):
+                try:
+                    playwright = await self._start_playwright()
+                    browser = await playwright.chromium.launch(headless=headless, args=args, **launch_options)
+                except Exception as e:
+                    # The driver itself may have died with the browser; restart it once.
+                    logger.warning(f"Browser launch failed ({e}), restarting Playwright driver")
+                    run_report.count("retries")
+                    await self.close()
+                    playwright = await self._start_playwright()
+                    browser = await playwright.chromium.launch(headless=headless, args=args, **launch_options)
+
+            self._browsers[key] = browser
+            self.launches += 1
+            logger.info(f"Launched Chromium (launch #{self.launches})")
+            return browser
+
+    @asynccontextmanager
+    async def session(self, site_id=None, headless=True, args=None, block_resources=True, **launch_options):
+        """Lend the shared browser; contexts created through the lease are closed on exit."""
+        browser = await self.get_browser(headless=headless, args=args, **launch_options)
+        lease = BrowserLease(browser, site_id=site_id, block_resources=block_resources, context_hooks=self.context_hooks)
+        # Ended by the first fetch_articles call (see run_report.SiteReport)
+        run_report.begin("listing")
+        try:
+            yield lease
+        finally:
+            run_report.end("listing")
+            await lease.close()
+            if lease.blockers:
+                stats = lease.network_stats()
+                self.network_stats[site_id] = stats
+                logger.info(
+                    f"{site_id}: blocked {stats['blocked_requests']}/{stats['requests']} requests "
+                    f"(~{stats['estimated_blocked_bytes'] // 1024} KB saved, "
+                    f"{stats['transferred_bytes'] // 1024} KB transferred)"
+                )
+
+    async def new_context(self, **context_options):
+        """Fresh context on the default browser. The caller owns and closes it."""
+        browser = await self.get_browser()
+        return await browser.new_context(**context_options)
+
+    async def close(self):
+        for browser in list(self._browsers.values()):
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers = {}
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+runtime = BrowserRuntime()
+
+
+def browser_session(site_id=None, headless=True, args=None, block_resources=True, **launch_options):
+    """Shortcut for ``runtime.session(...)`` used by the scrapers."""
+    return runtime.session(
+        site_id=site_id,
+        headless=headless,
+        args=args,
+        block_resources=block_resources,
+        **launch_options,
+    )
@@ -0,0 +1,101 @@
+import logging
+
+logger = logging.getLogger("CARD_EXTRACTION")
+
+# Runs once in the page over every matched card. Each field is a list of
+# specs tried in order; the first non-empty value wins. Sub-selectors look
+# into open shadow roots too, like Playwright locators do.
+_EXTRACT_JS = """
+(cards, fields) => {
+    const queryAll = (root, selector) => {
+        const found = Array.from(root.querySelectorAll(selector));
+        for (const el of root.querySelectorAll("*")) {
+            if (el.shadowRoot) found.push(...queryAll(el.shadowRoot, selector));
+        }
+        return found;
+    };
+    const read = (el, attr) => {
+        if (!el) return null;
+        let value;
+        if (attr === "text") value = el.textContent;
+        else if (attr === "inner_text") value = el.innerText;
+        else if (attr === "html") value = el.innerHTML;
+        else value = el.getAttribute(attr);
+        return value == null ? null : value.trim();
+    };
+    return cards.map(card => {
+        const pick = spec => {
+            const targets = spec.selector ? queryAll(card, spec.selector) : [card];
+            if (spec.all) return targets.map(el => read(el, spec.attr)).filter(v => v);
+            return read(targets[0] || null, spec.attr);
+        };
+        const row = {};
+        for (const [name, specs] of Object.entries(fields)) {
+            let value = null;
+            for (const spec of specs) {
+                value = pick(spec);
+                if (spec.all ? value.length : value) break;
+            }
+            row[name] = value;
+        }
+        return row;
+    });
+}
+"""
+
+
+def _normalise_spec(spec):
+    if spec is None or isinstance(spec, str):
+        return {"selector": spec, "attr": "text", "all": False}
+    if isinstance(spec, tuple):
+        selector, attr = spec
+        return {"selector": selector, "attr": attr, "all": False}
+    return {
+        "selector": spec.get("selector"),
+        "attr": spec.get("attr", "text"),
+        "all": bool(spec.get("all", False)),
+    }
+
+
+def build_field_map(fields):
+    """
+    Normalise a field map into the form the in-page script expects.
+
+    A field spec is one of:
+      "h3.title"                  text of the first match
+      ("a", "href")               attribute of the first match
+      (None, "href")              attribute of the card element itself
+      {"selector": "span.tag", "all": True}
+                                  list of texts of every match
+    and a list of specs is tried in order until one yields a value.
+    ``attr`` may be "text" (textContent), "inner_text", "html" or any
+    attribute name. Values are stripped; missing ones come back as None
+    (or [] for ``all``).
+    """
+    normalised = {}
+    for name, spec in fields.items():
+        specs = spec if isinstance(spec, list) else [spec]
+        normalised[name] = [_normalise_spec(s) for s in specs]
+    return normalised
+
+
+async def extract_cards(scope, card_selector, fields):
+    """
+    Read every card under ``scope`` in a single browser round trip.
+
+    Args:
+        scope: Playwright Page, Frame or Locator to search in
+        card_selector: selector matching one element per card
+        fields: field map, see ``build_field_map``
+
+    Returns:
+        List of dicts, one per card in document order
+    """
+    field_map = build_field_map(fields)
+    rows = await scope.locator(card_selector).evaluate_all(_EXTRACT_JS, field_map)
+    for row in rows:
+        for name, specs in field_map.items():
+            if row.get(name) is None and specs[-1]["all"]:
+                row[name] = []
+    logger.debug(f"Extracted {len(rows)} cards matching {card_selector}")
+    return rows
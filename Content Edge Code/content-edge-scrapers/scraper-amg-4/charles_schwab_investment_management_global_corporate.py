@@ -1,9 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 
 site = "Charles Schwab Investment Management"
@@ -25,10 +28,7 @@ logger = logging.getLogger(company_site_id)
 
 
 def extract_date(text):
-    try:
-        return parser.parse(text, fuzzy=True).date()
-    except Exception:
-        return None
+    return parse_date(text, site=company_site_id)
 
 
 class SchwabScraper:
@@ -41,18 +41,18 @@ class SchwabScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=False,
-                args=[
-                    "--no-sandbox",
-                    "--headless=new",
-                    "--disable-dev-shm-usage",
-                    "--disable-gpu",
-                    "--disable-blink-features=AutomationControlled",
-                    "--use-angle=software",
-                ],
-            )
+        async with browser_session(
+            company_site_id,
+            headless=False,
+            args=[
+                "--no-sandbox",
+                "--headless=new",
+                "--disable-dev-shm-usage",
+                "--disable-gpu",
+                "--disable-blink-features=AutomationControlled",
+                "--use-angle=software",
+            ],
+        ) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -68,7 +68,7 @@ class SchwabScraper:
 
 
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             try:
                 await page.wait_for_selector("a.proxy-option[data-segment='1931']", timeout=15000)
@@ -78,7 +78,7 @@ class SchwabScraper:
                     "button.ui-button.csim-btn--primary--color-1", timeout=15000
                 )
                 await page.click("button.ui-button.csim-btn--primary--color-1")
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
             except Exception:
                 pass
 
@@ -87,7 +87,7 @@ class SchwabScraper:
                 if not cards:
                     logger.debug("No cards found yet, scrolling")
                     await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(page, self.sleep_time)
                     continue
 
                 last_card = cards[-1]
@@ -102,7 +102,7 @@ class SchwabScraper:
                 if last_date and last_date >= self.target_date:
                     logger.info("Scrolling to load more articles")
                     await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await asyncio.sleep(self.sleep_time)
+                    await wait_until_ready(page, self.sleep_time)
                 else:
                     logger.info("Last date older than target date")
                     break
@@ -153,35 +153,33 @@ class SchwabScraper:
                 })
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
             return self.items
 
     async def scrape_article_pages(self, context):
         logger.debug("DEBUG: Starting to scrape individual articles")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-        for item in self.items:
-            url = item["article_url"]
-            if not url:
-                continue
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
 
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
 
-                paragraphs = await page.locator(
-                    "div.field--name-body p"
-                ).all_text_contents()
+            paragraphs = await page.locator(
+                "div.field--name-body p"
+            ).all_text_contents()
 
-                item["article_content"] = " ".join(
-                    p.strip() for p in paragraphs if p.strip()
-                )
+            item["article_content"] = " ".join(
+                p.strip() for p in paragraphs if p.strip()
+            )
 
-            except Exception as e:
-                logger.error(f"ERROR scraping {url}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+        except Exception as e:
+            logger.error(f"ERROR scraping {url}: {e}")
+            item["article_content"] = None
 
 
 async def CSIMGC(target_date):
@@ -189,12 +187,10 @@ async def CSIMGC(target_date):
     scraper = SchwabScraper(target_date)
     results = await scraper.scrape(url)
 
-    output_path = f"/tmp/{company_site_id}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import date
+
+from date_parsing import parse_date
+
+logger = logging.getLogger("CRAWL_STATE")
+
+# CRAWL_STATE=s3 (default), local (JSON files under CRAWL_STATE_DIR) or off.
+CRAWL_STATE_BACKEND = os.getenv("CRAWL_STATE", "s3")
+CRAWL_STATE_DIR = os.getenv("CRAWL_STATE_DIR", "/tmp/crawl-state")
+CRAWL_STATE_PREFIX = os.getenv("CRAWL_STATE_PREFIX", "state/crawl")
+# Oldest entries are dropped beyond this many URLs per site.
+MAX_TRACKED_URLS = int(os.getenv("CRAWL_STATE_MAX_URLS", "5000"))
+# Content shorter than this (after whitespace is collapsed) is never matched
+# by hash: short bodies are often shared boilerplate ("Please enable
+# JavaScript", a disclaimer) rather than the same article under a new URL.
+MIN_HASHED_CONTENT = int(os.getenv("CRAWL_STATE_MIN_HASHED_CONTENT", "500"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalise(text):
+    return _WHITESPACE_RE.sub(" ", str(text)).strip()
+
+
+def content_hash(text):
+    """Stable hash of article text, insensitive to whitespace differences."""
+    if not text:
+        return None
+    return hashlib.sha256(_normalise(text).encode("utf-8")).hexdigest()
+
+
+class CrawlState:
+    """
+    What has already been captured for one company_site_id.
+
+    ``articles`` maps article URL to its content hash, article date and the
+    run that captured it. ``high_water`` is the newest article date seen so
+    far; later runs walk listings no further back than that date.
+    """
+
+    def __init__(self, company_site_id, articles=None, high_water=None):
+        self.company_site_id = company_site_id
+        self.articles = articles or {}
+        self.high_water = high_water
+        self._hashes = {a.get("hash") for a in self.articles.values() if a.get("hash")}
+
+    @classmethod
+    def from_dict(cls, company_site_id, payload):
+        return cls(company_site_id, payload.get("articles"), payload.get("high_water"))
+
+    def to_dict(self):
+        return {
+            "company_site_id": self.company_site_id,
+            "high_water": self.high_water,
+            "articles": self.articles,
+        }
+
+    def is_known(self, url):
+        return bool(url) and url in self.articles
+
+    def listing_start(self, target_date):
+        """Date the listing walk has to reach: target_date or the high-water mark, whichever is later."""
+        high_water = parse_date(self.high_water)
+        requested = parse_date(target_date)
+        if high_water and requested and high_water > requested:
+            logger.warning(
+                f"{self.company_site_id}: target_date {requested} is before the last known article "
+                f"({high_water}); walking listings back to {high_water} only. Set full_crawl to backfill."
+            )
+            return str(high_water)
+        return target_date
+
+    def new_items(self, items):
+        """
+        Items not captured before: by URL, or for content of at least
+        MIN_HASHED_CONTENT characters, by identical content (an article
+        re-published under a new URL).
+        """
+        fresh = []
+        for item in items:
+            if self.is_known(item.get("article_url")):
+                continue
+            content = item.get("article_content")
+            if (content and len(_normalise(content)) >= MIN_HASHED_CONTENT
+                    and content_hash(content) in self._hashes):
+                logger.debug(f"Same content already captured: {item.get('article_url')}")
+                continue
+            fresh.append(item)
+        skipped = len(items) - len(fresh)
+        if skipped:
+            logger.info(f"{self.company_site_id}: {skipped} already captured, {len(fresh)} new")
+        return fresh
+
+    def record(self, items, run_date=None):
+        """Remember captured items (those with content) and move the high-water mark."""
+        run_date = str(run_date or date.today())
+        newest = parse_date(self.high_water)
+        for item in items:
+            url = item.get("article_url")
+            digest = content_hash(item.get("article_content"))
+            if not url or not digest:
+                continue
+            self.articles[url] = {
+                "hash": digest,
+                "date": item.get("article_date"),
+                "captured": run_date,
+            }
+            self._hashes.add(digest)
+            article_date = parse_date(item.get("article_date"))
+            if article_date and article_date <= date.today() and (newest is None or article_date > newest):
+                newest = article_date
+        self.high_water = str(newest) if newest else None
+
+        if len(self.articles) > MAX_TRACKED_URLS:
+            ordered = sorted(self.articles.items(), key=lambda kv: kv[1].get("captured") or "")
+            self.articles = dict(ordered[-MAX_TRACKED_URLS:])
+            self._hashes = {a.get("hash") for a in self.articles.values() if a.get("hash")}
+
+
+class LocalCrawlStateStore:
+    """Crawl state as one JSON file per site; the stand-in for S3 in tests and local runs."""
+
+    def __init__(self, directory=CRAWL_STATE_DIR):
+        self.directory = directory
+
+    def _path(self, company_site_id):
+        return os.path.join(self.directory, f"{company_site_id}.json")
+
+    def load(self, company_site_id):
+        try:
+            with open(self._path(company_site_id), "r", encoding="utf-8") as f:
+                return CrawlState.from_dict(company_site_id, json.load(f))
+        except FileNotFoundError:
+            return CrawlState(company_site_id)
+
+    def save(self, state):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(state.company_site_id) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(state.company_site_id))
+
+
+class S3CrawlStateStore:
+    """Crawl state under ``s3://<bucket>/<prefix>/<company_site_id>.json``."""
+
+    def __init__(self, bucket, prefix=CRAWL_STATE_PREFIX, client=None):
+        self.bucket = bucket
+        self.prefix = prefix.rstrip("/")
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("s3")
+        return self._client
+
+    def _key(self, company_site_id):
+        return f"{self.prefix}/{company_site_id}.json"
+
+    def load(self, company_site_id):
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=self._key(company_site_id))
+        except self.client.exceptions.NoSuchKey:
+            return CrawlState(company_site_id)
+        return CrawlState.from_dict(company_site_id, json.loads(obj["Body"].read()))
+
+    def save(self, state):
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(state.company_site_id),
+            Body=json.dumps(state.to_dict(), ensure_ascii=False),
+            ContentType="application/json",
+        )
+
+
+def get_state_store(bucket=None):
+    """Store selected by CRAWL_STATE; None when state is switched off or no bucket is set."""
+    if CRAWL_STATE_BACKEND == "off":
+        return None
+    if CRAWL_STATE_BACKEND == "local":
+        return LocalCrawlStateStore()
+    if not bucket:
+        logger.warning("No bucket configured, crawl state disabled")
+        return None
+    return S3CrawlStateStore(bucket)
+
+
+# Site the running pipeline task is scraping and its crawl state (None when
+# state is off), so shared helpers such as fetch_articles can skip articles
+# captured on an earlier run. Tasks started by the scraper inherit it. Items
+# are not looked up by their own company_site_id, which some scrapers set to
+# a different id than the registry's.
+_running = contextvars.ContextVar("crawl_state", default=(None, None))
+
+
+def activate(company_site_id, state):
+    """Make ``company_site_id`` and its ``state`` current for this task; returns a token for ``deactivate``."""
+    return _running.set((company_site_id, state))
+
+
+def deactivate(token):
+    _running.reset(token)
+
+
+def running_site():
+    """Registry id of the site the running task is scraping, or None outside a pipeline run."""
+    return _running.get()[0]
+
+
+def active():
+    """Crawl state of the running site, or None."""
+    return _running.get()[1]
@@ -1,10 +1,14 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from readiness import wait_until_ready
+from article_fetch import fetch_articles
+from coveo_listing import CoveoListing, CoveoSearchCapture
+from listing_boundary import ListingBoundary
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 
 # ---------------- SITE METADATA ----------------
@@ -15,11 +19,12 @@ country = "Singapore"
 role = "Finance Professional"
 BASE_URL = "https://www.dimensional.com"
 
+# Coveo Headless search used by the insights listing (newest first).
+SORT_CRITERIA = "@publishdate descending"
+DATE_FIELD = "publishdate"
+
 def extract_date(text):
-    try:
-        return parser.parse(text, fuzzy=True).date()
-    except Exception:
-        return None
+    return parse_date(text, site=company_site_id)
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -40,48 +45,17 @@ class DimensionalScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper → {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             )
 
             page = await context.new_page()
+            # Record the search call the insights page makes on load
+            search_capture = CoveoSearchCapture(page)
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             try:
                 await page.wait_for_selector(
@@ -118,127 +92,169 @@ class DimensionalScraper:
             except Exception:
                 logger.debug("Audience selector not shown")
 
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            while True:
-                await page.wait_for_selector(
-                    "a.coveo-headless-content-card", timeout=15000
-                )
+            # Listing from the Coveo search API, or else from the cards by
+            # clicking "More Results"; articles are then fetched in parallel.
+            if not await self.scrape_search_api(context, search_capture.request):
+                await self.scrape_listing_cards(context, page)
 
-                cards = await page.locator(
-                    "a.coveo-headless-content-card"
-                ).all()
-
-                logger.info(f"Found {len(cards)} cards")
-                stop_pagination = False
-
-                for card in cards:
-                    try:
-                        href = await card.get_attribute("href")
-                        if not href:
-                            continue
-
-                        article_url = (
-                            href if href.startswith("http") else BASE_URL + href
-                        )
-
-                        if article_url in self.seen_urls:
-                            continue
-
-                        self.seen_urls.add(article_url)
-
-                        title = await card.locator(
-                            "h3.t-heading-md"
-                        ).text_content()
-
-                        logger.debug(f"Scraping article → {title}")
-
-                        article_page = await context.new_page()
-                        await article_page.goto(article_url, timeout=60000)
-                        await asyncio.sleep(self.sleep_time)
-
-                        raw_date = await article_page.locator(
-                            "p.pdf--date"
-                        ).first.text_content()
-
-                        article_date = extract_date(raw_date)
-
-                        if not article_date or article_date < self.target_date:
-                            stop_pagination = True
-                            await article_page.close()
-                            break
-
-                        try:
-                            description = await article_page.locator(
-                                "div.rtf-container p"
-                            ).first.text_content()
-                        except Exception:
-                            description = None
-
-                        tags = await article_page.locator(
-                            "div.content-page-metadata-tags a"
-                        ).all_text_contents()
-
-                        content = await article_page.locator(
-                            "div.content-column"
-                        ).inner_text()
-
-                        self.items.append(
-                            {
-                                "company_site_id": company_site_id,
-                                "company_site_country": country,
-                                "company_site_role": role,
-                                "article_source": site,
-                                "article_section": section,
-                                "article_date": str(article_date),
-                                "article_title": title.strip(),
-                                "article_description": description.strip()
-                                if description
-                                else None,
-                                "article_content": content.strip()
-                                if content
-                                else None,
-                                "article_tags": tags,
-                                "article_slug": article_url.rstrip("/").split("/")[-1],
-                                "article_url": article_url,
-                            }
-                        )
-
-                        await article_page.close()
-
-                    except Exception as e:
-                        logger.error(f"ERROR scraping card: {e}")
-
-                if stop_pagination:
-                    logger.info("Target date reached — stopping pagination")
-                    break
-
-                load_more = page.locator(
-                    "button.coveo-headless-results-show-more-button"
-                )
+            await fetch_articles(context, self.items, self.scrape_article)
+            await context.close()
+            return [
+                item for item in self.items
+                if item["article_date"] and parser.parse(item["article_date"]).date() >= self.target_date
+            ]
+
+    async def scrape_listing_cards(self, context, page):
+        """Fallback: load cards until the last one is older than target_date, without opening each article."""
+        boundary = ListingBoundary(context, self.target_date, site=company_site_id, article_date_selector="p.pdf--date")
+
+        while True:
+            await page.wait_for_selector(
+                "a.coveo-headless-content-card", timeout=15000
+            )
+
+            cards = await page.locator(
+                "a.coveo-headless-content-card"
+            ).all()
+
+            logger.info(f"Found {len(cards)} cards")
+
+            for card in cards:
+                try:
+                    href = await card.get_attribute("href")
+                    if not href:
+                        continue
+
+                    article_url = (
+                        href if href.startswith("http") else BASE_URL + href
+                    )
+
+                    if article_url in self.seen_urls:
+                        continue
+
+                    self.seen_urls.add(article_url)
+
+                    title = await card.locator(
+                        "h3.t-heading-md"
+                    ).text_content()
+
+                    self.items.append(
+                        {
+                            "company_site_id": company_site_id,
+                            "company_site_country": country,
+                            "company_site_role": role,
+                            "article_source": site,
+                            "article_section": section,
+                            "article_date": None,
+                            "article_title": title.strip(),
+                            "article_description": None,
+                            "article_content": None,
+                            "article_tags": [],
+                            "article_slug": article_url.rstrip("/").split("/")[-1],
+                            "article_url": article_url,
+                        }
+                    )
+
+                except Exception as e:
+                    logger.error(f"ERROR reading card: {e}")
+
+            # Only the last card's date decides whether to load more
+            href = await cards[-1].get_attribute("href") if cards else None
+            last_url = (href if href.startswith("http") else BASE_URL + href) if href else None
+            last_date = await boundary.card_date(last_url, card=cards[-1], page=page) if last_url else None
+            if not last_date or last_date < self.target_date:
+                logger.info("Target date reached — stopping pagination")
+                break
+
+            load_more = page.locator(
+                "button.coveo-headless-results-show-more-button"
+            )
+
+            if await load_more.count() > 0:
+                logger.info("Clicking More Results")
+                await load_more.first.click()
+                await wait_until_ready(page, self.sleep_time)
+            else:
+                logger.info("No More Results button — stopping")
+                break
+
+    async def scrape_search_api(self, context, request):
+        """Collect listing items from the Coveo search API. False if it cannot be used."""
+        if request is None:
+            logger.info("No Coveo search request seen, clicking through cards")
+            return False
+        try:
+            listing = await CoveoListing.from_request(context, request, SORT_CRITERIA)
+            results = await listing.results_since(self.target_date, DATE_FIELD)
+        except Exception as e:
+            logger.warning(f"Coveo search API failed ({e}), clicking through cards")
+            return False
+
+        for result, article_date in results:
+            href = result.get("clickUri") or result.get("uri")
+            if not href:
+                continue
+            article_url = href if href.startswith("http") else BASE_URL + href
+            if article_url in self.seen_urls:
+                continue
+            self.seen_urls.add(article_url)
+
+            self.items.append(
+                {
+                    "company_site_id": company_site_id,
+                    "company_site_country": country,
+                    "company_site_role": role,
+                    "article_source": site,
+                    "article_section": section,
+                    "article_date": str(article_date) if article_date else None,
+                    "article_title": (result.get("title") or "").strip(),
+                    "article_description": None,
+                    "article_content": None,
+                    "article_tags": [],
+                    "article_slug": article_url.rstrip("/").split("/")[-1],
+                    "article_url": article_url,
+                }
+            )
+
+        logger.info(f"Coveo search API returned {len(self.items)} listings")
+        return True
+
+    async def scrape_article(self, page, item):
+        await page.goto(item["article_url"], timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
+
+        # The article page carries the date shown to readers; prefer it.
+        try:
+            raw_date = await page.locator("p.pdf--date").first.text_content(timeout=5000)
+            article_date = extract_date(raw_date)
+            if article_date:
+                item["article_date"] = str(article_date)
+        except Exception:
+            pass
+
+        try:
+            description = await page.locator("div.rtf-container p").first.text_content(timeout=5000)
+        except Exception:
+            description = None
 
-                if await load_more.count() > 0:
-                    logger.info("Clicking More Results")
-                    await load_more.first.click()
-                    await asyncio.sleep(self.sleep_time)
-                else:
-                    logger.info("No More Results button — stopping")
-                    break
+        tags = await page.locator("div.content-page-metadata-tags a").all_text_contents()
+        content = await page.locator("div.content-column").inner_text()
 
-            await browser.close()
-            return self.items
+        item["article_description"] = description.strip() if description else None
+        item["article_content"] = content.strip() if content else None
+        item["article_tags"] = tags
 
 async def DFASGFP(target_date):
     url = "https://www.dimensional.com/hk-en/insights#t=catAll&sort=@publishdate%20descending"
     scraper = DimensionalScraper(target_date)
     results = await scraper.scrape(url)
 
-    output_path = f"/tmp/{company_site_id}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 if __name__ == "__main__":
     target_date = sys.argv[1] if len(sys.argv) > 1 else "2025-12-01"
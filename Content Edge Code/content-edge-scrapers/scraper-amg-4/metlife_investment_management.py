@@ -1,11 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
 from dateutil import parser
 
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 site = "MetLife Investment Management"
 section = "Insights"
@@ -33,40 +35,7 @@ class MetLifeScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                        "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                ]
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -88,21 +57,22 @@ class MetLifeScraper:
 
             await page.set_content("<meta http-equiv='X-Content-Type-Options' content='nosniff'>")
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
-            try:
-                accept_btn = page.locator("button.overlay-accept-button")
-                if await accept_btn.count() > 0:
-                    logger.info("Clicking ACCEPT overlay button")
-                await accept_btn.first.click(timeout=3000)
-                await asyncio.sleep(1)
-            except Exception as e:
-                logger.debug(f"No ACCEPT overlay found: {e}")
-
-            # Accept cookies
-            try:
-                await page.locator("#onetrust-accept-btn-handler").click(timeout=3000)
-            except:
-                pass
+            await wait_until_ready(page, self.sleep_time)
+            with run_report.span("consent"):
+                try:
+                    accept_btn = page.locator("button.overlay-accept-button")
+                    if await accept_btn.count() > 0:
+                        logger.info("Clicking ACCEPT overlay button")
+                    await accept_btn.first.click(timeout=3000)
+                    await asyncio.sleep(1)
+                except Exception as e:
+                    logger.debug(f"No ACCEPT overlay found: {e}")
+
+                # Accept cookies
+                try:
+                    await page.locator("#onetrust-accept-btn-handler").click(timeout=3000)
+                except:
+                    pass
 
             while True:
                 await page.wait_for_selector("div.article-list-item", timeout=15000)
@@ -128,7 +98,7 @@ class MetLifeScraper:
                             logger.info("Clicking Show More")
                             await load_more.first.scroll_into_view_if_needed()
                             await load_more.first.click()
-                            await asyncio.sleep(self.sleep_time)
+                            await wait_until_ready(page, self.sleep_time)
                         else:
                             logger.info("No Show More button found")
                             break
@@ -184,37 +154,32 @@ class MetLifeScraper:
                 })
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
 
             return self.items
 
     async def scrape_article_pages(self, context):
-        for item in self.items:
-            page = await context.new_page()
-            try:
-                await page.goto(item["article_url"], timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        await fetch_articles(context, self.items, self.scrape_article)
 
-                # DESCRIPTION
-                try:
-                    item["article_description"] = await page.locator(
-                        "meta[name='description']"
-                    ).get_attribute("content")
-                except:
-                    item["article_description"] = None
+    async def scrape_article(self, page, item):
+        await page.goto(item["article_url"], timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
 
-                # CONTENT
-                paragraphs = await page.locator(
-                    "div.richtext.richtext-wysiwyg p"
-                ).all_text_contents()
+        # DESCRIPTION
+        try:
+            item["article_description"] = await page.locator(
+                "meta[name='description']"
+            ).get_attribute("content")
+        except:
+            item["article_description"] = None
 
-                content = " ".join(p.strip() for p in paragraphs if p.strip())
-                item["article_content"] = content if content else None
+        # CONTENT
+        paragraphs = await page.locator(
+            "div.richtext.richtext-wysiwyg p"
+        ).all_text_contents()
 
-            except Exception as e:
-                logger.error(f"Failed scraping article: {e}")
-            finally:
-                await page.close()
+        content = " ".join(p.strip() for p in paragraphs if p.strip())
+        item["article_content"] = content if content else None
 
 
 async def METLIFEIMCO(target_date):
@@ -222,11 +187,10 @@ async def METLIFEIMCO(target_date):
     scraper = MetLifeScraper(target_date)
     results = await scraper.scrape(url)
 
-    with open(f"/tmp/{company_site_id}.json", "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
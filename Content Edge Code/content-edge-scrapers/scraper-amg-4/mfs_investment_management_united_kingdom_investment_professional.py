@@ -1,10 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 site = "MFS Investment Management"
 section = "Insights"
@@ -41,40 +43,7 @@ class MFSScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                   "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 viewport={"width": 1280, "height": 1696},
@@ -87,22 +56,23 @@ class MFSScraper:
 
             page = await context.new_page()
             await page.goto(url, timeout=60000, wait_until="networkidle")
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            try:
-                if await page.locator("button.cta-primary.continue-btn").count() > 0:
-                    logger.info("Popup detected — clicking CONTINUE")
-                    await page.click("button.cta-primary.continue-btn", timeout=8000)
-                    await asyncio.sleep(2)
+            with run_report.span("consent"):
+                try:
+                    if await page.locator("button.cta-primary.continue-btn").count() > 0:
+                        logger.info("Popup detected — clicking CONTINUE")
+                        await page.click("button.cta-primary.continue-btn", timeout=8000)
+                        await asyncio.sleep(2)
 
-                if await page.locator("button.cta-primary.acceptCTA").count() > 0:
-                    logger.info("Accept popup detected — clicking ACCEPT & SAVE")
-                    await page.click("button.cta-primary.acceptCTA", timeout=8000)
-                    await asyncio.sleep(2)
+                    if await page.locator("button.cta-primary.acceptCTA").count() > 0:
+                        logger.info("Accept popup detected — clicking ACCEPT & SAVE")
+                        await page.click("button.cta-primary.acceptCTA", timeout=8000)
+                        await asyncio.sleep(2)
 
-                await page.wait_for_load_state("networkidle")
-            except Exception:
-                logger.info("Popup not shown — continuing")
+                    await page.wait_for_load_state("networkidle")
+                except Exception:
+                    logger.info("Popup not shown — continuing")
 
             last_height = await page.evaluate("document.body.scrollHeight")
 
@@ -126,7 +96,7 @@ class MFSScraper:
                         pass
 
                 await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
 
                 new_height = await page.evaluate("document.body.scrollHeight")
                 if new_height == last_height:
@@ -184,34 +154,32 @@ class MFSScraper:
                 })
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
 
             return self.items
 
     async def scrape_article_pages(self, context):
         logger.info("Scraping article detail pages")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-        for item in self.items:
-            page = await context.new_page()
-            try:
-                await page.goto(item["article_url"], timeout=60000, wait_until="networkidle")
-                await asyncio.sleep(self.sleep_time)
+    async def scrape_article(self, page, item):
+        try:
+            await page.goto(item["article_url"], timeout=60000, wait_until="networkidle")
+            await wait_until_ready(page, self.sleep_time)
 
-                content_blocks = await page.locator(
-                    "div.col-md-9.right-section div.rich-text"
-                ).all_text_contents()
+            content_blocks = await page.locator(
+                "div.col-md-9.right-section div.rich-text"
+            ).all_text_contents()
 
-                full_text = " ".join(
-                    block.strip() for block in content_blocks if block.strip()
-                )
+            full_text = " ".join(
+                block.strip() for block in content_blocks if block.strip()
+            )
 
-                item["article_content"] = full_text
+            item["article_content"] = full_text
 
-            except Exception as e:
-                logger.error(f"ERROR scraping {item['article_url']}: {e}")
-                item["article_content"] = None
-            finally:
-                await page.close()
+        except Exception as e:
+            logger.error(f"ERROR scraping {item['article_url']}: {e}")
+            item["article_content"] = None
 
 
 async def MFSUKIP(target_date):
@@ -219,12 +187,10 @@ async def MFSUKIP(target_date):
     scraper = MFSScraper(target_date)
     results = await scraper.scrape(url)
 
-    output_path = f"/tmp/{company_site_id}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles newer than {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
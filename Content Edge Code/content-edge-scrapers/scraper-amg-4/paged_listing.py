@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import os
+
+import run_report
+
+logger = logging.getLogger("PAGED_LISTING")
+
+# Deepest listing page walked; callers with deeper listings pass max_pages.
+MAX_PAGES = int(os.getenv("MAX_LISTING_PAGES", "200"))
+# Listing pages fetched at once once the date window is known.
+PAGE_CONCURRENCY = int(os.getenv("PAGE_CONCURRENCY", "4"))
+
+
+def _last_date(entries):
+    """Date of the last dated entry on a page (the oldest, in a newest-first listing)."""
+    for _, date in reversed(entries):
+        if date:
+            return date
+    return None
+
+
+class PagedListing:
+    """
+    A newest-first listing whose pages can be fetched by number, such as a
+    ``?page=N`` URL or a Coveo ``#first=`` offset.
+
+    Instead of walking page 1, 2, 3... until a date older than
+    ``target_date`` turns up, the pages are probed with exponential then
+    binary search to find the last page reaching back to ``target_date``,
+    and the pages up to it are fetched ``concurrency`` at a time. A backfill
+    50 pages deep costs about a dozen sequential probes, not 50 page loads
+    in a row, and probed pages are not fetched twice.
+
+    ``fetch_page(page_no)`` returns the page's ``(item, date)`` pairs in
+    listing order, with date None where unknown, and an empty list past the
+    last page. It raises when the page cannot be loaded: an empty result is
+    taken as the end of the listing, so a failed load must not look like
+    one. A failed page is tried once more and then the error is raised,
+    failing the site rather than silently cutting its listing short.
+    """
+
+    def __init__(self, fetch_page, target_date, first_page=1, max_pages=MAX_PAGES, concurrency=PAGE_CONCURRENCY):
+        self.fetch_page = fetch_page
+        self.target_date = target_date
+        self.first_page = first_page
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self._pages = {}
+
+    async def page(self, page_no):
+        if page_no not in self._pages:
+            with run_report.span("listing_page"):
+                try:
+                    entries = await self.fetch_page(page_no)
+                except Exception as e:
+                    logger.warning(f"Listing page {page_no} failed, retrying once: {e}")
+                    run_report.count("retries")
+                    entries = await self.fetch_page(page_no)
+            # Only pages that loaded are kept; a failure above propagates.
+            self._pages[page_no] = entries
+        return self._pages[page_no]
+
+    async def _past_target(self, index):
+        """Whether the page ``index`` places after the first is empty or ends before target_date."""
+        entries = await self.page(self.first_page + index)
+        last_date = _last_date(entries)
+        return not entries or (last_date is not None and last_date < self.target_date)
+
+    async def last_page(self):
+        """
+        Number of the last page with anything dated on or after target_date,
+        or ``first_page - 1`` if the listing is empty.
+        """
+        # Pages up to ``before`` are known to reach past target_date; the
+        # page at ``boundary`` ends before it (or is empty, or the cap).
+        before, boundary = -1, self.max_pages
+        probe = 0
+        while probe < boundary:
+            if await self._past_target(probe):
+                boundary = probe
+                break
+            before = probe
+            probe = 2 * probe + 1
+
+        while boundary - before > 1:
+            middle = (before + boundary) // 2
+            if await self._past_target(middle):
+                boundary = middle
+            else:
+                before = middle
+
+        # The page where dates cross target_date still holds newer entries.
+        if boundary < self.max_pages and self._pages.get(self.first_page + boundary):
+            before = boundary
+        if boundary == self.max_pages:
+            logger.warning(
+                f"Listing still reaches {self.target_date} at the page cap ({self.max_pages} pages); "
+                f"older pages are not fetched"
+            )
+        logger.info(f"Last page for {self.target_date}: {self.first_page + before} ({len(self._pages)} probed)")
+        return self.first_page + before
+
+    async def results_since(self):
+        """
+        Every ``(item, date)`` dated on or after target_date, or undated, from
+        the pages up to ``last_page()``, in listing order.
+        """
+        last = await self.last_page()
+        window = range(self.first_page, last + 1)
+        pending = [page_no for page_no in window if page_no not in self._pages]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load(page_no):
+            async with semaphore:
+                await self.page(page_no)
+
+        await asyncio.gather(*(load(page_no) for page_no in pending))
+        logger.info(f"Fetched {len(pending)} more pages, {len(self._pages)} in total")
+
+        collected = []
+        for page_no in window:
+            for item, date in self._pages[page_no]:
+                if date is None or date >= self.target_date:
+                    collected.append((item, date))
+        return collected
@@ -1,9 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 site = "PGIM"
 section = "Insights"
@@ -14,10 +18,7 @@ BASE_URL = "https://www.pgim.com"
 
 
 def extract_date(text):
-    try:
-        return parser.parse(text, fuzzy=True).date()
-    except Exception:
-        return None
+    return parse_date(text, site=company_site_id)
 
 
 logging.basicConfig(
@@ -36,6 +37,7 @@ class PGIMScraper:
         self.items = []
         self.seen_urls = set()
 
+    @run_report.timed("consent")
     async def handle_attestation(self, page):
         try:
             await page.wait_for_selector("a.cmp-cta__link", timeout=5000)
@@ -49,7 +51,7 @@ class PGIMScraper:
             if await save_btn.count() > 0:
                 await save_btn.first.click()
                 logger.info("Attestation accepted")
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
 
         except Exception:
             logger.debug("No attestation popup")
@@ -73,40 +75,7 @@ class PGIMScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper → {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                     "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
@@ -114,7 +83,7 @@ class PGIMScraper:
 
             page = await context.new_page()
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             await self.handle_attestation(page)
             await self.remove_attestation_dom(page)
@@ -203,12 +172,12 @@ class PGIMScraper:
                 await asyncio.sleep(1)
 
                 await load_more.first.click(force=True)
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
 
                 page_index += 1
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
 
             return [
                 i for i in self.items
@@ -217,20 +186,16 @@ class PGIMScraper:
             ]
 
     async def scrape_article_pages(self, context):
-        for item in self.items:
-            page = await context.new_page()
-            try:
-                await page.goto(item["article_url"], timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        await fetch_articles(context, self.items, self.scrape_article)
+
+    async def scrape_article(self, page, item):
+        await page.goto(item["article_url"], timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
 
-                paragraphs = await page.locator("p").all_text_contents()
-                item["article_content"] = " ".join(
-                    p.strip() for p in paragraphs if p.strip()
-                )
-            except Exception as e:
-                logger.error(f"Article scrape error: {e}")
-            finally:
-                await page.close()
+        paragraphs = await page.locator("p").all_text_contents()
+        item["article_content"] = " ".join(
+            p.strip() for p in paragraphs if p.strip()
+        )
 
 
 async def PGIMUSI(target_date):
@@ -240,12 +205,10 @@ async def PGIMUSI(target_date):
     scraper = PGIMScraper(target_date)
     results = await scraper.scrape(url)
 
-    output_path = f"/tmp/{company_site_id}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles ≥ {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
@@ -1,9 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
+from date_parsing import parse_date
 
 
 # ---------------- SITE METADATA ----------------
@@ -16,10 +20,7 @@ BASE_URL = "https://www.pinebridge.com"
 
 
 def extract_date(text):
-    try:
-        return parser.parse(text, fuzzy=True).date()
-    except Exception:
-        return None
+    return parse_date(text, site=company_site_id)
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -41,40 +42,7 @@ class PineBridgeScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper → {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=False,
-                args=[
-                    "--disable-gpu",
-                        "--no-sandbox",
-                        "--single-process",
-                        "--disable-dev-shm-usage",
-                        "--no-zygote",
-                        "--disable-setuid-sandbox",
-                        "--disable-accelerated-2d-canvas",
-                        "--no-first-run",
-                        "--no-default-browser-check",
-                        "--disable-background-networking",
-                        "--disable-background-timer-throttling",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-default-apps",
-                        "--disable-domain-reliability",
-                        "--disable-features=AudioServiceOutOfProcess",
-                        "--disable-hang-monitor",
-                        "--disable-ipc-flooding-protection",
-                        "--disable-popup-blocking",
-                        "--disable-prompt-on-repost",
-                        "--disable-renderer-backgrounding",
-                        "--disable-sync",
-                        "--force-color-profile=srgb",
-                        "--metrics-recording-only",
-                        "--mute-audio",
-                        "--no-pings",
-                        "--use-gl=swiftshader",
-                        "--window-size=1280,1696"
-                ],
-            )
+        async with browser_session(company_site_id, headless=False) as browser:
 
             context = await browser.new_context(
                 user_agent=(
@@ -86,14 +54,15 @@ class PineBridgeScraper:
 
             page = await context.new_page()
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            try:
-                await page.wait_for_selector("button:has-text('Accept')", timeout=15000)
-                await page.click("button:has-text('Accept')")
-                await asyncio.sleep(self.sleep_time)
-            except Exception:
-                pass
+            with run_report.span("consent"):
+                try:
+                    await page.wait_for_selector("button:has-text('Accept')", timeout=15000)
+                    await page.click("button:has-text('Accept')")
+                    await wait_until_ready(page, self.sleep_time)
+                except Exception:
+                    pass
 
             # -------- PAGINATION LOOP --------
             page_number = 1
@@ -157,7 +126,7 @@ class PineBridgeScraper:
                         logger.info("Clicking next page")
                         await next_btn.first.click()
                         await page.wait_for_load_state("networkidle")
-                        await asyncio.sleep(self.sleep_time)
+                        await wait_until_ready(page, self.sleep_time)
                         page_number += 1
                     else:
                         break
@@ -166,51 +135,43 @@ class PineBridgeScraper:
                     break
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
             return self.items
 
     async def scrape_article_pages(self, context):
         logger.info("Scraping article pages")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-        for item in self.items:
-            page = await context.new_page()
-            try:
-                await page.goto(item["article_url"], timeout=60000)
-                await asyncio.sleep(self.sleep_time)
-
-                # ---- DESCRIPTION ----
-                desc = await page.locator("div.undefined.false ul li p, div.undefined.false p").all_text_contents()
-                desc_clean = [d.strip() for d in desc if d.strip()]
-                item["article_description"] = " ".join(desc_clean) if desc_clean else None
+    async def scrape_article(self, page, item):
+        await page.goto(item["article_url"], timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
 
-                # ---- CONTENT ----
-                paragraphs = await page.locator(
-                    "div.undefined.false p, div.rich-content_isi__I1C6Q p, "
-                    "div.rich-content_isi__I1C6Q h2, div.rich-content_isi__I1C6Q h3"
-                ).all_text_contents()
+        # ---- DESCRIPTION ----
+        desc = await page.locator("div.undefined.false ul li p, div.undefined.false p").all_text_contents()
+        desc_clean = [d.strip() for d in desc if d.strip()]
+        item["article_description"] = " ".join(desc_clean) if desc_clean else None
 
-                content_clean = [p.strip() for p in paragraphs if p.strip()]
-                item["article_content"] = " ".join(content_clean) if content_clean else None
+        # ---- CONTENT ----
+        paragraphs = await page.locator(
+            "div.undefined.false p, div.rich-content_isi__I1C6Q p, "
+            "div.rich-content_isi__I1C6Q h2, div.rich-content_isi__I1C6Q h3"
+        ).all_text_contents()
 
-                if not content_clean:
-                    logger.warning(f"No content found → {item['article_url']}")
+        content_clean = [p.strip() for p in paragraphs if p.strip()]
+        item["article_content"] = " ".join(content_clean) if content_clean else None
 
-            except Exception as e:
-                logger.error(f"ERROR scraping {item['article_url']}: {e}")
-            finally:
-                await page.close()
+        if not content_clean:
+            logger.warning(f"No content found → {item['article_url']}")
 
 async def PBIUSI(target_date):
     url = "https://www.pinebridge.com/en-us/intermediary/all-insights"
     scraper = PineBridgeScraper(target_date)
     results = await scraper.scrape(url)
 
-    output_path = f"/tmp/{company_site_id}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
@@ -1,11 +1,13 @@
 import asyncio
-import json
 import logging
 import sys
-from datetime import datetime
 from dateutil import parser
 import re
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+import run_report
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 site = "RBC Global Asset Management"
 section = "Insights"
@@ -40,40 +42,7 @@ class RBCBlueBayUKScraper:
     async def scrape(self, url):
         logger.debug(f"DEBUG: Starting Playwright scraper for {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -81,19 +50,20 @@ class RBCBlueBayUKScraper:
             page = await context.new_page()
 
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
-            try:
-                await page.evaluate("""
-                    const modal = document.querySelector('#siteEntryModal');
-                    if (modal) modal.remove();
-                    document.querySelectorAll('.modal-backdrop').forEach(el => el.remove());
-                    document.body.classList.remove('modal-open');
-                    document.body.style.overflow = 'auto';
-                """)
-                logger.info("Popup force-removed after page load")
-            except Exception:
-                pass
+            with run_report.span("consent"):
+                try:
+                    await page.evaluate("""
+                        const modal = document.querySelector('#siteEntryModal');
+                        if (modal) modal.remove();
+                        document.querySelectorAll('.modal-backdrop').forEach(el => el.remove());
+                        document.body.classList.remove('modal-open');
+                        document.body.style.overflow = 'auto';
+                    """)
+                    logger.info("Popup force-removed after page load")
+                except Exception:
+                    pass
 
 
             current_page = 1
@@ -177,42 +147,40 @@ class RBCBlueBayUKScraper:
                     pass
 
                 await next_page.first.click()
-                await asyncio.sleep(self.sleep_time)
+                await wait_until_ready(page, self.sleep_time)
                 current_page += 1
 
             await self.scrape_article_pages(context)
-            await browser.close()
+            await context.close()
             return self.items
 
     async def scrape_article_pages(self, context):
         logger.debug("DEBUG: Starting to scrape individual articles")
+        await fetch_articles(context, self.items, self.scrape_article)
 
-        for item in self.items:
-            url = item["article_url"]
-            if not url:
-                continue
-            page = await context.new_page()
-            try:
-                await page.goto(url, timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+    async def scrape_article(self, page, item):
+        url = item["article_url"]
+        if not url:
+            return
+        try:
+            await page.goto(url, timeout=60000)
+            await wait_until_ready(page, self.sleep_time)
 
-                container = page.locator("div.container.bb-rich-text")
+            container = page.locator("div.container.bb-rich-text")
 
-                try:
-                    description = await container.locator("h2").first.text_content()
-                    item["article_description"] = description.strip()
-                except Exception:
-                    item["article_description"] = None
+            try:
+                description = await container.locator("h2").first.text_content()
+                item["article_description"] = description.strip()
+            except Exception:
+                item["article_description"] = None
 
-                texts = await container.locator("p, li, h3").all_text_contents()
-                item["article_content"] = " ".join(t.strip() for t in texts if t.strip())
+            texts = await container.locator("p, li, h3").all_text_contents()
+            item["article_content"] = " ".join(t.strip() for t in texts if t.strip())
 
-            except Exception as e:
-                logger.error(f"ERROR scraping {url}: {e}")
-                item["article_content"] = None
-                item["article_description"] = None
-            finally:
-                await page.close()
+        except Exception as e:
+            logger.error(f"ERROR scraping {url}: {e}")
+            item["article_content"] = None
+            item["article_description"] = None
 
 
 async def RBCSGIP(target_date):
@@ -220,12 +188,10 @@ async def RBCSGIP(target_date):
     scraper = RBCBlueBayUKScraper(target_date)
     results = await scraper.scrape(url)
 
-    output_path = f"/tmp/{company_site_id}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    write_debug_output(company_site_id, results)
 
     logger.info(f"Scraped {len(results)} articles after {target_date}")
-    return 200
+    return results
 
 
 if __name__ == "__main__":
@@ -1,11 +1,12 @@
 import asyncio
-import json
 import logging
 import sys
 import re
-from datetime import datetime
 from dateutil import parser
-from playwright.async_api import async_playwright
+from browser_runtime import browser_session
+from article_fetch import fetch_articles
+from readiness import wait_until_ready
+from scrape_output import write_debug_output
 
 # --- Site metadata ---
 site = "RBC Global Asset Management"
@@ -41,40 +42,7 @@ class RBCUSIMScraper:
     async def scrape(self, url):
         logger.info(f"Starting scraper for URL: {url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--single-process",
-                    "--disable-dev-shm-usage",
-                    "--no-zygote",
-                    "--disable-setuid-sandbox",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-component-update",
-                    "--disable-default-apps",
-                    "--disable-domain-reliability",
-                    "--disable-features=AudioServiceOutOfProcess",
-                    "--disable-hang-monitor",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--disable-renderer-backgrounding",
-                    "--disable-sync",
-                    "--force-color-profile=srgb",
-                    "--metrics-recording-only",
-                    "--mute-audio",
-                    "--no-pings",
-                    "--use-gl=swiftshader",
-                    "--window-size=1280,1696",
-                ],
-            )
+        async with browser_session(company_site_id) as browser:
 
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -97,7 +65,7 @@ class RBCUSIMScraper:
 
             # Step 1: Load page
             await page.goto(url, timeout=60000)
-            await asyncio.sleep(self.sleep_time)
+            await wait_until_ready(page, self.sleep_time)
 
             # Step 2: Pagination
             while True:
@@ -117,7 +85,7 @@ class RBCUSIMScraper:
                     if await load_more.count() > 0:
                         logger.info("Clicking Load More")
                         await load_more.first.click()
-                        await asyncio.sleep(self.sleep_time)
+                        await wait_until_ready(page, self.sleep_time)
                     else:
                         break
                 else:
@@ -166,30 +134,24 @@ class RBCUSIMScraper:
             # Step 4: Scrape article pages
             await self.scrape_article_pages(context)
 
-            await browser.close()
+            await context.close()
             logger.info(f"Finished scraping {len(self.items)} articles")
             return self.items
 
     async def scrape_article_pages(self, context):
-        page = await context.new_page()
-
-        for idx, item in enumerate(self.items, start=1):
-            try:
-                await page.goto(item["article_url"], timeout=60000)
-                await asyncio.sleep(self.sleep_time)
+        await fetch_articles(context, self.items, self.scrape_article)
 
-                content = await page.locator(
-                    "article.section-block.content-article"
-                ).all_text_contents()
+    async def scrape_article(self, page, item):
+        await page.goto(item["article_url"], timeout=60000)
+        await wait_until_ready(page, self.sleep_time)
 
-                item["article_content"] = " ".join(
-                    t.strip() for t in content if t.strip()
-                )
+        content = await page.locator(
+            "article.section-block.content-article"
+        ).all_text_contents()
 
-            except Exception as e:
-                logger.error(f"Article scrape failed #{idx}: {e}")
-
-        await page.close()
+        item["article_content"] = " ".join(
+            t.strip() for t in content if t.strip()
+        )
 
 
 async def RBCUSIM(target_date):
@@ -199,12 +161,10 @@ async def RBCUSIM(target_date):
         scraper = RBCUSIMScraper(target_date)
         results = await scraper.scrape(url)
 
-        output_path = f"/tmp/{company_site_id}.json"
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        write_debug_output(company_site_id, results)
 
         logger.info(f"Scraped {len(results)} articles after {target_date}")
-        return 200
+        return results
 
     except Exception as error:
         logger.error(f"Error: {error}")
@@ -0,0 +1,168 @@
+import logging
+import os
+from urllib.parse import urlparse
+
+logger = logging.getLogger("RESOURCE_BLOCKING")
+
+# Resource types that never carry article text.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+# Analytics, tag-manager and ad hosts (matched on the host suffix).
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "hotjar.io",
+    "clarity.ms",
+    "bat.bing.com",
+    "snap.licdn.com",
+    "px.ads.linkedin.com",
+    "ads-twitter.com",
+    "analytics.twitter.com",
+    "analytics.tiktok.com",
+    "omtrdc.net",
+    "demdex.net",
+    "everesttech.net",
+    "js-agent.newrelic.com",
+    "nr-data.net",
+    "cdn.segment.com",
+    "api.segment.io",
+    "optimizely.com",
+    "quantserve.com",
+    "scorecardresearch.com",
+    "adnxs.com",
+    "taboola.com",
+    "outbrain.com",
+    "crazyegg.com",
+    "mouseflow.com",
+    "fullstory.com",
+    "siteintercept.qualtrics.com",
+    "munchkin.marketo.net",
+    "pi.pardot.com",
+    "demandbase.com",
+    "j.6sc.co",
+    "bizible.com",
+)
+
+# Rough transfer size of a blocked request by type; aborted requests never
+# download, so the saving is an estimate.
+ESTIMATED_BYTES = {
+    "image": 60_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "media": 500_000,
+    "script": 40_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+# Per-site allow-lists. Sites that check element visibility before clicking
+# "Load more"/pagination controls keep their stylesheets.
+SITE_ALLOWLISTS = {
+    "am-237": {"types": {"stylesheet"}},
+    "am-238": {"types": {"stylesheet"}},
+    "am-239": {"types": {"stylesheet"}},
+    "am-247": {"types": {"stylesheet"}},
+    "am-248": {"types": {"stylesheet"}},
+    "am-264": {"types": {"stylesheet"}},
+    "am-265": {"types": {"stylesheet"}},
+    "am-269": {"types": {"stylesheet"}},
+    "am-270": {"types": {"stylesheet"}},
+    "am-271": {"types": {"stylesheet"}},
+    "am-273": {"types": {"stylesheet"}},
+    "am-278": {"types": {"stylesheet"}},
+    "am-279": {"types": {"stylesheet"}},
+    "am-280": {"types": {"stylesheet"}},
+    "am-295": {"types": {"stylesheet"}},
+    "am-296": {"types": {"stylesheet"}},
+    "am-297": {"types": {"stylesheet"}},
+    "am-301": {"types": {"stylesheet"}},
+}
+
+# Set BLOCK_RESOURCES=0 to switch interception off everywhere.
+BLOCKING_ENABLED = os.getenv("BLOCK_RESOURCES", "1") != "0"
+
+
+def _host_matches(host, domains):
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+class ResourceBlocker:
+    """
+    Context-wide request interception that aborts heavy and tracking requests.
+
+    Counts what it blocks (requests per reason and an estimate of the bytes
+    saved) and the bytes actually transferred, from Content-Length headers.
+    """
+
+    def __init__(self, site_id=None, allow_types=(), allow_hosts=()):
+        rules = SITE_ALLOWLISTS.get(site_id, {})
+        self.site_id = site_id
+        self.blocked_types = BLOCKED_RESOURCE_TYPES - set(rules.get("types", ())) - set(allow_types)
+        self.allow_hosts = tuple(rules.get("hosts", ())) + tuple(allow_hosts)
+        self.stats = {
+            "requests": 0,
+            "blocked_requests": 0,
+            "blocked_by_reason": {},
+            "estimated_blocked_bytes": 0,
+            "transferred_bytes": 0,
+        }
+
+    def _reason(self, request):
+        host = urlparse(request.url).hostname or ""
+        if _host_matches(host, self.allow_hosts):
+            return None
+        if request.resource_type in self.blocked_types:
+            return request.resource_type
+        if _host_matches(host, BLOCKED_HOSTS):
+            return "tracker"
+        return None
+
+    async def handle(self, route, request):
+        self.stats["requests"] += 1
+        reason = self._reason(request)
+        try:
+            if reason is None:
+                await route.continue_()
+                return
+
+            self.stats["blocked_requests"] += 1
+            by_reason = self.stats["blocked_by_reason"]
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+            self.stats["estimated_blocked_bytes"] += ESTIMATED_BYTES.get(request.resource_type, DEFAULT_ESTIMATED_BYTES)
+            await route.abort()
+        except Exception as e:
+            # The page may have navigated away or closed meanwhile.
+            logger.debug(f"Route handling skipped for {request.url}: {e}")
+
+    def on_response(self, response):
+        try:
+            self.stats["transferred_bytes"] += int(response.headers.get("content-length", 0))
+        except (TypeError, ValueError):
+            pass
+
+    async def install(self, context):
+        await context.route("**/*", self.handle)
+        context.on("response", self.on_response)
+        return self
+
+
+def merge_stats(stats_list):
+    """Sum the counters of several blockers (e.g. every context of one run)."""
+    total = {
+        "requests": 0,
+        "blocked_requests": 0,
+        "blocked_by_reason": {},
+        "estimated_blocked_bytes": 0,
+        "transferred_bytes": 0,
+    }
+    for stats in stats_list:
+        for key in ("requests", "blocked_requests", "estimated_blocked_bytes", "transferred_bytes"):
+            total[key] += stats[key]
+        for reason, count in stats["blocked_by_reason"].items():
+            total["blocked_by_reason"][reason] = total["blocked_by_reason"].get(reason, 0) + count
+    return total
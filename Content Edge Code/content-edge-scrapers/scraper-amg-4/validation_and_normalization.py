@@ -1,11 +1,48 @@
+"""
+Validates and normalises scraped output files.
+
+Each input file holds one site's items (a scraper's /tmp/<company_site_id>.json
+or an output object in any format the output writer produces). Rows missing a
+usable article_date, article_title or article_url are rejected with their
+reasons; the rest are cleaned. Inputs are grouped by site, so several days of
+one site (e.g. 2025-12-01/am-432.json and 2025-12-02/am-432.json) end up in
+the same <output_dir>/<site>.accepted.jsonl and <site>.rejected.jsonl. Sites
+are processed in parallel, and a summary with rejection-reason counts is
+printed.
+
+Usage:
+    python validation_and_normalization.py FILE_OR_DIR [...] [-o OUTPUT_DIR]
+        [--workers N] [--format jsonl|json] [--summary summary.json]
+"""
+import argparse
 import json
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+
 from dateutil import parser
+
 from normalise import clean_data
+from output_writer import FORMATS, WRITERS, read_items
+
+# Plain ISO dates and datetimes; anything else goes through dateutil.
+_ISO_DATE_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:Z|[+-]\d{2}:?\d{2})?)?"
+)
+INPUT_SUFFIXES = (".json", ".jsonl", ".json.gz", ".jsonl.gz", ".json.zst", ".jsonl.zst")
+
 
 def is_valid_date(value):
     if not isinstance(value, str):
         return False
+    if _ISO_DATE_RE.fullmatch(value.strip()):
+        try:
+            datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+            return True
+        except ValueError:
+            pass
     try:
         parser.parse(value)
         return True
@@ -26,36 +63,141 @@ def validate_row(row):
 
     return errors
 
-def main(input_file):
-    with open(input_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    accepted = []
-    rejected = []
-
-    for row in data:
-        errors = validate_row(row)
 
-        if errors:
-            rejected.append({
-                "row": row,
-                "reason": errors
-            })
+def site_name(path):
+    """Site id of an input file: its name up to the first dot (am-432.json -> am-432)."""
+    return os.path.basename(path).split(".", 1)[0]
+
+
+def iter_rows(path):
+    """Rows of an input file; uncompressed JSON Lines files are read line by line."""
+    with open(path, "rb") as f:
+        head = f.read(4)
+        f.seek(0)
+        if path.endswith(".jsonl") and not head.lstrip().startswith(b"["):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        yield from read_items(f.read())
+
+
+def find_inputs(paths):
+    """Input files named directly or found (non-recursively) in the given directories."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.endswith(INPUT_SUFFIXES)
+            )
         else:
-
-            cleaned_row = clean_data(row)
-            accepted.append(cleaned_row)
-
-    with open("accepted.json", "w", encoding="utf-8") as f:
-        json.dump(accepted, f, indent=4, ensure_ascii=False)
-
-    with open("rejected.json", "w", encoding="utf-8") as f:
-        json.dump(rejected, f, indent=4, ensure_ascii=False)
-
-    print(f"Accepted rows: {len(accepted)}")
-    print(f"Rejected rows: {len(rejected)}")
+            found.append(path)
+    return found
+
+
+def group_by_site(input_files):
+    """Input files keyed by site id, in the order each site is first seen."""
+    sites = {}
+    for path in input_files:
+        sites.setdefault(site_name(path), []).append(path)
+    return sites
+
+
+def validate_site(site, input_files, output_dir, fmt="jsonl"):
+    """
+    Validate and clean all of one site's files, streaming both outputs.
+
+    Returns:
+        Dict with the site, its inputs, row counts, rejection reasons and output paths
+    """
+    extension = FORMATS[fmt][0]
+    accepted_path = os.path.join(output_dir, f"{site}.accepted{extension}")
+    rejected_path = os.path.join(output_dir, f"{site}.rejected{extension}")
+    reasons = Counter()
+
+    with open(accepted_path, "wb") as accepted_file, open(rejected_path, "wb") as rejected_file:
+        accepted_writer = WRITERS[fmt](accepted_file)
+        rejected_writer = WRITERS[fmt](rejected_file)
+        for input_file in input_files:
+            for row in iter_rows(input_file):
+                errors = validate_row(row)
+                if errors:
+                    rejected_writer.write({"row": row, "reason": errors})
+                    reasons.update(errors)
+                else:
+                    accepted_writer.write(clean_data(row))
+        accepted_writer.close()
+        rejected_writer.close()
+
+    return {
+        "site": site,
+        "inputs": list(input_files),
+        "accepted": accepted_writer.count,
+        "rejected": rejected_writer.count,
+        "reasons": dict(reasons),
+        "accepted_path": accepted_path,
+        "rejected_path": rejected_path,
+    }
+
+
+def validate_files(input_files, output_dir, workers=None, fmt="jsonl"):
+    """
+    Validate many site files in a process pool, one task per site.
+
+    Returns:
+        Summary with totals, rejection-reason counts and per-site results
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    sites = group_by_site(input_files)
+    workers = workers or min(len(sites), os.cpu_count() or 1) or 1
+    if workers == 1:
+        results = [validate_site(site, paths, output_dir, fmt) for site, paths in sites.items()]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                validate_site,
+                list(sites),
+                list(sites.values()),
+                [output_dir] * len(sites),
+                [fmt] * len(sites),
+            ))
+
+    reasons = Counter()
+    for result in results:
+        reasons.update(result["reasons"])
+    return {
+        "files": len(input_files),
+        "accepted": sum(r["accepted"] for r in results),
+        "rejected": sum(r["rejected"] for r in results),
+        "reasons": dict(reasons.most_common()),
+        "sites": results,
+    }
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description="Validate and normalise scraped output files.")
+    arguments.add_argument("inputs", nargs="+", help="site output files or directories of them")
+    arguments.add_argument("-o", "--output-dir", default="validated")
+    arguments.add_argument("--workers", type=int, help="processes (default: one per CPU)")
+    arguments.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    arguments.add_argument("--summary", help="also write the summary to this JSON file")
+    args = arguments.parse_args(argv)
+
+    summary = validate_files(find_inputs(args.inputs), args.output_dir, args.workers, args.format)
+
+    for site in summary["sites"]:
+        print(f"{site['site']}: accepted {site['accepted']}, rejected {site['rejected']}")
+    print(f"Accepted rows: {summary['accepted']}")
+    print(f"Rejected rows: {summary['rejected']}")
+    for reason, count in summary["reasons"].items():
+        print(f"  {reason}: {count}")
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=4, ensure_ascii=False)
+    return summary
 
 
 if __name__ == "__main__":
-    main(r"C:\tmp\am-432.json")
-
+    main()
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The shared modules are authored in scraper-amg-1 and copied to the other
+# deploy directories, so the tests import them from there. Tools that only
+# ship in scraper-amg-4 are found after them.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scraper-amg-1"))
+sys.path.append(os.path.join(ROOT, "scraper-amg-4"))
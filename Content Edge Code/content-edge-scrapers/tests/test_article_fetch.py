@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from article_fetch import fetch_articles
+
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage()
+
+
+class FakePage:
+    async def close(self):
+        pass
+
+
+def test_fast_path_and_browser_share_one_deadline():
+    async def slow_fast_path(item):
+        await asyncio.sleep(0.15)
+        return False
+
+    async def slow_handler(page, item):
+        await asyncio.sleep(0.15)
+        item["article_content"] = "Body"
+
+    items = [{"article_url": "https://example.com/a"}]
+    started = time.perf_counter()
+    stats = asyncio.run(fetch_articles(FakeContext(), items, slow_handler, timeout=0.2, fast_path=slow_fast_path))
+
+    assert time.perf_counter() - started < 0.3
+    assert stats["timed_out"] == 1 and stats["fetched"] == 0
+    assert "article_content" not in items[0]
+
+
+def test_browser_gets_the_time_left_after_a_failed_fast_path():
+    async def failing_fast_path(item):
+        raise ValueError("no article body in the HTML")
+
+    async def handler(page, item):
+        item["article_content"] = "Body"
+
+    items = [{"article_url": "https://example.com/a"}]
+    stats = asyncio.run(fetch_articles(FakeContext(), items, handler, timeout=1, fast_path=failing_fast_path))
+
+    assert stats["fetched"] == 1 and stats["via_http"] == 0
+    assert items[0]["article_content"] == "Body"
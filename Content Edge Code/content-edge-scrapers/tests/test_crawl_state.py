@@ -0,0 +1,85 @@
+import asyncio
+
+from article_fetch import fetch_articles
+from crawl_state import CrawlState, LocalCrawlStateStore, content_hash
+from pipeline import SitePipeline
+
+
+def article(url, date, content):
+    return {"article_url": url, "article_date": date, "article_content": content}
+
+
+def test_state_round_trips_through_the_local_store(tmp_path):
+    store = LocalCrawlStateStore(str(tmp_path))
+    state = store.load("am-1")
+    assert state.articles == {} and state.high_water is None
+
+    state.record([
+        article("https://example.com/a", "2025-11-03", "First  article"),
+        article("https://example.com/b", "2025-11-10", "Second article"),
+        article("https://example.com/no-content", "2025-11-12", None),
+    ], run_date="2025-11-12")
+    store.save(state)
+
+    loaded = store.load("am-1")
+    assert loaded.high_water == "2025-11-10"
+    assert set(loaded.articles) == {"https://example.com/a", "https://example.com/b"}
+    assert loaded.articles["https://example.com/a"] == {
+        "hash": content_hash("First article"),
+        "date": "2025-11-03",
+        "captured": "2025-11-12",
+    }
+    assert loaded.is_known("https://example.com/b")
+    assert not loaded.is_known("https://example.com/no-content")
+
+
+def test_loaded_state_filters_captured_items(tmp_path):
+    body = " ".join(f"word{k}" for k in range(200))
+    store = LocalCrawlStateStore(str(tmp_path))
+    state = CrawlState("am-1")
+    state.record([
+        article("https://example.com/a", "2025-11-03", body),
+        article("https://example.com/b", "2025-11-03", "Please enable JavaScript"),
+    ], run_date="2025-11-03")
+    store.save(state)
+
+    loaded = store.load("am-1")
+    fresh = loaded.new_items([
+        article("https://example.com/a", "2025-11-03", body),
+        article("https://example.com/a-copy", "2025-11-03", f"  {body} "),
+        article("https://example.com/c", "2025-11-20", "New body"),
+        article("https://example.com/d", "2025-11-20", "Please enable JavaScript"),
+    ])
+    assert [item["article_url"] for item in fresh] == ["https://example.com/c", "https://example.com/d"]
+    assert loaded.listing_start("2025-10-01") == "2025-11-03"
+    assert loaded.listing_start("2025-12-01") == "2025-12-01"
+
+
+def test_fetch_skips_captured_articles_of_the_running_site(tmp_path):
+    # The registry runs am-269 but the scraper labels its items am-270.
+    store = LocalCrawlStateStore(str(tmp_path))
+    state = CrawlState("am-269")
+    state.record([article("https://example.com/a", "2025-11-03", "Body")], run_date="2025-11-03")
+    store.save(state)
+    fetched = []
+
+    async def fast_path(item):
+        fetched.append(item["article_url"])
+        item["article_content"] = "New body"
+        return True
+
+    async def scraper(target_date):
+        items = [
+            {"company_site_id": "am-270", "article_url": url, "article_date": "2025-12-01"}
+            for url in ("https://example.com/a", "https://example.com/b")
+        ]
+        stats = await fetch_articles(None, items, handler=None, fast_path=fast_path)
+        assert stats["known"] == 1
+        return [item for item in items if item.get("article_content")]
+
+    pipeline = SitePipeline({"am-269": scraper}, "bucket", upload=lambda data, bucket, key: True, crawl_store=store)
+    result = asyncio.run(pipeline.run_site("am-269", "2025-12-01"))
+
+    assert result["statusCode"] == 200 and result["articles"] == 1
+    assert fetched == ["https://example.com/b"]
+    assert store.load("am-269").is_known("https://example.com/b")
@@ -0,0 +1,37 @@
+from datetime import date
+
+import date_parsing
+from date_parsing import parse_date, parse_relative_date
+
+TODAY = date(2025, 6, 15)
+
+
+def test_relative_dates():
+    assert parse_relative_date("Today", today=TODAY) == TODAY
+    assert parse_relative_date("yesterday", today=TODAY) == date(2025, 6, 14)
+    assert parse_relative_date("3 days ago", today=TODAY) == date(2025, 6, 12)
+    assert parse_relative_date("a week ago", today=TODAY) == date(2025, 6, 8)
+    assert parse_relative_date("2 hours ago", today=TODAY) == TODAY
+    assert parse_relative_date("June 3, 2025", today=TODAY) is None
+
+
+def test_common_and_site_formats():
+    assert parse_date("2025-06-03", site="dp-common") == date(2025, 6, 3)
+    assert parse_date(" June 3, 2025 ", site="dp-common") == date(2025, 6, 3)
+    assert parse_date("Jun. 03, 2025", site="dp-common") == date(2025, 6, 3)
+    # Day first only where the site says so.
+    assert parse_date("03-06-2025", site="dp-us") == date(2025, 3, 6)
+    assert parse_date("03-06-2025", site="dp-uk", formats=("%d-%m-%Y",)) == date(2025, 6, 3)
+
+
+def test_matched_format_is_tried_first_for_the_site():
+    parse_date("3 June 2025", site="dp-order")
+    assert date_parsing._site_formats["dp-order"][0] == "%d %B %Y"
+
+
+def test_fuzzy_fallback_is_counted_and_empty_text_is_none():
+    assert parse_date("Published on June 3rd, 2025 by Research", site="dp-fuzzy") == date(2025, 6, 3)
+    assert date_parsing.fuzzy_fallbacks["dp-fuzzy"] == 1
+    assert parse_date("Published on June 3rd, 2025 by Research", site="dp-strict", fuzzy=False) is None
+    assert parse_date("", site="dp-fuzzy") is None
+    assert parse_date(None) is None
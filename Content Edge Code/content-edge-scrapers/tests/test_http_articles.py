@@ -0,0 +1,54 @@
+from http_articles import HtmlDocument
+
+PAGE = """
+<html><body>
+  <header><h1 class="title">Header title</h1></header>
+  <article id="main" data-kind='insight'>
+    <h1 class="title headline">Market outlook</h1>
+    <div class="body">
+      <p>First paragraph
+      <p>Second <b>bold</b> paragraph
+      <ul><li>One<li>Two</ul>
+      <script>var tracking = 1;</script>
+    </div>
+    <table><tr><td>A<td>B<tr><td>C</table>
+  </article>
+</body></html>
+"""
+
+
+def texts(doc, selector):
+    return [text.strip() for text in doc.all_text_contents(selector)]
+
+
+def test_tag_class_id_and_attribute_selectors():
+    doc = HtmlDocument(PAGE)
+    assert texts(doc, "h1.title") == ["Header title", "Market outlook"]
+    assert texts(doc, ".title.headline") == ["Market outlook"]
+    assert texts(doc, "#main h1") == ["Market outlook"]
+    assert texts(doc, "article[data-kind='insight'] > h1") == ["Market outlook"]
+    assert texts(doc, "article[data-kind=other] h1") == []
+    assert len(doc.query_all("[data-kind]")) == 1
+
+
+def test_child_and_descendant_combinators_and_selector_lists():
+    doc = HtmlDocument(PAGE)
+    assert texts(doc, "article > p") == []
+    assert texts(doc, "article p") == ["First paragraph", "Second bold paragraph"]
+    assert texts(doc, "header h1, .body > p") == ["Header title", "First paragraph", "Second bold paragraph"]
+
+
+def test_implied_end_tags_close_like_a_browser():
+    doc = HtmlDocument(PAGE)
+    # Neither <p> swallows the next one or the list after it.
+    assert texts(doc, ".body > ul > li") == ["One", "Two"]
+    assert texts(doc, "td") == ["A", "B", "C"]
+    assert len(doc.query_all("tr")) == 2
+
+
+def test_script_text_is_not_article_copy():
+    doc = HtmlDocument(PAGE)
+    assert "tracking" not in doc.all_text_contents(".body")[0]
+    assert doc.has_text(".body")
+    assert not doc.has_text(".missing")
+    assert not HtmlDocument("<div class='body'>  </div>").has_text(".body")
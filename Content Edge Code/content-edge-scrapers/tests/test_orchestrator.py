@@ -0,0 +1,90 @@
+import threading
+
+from orchestrator import FanOutOrchestrator, LocalInvoker
+
+
+def make_handler(site_ids, failing=(), articles=3):
+    calls = []
+
+    def handler(event, context):
+        calls.append(event)
+        if event.get("action") == "list_sites":
+            return {"statusCode": 200, "company_site_ids": list(site_ids)}
+        (company_site_id,) = event["company_site_ids"]
+        if company_site_id in failing:
+            raise RuntimeError(f"{company_site_id} crashed")
+        return {
+            "statusCode": 200,
+            "results": [{"company_site_id": company_site_id, "statusCode": 200, "articles": articles}],
+        }
+
+    handler.calls = calls
+    return handler
+
+
+def test_fan_out_runs_every_site_once():
+    amg_1 = make_handler(["am-1", "am-2", "am-3"])
+    amg_2 = make_handler(["am-4", "am-5"])
+    orchestrator = FanOutOrchestrator(LocalInvoker({"amg-1": amg_1, "amg-2": amg_2}), max_concurrency=2)
+
+    summary = orchestrator.run("2025-12-01", ["amg-1", "amg-2"])
+
+    assert summary["statusCode"] == 200
+    assert summary["sites"] == 5
+    assert summary["succeeded"] == 5
+    assert summary["articles"] == 15
+    assert summary["max_concurrency"] == 2
+    assert sorted(r["company_site_id"] for r in summary["results"]) == ["am-1", "am-2", "am-3", "am-4", "am-5"]
+    assert {r["site_group"] for r in summary["results"] if r["company_site_id"] == "am-4"} == {"amg-2"}
+
+    site_events = [e for e in amg_1.calls if "company_site_ids" in e]
+    assert len(site_events) == 3
+    assert all(e["target_date"] == "2025-12-01" and e["full_crawl"] is False for e in site_events)
+
+
+def test_fan_in_reports_failed_sites_and_groups():
+    amg_1 = make_handler(["am-1", "am-2"], failing={"am-2"})
+    orchestrator = FanOutOrchestrator(LocalInvoker({"amg-1": amg_1}))
+
+    summary = orchestrator.run("2025-12-01", ["amg-1", "amg-9"])
+
+    assert summary["statusCode"] == 207
+    assert summary["failed"] == ["am-2"]
+    assert summary["succeeded"] == 1
+    assert "amg-9" in summary["group_errors"]
+    failed = next(r for r in summary["results"] if r["company_site_id"] == "am-2")
+    assert failed["statusCode"] == 500
+    assert "crashed" in failed["body"]
+
+
+class GatedInvoker:
+    """Threaded invoker whose first site only finishes once all the others have."""
+
+    def __init__(self, site_ids):
+        self.site_ids = site_ids
+        self.others_done = threading.Event()
+        self.finished = []
+        self._lock = threading.Lock()
+
+    def invoke(self, group, payload):
+        if payload.get("action") == "list_sites":
+            return {"company_site_ids": self.site_ids}
+        (company_site_id,) = payload["company_site_ids"]
+        if company_site_id == self.site_ids[0]:
+            self.others_done.wait(timeout=5)
+        with self._lock:
+            self.finished.append(company_site_id)
+            if len(self.finished) == len(self.site_ids) - 1:
+                self.others_done.set()
+        return {"results": [{"company_site_id": company_site_id, "statusCode": 200, "articles": 1}]}
+
+
+def test_slow_site_does_not_hold_back_the_rest():
+    invoker = GatedInvoker(["am-1", "am-2", "am-3", "am-4"])
+    orchestrator = FanOutOrchestrator(invoker, max_concurrency=2)
+
+    summary = orchestrator.run("2025-12-01", ["amg-1"])
+
+    assert summary["succeeded"] == 4
+    assert invoker.finished == ["am-2", "am-3", "am-4", "am-1"]
+    assert [r["company_site_id"] for r in summary["results"]][-1] == "am-1"
@@ -0,0 +1,60 @@
+import gzip
+import json
+
+from local_s3 import LocalS3Client
+from output_writer import read_output, upload_items
+
+
+class CountingS3Client(LocalS3Client):
+    def __init__(self, root):
+        super().__init__(root)
+        self.parts = 0
+        self.puts = 0
+
+    def upload_part(self, **kwargs):
+        self.parts += 1
+        return super().upload_part(**kwargs)
+
+    def put_object(self, **kwargs):
+        self.puts += 1
+        return super().put_object(**kwargs)
+
+
+def sample_items(count):
+    return [
+        {
+            "article_url": f"https://example.com/{number}",
+            "article_title": f"Article {number}",
+            "article_content": " ".join(f"word{number * 31 + k}" for k in range(60)),
+        }
+        for number in range(count)
+    ]
+
+
+def test_multipart_gzip_round_trip(tmp_path):
+    client = CountingS3Client(str(tmp_path))
+    items = sample_items(200)
+    key = "output/website/2025/12/01/am-1.jsonl.gz"
+
+    size = upload_items(client, items, "bucket", key, fmt="jsonl", part_size=4096, compression="gzip")
+
+    assert client.parts > 1
+    assert client.puts == 0
+    obj = client.get_object(Bucket="bucket", Key=key)
+    body = obj["Body"].read()
+    assert len(body) == size
+    assert obj["ContentEncoding"] == "gzip"
+    assert obj["ContentType"] == "application/x-ndjson"
+    lines = gzip.decompress(body).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == items
+    assert read_output(client, "bucket", key) == items
+
+
+def test_small_output_is_a_single_put(tmp_path):
+    client = CountingS3Client(str(tmp_path))
+    items = sample_items(2)
+
+    upload_items(client, items, "bucket", "out.json", fmt="json", compression="none")
+
+    assert client.puts == 1 and client.parts == 0
+    assert read_output(client, "bucket", "out.json") == items
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from paged_listing import PagedListing
+
+NEWEST = date(2025, 12, 1)
+
+
+def make_listing(pages, per_page=10):
+    """A newest-first listing with one article a day, ``pages`` pages long."""
+    def entries(page_no):
+        if not 1 <= page_no <= pages:
+            return []
+        start = (page_no - 1) * per_page
+        return [(f"article-{n}", NEWEST - timedelta(days=n)) for n in range(start, start + per_page)]
+    return entries
+
+
+class Fetcher:
+    def __init__(self, entries, failures=None):
+        self.entries = entries
+        self.failures = dict(failures or {})
+        self.calls = []
+
+    async def __call__(self, page_no):
+        self.calls.append(page_no)
+        if self.failures.get(page_no):
+            self.failures[page_no] -= 1
+            raise RuntimeError(f"page {page_no} did not load")
+        return self.entries(page_no)
+
+
+def test_boundary_search_finds_the_page_crossing_target_date():
+    fetch = Fetcher(make_listing(pages=60))
+    # Article 347 is on page 35, which also holds older articles.
+    target = NEWEST - timedelta(days=347)
+    listing = PagedListing(fetch, target)
+
+    assert asyncio.run(listing.last_page()) == 35
+    assert len(fetch.calls) < 15
+
+
+def test_results_since_reads_every_page_once():
+    fetch = Fetcher(make_listing(pages=60))
+    target = NEWEST - timedelta(days=347)
+    listing = PagedListing(fetch, target, concurrency=3)
+
+    results = asyncio.run(listing.results_since())
+
+    assert [item for item, _ in results] == [f"article-{n}" for n in range(348)]
+    assert sorted(fetch.calls) == sorted(set(fetch.calls))
+
+
+def test_listing_shorter_than_the_window_and_empty_listing():
+    target = NEWEST - timedelta(days=1000)
+    assert asyncio.run(PagedListing(Fetcher(make_listing(pages=4)), target).last_page()) == 4
+    assert asyncio.run(PagedListing(Fetcher(make_listing(pages=0)), target).last_page()) == 0
+
+
+def test_failed_page_is_retried_once():
+    fetch = Fetcher(make_listing(pages=5), failures={3: 1})
+    target = NEWEST - timedelta(days=1000)
+
+    results = asyncio.run(PagedListing(fetch, target).results_since())
+
+    assert len(results) == 50
+    assert fetch.calls.count(3) == 2
+
+
+def test_page_failing_twice_fails_the_listing_and_is_not_cached():
+    fetch = Fetcher(make_listing(pages=5), failures={2: 2})
+    listing = PagedListing(fetch, NEWEST - timedelta(days=1000))
+
+    with pytest.raises(RuntimeError, match="page 2"):
+        asyncio.run(listing.results_since())
+    assert 2 not in listing._pages
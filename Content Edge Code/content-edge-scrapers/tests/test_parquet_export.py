@@ -0,0 +1,61 @@
+import os
+from datetime import date
+
+import pyarrow.dataset as ds
+
+from local_s3 import LocalS3Client
+from output_writer import upload_items
+from parquet_export import export_period
+
+
+def read_export(root):
+    # The local client keeps each object's metadata in a file next to it.
+    return ds.dataset(str(root / "bucket" / "analytics" / "articles"), format="parquet",
+                      partitioning="hive", exclude_invalid_files=True).to_table()
+
+
+def article(number, **fields):
+    return {
+        "article_source": "Example",
+        "article_title": f"Article {number}",
+        "article_url": f"https://example.com/{number}",
+        "article_date": "2025-12-01",
+        "article_tags": ["markets"],
+        "article_content": "Body",
+        **fields,
+    }
+
+
+def test_sites_with_different_fields_read_back_as_one_table(tmp_path):
+    client = LocalS3Client(str(tmp_path))
+    upload_items(client, [article(1, article_description=None, reading_time=4)],
+                 "bucket", "output/website/2025/12/01/am-1.jsonl", fmt="jsonl", compression="none")
+    upload_items(client, [article(2, article_description="Summary"), article(3, article_description="More")],
+                 "bucket", "output/website/2025/12/01/am-2.jsonl", fmt="jsonl", compression="none")
+
+    summary = export_period("2025-12", "bucket", client=client)
+
+    assert summary == {"period": "2025-12", "articles": 3, "sites": 2, "files": 2}
+    table = read_export(tmp_path)
+    rows = sorted(table.to_pylist(), key=lambda row: row["article_url"])
+    assert [row["company_site_id"] for row in rows] == ["am-1", "am-2", "am-2"]
+    assert [row["article_description"] for row in rows] == [None, "Summary", "More"]
+    assert rows[0]["article_date"] == date(2025, 12, 1)
+    # Extra fields keep their scraped type.
+    assert rows[0]["extra"] == '{"reading_time": 4}'
+    assert rows[1]["extra"] is None
+
+
+def test_only_the_newest_output_of_a_site_and_day_is_exported(tmp_path):
+    client = LocalS3Client(str(tmp_path))
+    old_key = "output/website/2025/12/01/am-1.json"
+    upload_items(client, [article(1), article(2)], "bucket", old_key, fmt="json", compression="none")
+    os.utime(client._path("bucket", old_key), (1_700_000_000, 1_700_000_000))
+    upload_items(client, [article(1), article(2), article(3)],
+                 "bucket", "output/website/2025/12/01/am-1.jsonl", fmt="jsonl", compression="none")
+
+    summary = export_period("2025-12-01", "bucket", client=client)
+
+    assert summary["articles"] == 3 and summary["files"] == 1
+    table = read_export(tmp_path)
+    assert table.num_rows == 3
@@ -0,0 +1,44 @@
+import asyncio
+
+from pipeline import SitePipeline
+
+
+class Uploads:
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.keys = []
+
+    def __call__(self, data, bucket, key):
+        self.keys.append(key)
+        return self.ok
+
+
+def run(registry, site_ids, upload):
+    pipeline = SitePipeline(registry, "bucket", upload)
+    return asyncio.run(pipeline.run_sites(site_ids, "2025-12-01"))
+
+
+def test_a_scraper_that_returns_a_status_code_fails_its_site():
+    async def returns_items(target_date):
+        return [{"article_url": "https://example.com/a", "article_title": "A", "article_content": "Body"}]
+
+    async def returns_status(target_date):
+        return 200
+
+    upload = Uploads()
+    ok, bare = run({"am-1": returns_items, "am-2": returns_status}, ["am-1", "am-2"], upload)
+
+    assert ok["statusCode"] == 200 and ok["articles"] == 1
+    assert bare["statusCode"] == 500 and bare["articles"] == 0
+    assert "200" in bare["body"]
+    assert upload.keys == ["output/website/2025/12/01/am-1.jsonl"]
+
+
+def test_a_failed_upload_fails_the_site():
+    async def returns_items(target_date):
+        return [{"article_url": "https://example.com/a", "article_title": "A", "article_content": "Body"}]
+
+    (result,) = run({"am-1": returns_items}, ["am-1"], Uploads(ok=False))
+
+    assert result["statusCode"] == 500
+    assert "failed" in result["body"]
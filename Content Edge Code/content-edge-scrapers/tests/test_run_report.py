@@ -0,0 +1,39 @@
+import asyncio
+
+import run_report
+from article_fetch import fetch_articles
+
+
+def test_listing_phase_ends_at_the_first_article_fetch():
+    report = run_report.SiteReport("am-1", "2025-12-01")
+
+    async def scrape():
+        token = run_report.activate(report)
+        try:
+            run_report.begin("listing")
+            await asyncio.sleep(0.02)
+            items = [{"article_url": "https://example.com/a"}]
+
+            async def fast_path(item):
+                await asyncio.sleep(0.05)
+                return True
+
+            await fetch_articles(None, items, handler=None, fast_path=fast_path)
+            await fetch_articles(None, [], handler=None)
+            run_report.end("listing")
+        finally:
+            run_report.deactivate(token)
+
+    asyncio.run(scrape())
+
+    listing = report.spans["listing"]
+    assert len(listing) == 1
+    assert 0.02 <= listing[0] < 0.05
+    assert report.summary()["article_latency"]["count"] == 1
+
+
+def test_phases_are_ignored_outside_a_reported_run():
+    run_report.begin("listing")
+    run_report.end("listing")
+    with run_report.span("consent"):
+        pass
@@ -0,0 +1,38 @@
+from section_crawl import article_key, canonical_url, dedupe_items
+
+
+def test_canonical_url_drops_query_fragment_and_trailing_slash():
+    assert canonical_url("HTTPS://Example.com/Insights/Outlook/?utm=x#top") == "https://example.com/Insights/Outlook"
+    assert canonical_url(None) == ""
+
+
+def test_dedupe_keeps_first_of_each_article_in_order():
+    items = [
+        {"article_url": "https://example.com/a", "section": "markets"},
+        {"article_url": "https://example.com/b/", "section": "markets"},
+        {"article_url": "https://EXAMPLE.com/a?ref=rates", "section": "rates"},
+        {"article_url": "https://example.com/b", "section": "rates"},
+        {"article_url": "https://example.com/c", "section": "rates"},
+    ]
+    unique = dedupe_items(items)
+    assert [(item["article_url"], item["section"]) for item in unique] == [
+        ("https://example.com/a", "markets"),
+        ("https://example.com/b/", "markets"),
+        ("https://example.com/c", "rates"),
+    ]
+
+
+def test_dedupe_falls_back_to_slug_and_keeps_items_without_a_key():
+    items = [
+        {"article_slug": "outlook"},
+        {"article_slug": "outlook"},
+        {"article_title": "no key"},
+        {"article_title": "no key"},
+    ]
+    assert article_key(items[0]) == "outlook"
+    assert dedupe_items(items) == [items[0], items[2], items[3]]
+
+
+def test_dedupe_with_a_custom_key():
+    items = [{"id": 1, "v": "a"}, {"id": 2, "v": "b"}, {"id": 1, "v": "c"}]
+    assert dedupe_items(items, key=lambda item: item["id"]) == items[:2]
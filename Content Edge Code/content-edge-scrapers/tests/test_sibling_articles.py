@@ -0,0 +1,41 @@
+import asyncio
+
+from article_fetch import fetch_articles
+from pipeline import SitePipeline
+from sibling_articles import canonical_article_url
+
+
+def test_canonical_url_drops_region_and_audience():
+    assert canonical_article_url("https://www.pimco.com/us/en/insights/outlook") == "pimco.com/insights/outlook"
+    assert canonical_article_url("https://www.franklintempleton.co.uk/en-gb/advisers/articles/q4") == \
+        "franklintempleton.com/articles/q4"
+
+
+def test_siblings_fetch_a_shared_article_once():
+    fetches = []
+
+    async def fast_path(item):
+        fetches.append(item["article_url"])
+        await asyncio.sleep(0.01)
+        item["article_content"] = "Shared body"
+        return True
+
+    def scraper(item_site_id, region):
+        async def scrape(target_date):
+            # Items carry the scraper's own ids, not the registry's.
+            items = [{
+                "company_site_id": item_site_id,
+                "article_url": f"https://www.example.com/{region}/en/insights/outlook",
+            }]
+            await fetch_articles(None, items, handler=None, fast_path=fast_path)
+            return items
+        return scrape
+
+    registry = {"am-414": scraper("am-416", "us"), "am-415": scraper("am-414", "sg")}
+    pipeline = SitePipeline(registry, "bucket", upload=lambda data, bucket, key: True)
+
+    results, stats = asyncio.run(pipeline.run_siblings("pinebridge", ["am-414", "am-415"], "2025-12-01"))
+
+    assert len(fetches) == 1
+    assert stats == {"fetched": 1, "shared": 1}
+    assert all(r["statusCode"] == 200 and r["articles"] == 1 for r in results)
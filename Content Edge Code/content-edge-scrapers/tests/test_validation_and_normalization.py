@@ -0,0 +1,48 @@
+import json
+
+from validation_and_normalization import main
+
+
+def write_items(path, items):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(items), encoding="utf-8")
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def article(number, **overrides):
+    item = {
+        "article_url": f"https://example.com/{number}",
+        "article_title": f"  Article   {number} ",
+        "article_date": "2025-12-01",
+    }
+    item.update(overrides)
+    return item
+
+
+def test_same_site_inputs_share_one_output(tmp_path):
+    write_items(tmp_path / "2025-12-01" / "am-1.json", [article(1), article(2, article_date="soon")])
+    write_items(tmp_path / "2025-12-02" / "am-1.json", [article(3), article(4, article_url=" ")])
+    write_items(tmp_path / "2025-12-02" / "am-2.json", [article(5)])
+    output_dir = tmp_path / "validated"
+
+    summary = main([
+        str(tmp_path / "2025-12-01"), str(tmp_path / "2025-12-02"),
+        "-o", str(output_dir), "--workers", "1",
+    ])
+
+    assert summary["files"] == 3
+    assert [site["site"] for site in summary["sites"]] == ["am-1", "am-2"]
+    accepted = read_lines(output_dir / "am-1.accepted.jsonl")
+    assert [row["article_url"] for row in accepted] == ["https://example.com/1", "https://example.com/3"]
+    assert accepted[0]["article_title"] == "Article 1"
+    rejected = read_lines(output_dir / "am-1.rejected.jsonl")
+    assert [row["reason"] for row in rejected] == [
+        ["Invalid or missing article_date"],
+        ["Invalid or missing article_url"],
+    ]
+    assert summary["sites"][0]["accepted"] == len(accepted)
+    assert summary["reasons"] == {"Invalid or missing article_date": 1, "Invalid or missing article_url": 1}
+    assert len(read_lines(output_dir / "am-2.accepted.jsonl")) == 1